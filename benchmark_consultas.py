@@ -0,0 +1,123 @@
+"""
+Micro-benchmark das buscas unitárias de produto e itens de venda.
+
+Compara o caminho antigo (cursor dicionário + SELECT p.* + from_dict) com o
+caminho rápido (prepared statement + tupla + from_row), por chamada.
+
+Uso:
+    python benchmark_consultas.py                           # só montagem dos modelos
+    python benchmark_consultas.py 7891234567890             # + busca por código de barras
+    python benchmark_consultas.py 7891234567890 1500        # + itens da venda 1500
+"""
+import sys
+import time
+from datetime import datetime
+from decimal import Decimal
+from src.models.produto import Produto
+from src.models.venda import ItemVenda
+
+REPETICOES = 2000
+
+def medir(funcao, repeticoes=REPETICOES):
+    """Executa a função N vezes e retorna microssegundos por chamada."""
+    funcao()  # aquecimento (conexão, prepare)
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes * 1_000_000
+
+def mostrar(titulo, antes, depois):
+    """Imprime a comparação de uma medição."""
+    print(f"   {titulo:<32} antes: {antes:9.1f} µs   depois: {depois:9.1f} µs   ({antes / depois:.1f}x)")
+
+def benchmark_modelos():
+    """Montagem dos objetos a partir de uma linha já lida do banco."""
+    agora = datetime.now()
+    linha = (
+        1, '7891234567890', 'Arroz Branco 1kg', 'Arroz tipo 1', 5, Decimal('3.50'), Decimal('5.99'),
+        50, 10, 'UN', 1, agora, agora, 'Alimentos'
+    )
+    dicionario = dict(zip(Produto.CAMPOS_LINHA, linha))
+    
+    mostrar(
+        "Produto (modelo)",
+        medir(lambda: Produto.from_dict(dicionario), 50000),
+        medir(lambda: Produto.from_row(linha), 50000)
+    )
+    
+    linha_item = (1, 10, 1, Decimal('2.000'), Decimal('5.99'), Decimal('0.00'), Decimal('11.98'),
+                  'Arroz Branco 1kg', '7891234567890')
+    dicionario_item = dict(zip(ItemVenda.CAMPOS_LINHA, linha_item))
+    
+    mostrar(
+        "ItemVenda (modelo)",
+        medir(lambda: ItemVenda.from_dict(dicionario_item), 50000),
+        medir(lambda: ItemVenda.from_row(linha_item), 50000)
+    )
+
+def benchmark_banco(codigo_barras, venda_id=None):
+    """Ida e volta ao banco pelas duas implementações."""
+    from src.config.database import DatabaseConnection
+    from src.dao.produto_dao import ProdutoDAO
+    from src.dao.venda_dao import ItemVendaDAO
+    
+    # Os caminhos "antes" reproduzem as implementações substituídas, com o mesmo tipo de cursor
+    def produto_antigo():
+        with DatabaseConnection.get_cursor(readonly=True, usar_replica=False) as cursor:
+            cursor.execute("""
+                SELECT p.*, c.nome as categoria_nome
+                FROM produtos p
+                LEFT JOIN categorias c ON p.categoria_id = c.id
+                WHERE p.codigo_barras = %s AND p.ativo = TRUE
+            """, (codigo_barras,))
+            row = cursor.fetchone()
+            return Produto.from_dict(row) if row else None
+    
+    if ProdutoDAO.buscar_por_codigo_barras(codigo_barras) is None:
+        print(f"✗ Produto {codigo_barras} não encontrado")
+        return
+    
+    mostrar(
+        "buscar_por_codigo_barras",
+        medir(produto_antigo),
+        medir(lambda: ProdutoDAO.buscar_por_codigo_barras(codigo_barras))
+    )
+    
+    if venda_id is None:
+        return
+    
+    def itens_antigo():
+        with DatabaseConnection.get_cursor(readonly=True) as cursor:
+            cursor.execute("""
+                SELECT iv.*, p.nome as produto_nome, p.codigo_barras as produto_codigo_barras
+                FROM itens_venda iv
+                JOIN produtos p ON iv.produto_id = p.id
+                WHERE iv.venda_id = %s
+                ORDER BY iv.id
+            """, (venda_id,))
+            return [ItemVenda.from_dict(row) for row in cursor.fetchall()]
+    
+    mostrar(
+        "ItemVendaDAO.buscar_por_venda",
+        medir(itens_antigo),
+        medir(lambda: ItemVendaDAO.buscar_por_venda(venda_id))
+    )
+
+def main():
+    """Função principal."""
+    argumentos = sys.argv[1:]
+    
+    print("=" * 60)
+    print("⏱  Benchmark das consultas unitárias (por chamada)")
+    print("=" * 60)
+    
+    benchmark_modelos()
+    
+    if argumentos:
+        venda_id = int(argumentos[1]) if len(argumentos) > 1 else None
+        benchmark_banco(argumentos[0], venda_id)
+    else:
+        print("\n   Informe um código de barras para medir também a ida ao banco.")
+
+if __name__ == '__main__':
+    main()
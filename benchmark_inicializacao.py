@@ -0,0 +1,82 @@
+"""
+Benchmark do tempo de importação na inicialização (python -X importtime).
+
+Mede quanto custa importar os módulos necessários até a tela de login e
+lista os módulos mais pesados. Cada medição roda em um processo novo.
+
+Uso:
+    python benchmark_inicializacao.py                  # main (até a tela de login)
+    python benchmark_inicializacao.py src.ui.caixa.venda_window 10
+"""
+import statistics
+import subprocess
+import sys
+
+def medir_importacao(modulo):
+    """
+    Importa o módulo em um processo novo com -X importtime.
+    
+    Returns:
+        (tempo total em ms, lista [(ms acumulado, módulo)] de todos os imports)
+    """
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        capture_output=True, text=True
+    )
+    if processo.returncode != 0:
+        erro = processo.stderr.strip().splitlines()[-1] if processo.stderr.strip() else "erro desconhecido"
+        raise RuntimeError(erro)
+    
+    # Linhas no formato: "import time:  self [us] | cumulative | imported package"
+    imports = []
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        _, acumulado, nome = linha[len("import time:"):].split("|")
+        # Submódulos vêm indentados (2 espaços por nível)
+        imports.append((int(acumulado) / 1000, nome[1:].rstrip()))
+    
+    total = next((ms for ms, nome in imports if nome == modulo), None)
+    if total is None:
+        total = sum(ms for ms, nome in imports if nome == nome.lstrip())
+    return total, imports
+
+def main():
+    """Função principal."""
+    modulo = sys.argv[1] if len(sys.argv) > 1 else "main"
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    
+    print("=" * 60)
+    print(f"⏱  Tempo de importação de '{modulo}' ({repeticoes} execuções)")
+    print("=" * 60)
+    
+    tempos = []
+    imports = []
+    try:
+        for _ in range(repeticoes):
+            total, imports = medir_importacao(modulo)
+            tempos.append(total)
+    except RuntimeError as e:
+        print(f"✗ Falha ao importar {modulo}: {e}")
+        sys.exit(1)
+    
+    print(f"✓ Mediana: {statistics.median(tempos):.1f} ms  (mín {min(tempos):.1f} / máx {max(tempos):.1f})")
+    
+    # Imports diretos do módulo medido: linhas com um nível de indentação
+    # logo acima da linha do módulo (o importtime lista os filhos antes do pai)
+    nomes = [nome for _, nome in imports]
+    fim = nomes.index(modulo) if modulo in nomes else 0
+    bloco = []
+    for ms, nome in reversed(imports[:fim]):
+        if nome == nome.lstrip():
+            break
+        if nome[2] != " ":
+            bloco.append((ms, nome.strip()))
+    pesados = sorted(bloco, reverse=True)[:10]
+    
+    print("\n📦 Módulos mais pesados (acumulado, última execução):")
+    for ms, nome in pesados:
+        print(f"   {ms:8.1f} ms  {nome}")
+
+if __name__ == '__main__':
+    main()
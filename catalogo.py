@@ -0,0 +1,97 @@
+"""
+Importação e exportação do catálogo de produtos (CSV ou XLSX).
+
+Uso:
+    python catalogo.py importar lista_fornecedor.xlsx
+    python catalogo.py importar lista_fornecedor.csv --simular   # só valida
+    python catalogo.py importar lista.xlsx --usuario=gerente      # responsável (padrão: admin)
+    python catalogo.py exportar catalogo.xlsx [--ativos]
+
+Colunas: codigo_barras, nome, descricao, categoria, preco_custo, preco_venda,
+estoque_atual, estoque_minimo, unidade_medida, ativo. Obrigatórias:
+codigo_barras, nome e preco_venda. Produtos com código de barras já
+cadastrado são atualizados; colunas ausentes na planilha e células vazias
+não são alteradas. Mudanças de estoque_atual ficam no histórico de
+movimentações em nome do usuário informado.
+"""
+import csv
+import sys
+import time
+from pathlib import Path
+from src.dao.usuario_dao import UsuarioDAO
+from src.services.catalogo_service import catalogo_service
+
+def mostrar_progresso(processadas, total):
+    """Atualiza a linha de progresso no terminal."""
+    if total:
+        print(f"\r   {processadas}/{total} ({processadas / total:.0%})", end="", flush=True)
+    else:
+        print(f"\r   {processadas}", end="", flush=True)
+
+def importar(caminho, simular, username):
+    """Importa a planilha e grava os erros em <arquivo>.erros.csv."""
+    usuario = None if simular else UsuarioDAO.buscar_por_username(username)
+    if not simular and usuario is None:
+        print(f"✗ Usuário {username} não encontrado")
+        sys.exit(1)
+    
+    print(f"📥 Importando {caminho}{' (simulação, nada será gravado)' if simular else ''}...")
+    inicio = time.perf_counter()
+    try:
+        resultado = catalogo_service.importar(
+            caminho, simular=simular, progresso=mostrar_progresso,
+            usuario_id=usuario.id if usuario else None,
+            usuario_nome=usuario.nome_completo if usuario else "Sistema"
+        )
+    except (OSError, ValueError) as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+    print()
+    
+    duracao = time.perf_counter() - inicio
+    print(f"✓ {resultado.linhas} linha(s) em {duracao:.1f}s ({resultado.linhas / max(duracao, 0.001):.0f} linhas/s)")
+    if simular:
+        print(f"   Válidas: {resultado.validas}")
+    else:
+        print(f"   Novos: {resultado.inseridos}   Atualizados: {resultado.atualizados}")
+    
+    if resultado.erros:
+        arquivo_erros = Path(caminho).with_suffix(".erros.csv")
+        with open(arquivo_erros, 'w', encoding='utf-8-sig', newline='') as arquivo:
+            escritor = csv.writer(arquivo, delimiter=';')
+            escritor.writerow(["linha", "codigo_barras", "erro"])
+            escritor.writerows(resultado.erros)
+        
+        print(f"✗ {len(resultado.erros)} linha(s) com erro (lista completa em {arquivo_erros}):")
+        for linha, codigo, mensagem in resultado.erros[:20]:
+            print(f"   linha {linha} [{codigo}]: {mensagem}")
+
+def exportar(caminho, apenas_ativos):
+    """Exporta o catálogo."""
+    print(f"📤 Exportando catálogo para {caminho}...")
+    try:
+        quantidade = catalogo_service.exportar(caminho, apenas_ativos=apenas_ativos, progresso=mostrar_progresso)
+    except (OSError, ValueError) as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+    print()
+    print(f"✓ {quantidade} produto(s) exportado(s)")
+
+def main():
+    """Função principal."""
+    argumentos = [a for a in sys.argv[1:] if not a.startswith("--")]
+    opcoes = {a for a in sys.argv[1:] if a.startswith("--")}
+    username = next((a.split("=", 1)[1] for a in opcoes if a.startswith("--usuario=")), "admin")
+    
+    if len(argumentos) != 2 or argumentos[0] not in ("importar", "exportar"):
+        print(__doc__)
+        sys.exit(1)
+    
+    acao, caminho = argumentos
+    if acao == "importar":
+        importar(caminho, "--simular" in opcoes, username)
+    else:
+        exportar(caminho, "--ativos" in opcoes)
+
+if __name__ == '__main__':
+    main()
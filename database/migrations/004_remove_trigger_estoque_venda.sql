@@ -0,0 +1,13 @@
+-- Migração 004: Remover trigger de baixa de estoque por item
+-- Data: 2026-10-18
+-- Descrição: A baixa de estoque passa a ser feita pela aplicação (EstoqueDAO)
+--            com um único UPDATE relativo por venda e histórico gravado em lote.
+--            Manter o trigger faria o estoque ser baixado duas vezes.
+
+USE pdv_sistema;
+
+DROP TRIGGER IF EXISTS tr_atualizar_estoque_venda;
+
+-- Verificação
+SELECT 'Migração 004 aplicada com sucesso!' as status;
+SHOW TRIGGERS WHERE `Trigger` = 'tr_atualizar_estoque_venda';
@@ -0,0 +1,20 @@
+-- Migração 005: Índices compostos (status, data_hora) para consultas por período
+-- Data: 2026-10-18
+-- Descrição: As consultas por período passaram a usar intervalos semiabertos
+--            (data_hora >= início AND data_hora < fim) em vez de DATE(data_hora),
+--            o que permite usar índices. Os totais do dia filtram também por
+--            status, então o índice composto resolve as duas condições.
+
+USE pdv_sistema;
+
+ALTER TABLE vendas
+ADD INDEX idx_status_data_hora (status, data_hora);
+
+ALTER TABLE pagamentos
+ADD INDEX idx_status_data_hora (status, data_hora);
+
+-- Verificação
+SELECT 'Migração 005 aplicada com sucesso!' as status;
+
+-- Para conferir que as consultas dos DAOs usam os índices (EXPLAIN):
+-- python testar_indices.py
@@ -0,0 +1,14 @@
+-- Migração 006: Índice em produtos.data_atualizacao
+-- Data: 2026-10-18
+-- Descrição: A frente de caixa mantém o catálogo em memória e busca só os
+--            produtos alterados (WHERE data_atualizacao >= ?). O índice deixa
+--            essa verificação periódica barata mesmo com catálogos grandes.
+
+USE pdv_sistema;
+
+ALTER TABLE produtos
+ADD INDEX idx_data_atualizacao (data_atualizacao);
+
+-- Verificação
+SELECT 'Migração 006 aplicada com sucesso!' as status;
+EXPLAIN SELECT MAX(data_atualizacao) FROM produtos;
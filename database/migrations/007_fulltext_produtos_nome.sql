@@ -0,0 +1,18 @@
+-- Migração 007: Índice FULLTEXT (ngram) em produtos.nome
+-- Data: 2026-10-18
+-- Descrição: A busca de produtos do PDV web (/api/pdv/produtos/buscar) passou a
+--            filtrar, ordenar e limitar no banco (ProdutoDAO.pesquisar), usando
+--            este índice para o nome e idx_codigo_barras para prefixo do código.
+--            O parser ngram encontra partes de palavras ("arro" -> "Arroz") e a
+--            collation utf8mb4_unicode_ci ignora acentos ("acucar" -> "Açúcar").
+
+USE pdv_sistema;
+
+ALTER TABLE produtos
+ADD FULLTEXT INDEX ft_nome (nome) WITH PARSER ngram;
+
+-- Verificação
+SELECT 'Migração 007 aplicada com sucesso!' as status;
+EXPLAIN
+SELECT id FROM produtos
+WHERE MATCH(nome) AGAINST ('"acucar"' IN BOOLEAN MODE) AND ativo = TRUE;
@@ -0,0 +1,24 @@
+-- Migração 008: Resumo diário de vendas
+-- Data: 2026-10-18
+-- Descrição: Cria a tabela vendas_resumo_diario (dia × caixa × forma de
+--            pagamento), usada pelo dashboard e pelos relatórios no lugar de
+--            varrer vendas/pagamentos. A aplicação mantém a tabela a cada
+--            venda e estorno; após aplicar esta migração, carregue o
+--            histórico com: python reconstruir_resumo_vendas.py
+
+USE pdv_sistema;
+
+CREATE TABLE vendas_resumo_diario (
+    data DATE NOT NULL,
+    caixa_id INT NOT NULL DEFAULT 0 COMMENT '0 = venda sem caixa',
+    forma_pagamento ENUM('dinheiro', 'debito', 'credito', 'pix') NOT NULL,
+    quantidade_vendas INT NOT NULL DEFAULT 0 COMMENT 'Contada na forma do primeiro pagamento',
+    quantidade_pagamentos INT NOT NULL DEFAULT 0,
+    valor_total DECIMAL(14,2) NOT NULL DEFAULT 0.00,
+    quantidade_estornos INT NOT NULL DEFAULT 0,
+    valor_estornado DECIMAL(14,2) NOT NULL DEFAULT 0.00,
+    PRIMARY KEY (data, caixa_id, forma_pagamento)
+) ENGINE=InnoDB COMMENT='Totais de vendas finalizadas por dia, caixa e forma de pagamento';
+
+-- Verificação
+SELECT 'Migração 008 aplicada com sucesso!' as status;
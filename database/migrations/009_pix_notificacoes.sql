@@ -0,0 +1,18 @@
+-- Migração 009: Notificações de status de pagamento PIX
+-- Data: 2026-10-18
+-- Descrição: O webhook do Mercado Pago (web_app) grava aqui o status de cada
+--            pagamento notificado. A frente de caixa, que roda em outro
+--            processo, lê esta tabela para saber da aprovação em menos de um
+--            segundo, consultando a API do Mercado Pago só como reserva.
+
+USE pdv_sistema;
+
+CREATE TABLE pix_notificacoes (
+    payment_id VARCHAR(50) PRIMARY KEY,
+    status VARCHAR(30) NOT NULL,
+    data_hora DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_data_hora (data_hora)
+) ENGINE=InnoDB COMMENT='Último status de pagamento recebido pelo webhook do Mercado Pago';
+
+-- Verificação
+SELECT 'Migração 009 aplicada com sucesso!' as status;
@@ -0,0 +1,15 @@
+-- Migração 010: Chave de idempotência das vendas
+-- Data: 2026-10-18
+-- Descrição: A frente de caixa grava as vendas em um diário local (SQLite)
+--            e as replica ao MySQL em segundo plano. Cada venda leva uma
+--            chave gerada no caixa; o índice único garante que um reenvio
+--            (queda de conexão após o commit, reinício) não duplique a venda.
+
+USE pdv_sistema;
+
+ALTER TABLE vendas
+ADD COLUMN chave_idempotencia VARCHAR(36) NULL COMMENT 'Gerada pelo caixa; evita duplicar vendas replicadas do diário local' AFTER observacoes,
+ADD UNIQUE INDEX uk_chave_idempotencia (chave_idempotencia);
+
+-- Verificação
+SELECT 'Migração 010 aplicada com sucesso!' as status;
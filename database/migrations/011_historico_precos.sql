@@ -0,0 +1,28 @@
+-- Migração 011: Histórico de preços
+-- Data: 2026-10-18
+-- Descrição: O reajuste de preços em massa (por percentual, margem sobre o
+--            custo ou arredondamento) grava uma linha por produto alterado,
+--            com o preço anterior e o novo. O campo lote agrupa as linhas
+--            de um mesmo reajuste e é usado para aplicar o novo preço.
+
+USE pdv_sistema;
+
+CREATE TABLE historico_precos (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    produto_id INT NOT NULL,
+    preco_anterior DECIMAL(10,2) NOT NULL,
+    preco_novo DECIMAL(10,2) NOT NULL,
+    preco_custo DECIMAL(10,2) COMMENT 'Custo do produto no momento do reajuste',
+    regra VARCHAR(200) NOT NULL,
+    lote CHAR(36) NOT NULL COMMENT 'Identifica o reajuste que gerou a alteração',
+    usuario_id INT NOT NULL,
+    data_hora DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (produto_id) REFERENCES produtos(id) ON DELETE CASCADE,
+    FOREIGN KEY (usuario_id) REFERENCES usuarios(id),
+    INDEX idx_produto_data (produto_id, data_hora),
+    INDEX idx_lote_produto (lote, produto_id),
+    INDEX idx_data_hora (data_hora)
+) ENGINE=InnoDB COMMENT='Alterações de preço de venda feitas pelo reajuste em massa';
+
+-- Verificação
+SELECT 'Migração 011 aplicada com sucesso!' as status;
@@ -0,0 +1,17 @@
+-- Migração 012: Sequência dos números de venda por caixa
+-- Data: 2026-10-18
+-- Descrição: O número da venda deixa de ser o horário (V + AAAAMMDDHHMMSS),
+--            que repetia quando dois caixas finalizavam no mesmo segundo.
+--            Cada caixa reserva aqui blocos de números (hi/lo) e emite os
+--            números do bloco em memória, sem ir ao banco a cada venda.
+
+USE pdv_sistema;
+
+CREATE TABLE IF NOT EXISTS sequencias_venda (
+    caixa_id INT NOT NULL PRIMARY KEY COMMENT '0 = vendas sem caixa',
+    proximo BIGINT NOT NULL DEFAULT 1 COMMENT 'Primeiro número ainda não reservado',
+    atualizado_em DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB COMMENT='Próximo bloco de números de venda de cada caixa';
+
+-- Verificação
+SELECT 'Migração 012 aplicada com sucesso!' as status;
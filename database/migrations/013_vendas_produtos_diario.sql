@@ -0,0 +1,26 @@
+-- Migração 013: Resumo diário de vendas por produto
+-- Data: 2026-10-18
+-- Descrição: Cria a tabela vendas_produtos_diario (dia × caixa × produto),
+--            usada pelo relatório de produtos mais vendidos, pela curva ABC
+--            e pela tendência de cada produto no lugar de varrer
+--            itens_venda. A aplicação mantém a tabela a cada venda e
+--            estorno; após aplicar esta migração, carregue o histórico com:
+--            python reconstruir_resumo_vendas.py
+
+USE pdv_sistema;
+
+CREATE TABLE vendas_produtos_diario (
+    data DATE NOT NULL,
+    caixa_id INT NOT NULL DEFAULT 0 COMMENT '0 = venda sem caixa',
+    produto_id INT NOT NULL,
+    quantidade DECIMAL(14,3) NOT NULL DEFAULT 0.000,
+    valor_total DECIMAL(14,2) NOT NULL DEFAULT 0.00 COMMENT 'Soma dos subtotais dos itens',
+    quantidade_vendas INT NOT NULL DEFAULT 0 COMMENT 'Vendas em que o produto aparece',
+    quantidade_estornada DECIMAL(14,3) NOT NULL DEFAULT 0.000,
+    valor_estornado DECIMAL(14,2) NOT NULL DEFAULT 0.00,
+    PRIMARY KEY (data, caixa_id, produto_id),
+    INDEX idx_produto_data (produto_id, data)
+) ENGINE=InnoDB COMMENT='Totais de vendas finalizadas por dia, caixa e produto';
+
+-- Verificação
+SELECT 'Migração 013 aplicada com sucesso!' as status;
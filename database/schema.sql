@@ -41,7 +41,9 @@ CREATE TABLE produtos (
     INDEX idx_codigo_barras (codigo_barras),
     INDEX idx_nome (nome),
     INDEX idx_categoria (categoria_id),
-    INDEX idx_ativo (ativo)
+    INDEX idx_ativo (ativo),
+    INDEX idx_data_atualizacao (data_atualizacao),
+    FULLTEXT INDEX ft_nome (nome) WITH PARSER ngram
 ) ENGINE=InnoDB;
 
 -- ========================================
@@ -93,13 +95,16 @@ CREATE TABLE vendas (
     total DECIMAL(10,2) NOT NULL,
     status ENUM('aberta', 'finalizada', 'cancelada') DEFAULT 'aberta',
     observacoes TEXT,
+    chave_idempotencia VARCHAR(36) NULL COMMENT 'Gerada pelo caixa; evita duplicar vendas replicadas do diário local',
     FOREIGN KEY (usuario_id) REFERENCES usuarios(id),
     FOREIGN KEY (caixa_id) REFERENCES caixa(id) ON DELETE SET NULL,
+    UNIQUE INDEX uk_chave_idempotencia (chave_idempotencia),
     INDEX idx_numero_venda (numero_venda),
     INDEX idx_usuario (usuario_id),
     INDEX idx_caixa (caixa_id),
     INDEX idx_data_hora (data_hora),
-    INDEX idx_status (status)
+    INDEX idx_status (status),
+    INDEX idx_status_data_hora (status, data_hora)
 ) ENGINE=InnoDB;
 
 -- ========================================
@@ -139,7 +144,8 @@ CREATE TABLE pagamentos (
     INDEX idx_venda (venda_id),
     INDEX idx_forma_pagamento (forma_pagamento),
     INDEX idx_status (status),
-    INDEX idx_data_hora (data_hora)
+    INDEX idx_data_hora (data_hora),
+    INDEX idx_status_data_hora (status, data_hora)
 ) ENGINE=InnoDB;
 
 -- ========================================
@@ -179,6 +185,83 @@ CREATE TABLE estornos (
     INDEX idx_data (data_estorno)
 ) ENGINE=InnoDB COMMENT='Registros de estornos de vendas';
 
+-- ========================================
+-- TABELA: vendas_resumo_diario
+-- ========================================
+-- Mantida pela aplicação (ResumoVendasDAO) na finalização da venda e no
+-- estorno. Recalcular com: python reconstruir_resumo_vendas.py
+CREATE TABLE vendas_resumo_diario (
+    data DATE NOT NULL,
+    caixa_id INT NOT NULL DEFAULT 0 COMMENT '0 = venda sem caixa',
+    forma_pagamento ENUM('dinheiro', 'debito', 'credito', 'pix') NOT NULL,
+    quantidade_vendas INT NOT NULL DEFAULT 0 COMMENT 'Contada na forma do primeiro pagamento aprovado',
+    quantidade_pagamentos INT NOT NULL DEFAULT 0,
+    valor_total DECIMAL(14,2) NOT NULL DEFAULT 0.00,
+    quantidade_estornos INT NOT NULL DEFAULT 0,
+    valor_estornado DECIMAL(14,2) NOT NULL DEFAULT 0.00,
+    PRIMARY KEY (data, caixa_id, forma_pagamento)
+) ENGINE=InnoDB COMMENT='Totais de vendas finalizadas por dia, caixa e forma de pagamento';
+
+-- ========================================
+-- TABELA: pix_notificacoes
+-- ========================================
+-- Gravada pelo webhook (web_app) e lida pela frente de caixa
+CREATE TABLE pix_notificacoes (
+    payment_id VARCHAR(50) PRIMARY KEY,
+    status VARCHAR(30) NOT NULL,
+    data_hora DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_data_hora (data_hora)
+) ENGINE=InnoDB COMMENT='Último status de pagamento recebido pelo webhook do Mercado Pago';
+
+-- ========================================
+-- TABELA: historico_precos
+-- ========================================
+-- Gravada pelo reajuste de preços em massa (ReajustePrecoDAO)
+CREATE TABLE historico_precos (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    produto_id INT NOT NULL,
+    preco_anterior DECIMAL(10,2) NOT NULL,
+    preco_novo DECIMAL(10,2) NOT NULL,
+    preco_custo DECIMAL(10,2) COMMENT 'Custo do produto no momento do reajuste',
+    regra VARCHAR(200) NOT NULL,
+    lote CHAR(36) NOT NULL COMMENT 'Identifica o reajuste que gerou a alteração',
+    usuario_id INT NOT NULL,
+    data_hora DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (produto_id) REFERENCES produtos(id) ON DELETE CASCADE,
+    FOREIGN KEY (usuario_id) REFERENCES usuarios(id),
+    INDEX idx_produto_data (produto_id, data_hora),
+    INDEX idx_lote_produto (lote, produto_id),
+    INDEX idx_data_hora (data_hora)
+) ENGINE=InnoDB COMMENT='Alterações de preço de venda feitas pelo reajuste em massa';
+
+-- ========================================
+-- TABELA: sequencias_venda
+-- ========================================
+-- Blocos de números de venda reservados por caixa (NumeracaoVendas)
+CREATE TABLE sequencias_venda (
+    caixa_id INT NOT NULL PRIMARY KEY COMMENT '0 = vendas sem caixa',
+    proximo BIGINT NOT NULL DEFAULT 1 COMMENT 'Primeiro número ainda não reservado',
+    atualizado_em DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB COMMENT='Próximo bloco de números de venda de cada caixa';
+
+-- ========================================
+-- TABELA: vendas_produtos_diario
+-- ========================================
+-- Mantida pela aplicação (ResumoProdutosDAO) na finalização da venda e no
+-- estorno. Recalcular com: python reconstruir_resumo_vendas.py
+CREATE TABLE vendas_produtos_diario (
+    data DATE NOT NULL,
+    caixa_id INT NOT NULL DEFAULT 0 COMMENT '0 = venda sem caixa',
+    produto_id INT NOT NULL,
+    quantidade DECIMAL(14,3) NOT NULL DEFAULT 0.000,
+    valor_total DECIMAL(14,2) NOT NULL DEFAULT 0.00 COMMENT 'Soma dos subtotais dos itens',
+    quantidade_vendas INT NOT NULL DEFAULT 0 COMMENT 'Vendas em que o produto aparece',
+    quantidade_estornada DECIMAL(14,3) NOT NULL DEFAULT 0.000,
+    valor_estornado DECIMAL(14,2) NOT NULL DEFAULT 0.00,
+    PRIMARY KEY (data, caixa_id, produto_id),
+    INDEX idx_produto_data (produto_id, data)
+) ENGINE=InnoDB COMMENT='Totais de vendas finalizadas por dia, caixa e produto';
+
 -- ========================================
 -- DADOS INICIAIS
 -- ========================================
@@ -261,28 +344,12 @@ GROUP BY p.id, p.nome, c.nome
 ORDER BY quantidade_vendida DESC;
 
 -- ========================================
--- TRIGGERS
+-- ESTOQUE
 -- ========================================
 
--- Trigger para atualizar estoque após venda
-DELIMITER $$
-
-CREATE TRIGGER tr_atualizar_estoque_venda
-AFTER INSERT ON itens_venda
-FOR EACH ROW
-BEGIN
-    UPDATE produtos 
-    SET estoque_atual = estoque_atual - NEW.quantidade
-    WHERE id = NEW.produto_id;
-    
-    -- Registrar movimentação de estoque
-    INSERT INTO movimentacoes_estoque (produto_id, tipo, quantidade, motivo, usuario_id)
-    SELECT NEW.produto_id, 'saida', NEW.quantidade, 
-           CONCAT('Venda #', v.numero_venda), v.usuario_id
-    FROM vendas v WHERE v.id = NEW.venda_id;
-END$$
-
-DELIMITER ;
+-- A baixa de estoque e o registro em movimentacoes_estoque são feitos
+-- pela aplicação (EstoqueDAO), em lote e na mesma transação da venda.
+-- Não há trigger em itens_venda.
 
 -- ========================================
 -- FIM DO SCHEMA
@@ -3,37 +3,53 @@ Ponto de entrada do Sistema PDV.
 """
 
 import sys
+import threading
 import tkinter as tk
 from tkinter import messagebox
 
 # Adiciona o diretório src ao path
 sys.path.insert(0, 'src')
 
-from src.config.database import DatabaseConnection
 from src.ui.login_window import LoginWindow
 from src.utils.logger import Logger
 
 
+def pre_aquecer_banco(resultado: dict):
+    """Carrega a camada de dados e abre a primeira conexão (thread de fundo)."""
+    try:
+        from src.config.database import DatabaseConnection
+        import src.services.auth_service  # noqa: F401 - deixa o login pronto
+        resultado['conectado'] = DatabaseConnection.pre_aquecer()
+    except Exception as e:
+        Logger.log_erro("PRE-AQUECIMENTO", e)
+        resultado['conectado'] = False
+
+
+def verificar_conexao(root, resultado: dict):
+    """Acompanha o pré-aquecimento e avisa se o banco não respondeu."""
+    if 'conectado' not in resultado:
+        root.after(100, verificar_conexao, root, resultado)
+        return
+    
+    if not resultado['conectado']:
+        messagebox.showerror(
+            "Erro de Conexão",
+            "Não foi possível conectar ao banco de dados MySQL.\n\n"
+            "Verifique se:\n"
+            "1. O MySQL está rodando\n"
+            "2. O banco 'pdv_sistema' existe\n"
+            "3. As credenciais estão corretas (root sem senha)\n\n"
+            "Execute: mysql -u root < database/schema.sql"
+        )
+
+
 def main():
     """Função principal."""
     try:
-        # Testa conexão com banco de dados
         print("=" * 60)
         print(" Sistema PDV - Inicialização")
         print("=" * 60)
         
-        if not DatabaseConnection.test_connection():
-            messagebox.showerror(
-                "Erro de Conexão",
-                "Não foi possível conectar ao banco de dados MySQL.\n\n"
-                "Verifique se:\n"
-                "1. O MySQL está rodando\n"
-                "2. O banco 'pdv_sistema' existe\n"
-                "3. As credenciais estão corretas (root sem senha)\n\n"
-                "Execute: mysql -u root < database/schema.sql"
-            )
-            return
-        
         Logger.log_operacao("Sistema", "INICIALIZAÇÃO", "Sistema PDV iniciado")
         
         # Cria e exibe janela de login
@@ -42,6 +58,11 @@ def main():
         
         login_window = LoginWindow(root)
         
+        # A conexão com o banco é aberta em paralelo enquanto o operador digita
+        resultado = {}
+        threading.Thread(target=pre_aquecer_banco, args=(resultado,), daemon=True).start()
+        verificar_conexao(root, resultado)
+        
         root.mainloop()
         
     except KeyboardInterrupt:
@@ -81,23 +81,29 @@ def criar_produtos():
     ]
     
     print("\n📦 Criando produtos...")
-    for codigo, nome, cat_id, custo, venda, estoque, unidade in produtos:
-        try:
-            produto = Produto(
-                codigo_barras=codigo,
-                nome=nome,
-                categoria_id=cat_id,
-                preco_custo=Decimal(str(custo)),
-                preco_venda=Decimal(str(venda)),
-                estoque_minimo=10,
-                estoque_atual=estoque,
-                unidade_medida=unidade,
-                ativo=True
-            )
-            ProdutoDAO.criar(produto)
-            print(f"  ✓ {nome} - R$ {venda}")
-        except Exception as e:
-            print(f"  ✗ {nome}: {e}")
+    lote = [
+        Produto(
+            codigo_barras=codigo,
+            nome=nome,
+            categoria_id=cat_id,
+            preco_custo=Decimal(str(custo)),
+            preco_venda=Decimal(str(venda)),
+            estoque_minimo=10,
+            estoque_atual=estoque,
+            unidade_medida=unidade,
+            ativo=True
+        )
+        for codigo, nome, cat_id, custo, venda, estoque, unidade in produtos
+    ]
+    
+    # Um único INSERT multi-linha em vez de uma conexão/commit por produto
+    try:
+        inseridos, atualizados = ProdutoDAO.salvar_em_lote(lote)
+        for produto in lote:
+            print(f"  ✓ {produto.nome} - R$ {produto.preco_venda}")
+        print(f"  {inseridos} novo(s), {atualizados} atualizado(s)")
+    except Exception as e:
+        print(f"  ✗ Erro ao gravar produtos: {e}")
 
 def main():
     """Função principal."""
@@ -0,0 +1,51 @@
+"""
+Script para recalcular os resumos diários de vendas (vendas_resumo_diario e
+vendas_produtos_diario).
+
+Uso:
+    python reconstruir_resumo_vendas.py                         # todo o histórico
+    python reconstruir_resumo_vendas.py 2026-10-01              # um dia
+    python reconstruir_resumo_vendas.py 2026-10-01 2026-10-31   # um período
+"""
+import sys
+from datetime import date
+from src.config.database import DatabaseConnection
+from src.dao.resumo_vendas_dao import ResumoVendasDAO
+from src.dao.resumo_produtos_dao import ResumoProdutosDAO
+
+def main():
+    """Função principal."""
+    argumentos = sys.argv[1:]
+    
+    try:
+        data_inicio = date.fromisoformat(argumentos[0]) if argumentos else None
+        data_fim = date.fromisoformat(argumentos[1]) if len(argumentos) > 1 else None
+    except ValueError:
+        print("✗ Datas devem estar no formato AAAA-MM-DD")
+        sys.exit(1)
+    
+    print("=" * 60)
+    print("📊 Recalculando resumos diários de vendas")
+    if data_inicio:
+        print(f"   Período: {data_inicio} a {data_fim or data_inicio}")
+    else:
+        print("   Período: todo o histórico")
+    print("=" * 60)
+    
+    DatabaseConnection.initialize_pool()
+    
+    falhou = False
+    for nome, reconstruir in (("resumo de vendas", ResumoVendasDAO.reconstruir),
+                              ("resumo por produto", ResumoProdutosDAO.reconstruir)):
+        linhas = reconstruir(data_inicio, data_fim)
+        if linhas < 0:
+            print(f"✗ Erro ao recalcular o {nome}")
+            falhou = True
+        else:
+            print(f"✓ {linhas} linhas geradas no {nome}")
+    
+    if falhou:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -29,13 +29,8 @@ def executar_schema():
         # Remove comentários
         schema = re.sub(r'--.*$', '', schema, flags=re.MULTILINE)
         
-        # Processa DELIMITER (remove triggers por enquanto para simplificar)
-        # Separa em partes antes e depois dos triggers
-        partes = schema.split('DELIMITER')
-        
-        # Executa a primeira parte (CREATE TABLEs)
-        parte_tabelas = partes[0]
-        statements = [s.strip() for s in parte_tabelas.split(';') if s.strip()]
+        # O schema não usa DELIMITER (a baixa de estoque é feita pela aplicação)
+        statements = [s.strip() for s in schema.split(';') if s.strip()]
         
         for statement in statements:
             if statement:
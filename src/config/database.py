@@ -3,10 +3,16 @@ Módulo de configuração do banco de dados MySQL.
 Utiliza config.ini para credenciais e configurações.
 """
 
+import threading
+import time
+from typing import Iterator, Optional
+
 import mysql.connector
-from mysql.connector import pooling, Error
+from mysql.connector import Error
 from contextlib import contextmanager
 from .config_reader import config
+from .pool_conexoes import PoolConexoes, PoolEsgotadoError
+from src.utils.monitor_sql import monitor_sql
 
 
 class DatabaseConfig:
@@ -36,94 +42,217 @@ class DatabaseConfig:
     def get_pool_size():
         return config.get_db_pool_size()
     
+    @staticmethod
+    def get_idade_validacao():
+        """Segundos de ociosidade a partir dos quais a conexão é testada antes do uso."""
+        return config.getfloat('database', 'idade_validacao_conexao', fallback=30.0)
+    
+    @staticmethod
+    def get_espera_conexao():
+        """Segundos de espera por uma conexão livre quando o pool está todo em uso."""
+        return config.getfloat('database', 'espera_conexao', fallback=5.0)
+    
+    @staticmethod
+    def get_timeout_conexao():
+        """Segundos para desistir de abrir uma conexão (servidor fora do ar ou inacessível)."""
+        return config.getint('database', 'timeout_conexao', fallback=5)
+    
+    @staticmethod
+    def get_espera_fluxo():
+        """Segundos que o servidor espera o cliente ler o próximo lote de uma consulta em fluxo."""
+        return config.getint('database', 'espera_consulta_fluxo', fallback=600)
+    
+    @staticmethod
+    def get_replica():
+        """
+        Parâmetros da réplica de leitura ([database_replica] no config.ini).
+        
+        Returns:
+            dict de conexão ou None se não houver réplica configurada
+        """
+        host = config.get('database_replica', 'host', fallback=None)
+        if not host:
+            return None
+        
+        return {
+            'host': host,
+            'port': config.getint('database_replica', 'port', fallback=DatabaseConfig.get_port()),
+            'user': config.get('database_replica', 'user', fallback=DatabaseConfig.get_user()),
+            'password': config.get('database_replica', 'password', fallback=DatabaseConfig.get_password()),
+            'database': config.get('database_replica', 'database', fallback=DatabaseConfig.get_database())
+        }
+    
+    @staticmethod
+    def get_replica_pool_size():
+        return config.getint('database_replica', 'pool_size', fallback=DatabaseConfig.get_pool_size())
+    
+    @staticmethod
+    def get_atraso_maximo_replica():
+        """Atraso (segundos) acima do qual as leituras voltam para o primário."""
+        return config.getfloat('database_replica', 'atraso_maximo', fallback=5.0)
+    
+    @staticmethod
+    def get_intervalo_verificacao_replica():
+        """Segundos entre medições do atraso da réplica."""
+        return config.getfloat('database_replica', 'intervalo_verificacao', fallback=5.0)
+    
     POOL_NAME = 'pdv_pool'
+    
+    # Erros do conector que indicam conexão perdida com o servidor
+    ERROS_CONEXAO = (2003, 2006, 2013, 2055)
 
 
 class DatabaseConnection:
     """Gerenciador de conexão com pool de conexões."""
     
     _pool = None
+    _pool_lock = threading.Lock()
+    
+    # Réplica de leitura (opcional)
+    _replica_pool = None
+    _replica_lock = threading.Lock()
+    _replica_verificada_em = None
+    _replica_atraso = None
+    _leituras = {'replica': 0, 'primario': 0}
     
     @classmethod
     def initialize_pool(cls):
-        """Inicializa o pool de conexões."""
+        """
+        Inicializa o pool de conexões (as conexões são abertas sob demanda).
+        
+        Chamado automaticamente no primeiro uso do banco; importar este
+        módulo não abre conexão nenhuma.
+        """
+        with cls._pool_lock:
+            cls._criar_pools()
+    
+    @classmethod
+    def _criar_pools(cls):
+        """Cria os pools do primário e da réplica (chamar com _pool_lock)."""
         if cls._pool is None:
-            try:
-                cls._pool = pooling.MySQLConnectionPool(
-                    pool_name=DatabaseConfig.POOL_NAME,
-                    pool_size=DatabaseConfig.get_pool_size(),
-                    pool_reset_session=True,
-                    host=DatabaseConfig.get_host(),
-                    port=DatabaseConfig.get_port(),
-                    user=DatabaseConfig.get_user(),
-                    password=DatabaseConfig.get_password(),
-                    database=DatabaseConfig.get_database(),
-                    charset='utf8mb4',
-                    collation='utf8mb4_unicode_ci',
-                    autocommit=False
-                )
-                print(f"✓ Pool de conexões criado com sucesso ({DatabaseConfig.get_pool_size()} conexões)")
-            except Error as e:
-                print(f"✗ Erro ao criar pool de conexões: {e}")
-                raise
+            cls._pool = PoolConexoes(
+                tamanho=DatabaseConfig.get_pool_size(),
+                idade_validacao=DatabaseConfig.get_idade_validacao(),
+                espera_maxima=DatabaseConfig.get_espera_conexao(),
+                host=DatabaseConfig.get_host(),
+                port=DatabaseConfig.get_port(),
+                user=DatabaseConfig.get_user(),
+                password=DatabaseConfig.get_password(),
+                database=DatabaseConfig.get_database(),
+                connection_timeout=DatabaseConfig.get_timeout_conexao(),
+                charset='utf8mb4',
+                collation='utf8mb4_unicode_ci'
+            )
+            print(f"✓ Pool de conexões criado com sucesso ({DatabaseConfig.get_pool_size()} conexões)")
+        
+        replica = DatabaseConfig.get_replica()
+        if cls._replica_pool is None and replica:
+            cls._replica_pool = PoolConexoes(
+                tamanho=DatabaseConfig.get_replica_pool_size(),
+                idade_validacao=DatabaseConfig.get_idade_validacao(),
+                espera_maxima=DatabaseConfig.get_espera_conexao(),
+                connection_timeout=DatabaseConfig.get_timeout_conexao(),
+                charset='utf8mb4',
+                collation='utf8mb4_unicode_ci',
+                **replica
+            )
+            print(f"✓ Réplica de leitura configurada ({replica['host']}:{replica['port']})")
     
     @classmethod
-    def get_connection(cls, retry_count=3, retry_delay=1):
+    def pre_aquecer(cls) -> bool:
         """
-        Obtém uma conexão do pool com retry logic.
+        Abre a primeira conexão do pool antes de ela ser necessária.
+        
+        Chamado em segundo plano enquanto a tela de login é exibida; a
+        conexão volta ao pool e é reutilizada pelo login.
         
-        Args:
-            retry_count: Número máximo de tentativas
-            retry_delay: Delay em segundos entre tentativas
-            
         Returns:
-            Conexão do pool
-            
-        Raises:
-            Error: Se falhar após todas as tentativas
+            True se o banco respondeu
+        """
+        try:
+            cls._obter_conexao(retry_count=1).close()
+            return True
+        except Error as e:
+            print(f"✗ Erro ao conectar ao banco de dados: {e}")
+            return False
+    
+    @classmethod
+    def _obter_conexao(cls, retry_count=3, retry_delay=1, pool: PoolConexoes = None):
+        """
+        Empresta uma conexão do pool com retry logic.
+        
+        Falha ao conectar descarta as conexões ociosas (provavelmente mortas
+        pela mesma queda) sem recriar o pool; pool esgotado não é repetido,
+        pois o pool já esperou pelo prazo configurado.
         """
-        import time
         from src.utils.logger import Logger
         
         if cls._pool is None:
             cls.initialize_pool()
+        pool = pool or cls._pool
         
         last_error = None
         for tentativa in range(1, retry_count + 1):
             try:
-                connection = cls._pool.get_connection()
-                
-                # Testa se a conexão está válida
-                if connection.is_connected():
-                    return connection
-                    
+                return pool.obter()
+            
+            except PoolEsgotadoError as e:
+                Logger().error(f"Pool de conexões esgotado: {e}")
+                raise
+            
             except Error as e:
                 last_error = e
-                Logger.warning(
+                Logger().warning(
                     f"Tentativa {tentativa}/{retry_count} falhou ao obter conexão: {e}"
                 )
                 
                 if tentativa < retry_count:
                     time.sleep(retry_delay)
-                    # Tenta reinicializar o pool
-                    try:
-                        cls._pool = None
-                        cls.initialize_pool()
-                    except:
-                        pass
+                    pool.recuperar()
         
         # Após todas as tentativas
-        Logger.error(f"Falha ao conectar após {retry_count} tentativas: {last_error}")
+        Logger().error(f"Falha ao conectar após {retry_count} tentativas: {last_error}")
         raise last_error
     
+    @classmethod
+    def get_connection(cls, retry_count=3, retry_delay=1):
+        """
+        Obtém uma conexão do pool com uma transação já aberta.
+        
+        Quem usa a conexão diretamente deve chamar commit() e close();
+        close() devolve a conexão ao pool e desfaz o que não foi confirmado.
+        
+        Args:
+            retry_count: Número máximo de tentativas
+            retry_delay: Delay em segundos entre tentativas
+            
+        Returns:
+            Conexão do pool
+            
+        Raises:
+            Error: Se falhar após todas as tentativas
+        """
+        connection = cls._obter_conexao(retry_count, retry_delay)
+        try:
+            connection.start_transaction()
+        except Error:
+            connection.descartar()
+            connection.close()
+            raise
+        return connection
+    
     @classmethod
     @contextmanager
-    def get_cursor(cls, dictionary=True):
+    def get_cursor(cls, dictionary=True, readonly=False, usar_replica=None):
         """
         Context manager para obter cursor com gerenciamento automático.
         
         Args:
             dictionary (bool): Se True, retorna resultados como dicionário
+            readonly (bool): Se True, só leitura: sem transação e sem commit,
+                encaminhada à réplica quando houver uma em dia
+            usar_replica (bool): False mantém a leitura no primário (dados
+                recém-gravados); por padrão segue `readonly`
             
         Yields:
             cursor: Cursor do banco de dados
@@ -133,29 +262,299 @@ class DatabaseConnection:
         connection = None
         cursor = None
         
+        if usar_replica is None:
+            usar_replica = readonly
+        
         try:
-            connection = cls.get_connection()  # Usa retry logic
-            cursor = connection.cursor(dictionary=dictionary)
+            if readonly and usar_replica:
+                connection = cls._obter_conexao_leitura()
+            else:
+                connection = cls._obter_conexao()  # Usa retry logic
+            if not readonly:
+                connection.start_transaction()
+            # Mede cada comando e atribui ao método do DAO que abriu o cursor
+            cursor = monitor_sql.envolver(connection.cursor(dictionary=dictionary))
             yield cursor
-            connection.commit()
+            if not readonly:
+                connection.commit()
             
         except Error as e:
             if connection:
-                connection.rollback()
+                cls._desfazer(connection, e)
             
             # Log detalhado do erro
-            Logger.error(f"Erro na transação do banco de dados: {e}")
+            Logger().error(f"Erro na transação do banco de dados: {e}")
             import traceback
-            Logger.error(f"Stack trace:\n{traceback.format_exc()}")
+            Logger().error(f"Stack trace:\n{traceback.format_exc()}")
             
             raise
+        
+        except Exception:
+            # Falhas fora do driver também não podem deixar transação pela metade
+            if connection:
+                cls._desfazer(connection)
+            raise
             
         finally:
             if cursor:
-                cursor.close()
+                try:
+                    cursor.close()
+                except Error:
+                    pass
             if connection:
                 connection.close()
     
+    @classmethod
+    def _desfazer(cls, connection, erro: Error = None):
+        """Desfaz a transação; se a conexão caiu, descarta ela e as demais ociosas."""
+        if erro is not None and getattr(erro, 'errno', None) in DatabaseConfig.ERROS_CONEXAO:
+            connection.descartar()
+            connection.pool.recuperar()
+            if connection.pool is cls._replica_pool:
+                cls._marcar_replica_indisponivel()
+            return
+        
+        try:
+            if connection.in_transaction:
+                connection.rollback()
+        except Error:
+            connection.descartar()
+    
+    @classmethod
+    def consultar_preparado(cls, sql: str, params: tuple = (), usar_replica: bool = True) -> list:
+        """
+        Executa uma consulta de leitura por prepared statement.
+        
+        Caminho rápido para consultas muito frequentes: o statement é
+        preparado uma vez por conexão do pool e as linhas voltam como
+        tuplas posicionais, sem montar dicionários.
+        
+        Args:
+            sql: Consulta com placeholders %s (mesmo texto a cada chamada)
+            params: Parâmetros da consulta
+            usar_replica: False mantém a leitura no primário
+            
+        Returns:
+            Lista de tuplas na ordem das colunas do SELECT
+        """
+        from src.utils.logger import Logger
+        
+        connection = cls._obter_conexao_leitura() if usar_replica else cls._obter_conexao()
+        inicio = time.perf_counter()
+        try:
+            cursor = connection.cursor_preparado(sql)
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+            if monitor_sql.ativo:
+                monitor_sql.registrar(monitor_sql.identificar_origem(), sql, time.perf_counter() - inicio, len(rows))
+            return rows
+        
+        except Error as e:
+            if monitor_sql.ativo:
+                monitor_sql.registrar(monitor_sql.identificar_origem(), sql, time.perf_counter() - inicio, 0, erro=True)
+            # Statement pode ter ficado inválido (ex.: ALTER TABLE): recomeça com conexão nova
+            connection.descartar()
+            if getattr(e, 'errno', None) in DatabaseConfig.ERROS_CONEXAO:
+                connection.pool.recuperar()
+                if connection.pool is cls._replica_pool:
+                    cls._marcar_replica_indisponivel()
+            Logger().error(f"Erro na consulta preparada: {e}")
+            raise
+        
+        finally:
+            connection.close()
+    
+    @classmethod
+    def consultar_em_fluxo(cls, sql: str, params: tuple = (), tamanho_lote: int = 1000,
+                           usar_replica: bool = True) -> Iterator[list]:
+        """
+        Percorre o resultado de uma consulta em lotes, sem carregá-lo inteiro.
+        
+        Usa um cursor não bufferizado: o servidor envia as linhas conforme
+        são lidas, então a memória fica no tamanho de um lote mesmo para
+        milhões de linhas (exportações de um ano de vendas). A conexão fica
+        presa até o fim da leitura; se quem consome parar antes (cancelar),
+        ela é descartada em vez de voltar ao pool com linhas não lidas.
+        
+        Args:
+            sql: Consulta de leitura
+            params: Parâmetros da consulta
+            tamanho_lote: Linhas por lote
+            usar_replica: False mantém a leitura no primário
+        
+        Returns:
+            Iterador de listas de tuplas na ordem das colunas do SELECT
+        """
+        # A origem é identificada aqui, na chamada do DAO: o corpo do gerador
+        # só roda quando o consumidor (ex.: a exportação) começa a ler
+        origem = monitor_sql.identificar_origem() if monitor_sql.ativo else None
+        return cls._ler_em_fluxo(sql, params, tamanho_lote, usar_replica, origem)
+    
+    @classmethod
+    def _ler_em_fluxo(cls, sql: str, params: tuple, tamanho_lote: int, usar_replica: bool,
+                      origem: Optional[str]) -> Iterator[list]:
+        """Gerador de consultar_em_fluxo."""
+        from src.utils.logger import Logger
+        
+        connection = cls._obter_conexao_leitura() if usar_replica else cls._obter_conexao()
+        inicio = time.perf_counter()
+        linhas = 0
+        completo = False
+        cursor = None
+        try:
+            cursor = connection.cursor(buffered=False)
+            # O servidor espera o cliente gravar cada lote no arquivo antes de enviar o próximo
+            cursor.execute("SET SESSION net_write_timeout = %s", (DatabaseConfig.get_espera_fluxo(),))
+            cursor.execute(sql, params)
+            while True:
+                lote = cursor.fetchmany(tamanho_lote)
+                if not lote:
+                    break
+                linhas += len(lote)
+                yield lote
+            cursor.execute("SET SESSION net_write_timeout = DEFAULT")
+            completo = True
+        
+        except Error as e:
+            if getattr(e, 'errno', None) in DatabaseConfig.ERROS_CONEXAO:
+                connection.pool.recuperar()
+                if connection.pool is cls._replica_pool:
+                    cls._marcar_replica_indisponivel()
+            Logger().error(f"Erro na consulta em fluxo: {e}")
+            raise
+        
+        finally:
+            if origem:
+                monitor_sql.registrar(origem, sql, time.perf_counter() - inicio, linhas, erro=not completo)
+            if not completo:
+                connection.descartar()
+            if cursor:
+                try:
+                    cursor.close()
+                except Error:
+                    pass
+            connection.close()
+    
+    # ==================== RÉPLICA DE LEITURA ====================
+    
+    @classmethod
+    def _obter_conexao_leitura(cls):
+        """Conexão da réplica se ela estiver em dia; senão, do primário."""
+        if cls._pool is None:
+            cls.initialize_pool()
+        
+        if cls._replica_pool is not None and cls._replica_em_dia():
+            try:
+                connection = cls._replica_pool.obter()
+                cls._leituras['replica'] += 1
+                return connection
+            except Error:
+                cls._marcar_replica_indisponivel()
+        
+        cls._leituras['primario'] += 1
+        return cls._obter_conexao()
+    
+    @classmethod
+    def _replica_em_dia(cls) -> bool:
+        """
+        Indica se o atraso da réplica está dentro do limite.
+        
+        O atraso é medido no máximo uma vez por intervalo de verificação,
+        por uma única thread; as demais usam a última medição.
+        """
+        agora = time.monotonic()
+        vencida = (
+            cls._replica_verificada_em is None
+            or agora - cls._replica_verificada_em >= DatabaseConfig.get_intervalo_verificacao_replica()
+        )
+        
+        if vencida and cls._replica_lock.acquire(blocking=False):
+            try:
+                cls._replica_verificada_em = agora
+                anterior = cls._replica_atraso
+                cls._replica_atraso = cls._medir_atraso_replica()
+                if (anterior is None) != (cls._replica_atraso is None):
+                    from src.utils.logger import Logger
+                    Logger.log_operacao(
+                        "Sistema", "REPLICA",
+                        "disponível" if cls._replica_atraso is not None else "indisponível, lendo do primário"
+                    )
+            finally:
+                cls._replica_lock.release()
+        
+        atraso = cls._replica_atraso
+        return atraso is not None and atraso <= DatabaseConfig.get_atraso_maximo_replica()
+    
+    @classmethod
+    def _medir_atraso_replica(cls) -> float:
+        """
+        Consulta o atraso de replicação em segundos.
+        
+        Returns:
+            Atraso em segundos (0 se o servidor não for réplica, ex.: cópia
+            local usada em testes) ou None se a réplica estiver fora do ar
+            ou com a replicação parada
+        """
+        connection = None
+        try:
+            connection = cls._replica_pool.obter()
+            cursor = connection.cursor(dictionary=True)
+            try:
+                cursor.execute("SHOW REPLICA STATUS")
+            except Error:
+                # MySQL anterior a 8.0.22
+                cursor.execute("SHOW SLAVE STATUS")
+            status = cursor.fetchone()
+            cursor.fetchall()
+            cursor.close()
+            
+            if status is None:
+                return 0.0
+            atraso = status.get('Seconds_Behind_Source', status.get('Seconds_Behind_Master'))
+            return float(atraso) if atraso is not None else None
+        
+        except Error:
+            if connection:
+                connection.descartar()
+            return None
+        
+        finally:
+            if connection:
+                connection.close()
+    
+    @classmethod
+    def _marcar_replica_indisponivel(cls):
+        """Desvia as leituras para o primário até a próxima verificação."""
+        cls._replica_atraso = None
+        cls._replica_verificada_em = time.monotonic()
+    
+    @classmethod
+    def obter_metricas_replica(cls) -> dict:
+        """Situação da réplica de leitura (vazio se não configurada)."""
+        if cls._replica_pool is None:
+            return {}
+        return {
+            'atraso_segundos': cls._replica_atraso,
+            'em_uso': cls._replica_em_dia(),
+            'leituras_replica': cls._leituras['replica'],
+            'leituras_primario': cls._leituras['primario'],
+            'pool': cls._replica_pool.obter_metricas()
+        }
+    
+    @classmethod
+    def obter_metricas_pool(cls) -> dict:
+        """Métricas do pool de conexões (vazio se o pool ainda não existe)."""
+        if cls._pool is None:
+            return {}
+        return cls._pool.obter_metricas()
+    
+    @classmethod
+    def redimensionar_pool(cls, tamanho: int):
+        """Altera o tamanho do pool sem interromper as conexões em uso."""
+        if cls._pool is None:
+            cls.initialize_pool()
+        cls._pool.redimensionar(tamanho)
+    
     @classmethod
     def test_connection(cls):
         """Testa a conexão com o banco de dados."""
@@ -218,9 +617,3 @@ class DatabaseConnection:
         except Error as e:
             print(f"✗ Erro ao executar script: {e}")
 
-
-# Inicializar pool ao importar o módulo
-try:
-    DatabaseConnection.initialize_pool()
-except Exception as e:
-    print(f"⚠ Aviso: Pool não inicializado. Execute test_connection() para verificar.")
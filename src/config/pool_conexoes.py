@@ -0,0 +1,272 @@
+"""
+Pool de conexões MySQL do sistema.
+
+Substitui o MySQLConnectionPool do conector, que faz um ping e um reset de
+sessão no servidor a cada empréstimo/devolução. Aqui a conexão só é
+validada se ficou ociosa mais que `idade_validacao` segundos, a espera por
+uma conexão livre tem prazo e métricas, e o pool pode ser redimensionado
+ou recuperado (após queda do servidor) sem ser recriado.
+"""
+
+import threading
+import time
+from typing import Dict, List
+
+import mysql.connector
+from mysql.connector import Error
+
+from src.utils.logger import Logger
+from src.utils.metricas import MetricasLatencia
+
+
+class PoolEsgotadoError(Error):
+    """Nenhuma conexão livre dentro do prazo de espera."""
+    pass
+
+
+class ConexaoPool:
+    """
+    Conexão emprestada do pool.
+    
+    Repassa tudo para a conexão MySQL real; close() devolve ao pool.
+    """
+    
+    def __init__(self, pool: 'PoolConexoes', conexao, geracao: int, preparados: Dict[str, object]):
+        self.pool = pool
+        self._conexao = conexao
+        self._geracao = geracao
+        self._preparados = preparados
+        self._descartar = False
+        self._devolvida = False
+    
+    def __getattr__(self, nome):
+        return getattr(self._conexao, nome)
+    
+    def cursor_preparado(self, sql: str):
+        """
+        Cursor com o prepared statement de `sql`, criado uma vez por conexão.
+        
+        O statement fica preparado no servidor enquanto a conexão viver; as
+        próximas execuções enviam só os parâmetros. O cursor pertence ao
+        pool: ler todas as linhas e não fechá-lo.
+        """
+        cursor = self._preparados.get(sql)
+        if cursor is None:
+            cursor = self._conexao.cursor(prepared=True)
+            self._preparados[sql] = cursor
+        return cursor
+    
+    def descartar(self):
+        """Marca a conexão para ser fechada (e não reutilizada) na devolução."""
+        self._descartar = True
+    
+    def close(self):
+        """Devolve a conexão ao pool (chamadas repetidas são ignoradas)."""
+        if not self._devolvida:
+            self._devolvida = True
+            self.pool.devolver(self)
+
+
+class PoolConexoes:
+    """Pool de conexões com validação por idade, prazo de espera e métricas."""
+    
+    def __init__(self, tamanho: int, idade_validacao: float, espera_maxima: float, **parametros):
+        """
+        Args:
+            tamanho: Número máximo de conexões abertas
+            idade_validacao: Segundos de ociosidade a partir dos quais a conexão é testada
+            espera_maxima: Segundos de espera por uma conexão livre antes de desistir
+            **parametros: Repassados para mysql.connector.connect (host, user...)
+        """
+        self.tamanho = tamanho
+        self.idade_validacao = idade_validacao
+        self.espera_maxima = espera_maxima
+        # Sem transação implícita: quem escreve abre a transação explicitamente
+        self._parametros = dict(parametros, autocommit=True)
+        
+        self._cond = threading.Condition()
+        self._ociosas: List[tuple] = []  # (conexao, geracao, devolvida_em, preparados)
+        self._abertas = 0
+        self._em_uso = 0
+        self._aguardando = 0
+        self._geracao = 0
+        
+        self.metricas = MetricasLatencia()
+        self._esgotamentos = 0
+        self._validacoes = 0
+        self._reconexoes = 0
+        self._recuperacoes = 0
+    
+    # ==================== EMPRÉSTIMO ====================
+    
+    def obter(self) -> ConexaoPool:
+        """
+        Empresta uma conexão, esperando até `espera_maxima` se todas estiverem em uso.
+        
+        Raises:
+            PoolEsgotadoError: Se nenhuma conexão ficar livre no prazo
+            Error: Se não for possível abrir uma nova conexão
+        """
+        inicio = time.perf_counter()
+        limite = time.monotonic() + self.espera_maxima
+        conexao = None
+        
+        with self._cond:
+            while True:
+                if self._ociosas:
+                    # A devolvida por último tem mais chance de continuar viva
+                    conexao, geracao, devolvida_em, preparados = self._ociosas.pop()
+                    break
+                if self._abertas < self.tamanho:
+                    self._abertas += 1
+                    geracao, devolvida_em, preparados = self._geracao, None, {}
+                    break
+                
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    self._esgotamentos += 1
+                    self.metricas.registrar("espera_conexao", time.perf_counter() - inicio, erro=True)
+                    raise PoolEsgotadoError(
+                        msg=f"Nenhuma conexão livre em {self.espera_maxima:g}s "
+                            f"({self._em_uso}/{self.tamanho} em uso)"
+                    )
+                
+                self._aguardando += 1
+                self._cond.wait(restante)
+                self._aguardando -= 1
+            
+            self._em_uso += 1
+        
+        try:
+            if conexao is None:
+                conexao = self._conectar()
+            elif time.monotonic() - devolvida_em > self.idade_validacao:
+                validada = self._validar(conexao)
+                if validada is not conexao:
+                    conexao, preparados = validada, {}
+        except Exception:
+            with self._cond:
+                self._abertas -= 1
+                self._em_uso -= 1
+                self._cond.notify()
+            raise
+        
+        self.metricas.registrar("espera_conexao", time.perf_counter() - inicio)
+        return ConexaoPool(self, conexao, geracao, preparados)
+    
+    def devolver(self, conexao_pool: ConexaoPool):
+        """Recebe a conexão de volta; fecha se marcada, de geração antiga ou acima do tamanho."""
+        conexao = conexao_pool._conexao
+        descartar = conexao_pool._descartar or conexao_pool._geracao != self._geracao
+        
+        if not descartar and conexao.in_transaction:
+            # Transação esquecida aberta não pode vazar para o próximo usuário
+            try:
+                conexao.rollback()
+            except Error:
+                descartar = True
+        
+        with self._cond:
+            self._em_uso -= 1
+            if descartar or self._abertas > self.tamanho:
+                self._abertas -= 1
+            else:
+                self._ociosas.append(
+                    (conexao, conexao_pool._geracao, time.monotonic(), conexao_pool._preparados)
+                )
+                conexao = None
+            self._cond.notify()
+        
+        if conexao is not None:
+            self._fechar(conexao)
+    
+    # ==================== CONEXÕES ====================
+    
+    def _conectar(self):
+        """Abre uma nova conexão com o servidor."""
+        return mysql.connector.connect(**self._parametros)
+    
+    def _validar(self, conexao):
+        """Testa uma conexão ociosa há muito tempo; troca por uma nova se estiver morta."""
+        self._validacoes += 1
+        try:
+            conexao.ping(reconnect=False)
+            return conexao
+        except Error:
+            self._reconexoes += 1
+            self._fechar(conexao)
+            return self._conectar()
+    
+    @staticmethod
+    def _fechar(conexao):
+        """Fecha a conexão ignorando erros (ela pode já estar morta)."""
+        try:
+            conexao.close()
+        except Exception:
+            pass
+    
+    # ==================== MANUTENÇÃO ====================
+    
+    def redimensionar(self, tamanho: int):
+        """
+        Altera o número máximo de conexões sem interromper quem está usando.
+        
+        Conexões ociosas excedentes são fechadas na hora; as emprestadas,
+        quando forem devolvidas.
+        """
+        with self._cond:
+            self.tamanho = tamanho
+            fechar = []
+            while self._abertas > tamanho and self._ociosas:
+                fechar.append(self._ociosas.pop(0)[0])
+                self._abertas -= 1
+            self._cond.notify_all()
+        
+        for conexao in fechar:
+            self._fechar(conexao)
+        Logger.log_operacao("Sistema", "POOL REDIMENSIONADO", f"{tamanho} conexões")
+    
+    def recuperar(self):
+        """
+        Descarta as conexões atuais após uma queda do servidor.
+        
+        As ociosas são fechadas imediatamente e as emprestadas ao serem
+        devolvidas; os próximos empréstimos abrem conexões novas.
+        """
+        with self._cond:
+            self._geracao += 1
+            self._recuperacoes += 1
+            fechar = [item[0] for item in self._ociosas]
+            self._ociosas.clear()
+            self._abertas -= len(fechar)
+            self._cond.notify_all()
+        
+        for conexao in fechar:
+            self._fechar(conexao)
+        Logger.log_operacao("Sistema", "POOL RECUPERADO", f"{len(fechar)} conexão(ões) ociosa(s) descartada(s)")
+    
+    def obter_metricas(self) -> Dict:
+        """
+        Situação e contadores do pool.
+        
+        Returns:
+            dict com tamanho, abertas, em_uso, ociosas, aguardando, emprestimos,
+            espera_media_ms, espera_maxima_ms, esgotamentos, validacoes,
+            reconexoes e recuperacoes
+        """
+        espera = self.metricas.obter().get("espera_conexao", {})
+        with self._cond:
+            return {
+                "tamanho": self.tamanho,
+                "abertas": self._abertas,
+                "em_uso": self._em_uso,
+                "ociosas": len(self._ociosas),
+                "aguardando": self._aguardando,
+                "emprestimos": espera.get("chamadas", 0),
+                "espera_media_ms": espera.get("tempo_medio_ms", 0.0),
+                "espera_maxima_ms": espera.get("tempo_maximo_ms", 0.0),
+                "esgotamentos": self._esgotamentos,
+                "validacoes": self._validacoes,
+                "reconexoes": self._reconexoes,
+                "recuperacoes": self._recuperacoes
+            }
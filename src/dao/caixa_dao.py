@@ -6,6 +6,7 @@ from typing import List, Optional
 from datetime import date
 from src.config.database import DatabaseConnection
 from src.models.caixa import Caixa
+from src.dao.periodo import Periodo
 
 
 class CaixaDAO:
@@ -104,7 +105,7 @@ class CaixaDAO:
         """
         
         try:
-            with DatabaseConnection.get_cursor() as cursor:
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
                 cursor.execute(sql, (usuario_id,))
                 rows = cursor.fetchall()
                 
@@ -116,17 +117,18 @@ class CaixaDAO:
     @staticmethod
     def buscar_por_periodo(data_inicio: date, data_fim: date) -> List[Caixa]:
         """Busca caixas por período."""
-        sql = """
+        filtro, params = Periodo.filtro("c.data_abertura", data_inicio, data_fim)
+        sql = f"""
             SELECT c.*, u.nome_completo as usuario_nome
             FROM caixa c
             LEFT JOIN usuarios u ON c.usuario_id = u.id
-            WHERE DATE(c.data_abertura) BETWEEN %s AND %s
+            WHERE {filtro}
             ORDER BY c.data_abertura DESC
         """
         
         try:
-            with DatabaseConnection.get_cursor() as cursor:
-                cursor.execute(sql, (data_inicio, data_fim))
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
+                cursor.execute(sql, tuple(params))
                 rows = cursor.fetchall()
                 
                 return [Caixa.from_dict(row) for row in rows]
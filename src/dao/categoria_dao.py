@@ -11,12 +11,14 @@ class CategoriaDAO:
     """Data Access Object para Categoria."""
     
     @staticmethod
-    def criar(categoria: Categoria) -> Optional[int]:
+    def criar(categoria: Categoria, cursor=None) -> Optional[int]:
         """
         Cria uma nova categoria no banco de dados.
         
         Args:
             categoria: Objeto Categoria a ser criado
+            cursor: Cursor de uma transação já aberta (a categoria só fica
+                gravada se quem chama confirmar)
             
         Returns:
             ID da categoria criada ou None em caso de erro
@@ -26,13 +28,14 @@ class CategoriaDAO:
             VALUES (%s, %s, %s)
         """
         
+        params = (categoria.nome, categoria.descricao, categoria.ativo)
+        
         try:
+            if cursor is not None:
+                cursor.execute(sql, params)
+                return cursor.lastrowid
             with DatabaseConnection.get_cursor() as cursor:
-                cursor.execute(sql, (
-                    categoria.nome,
-                    categoria.descricao,
-                    categoria.ativo
-                ))
+                cursor.execute(sql, params)
                 return cursor.lastrowid
         except Exception as e:
             print(f"Erro ao criar categoria: {e}")
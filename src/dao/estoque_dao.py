@@ -0,0 +1,221 @@
+"""
+DAO para movimentação de estoque no banco de dados.
+Aplica baixas e reposições em lote e registra o histórico em movimentacoes_estoque.
+"""
+
+from typing import Dict, List
+from decimal import Decimal
+from src.models.venda import ItemVenda
+
+
+class EstoqueInsuficienteError(Exception):
+    """Levantada quando uma baixa deixaria algum produto com estoque negativo."""
+    
+    def __init__(self, produtos: List[str]):
+        self.produtos = produtos
+        super().__init__(f"Estoque insuficiente: {', '.join(produtos)}")
+
+
+class EstoqueDAO:
+    """Data Access Object para movimentação de estoque."""
+    
+    TIPO_ENTRADA = 'entrada'
+    TIPO_SAIDA = 'saida'
+    TIPO_AJUSTE = 'ajuste'
+    
+    @staticmethod
+    def _agrupar_por_produto(itens: List[ItemVenda]) -> Dict[int, Decimal]:
+        """Soma as quantidades por produto (o mesmo produto pode aparecer em vários itens)."""
+        quantidades: Dict[int, Decimal] = {}
+        for item in itens:
+            if item.quantidade and item.quantidade > 0:
+                quantidades[item.produto_id] = quantidades.get(item.produto_id, Decimal('0')) + item.quantidade
+        return quantidades
+    
+    @staticmethod
+    def _tabela_derivada(quantidades: Dict[int, Decimal]) -> tuple:
+        """Monta a tabela derivada (produto_id, quantidade) usada nos UPDATEs em lote."""
+        linhas = ["SELECT %s AS produto_id, %s AS quantidade"]
+        linhas += ["SELECT %s, %s"] * (len(quantidades) - 1)
+        
+        params = []
+        for produto_id, quantidade in quantidades.items():
+            params.extend((produto_id, quantidade))
+        
+        return " UNION ALL ".join(linhas), params
+    
+    @staticmethod
+    def baixar_estoque(itens: List[ItemVenda], usuario_id: int, motivo: str, cursor,
+                       permitir_negativo: bool = False) -> int:
+        """
+        Dá baixa no estoque de todos os itens com um único UPDATE relativo.
+        
+        Os saldos são conferidos antes, com as linhas travadas (SELECT ...
+        FOR UPDATE) até o fim da transação do chamador. O número de linhas
+        do UPDATE não serve para isso: estoque_atual é INT e a quantidade
+        pode ser fracionada (peso), então 10 - 0,3 volta a 10 e o MySQL
+        conta a linha como não alterada.
+        
+        Args:
+            itens: Itens vendidos
+            usuario_id: Usuário responsável pela movimentação
+            motivo: Descrição gravada no histórico (ex: "Venda #V123")
+            cursor: Cursor da transação em andamento
+            permitir_negativo: Aplica a baixa mesmo sem saldo (venda que já
+                aconteceu no caixa e está sendo replicada do diário local)
+        
+        Returns:
+            Número de produtos atualizados
+        
+        Raises:
+            EstoqueInsuficienteError: Se algum produto ficaria negativo
+        """
+        quantidades = EstoqueDAO._agrupar_por_produto(itens)
+        if not quantidades:
+            return 0
+        
+        if not permitir_negativo:
+            sem_saldo = EstoqueDAO._produtos_sem_saldo(quantidades, cursor)
+            if sem_saldo:
+                raise EstoqueInsuficienteError(sem_saldo)
+        
+        derivada, params = EstoqueDAO._tabela_derivada(quantidades)
+        sql = f"""
+            UPDATE produtos p
+            JOIN ({derivada}) d ON p.id = d.produto_id
+            SET p.estoque_atual = p.estoque_atual - d.quantidade
+        """
+        
+        cursor.execute(sql, tuple(params))
+        
+        EstoqueDAO._registrar_movimentacoes(
+            quantidades, EstoqueDAO.TIPO_SAIDA, usuario_id, motivo, cursor
+        )
+        return len(quantidades)
+    
+    @staticmethod
+    def repor_estoque(itens: List[ItemVenda], usuario_id: int, motivo: str, cursor) -> int:
+        """
+        Devolve ao estoque a quantidade dos itens com um único UPDATE relativo.
+        
+        Args:
+            itens: Itens devolvidos
+            usuario_id: Usuário responsável pela movimentação
+            motivo: Descrição gravada no histórico
+            cursor: Cursor da transação em andamento
+        
+        Returns:
+            Número de produtos atualizados
+        """
+        quantidades = EstoqueDAO._agrupar_por_produto(itens)
+        if not quantidades:
+            return 0
+        
+        derivada, params = EstoqueDAO._tabela_derivada(quantidades)
+        sql = f"""
+            UPDATE produtos p
+            JOIN ({derivada}) d ON p.id = d.produto_id
+            SET p.estoque_atual = p.estoque_atual + d.quantidade
+        """
+        
+        cursor.execute(sql, tuple(params))
+        atualizados = cursor.rowcount
+        
+        EstoqueDAO._registrar_movimentacoes(
+            quantidades, EstoqueDAO.TIPO_ENTRADA, usuario_id, motivo, cursor
+        )
+        return atualizados
+    
+    @staticmethod
+    def _registrar_movimentacoes(quantidades: Dict[int, Decimal], tipo: str,
+                                 usuario_id: int, motivo: str, cursor):
+        """Grava o histórico de movimentações com um único INSERT multi-linha."""
+        sql = """
+            INSERT INTO movimentacoes_estoque (
+                produto_id, tipo, quantidade, motivo, usuario_id
+            ) VALUES
+        """ + ", ".join(["(%s, %s, %s, %s, %s)"] * len(quantidades))
+        
+        params = []
+        for produto_id, quantidade in quantidades.items():
+            params.extend((produto_id, tipo, quantidade, motivo, usuario_id))
+        
+        cursor.execute(sql, tuple(params))
+    
+    @staticmethod
+    def registrar_ajustes(diferencas: Dict[int, Decimal], usuario_id: int, motivo: str, cursor) -> int:
+        """
+        Registra no histórico ajustes de saldo feitos fora das vendas (ex.: importação).
+        
+        Args:
+            diferencas: {produto_id: novo saldo - saldo anterior} (negativo reduz)
+            usuario_id: Usuário responsável pelo ajuste
+            motivo: Descrição gravada no histórico
+            cursor: Cursor da transação que alterou o saldo
+        
+        Returns:
+            Número de movimentações gravadas (diferenças zero são ignoradas)
+        """
+        diferencas = {produto_id: d for produto_id, d in diferencas.items() if d}
+        if diferencas:
+            EstoqueDAO._registrar_movimentacoes(
+                diferencas, EstoqueDAO.TIPO_AJUSTE, usuario_id, motivo, cursor
+            )
+        return len(diferencas)
+    
+    @staticmethod
+    def produtos_negativos(itens: List[ItemVenda], cursor) -> List[str]:
+        """
+        Produtos dos itens que estão com estoque negativo.
+        
+        Usado após uma baixa com permitir_negativo, para sinalizar as vendas
+        replicadas do diário local que deixaram o saldo abaixo de zero.
+        
+        Returns:
+            Lista de "nome (estoque: saldo)", vazia se nenhum ficou negativo
+        """
+        quantidades = EstoqueDAO._agrupar_por_produto(itens)
+        if not quantidades:
+            return []
+        
+        placeholders = ", ".join(["%s"] * len(quantidades))
+        cursor.execute(
+            f"SELECT id, nome, estoque_atual FROM produtos WHERE id IN ({placeholders}) AND estoque_atual < 0",
+            tuple(quantidades.keys())
+        )
+        
+        produtos = []
+        for row in cursor.fetchall():
+            if isinstance(row, dict):
+                produtos.append(f"{row['nome']} (estoque: {row['estoque_atual']})")
+            else:
+                produtos.append(f"{row[1]} (estoque: {row[2]})")
+        return produtos
+    
+    @staticmethod
+    def _produtos_sem_saldo(quantidades: Dict[int, Decimal], cursor) -> List[str]:
+        """Trava as linhas dos produtos e retorna os que não têm saldo para a baixa."""
+        placeholders = ", ".join(["%s"] * len(quantidades))
+        cursor.execute(
+            f"SELECT id, nome, estoque_atual FROM produtos WHERE id IN ({placeholders}) FOR UPDATE",
+            tuple(quantidades.keys())
+        )
+        
+        encontrados = {}
+        for row in cursor.fetchall():
+            if isinstance(row, dict):
+                encontrados[row['id']] = (row['nome'], row['estoque_atual'])
+            else:
+                encontrados[row[0]] = (row[1], row[2])
+        
+        produtos = []
+        for produto_id, quantidade in quantidades.items():
+            if produto_id not in encontrados:
+                produtos.append(f"produto #{produto_id} não encontrado")
+                continue
+            nome, estoque = encontrados[produto_id]
+            if estoque < quantidade:
+                produtos.append(f"{nome} (disponível: {estoque})")
+        
+        return produtos
+
@@ -2,10 +2,16 @@
 DAO para operações com Estornos no banco de dados.
 """
 
-from typing import List, Optional
+from typing import List, Optional, Set
 from datetime import date, datetime
 from src.config.database import DatabaseConnection
 from src.models.estorno import Estorno
+from src.models.venda import ItemVenda
+from src.dao.estoque_dao import EstoqueDAO
+from src.dao.lotes import Lotes
+from src.dao.periodo import Periodo
+from src.dao.resumo_vendas_dao import ResumoVendasDAO
+from src.dao.resumo_produtos_dao import ResumoProdutosDAO
 
 
 class EstornoDAO:
@@ -42,6 +48,64 @@ class EstornoDAO:
             print(f"Erro ao criar estorno: {e}")
             return None
     
+    @staticmethod
+    def registrar_estorno_completo(estorno: Estorno, itens: List[ItemVenda],
+                                   numero_venda: str) -> Optional[int]:
+        """
+        Registra o estorno, repõe o estoque e cancela a venda em uma única transação.
+        
+        O cancelamento só acontece se a venda ainda estiver finalizada, o que
+        impede que dois estornos simultâneos devolvam o estoque em dobro.
+        
+        Args:
+            estorno: Objeto Estorno
+            itens: Itens da venda a devolver ao estoque
+            numero_venda: Número da venda (para o histórico de estoque)
+            
+        Returns:
+            ID do estorno criado ou None em caso de erro
+        """
+        sql_cancelar = """
+            UPDATE vendas SET status = 'cancelada'
+            WHERE id = %s AND status = 'finalizada'
+        """
+        
+        sql_estorno = """
+            INSERT INTO estornos (
+                venda_id, usuario_id, motivo, valor_estornado, observacoes
+            ) VALUES (%s, %s, %s, %s, %s)
+        """
+        
+        try:
+            with DatabaseConnection.get_cursor() as cursor:
+                cursor.execute(sql_cancelar, (estorno.venda_id,))
+                if cursor.rowcount == 0:
+                    raise ValueError("Venda não está finalizada ou já foi estornada")
+                
+                ResumoVendasDAO.registrar_estorno(estorno.venda_id, cursor)
+                ResumoProdutosDAO.registrar_estorno(estorno.venda_id, cursor)
+                
+                cursor.execute(sql_estorno, (
+                    estorno.venda_id,
+                    estorno.usuario_id,
+                    estorno.motivo,
+                    estorno.valor_estornado,
+                    estorno.observacoes
+                ))
+                estorno_id = cursor.lastrowid
+                
+                EstoqueDAO.repor_estoque(
+                    itens,
+                    estorno.usuario_id,
+                    f"Estorno venda #{numero_venda}",
+                    cursor
+                )
+                
+                return estorno_id
+        except Exception as e:
+            print(f"Erro ao registrar estorno: {e}")
+            return None
+    
     @staticmethod
     def buscar_por_id(estorno_id: int) -> Optional[Estorno]:
         """
@@ -108,7 +172,7 @@ class EstornoDAO:
         sql = "SELECT COUNT(*) as total FROM estornos WHERE venda_id = %s"
         
         try:
-            with DatabaseConnection.get_cursor() as cursor:
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
                 cursor.execute(sql, (venda_id,))
                 row = cursor.fetchone()
                 return row['total'] > 0 if row else False
@@ -116,6 +180,32 @@ class EstornoDAO:
             print(f"Erro ao verificar estorno: {e}")
             return False
     
+    @staticmethod
+    def buscar_vendas_estornadas(venda_ids: List[int]) -> Set[int]:
+        """
+        Verifica de uma vez quais vendas da lista já foram estornadas.
+        
+        Args:
+            venda_ids: IDs das vendas
+            
+        Returns:
+            Conjunto com os IDs das vendas estornadas
+        """
+        estornadas = set()
+        if not venda_ids:
+            return estornadas
+        
+        try:
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
+                for lote in Lotes.dividir(venda_ids):
+                    filtro, params = Lotes.filtro("venda_id", lote)
+                    cursor.execute(f"SELECT DISTINCT venda_id FROM estornos WHERE {filtro}", tuple(params))
+                    estornadas.update(row['venda_id'] for row in cursor.fetchall())
+            return estornadas
+        except Exception as e:
+            print(f"Erro ao verificar estornos: {e}")
+            return set()
+    
     @staticmethod
     def buscar_por_periodo(data_inicio: date, data_fim: date) -> List[Estorno]:
         """
@@ -128,18 +218,19 @@ class EstornoDAO:
         Returns:
             Lista de estornos
         """
-        sql = """
+        filtro, params = Periodo.filtro("e.data_estorno", data_inicio, data_fim)
+        sql = f"""
             SELECT e.*, v.numero_venda, u.nome_completo as usuario_nome
             FROM estornos e
             JOIN vendas v ON e.venda_id = v.id
             JOIN usuarios u ON e.usuario_id = u.id
-            WHERE DATE(e.data_estorno) BETWEEN %s AND %s
+            WHERE {filtro}
             ORDER BY e.data_estorno DESC
         """
         
         try:
-            with DatabaseConnection.get_cursor() as cursor:
-                cursor.execute(sql, (data_inicio, data_fim))
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
+                cursor.execute(sql, tuple(params))
                 rows = cursor.fetchall()
                 
                 return [Estorno.from_dict(row) for row in rows]
@@ -161,17 +252,18 @@ class EstornoDAO:
         if data is None:
             data = date.today()
         
-        sql = """
+        filtro, params = Periodo.filtro("data_estorno", data)
+        sql = f"""
             SELECT 
                 SUM(valor_estornado) as total,
                 COUNT(*) as quantidade
             FROM estornos
-            WHERE DATE(data_estorno) = %s
+            WHERE {filtro}
         """
         
         try:
-            with DatabaseConnection.get_cursor() as cursor:
-                cursor.execute(sql, (data,))
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
+                cursor.execute(sql, tuple(params))
                 row = cursor.fetchone()
                 
                 return {
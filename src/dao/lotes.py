@@ -0,0 +1,47 @@
+"""
+Consultas em lote por lista de IDs compartilhadas pelos DAOs.
+Gera predicados `coluna IN (%s, ...)` divididos em blocos de tamanho
+limitado, para carregar os dados de muitas vendas com poucas consultas
+(em vez de uma consulta por venda).
+"""
+
+from typing import Iterable, Iterator, List, Tuple
+
+
+# Quantidade máxima de IDs por IN (...): mantém o comando pequeno e o plano estável
+TAMANHO_LOTE = 500
+
+
+class Lotes:
+    """Divisão de listas de IDs em blocos para cláusulas IN."""
+    
+    @staticmethod
+    def dividir(ids: Iterable[int], tamanho: int = TAMANHO_LOTE) -> Iterator[List[int]]:
+        """
+        Divide os IDs (sem repetição, na ordem recebida) em blocos.
+        
+        Args:
+            ids: IDs a consultar
+            tamanho: Máximo de IDs por bloco
+        
+        Yields:
+            Listas com até `tamanho` IDs
+        """
+        unicos = list(dict.fromkeys(ids))
+        for inicio in range(0, len(unicos), tamanho):
+            yield unicos[inicio:inicio + tamanho]
+    
+    @staticmethod
+    def filtro(coluna: str, ids: List[int]) -> Tuple[str, List[int]]:
+        """
+        Monta o predicado SQL IN para um bloco de IDs.
+        
+        Args:
+            coluna: Nome da coluna (ex: "iv.venda_id")
+            ids: Bloco de IDs (não vazio)
+        
+        Returns:
+            Tupla (fragmento SQL, parâmetros)
+        """
+        marcadores = ", ".join(["%s"] * len(ids))
+        return f"{coluna} IN ({marcadores})", list(ids)
@@ -2,10 +2,12 @@
 DAO para operações com Pagamentos no banco de dados.
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import date
 from src.config.database import DatabaseConnection
 from src.models.pagamento import Pagamento
+from src.dao.lotes import Lotes
+from src.dao.periodo import Periodo
 
 
 class PagamentoDAO:
@@ -40,6 +42,50 @@ class PagamentoDAO:
             print(f"Erro ao criar pagamento: {e}")
             return None
     
+    @staticmethod
+    def criar_em_lote(pagamentos: List[Pagamento], cursor) -> int:
+        """
+        Insere vários pagamentos com um único INSERT multi-linha.
+        
+        Não abre transação própria: deve ser chamado com o cursor da
+        transação que grava a venda.
+        
+        Args:
+            pagamentos: Pagamentos com venda_id já preenchido
+            cursor: Cursor da transação em andamento
+            
+        Returns:
+            Número de linhas inseridas
+        """
+        if not pagamentos:
+            return 0
+        
+        sql = """
+            INSERT INTO pagamentos (
+                venda_id, forma_pagamento, valor, numero_parcelas, status,
+                nsu, codigo_autorizacao, dados_pix, valor_pago, troco, data_hora
+            ) VALUES 
+        """ + ", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"] * len(pagamentos))
+        
+        params = []
+        for pagamento in pagamentos:
+            params.extend((
+                pagamento.venda_id,
+                pagamento.forma_pagamento,
+                pagamento.valor,
+                pagamento.numero_parcelas,
+                pagamento.status,
+                pagamento.nsu,
+                pagamento.codigo_autorizacao,
+                pagamento.dados_pix,
+                pagamento.valor_pago if pagamento.valor_pago else pagamento.valor,
+                pagamento.troco if pagamento.troco else 0,
+                pagamento.data_hora
+            ))
+        
+        cursor.execute(sql, tuple(params))
+        return cursor.rowcount
+    
     @staticmethod
     def buscar_por_id(id: int) -> Optional[Pagamento]:
         """Busca um pagamento por ID."""
@@ -76,18 +122,55 @@ class PagamentoDAO:
             print(f"Erro ao buscar pagamentos da venda: {e}")
             return []
     
+    @staticmethod
+    def buscar_por_vendas(venda_ids: List[int], cursor=None) -> Dict[int, List[Pagamento]]:
+        """
+        Busca os pagamentos de várias vendas com uma consulta por bloco de IDs.
+        
+        Args:
+            venda_ids: IDs das vendas
+            cursor: Cursor dicionário já aberto (reaproveita a conexão de quem chama)
+            
+        Returns:
+            dict venda_id -> pagamentos em ordem de data (vendas sem pagamento ficam de fora)
+        """
+        pagamentos: Dict[int, List[Pagamento]] = {}
+        if not venda_ids:
+            return pagamentos
+        
+        def consultar(cursor):
+            for lote in Lotes.dividir(venda_ids):
+                filtro, params = Lotes.filtro("venda_id", lote)
+                cursor.execute(f"""
+                    SELECT * FROM pagamentos
+                    WHERE {filtro}
+                    ORDER BY venda_id, data_hora
+                """, tuple(params))
+                for row in cursor.fetchall():
+                    pagamentos.setdefault(row['venda_id'], []).append(Pagamento.from_dict(row))
+        
+        try:
+            if cursor is not None:
+                consultar(cursor)
+            else:
+                with DatabaseConnection.get_cursor(readonly=True) as cursor:
+                    consultar(cursor)
+            return pagamentos
+        except Exception as e:
+            print(f"Erro ao buscar pagamentos das vendas: {e}")
+            return {}
+    
     @staticmethod
     def buscar_por_periodo(data_inicio: date, data_fim: date, forma_pagamento: str = None) -> List[Pagamento]:
         """Busca pagamentos por período."""
-        sql = """
+        filtro, params = Periodo.filtro("p.data_hora", data_inicio, data_fim)
+        sql = f"""
             SELECT p.*, v.numero_venda
             FROM pagamentos p
             JOIN vendas v ON p.venda_id = v.id
-            WHERE DATE(p.data_hora) BETWEEN %s AND %s
+            WHERE {filtro}
         """
         
-        params = [data_inicio, data_fim]
-        
         if forma_pagamento:
             sql += " AND p.forma_pagamento = %s"
             params.append(forma_pagamento)
@@ -95,7 +178,7 @@ class PagamentoDAO:
         sql += " ORDER BY p.data_hora DESC"
         
         try:
-            with DatabaseConnection.get_cursor() as cursor:
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
                 cursor.execute(sql, tuple(params))
                 rows = cursor.fetchall()
                 
@@ -127,22 +210,23 @@ class PagamentoDAO:
         if data is None:
             data = date.today()
         
-        sql = """
+        filtro, params = Periodo.filtro("p.data_hora", data)
+        sql = f"""
             SELECT 
                 forma_pagamento,
                 SUM(valor) as total,
                 COUNT(*) as quantidade
             FROM pagamentos p
             JOIN vendas v ON p.venda_id = v.id
-            WHERE DATE(p.data_hora) = %s 
+            WHERE {filtro}
             AND p.status = 'aprovado'
             AND v.status = 'finalizada'
             GROUP BY forma_pagamento
         """
         
         try:
-            with DatabaseConnection.get_cursor() as cursor:
-                cursor.execute(sql, (data,))
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
+                cursor.execute(sql, tuple(params))
                 rows = cursor.fetchall()
                 
                 resultado = {}
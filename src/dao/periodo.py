@@ -0,0 +1,60 @@
+"""
+Filtros de período compartilhados pelos DAOs.
+Gera predicados semiabertos [início, fim) sobre colunas DATETIME,
+que aproveitam os índices (ao contrário de DATE(coluna) BETWEEN ...).
+"""
+
+from typing import List, Tuple, Union
+from datetime import date, datetime, time, timedelta
+
+
+DataLike = Union[date, datetime, str]
+
+
+class Periodo:
+    """Conversão de datas do calendário em intervalos de DATETIME."""
+    
+    @staticmethod
+    def _para_data(valor: DataLike) -> date:
+        """Normaliza date, datetime ou string ISO (AAAA-MM-DD) em date."""
+        if isinstance(valor, datetime):
+            return valor.date()
+        if isinstance(valor, date):
+            return valor
+        return date.fromisoformat(str(valor)[:10])
+    
+    @staticmethod
+    def intervalo(data_inicio: DataLike, data_fim: DataLike = None) -> Tuple[datetime, datetime]:
+        """
+        Converte um período de dias (inclusivo) em um intervalo [início, fim).
+        
+        Args:
+            data_inicio: Primeiro dia do período
+            data_fim: Último dia do período (usa data_inicio se None)
+        
+        Returns:
+            Tupla (início à meia-noite, meia-noite do dia seguinte ao fim)
+        """
+        inicio = Periodo._para_data(data_inicio)
+        fim = Periodo._para_data(data_fim) if data_fim is not None else inicio
+        
+        return (
+            datetime.combine(inicio, time.min),
+            datetime.combine(fim + timedelta(days=1), time.min)
+        )
+    
+    @staticmethod
+    def filtro(coluna: str, data_inicio: DataLike, data_fim: DataLike = None) -> Tuple[str, List[datetime]]:
+        """
+        Monta o predicado SQL do período para uma coluna DATETIME.
+        
+        Args:
+            coluna: Nome da coluna (ex: "v.data_hora")
+            data_inicio: Primeiro dia do período
+            data_fim: Último dia do período (usa data_inicio se None)
+        
+        Returns:
+            Tupla (fragmento SQL, parâmetros)
+        """
+        inicio, fim = Periodo.intervalo(data_inicio, data_fim)
+        return f"{coluna} >= %s AND {coluna} < %s", [inicio, fim]
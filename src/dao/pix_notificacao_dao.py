@@ -0,0 +1,64 @@
+"""
+DAO para as notificações de status de pagamento recebidas pelo webhook.
+O web_app grava o status informado pelo Mercado Pago e a frente de caixa,
+que roda em outro processo, lê daqui em vez de consultar a API.
+"""
+
+from typing import Dict, Iterable
+from src.config.database import DatabaseConnection
+
+
+class PixNotificacaoDAO:
+    """Data Access Object para a tabela pix_notificacoes."""
+    
+    @staticmethod
+    def registrar(payment_id: str, status: str) -> bool:
+        """
+        Grava (ou atualiza) o último status conhecido de um pagamento.
+        
+        Args:
+            payment_id: ID do pagamento no Mercado Pago
+            status: Status informado pela API (approved, rejected, ...)
+        
+        Returns:
+            True se gravado com sucesso
+        """
+        sql = """
+            INSERT INTO pix_notificacoes (payment_id, status)
+            VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE status = VALUES(status)
+        """
+        
+        try:
+            with DatabaseConnection.get_cursor() as cursor:
+                cursor.execute(sql, (str(payment_id), status))
+                return True
+        except Exception as e:
+            print(f"Erro ao registrar notificação PIX: {e}")
+            return False
+    
+    @staticmethod
+    def buscar_status(payment_ids: Iterable[str]) -> Dict[str, str]:
+        """
+        Busca o status notificado de vários pagamentos em uma consulta.
+        
+        Args:
+            payment_ids: IDs dos pagamentos
+        
+        Returns:
+            dict {payment_id: status} apenas dos pagamentos já notificados
+        """
+        ids = [str(p) for p in payment_ids]
+        if not ids:
+            return {}
+        
+        placeholders = ", ".join(["%s"] * len(ids))
+        sql = f"SELECT payment_id, status FROM pix_notificacoes WHERE payment_id IN ({placeholders})"
+        
+        try:
+            with DatabaseConnection.get_cursor(readonly=True, usar_replica=False) as cursor:
+                cursor.execute(sql, tuple(ids))
+                return {row['payment_id']: row['status'] for row in cursor.fetchall()}
+        except Exception as e:
+            print(f"Erro ao buscar notificações PIX: {e}")
+            return {}
@@ -2,14 +2,43 @@
 DAO para operações com Produtos no banco de dados.
 """
 
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
+from datetime import datetime
 from src.config.database import DatabaseConnection
+from src.dao.estoque_dao import EstoqueDAO
+from src.dao.lotes import Lotes
 from src.models.produto import Produto
 
 
 class ProdutoDAO:
     """Data Access Object para Produto."""
     
+    # Colunas na ordem de Produto.CAMPOS_LINHA (consultas preparadas das buscas unitárias)
+    _SELECT_POSICIONAL = """
+        SELECT p.id, p.codigo_barras, p.nome, p.descricao, p.categoria_id, p.preco_custo,
+               p.preco_venda, p.estoque_atual, p.estoque_minimo, p.unidade_medida, p.ativo,
+               p.data_cadastro, p.data_atualizacao, c.nome
+        FROM produtos p
+        LEFT JOIN categorias c ON p.categoria_id = c.id
+    """
+    
+    # Campos que podem ser projetados em buscar_pagina (nome público -> expressão SQL)
+    CAMPOS_PROJETAVEIS = {
+        'id': 'p.id',
+        'codigo_barras': 'p.codigo_barras',
+        'nome': 'p.nome',
+        'descricao': 'p.descricao',
+        'categoria_id': 'p.categoria_id',
+        'categoria_nome': 'c.nome',
+        'preco_custo': 'p.preco_custo',
+        'preco_venda': 'p.preco_venda',
+        'estoque_atual': 'p.estoque_atual',
+        'estoque_minimo': 'p.estoque_minimo',
+        'unidade_medida': 'p.unidade_medida',
+        'ativo': 'p.ativo',
+        'data_atualizacao': 'p.data_atualizacao',
+    }
+    
     @staticmethod
     def criar(produto: Produto) -> Optional[int]:
         """Cria um novo produto no banco de dados."""
@@ -43,21 +72,11 @@ class ProdutoDAO:
     @staticmethod
     def buscar_por_id(id: int) -> Optional[Produto]:
         """Busca um produto por ID."""
-        sql = """
-            SELECT p.*, c.nome as categoria_nome
-            FROM produtos p
-            LEFT JOIN categorias c ON p.categoria_id = c.id
-            WHERE p.id = %s
-        """
+        sql = ProdutoDAO._SELECT_POSICIONAL + " WHERE p.id = %s"
         
         try:
-            with DatabaseConnection.get_cursor() as cursor:
-                cursor.execute(sql, (id,))
-                row = cursor.fetchone()
-                
-                if row:
-                    return Produto.from_dict(row)
-                return None
+            rows = DatabaseConnection.consultar_preparado(sql, (id,), usar_replica=False)
+            return Produto.from_row(rows[0]) if rows else None
         except Exception as e:
             print(f"Erro ao buscar produto: {e}")
             return None
@@ -65,21 +84,11 @@ class ProdutoDAO:
     @staticmethod
     def buscar_por_codigo_barras(codigo_barras: str) -> Optional[Produto]:
         """Busca um produto por código de barras."""
-        sql = """
-            SELECT p.*, c.nome as categoria_nome
-            FROM produtos p
-            LEFT JOIN categorias c ON p.categoria_id = c.id
-            WHERE p.codigo_barras = %s AND p.ativo = TRUE
-        """
+        sql = ProdutoDAO._SELECT_POSICIONAL + " WHERE p.codigo_barras = %s AND p.ativo = TRUE"
         
         try:
-            with DatabaseConnection.get_cursor() as cursor:
-                cursor.execute(sql, (codigo_barras,))
-                row = cursor.fetchone()
-                
-                if row:
-                    return Produto.from_dict(row)
-                return None
+            rows = DatabaseConnection.consultar_preparado(sql, (codigo_barras,), usar_replica=False)
+            return Produto.from_row(rows[0]) if rows else None
         except Exception as e:
             print(f"Erro ao buscar produto por código de barras: {e}")
             return None
@@ -99,7 +108,7 @@ class ProdutoDAO:
         sql += " ORDER BY p.nome"
         
         try:
-            with DatabaseConnection.get_cursor() as cursor:
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
                 cursor.execute(sql)
                 rows = cursor.fetchall()
                 
@@ -108,6 +117,139 @@ class ProdutoDAO:
             print(f"Erro ao buscar produtos: {e}")
             return []
     
+    @staticmethod
+    def contar(apenas_ativos: bool = True) -> int:
+        """Conta os produtos cadastrados sem carregá-los."""
+        sql = "SELECT COUNT(*) as total FROM produtos"
+        
+        if apenas_ativos:
+            sql += " WHERE ativo = TRUE"
+        
+        try:
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
+                cursor.execute(sql)
+                row = cursor.fetchone()
+                return int(row['total'])
+        except Exception as e:
+            print(f"Erro ao contar produtos: {e}")
+            return 0
+    
+    @staticmethod
+    def obter_marcador_alteracao() -> Optional[datetime]:
+        """Retorna a data da alteração mais recente no catálogo (MAX(data_atualizacao))."""
+        sql = "SELECT MAX(data_atualizacao) as marcador FROM produtos"
+        
+        try:
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
+                cursor.execute(sql)
+                row = cursor.fetchone()
+                return row['marcador'] if row else None
+        except Exception as e:
+            print(f"Erro ao obter marcador de alteração dos produtos: {e}")
+            return None
+    
+    @staticmethod
+    def obter_versao_catalogo() -> Optional[str]:
+        """
+        Retorna uma versão do catálogo que muda a cada inclusão ou alteração.
+        
+        Combina MAX(data_atualizacao) e MAX(id), ambos resolvidos pelos índices.
+        
+        Returns:
+            Texto "AAAA-MM-DDTHH:MM:SS.<id>" ou None em caso de erro
+        """
+        sql = "SELECT MAX(data_atualizacao) as marcador, MAX(id) as ultimo_id FROM produtos"
+        
+        try:
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
+                cursor.execute(sql)
+                row = cursor.fetchone()
+                if not row or row['marcador'] is None:
+                    return "0"
+                return f"{row['marcador'].isoformat()}.{row['ultimo_id']}"
+        except Exception as e:
+            print(f"Erro ao obter versão do catálogo: {e}")
+            return None
+    
+    @staticmethod
+    def buscar_alterados_desde(marcador: datetime) -> List[Produto]:
+        """
+        Busca produtos (ativos ou não) alterados a partir de um instante.
+        
+        Args:
+            marcador: Valor de data_atualizacao da última leitura
+            
+        Returns:
+            Lista de produtos alterados
+        """
+        sql = """
+            SELECT p.*, c.nome as categoria_nome
+            FROM produtos p
+            LEFT JOIN categorias c ON p.categoria_id = c.id
+            WHERE p.data_atualizacao >= %s
+        """
+        
+        try:
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
+                cursor.execute(sql, (marcador,))
+                rows = cursor.fetchall()
+                
+                return [Produto.from_dict(row) for row in rows]
+        except Exception as e:
+            print(f"Erro ao buscar produtos alterados: {e}")
+            return []
+    
+    @staticmethod
+    def buscar_pagina(after_id: int = 0, limite: int = 100, campos: Sequence[str] = None,
+                      apenas_ativos: bool = False) -> List[dict]:
+        """
+        Busca uma página de produtos por cursor (keyset) com projeção de campos.
+        
+        A paginação usa "WHERE p.id > after_id ORDER BY p.id LIMIT n", que
+        percorre a chave primária sem OFFSET. As linhas voltam como dicionários,
+        sem montar objetos Produto.
+        
+        Args:
+            after_id: Último ID da página anterior (0 para a primeira página)
+            limite: Quantidade máxima de linhas
+            campos: Campos desejados (ver CAMPOS_PROJETAVEIS); None para todos
+            apenas_ativos: Se True, ignora produtos inativos
+            
+        Returns:
+            Lista de dicionários, sempre com a chave 'id'
+        
+        Raises:
+            ValueError: Se algum campo não for projetável
+            Error: Se a consulta falhar (quem percorre as páginas não pode
+                confundir uma falha com o fim do catálogo)
+        """
+        if campos:
+            invalidos = [c for c in campos if c not in ProdutoDAO.CAMPOS_PROJETAVEIS]
+            if invalidos:
+                raise ValueError(f"Campos inválidos: {', '.join(invalidos)}")
+            campos = ['id'] + [c for c in campos if c != 'id']
+        else:
+            campos = list(ProdutoDAO.CAMPOS_PROJETAVEIS)
+        
+        colunas = ", ".join(
+            f"{ProdutoDAO.CAMPOS_PROJETAVEIS[c]} AS {c}" for c in campos
+        )
+        join = "LEFT JOIN categorias c ON p.categoria_id = c.id" if 'categoria_nome' in campos else ""
+        filtro_ativo = "AND p.ativo = TRUE" if apenas_ativos else ""
+        
+        sql = f"""
+            SELECT {colunas}
+            FROM produtos p
+            {join}
+            WHERE p.id > %s {filtro_ativo}
+            ORDER BY p.id
+            LIMIT %s
+        """
+        
+        with DatabaseConnection.get_cursor(readonly=True) as cursor:
+            cursor.execute(sql, (after_id or 0, limite))
+            return cursor.fetchall()
+    
     @staticmethod
     def buscar_por_nome(nome: str) -> List[Produto]:
         """Busca produtos por nome (busca parcial)."""
@@ -129,6 +271,84 @@ class ProdutoDAO:
             print(f"Erro ao buscar produtos por nome: {e}")
             return []
     
+    @staticmethod
+    def pesquisar(termo: str, limite: int = 10) -> List[Produto]:
+        """
+        Pesquisa produtos ativos por código de barras ou nome, com ranking e LIMIT no banco.
+        
+        Usa o índice de código de barras para correspondência por prefixo e o
+        índice FULLTEXT (ngram) de nome; a collation utf8mb4_unicode_ci torna
+        a busca indiferente a acentos e maiúsculas.
+        
+        Ordem do resultado: código exato, prefixo do código, relevância do nome.
+        
+        Args:
+            termo: Texto digitado
+            limite: Quantidade máxima de resultados
+            
+        Returns:
+            Lista de produtos (apenas os campos usados na venda)
+        """
+        termo = (termo or "").strip()
+        if not termo:
+            return []
+        
+        # Remove operadores do modo booleano e busca o termo como frase
+        termo_fulltext = ''.join(c for c in termo if c not in '+-<>()~*"@').strip()
+        prefixo = termo.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        
+        subconsultas = ["""
+            (SELECT id, IF(codigo_barras = %s, 3, 2) AS prioridade, 0 AS relevancia
+             FROM produtos
+             WHERE codigo_barras LIKE %s AND ativo = TRUE
+             ORDER BY codigo_barras
+             LIMIT %s)
+        """]
+        params = [termo, prefixo, limite]
+        
+        if len(termo_fulltext) >= 2:
+            subconsultas.append("""
+                (SELECT id, 1 AS prioridade,
+                        MATCH(nome) AGAINST (%s IN BOOLEAN MODE) AS relevancia
+                 FROM produtos
+                 WHERE MATCH(nome) AGAINST (%s IN BOOLEAN MODE) AND ativo = TRUE
+                 ORDER BY relevancia DESC
+                 LIMIT %s)
+            """)
+            frase = f'"{termo_fulltext}"'
+            params.extend([frase, frase, limite])
+        else:
+            # Termos de 1 caractere ficam abaixo do tamanho do ngram
+            subconsultas.append("""
+                (SELECT id, 1 AS prioridade, 0 AS relevancia
+                 FROM produtos
+                 WHERE nome LIKE %s AND ativo = TRUE
+                 ORDER BY nome
+                 LIMIT %s)
+            """)
+            params.extend([prefixo, limite])
+        
+        sql = f"""
+            SELECT p.id, p.codigo_barras, p.nome, p.preco_venda,
+                   p.estoque_atual, p.estoque_minimo, p.unidade_medida, p.ativo
+            FROM ({" UNION ALL ".join(subconsultas)}) r
+            JOIN produtos p ON p.id = r.id
+            GROUP BY p.id
+            ORDER BY MAX(r.prioridade) DESC, MAX(r.relevancia) DESC, p.nome
+            LIMIT %s
+        """
+        params.append(limite)
+        
+        try:
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
+                cursor.execute(sql, tuple(params))
+                rows = cursor.fetchall()
+                
+                return [Produto.from_dict(row) for row in rows]
+        except Exception as e:
+            print(f"Erro ao pesquisar produtos: {e}")
+            return []
+    
     @staticmethod
     def buscar_por_categoria(categoria_id: int) -> List[Produto]:
         """Busca produtos por categoria."""
@@ -162,7 +382,7 @@ class ProdutoDAO:
         """
         
         try:
-            with DatabaseConnection.get_cursor() as cursor:
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
                 cursor.execute(sql)
                 rows = cursor.fetchall()
                 
@@ -203,6 +423,103 @@ class ProdutoDAO:
             print(f"Erro ao atualizar produto: {e}")
             return False
     
+    # Colunas gravadas por salvar_em_lote (na ordem do VALUES)
+    COLUNAS_LOTE = (
+        'codigo_barras', 'nome', 'descricao', 'categoria_id', 'preco_custo', 'preco_venda',
+        'estoque_atual', 'estoque_minimo', 'unidade_medida', 'ativo'
+    )
+    
+    @staticmethod
+    def salvar_em_lote(produtos: List[Produto], colunas_atualizar: Sequence[str] = None,
+                       usuario_id: Optional[int] = None, motivo: str = "Importação de catálogo",
+                       cursor=None) -> Tuple[int, int]:
+        """
+        Insere ou atualiza vários produtos pelo código de barras em um único comando.
+        
+        Usa INSERT ... VALUES (...), (...) ON DUPLICATE KEY UPDATE sobre a
+        chave única de codigo_barras, em uma transação.
+        
+        Com usuario_id, a diferença de estoque_atual de cada produto (saldo
+        anterior, ou zero para os novos) é registrada em movimentacoes_estoque
+        como ajuste, na mesma transação.
+        
+        Args:
+            produtos: Produtos com codigo_barras preenchido
+            colunas_atualizar: Colunas sobrescritas nos produtos que já existem
+                (None para todas); as demais mantêm o valor do banco
+            usuario_id: Usuário responsável pelos ajustes de estoque (None não registra)
+            motivo: Descrição dos ajustes no histórico
+            cursor: Cursor de uma transação já aberta (quem chama confirma);
+                sem ele o lote usa uma transação própria
+            
+        Returns:
+            Tupla (inseridos, atualizados)
+            
+        Raises:
+            Error: Se o lote falhar (nada do lote é gravado)
+        """
+        if not produtos:
+            return 0, 0
+        
+        colunas = ProdutoDAO.COLUNAS_LOTE
+        atualizar = [c for c in (colunas_atualizar or colunas) if c in colunas and c != 'codigo_barras']
+        linha = "(" + ", ".join(["%s"] * len(colunas)) + ")"
+        
+        sql = f"""
+            INSERT INTO produtos ({", ".join(colunas)})
+            VALUES {", ".join([linha] * len(produtos))}
+        """
+        if atualizar:
+            sql += " ON DUPLICATE KEY UPDATE " + ", ".join(f"{c} = VALUES({c})" for c in atualizar)
+        else:
+            sql += " ON DUPLICATE KEY UPDATE codigo_barras = codigo_barras"
+        
+        params = []
+        for produto in produtos:
+            params.extend(getattr(produto, c) for c in colunas)
+        
+        registrar_estoque = usuario_id is not None and (
+            'estoque_atual' in atualizar or any(p.estoque_atual for p in produtos)
+        )
+        
+        filtro, codigos = Lotes.filtro("codigo_barras", list({p.codigo_barras for p in produtos}))
+        
+        def gravar(cursor) -> int:
+            """Grava o lote e retorna quantos produtos já existiam."""
+            # Quais já existem (e o saldo anterior, travado até o commit para o histórico)
+            cursor.execute(
+                f"SELECT codigo_barras, estoque_atual FROM produtos WHERE {filtro}"
+                + (" FOR UPDATE" if registrar_estoque else ""),
+                tuple(codigos)
+            )
+            anteriores = {row['codigo_barras']: row['estoque_atual'] for row in cursor.fetchall()}
+            
+            cursor.execute(sql, tuple(params))
+            
+            if registrar_estoque:
+                cursor.execute(f"SELECT id, codigo_barras FROM produtos WHERE {filtro}", tuple(codigos))
+                ids = {row['codigo_barras']: row['id'] for row in cursor.fetchall()}
+                
+                diferencas = {}
+                for produto in produtos:
+                    if produto.codigo_barras not in anteriores:
+                        diferencas[ids[produto.codigo_barras]] = produto.estoque_atual
+                    elif 'estoque_atual' in atualizar:
+                        diferencas[ids[produto.codigo_barras]] = (
+                            produto.estoque_atual - (anteriores[produto.codigo_barras] or 0)
+                        )
+                EstoqueDAO.registrar_ajustes(diferencas, usuario_id, motivo, cursor)
+            return len(anteriores)
+        
+        if cursor is not None:
+            existentes = gravar(cursor)
+        else:
+            with DatabaseConnection.get_cursor() as cursor:
+                existentes = gravar(cursor)
+        
+        novos = len(codigos) - existentes
+        return novos, len(produtos) - novos
+    
     @staticmethod
     def atualizar_estoque(produto_id: int, quantidade: int) -> bool:
         """Atualiza o estoque de um produto."""
@@ -0,0 +1,181 @@
+"""
+DAO para o reajuste de preços em massa e o histórico de preços.
+
+O novo preço é calculado pelo próprio MySQL a partir de uma expressão SQL
+montada da regra, então simulação e aplicação percorrem os produtos em
+comandos set-based, sem trazer um produto por vez para a aplicação.
+"""
+
+from typing import List, Optional, Tuple
+from src.config.database import DatabaseConnection
+from src.dao.lotes import Lotes
+from src.models.reajuste_preco import RegraReajuste, FiltroProdutos
+
+
+class ReajustePrecoDAO:
+    """Data Access Object para reajuste e histórico de preços."""
+    
+    @staticmethod
+    def _expressao(regra: RegraReajuste) -> Tuple[str, list]:
+        """Expressão SQL do novo preço (sobre o alias p de produtos) e seus parâmetros."""
+        if regra.tipo == RegraReajuste.TIPO_PERCENTUAL:
+            expressao, params = "p.preco_venda * (1 + %s / 100)", [regra.valor]
+        elif regra.tipo == RegraReajuste.TIPO_MARGEM:
+            expressao, params = "p.preco_custo * (1 + %s / 100)", [regra.valor]
+        else:
+            expressao, params = "p.preco_venda", []
+        
+        expressao = f"ROUND({expressao}, 2)"
+        if regra.terminacao is not None:
+            # Menor preço >= ao calculado que termina nos centavos pedidos
+            expressao = f"(CEILING({expressao} - %s) + %s)"
+            params += [regra.terminacao, regra.terminacao]
+        return expressao, params
+    
+    @staticmethod
+    def _filtro(filtro: FiltroProdutos, regra: RegraReajuste) -> Tuple[str, list]:
+        """Predicado WHERE dos produtos selecionados e seus parâmetros."""
+        condicoes, params = ["1 = 1"], []
+        
+        if filtro.apenas_ativos:
+            condicoes.append("p.ativo = TRUE")
+        if filtro.categoria_id:
+            condicoes.append("p.categoria_id = %s")
+            params.append(filtro.categoria_id)
+        if filtro.termo:
+            condicoes.append("p.nome LIKE %s")
+            params.append(f"%{filtro.termo}%")
+        if filtro.codigos_barras:
+            trecho, codigos = Lotes.filtro("p.codigo_barras", filtro.codigos_barras)
+            condicoes.append(trecho)
+            params.extend(codigos)
+        if regra.tipo == RegraReajuste.TIPO_MARGEM:
+            # Sem custo cadastrado não há como aplicar margem
+            condicoes.append("p.preco_custo > 0")
+        
+        return " AND ".join(condicoes), params
+    
+    @staticmethod
+    def simular(regra: RegraReajuste, filtro: FiltroProdutos) -> List[dict]:
+        """
+        Calcula o novo preço de todos os produtos do filtro em uma consulta.
+        
+        Returns:
+            Lista de dicts (id, codigo_barras, nome, categoria_nome, preco_custo,
+            preco_venda, preco_novo), só com os produtos cujo preço muda
+        """
+        expressao, params_expressao = ReajustePrecoDAO._expressao(regra)
+        where, params_filtro = ReajustePrecoDAO._filtro(filtro, regra)
+        
+        sql = f"""
+            SELECT * FROM (
+                SELECT p.id, p.codigo_barras, p.nome, c.nome as categoria_nome,
+                       p.preco_custo, p.preco_venda, {expressao} as preco_novo
+                FROM produtos p
+                LEFT JOIN categorias c ON p.categoria_id = c.id
+                WHERE {where}
+            ) t
+            WHERE t.preco_novo <> t.preco_venda AND t.preco_novo > 0
+            ORDER BY t.nome
+        """
+        
+        try:
+            with DatabaseConnection.get_cursor(readonly=True, usar_replica=False) as cursor:
+                cursor.execute(sql, tuple(params_expressao + params_filtro))
+                return cursor.fetchall()
+        except Exception as e:
+            print(f"Erro ao simular reajuste: {e}")
+            return []
+    
+    @staticmethod
+    def proximo_limite(filtro: FiltroProdutos, regra: RegraReajuste, apos_id: int, tamanho: int) -> Optional[int]:
+        """
+        Maior ID do próximo bloco de até `tamanho` produtos do filtro após `apos_id`.
+        
+        Returns:
+            ID final do bloco, ou None se não houver mais produtos
+        """
+        where, params = ReajustePrecoDAO._filtro(filtro, regra)
+        sql = f"""
+            SELECT MAX(id) as limite FROM (
+                SELECT p.id FROM produtos p
+                WHERE {where} AND p.id > %s
+                ORDER BY p.id
+                LIMIT %s
+            ) t
+        """
+        
+        with DatabaseConnection.get_cursor(readonly=True, usar_replica=False) as cursor:
+            cursor.execute(sql, tuple(params + [apos_id, tamanho]))
+            row = cursor.fetchone()
+            return row['limite'] if row else None
+    
+    @staticmethod
+    def aplicar_faixa(regra: RegraReajuste, filtro: FiltroProdutos, apos_id: int, ate_id: int,
+                      lote: str, usuario_id: int) -> int:
+        """
+        Reajusta os produtos do filtro com id em (apos_id, ate_id] em uma transação.
+        
+        Trava a faixa, grava o histórico (INSERT ... SELECT com o preço
+        calculado) e depois copia o preço novo do histórico para os produtos (UPDATE com
+        JOIN), assim o preço aplicado é exatamente o registrado.
+        
+        Returns:
+            Quantidade de produtos alterados
+        
+        Raises:
+            Error: Se a faixa falhar (nada da faixa é gravado)
+        """
+        expressao, params_expressao = ReajustePrecoDAO._expressao(regra)
+        where, params_filtro = ReajustePrecoDAO._filtro(filtro, regra)
+        
+        sql_historico = f"""
+            INSERT INTO historico_precos
+                (produto_id, preco_anterior, preco_novo, preco_custo, regra, lote, usuario_id)
+            SELECT t.id, t.preco_venda, t.preco_novo, t.preco_custo, %s, %s, %s
+            FROM (
+                SELECT p.id, p.preco_venda, p.preco_custo, {expressao} as preco_novo
+                FROM produtos p
+                WHERE {where} AND p.id > %s AND p.id <= %s
+            ) t
+            WHERE t.preco_novo <> t.preco_venda AND t.preco_novo > 0
+        """
+        sql_produtos = """
+            UPDATE produtos p
+            JOIN historico_precos h ON h.produto_id = p.id AND h.lote = %s
+            SET p.preco_venda = h.preco_novo
+            WHERE p.id > %s AND p.id <= %s
+        """
+        
+        with DatabaseConnection.get_cursor() as cursor:
+            # Trava a faixa: o preço lido para o histórico não muda até o UPDATE
+            cursor.execute("SELECT id FROM produtos WHERE id > %s AND id <= %s FOR UPDATE", (apos_id, ate_id))
+            cursor.fetchall()
+            
+            cursor.execute(sql_historico, tuple(
+                [regra.descricao(), lote, usuario_id] + params_expressao + params_filtro + [apos_id, ate_id]
+            ))
+            alterados = cursor.rowcount
+            if alterados:
+                cursor.execute(sql_produtos, (lote, apos_id, ate_id))
+            return alterados
+    
+    @staticmethod
+    def buscar_historico(produto_id: int, limite: int = 50) -> List[dict]:
+        """Últimas alterações de preço de um produto, da mais recente para a mais antiga."""
+        sql = """
+            SELECT h.*, u.nome_completo as usuario_nome
+            FROM historico_precos h
+            LEFT JOIN usuarios u ON h.usuario_id = u.id
+            WHERE h.produto_id = %s
+            ORDER BY h.data_hora DESC, h.id DESC
+            LIMIT %s
+        """
+        
+        try:
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
+                cursor.execute(sql, (produto_id, limite))
+                return cursor.fetchall()
+        except Exception as e:
+            print(f"Erro ao buscar histórico de preços: {e}")
+            return []
@@ -0,0 +1,258 @@
+"""
+DAO para o resumo diário de vendas por produto (tabela vendas_produtos_diario).
+Agregado por dia × caixa × produto, mantido de forma incremental na
+finalização da venda e no estorno, para que o ranking de produtos, a curva
+ABC e a tendência de cada produto não precisem varrer itens_venda.
+"""
+
+from datetime import date
+from typing import Dict, List
+from src.config.database import DatabaseConnection
+from src.dao.periodo import Periodo
+
+
+class ResumoProdutosDAO:
+    """Data Access Object para o resumo diário de vendas por produto."""
+    
+    # Soma os contadores do agregado em vez de sobrescrevê-los
+    _ACUMULAR = """
+        ON DUPLICATE KEY UPDATE
+            quantidade = quantidade + VALUES(quantidade),
+            valor_total = valor_total + VALUES(valor_total),
+            quantidade_vendas = quantidade_vendas + VALUES(quantidade_vendas),
+            quantidade_estornada = quantidade_estornada + VALUES(quantidade_estornada),
+            valor_estornado = valor_estornado + VALUES(valor_estornado)
+    """
+    
+    # Critérios de ordenação aceitos -> coluna do SELECT
+    ORDENACOES = {
+        'valor': 'valor_total',
+        'quantidade': 'quantidade',
+        'vendas': 'quantidade_vendas'
+    }
+    
+    @staticmethod
+    def _aplicar_venda(venda_id: int, sinal: int, cursor) -> None:
+        """
+        Soma (sinal=1) ou retira (sinal=-1) os itens de uma venda do resumo do seu dia.
+        
+        Itens repetidos do mesmo produto contam uma única venda. Ao retirar,
+        quantidade e valor passam para quantidade_estornada/valor_estornado
+        da mesma linha.
+        """
+        estorno = 1 if sinal < 0 else 0
+        
+        sql = """
+            INSERT INTO vendas_produtos_diario (
+                data, caixa_id, produto_id, quantidade, valor_total,
+                quantidade_vendas, quantidade_estornada, valor_estornado
+            )
+            SELECT
+                DATE(v.data_hora),
+                COALESCE(v.caixa_id, 0),
+                iv.produto_id,
+                %s * SUM(iv.quantidade),
+                %s * SUM(iv.subtotal),
+                %s,
+                %s * SUM(iv.quantidade),
+                %s * SUM(iv.subtotal)
+            FROM vendas v
+            JOIN itens_venda iv ON iv.venda_id = v.id
+            WHERE v.id = %s
+            GROUP BY DATE(v.data_hora), COALESCE(v.caixa_id, 0), iv.produto_id
+        """ + ResumoProdutosDAO._ACUMULAR
+        
+        cursor.execute(sql, (sinal, sinal, sinal, estorno, estorno, venda_id))
+    
+    @staticmethod
+    def registrar_venda(venda_id: int, cursor) -> None:
+        """
+        Soma os itens de uma venda finalizada ao resumo do dia.
+        
+        Args:
+            venda_id: ID da venda (itens já gravados)
+            cursor: Cursor da transação que grava a venda
+        """
+        ResumoProdutosDAO._aplicar_venda(venda_id, 1, cursor)
+    
+    @staticmethod
+    def registrar_estorno(venda_id: int, cursor) -> None:
+        """
+        Retira os itens de uma venda estornada do resumo do dia em que foi feita.
+        
+        Args:
+            venda_id: ID da venda estornada
+            cursor: Cursor da transação que grava o estorno
+        """
+        ResumoProdutosDAO._aplicar_venda(venda_id, -1, cursor)
+    
+    @staticmethod
+    def reconstruir(data_inicio: date = None, data_fim: date = None) -> int:
+        """
+        Recalcula o resumo a partir de vendas/itens_venda.
+        
+        Usado para carga inicial (backfill) ou correção. Sem datas, recalcula
+        todo o histórico.
+        
+        Args:
+            data_inicio: Primeiro dia a recalcular
+            data_fim: Último dia a recalcular
+        
+        Returns:
+            Número de linhas geradas no resumo (-1 em caso de erro)
+        """
+        if data_inicio:
+            filtro_resumo = "data BETWEEN %s AND %s"
+            params_resumo = [data_inicio, data_fim or data_inicio]
+            filtro_vendas, params_vendas = Periodo.filtro("v.data_hora", data_inicio, data_fim)
+        else:
+            filtro_resumo, params_resumo = "1 = 1", []
+            filtro_vendas, params_vendas = "1 = 1", []
+        
+        sql_limpar = f"DELETE FROM vendas_produtos_diario WHERE {filtro_resumo}"
+        
+        sql_recalcular = f"""
+            INSERT INTO vendas_produtos_diario (
+                data, caixa_id, produto_id, quantidade, valor_total,
+                quantidade_vendas, quantidade_estornada, valor_estornado
+            )
+            SELECT
+                DATE(v.data_hora),
+                COALESCE(v.caixa_id, 0),
+                iv.produto_id,
+                SUM(IF(v.status = 'finalizada', iv.quantidade, 0)),
+                SUM(IF(v.status = 'finalizada', iv.subtotal, 0)),
+                COUNT(DISTINCT IF(v.status = 'finalizada', v.id, NULL)),
+                SUM(IF(v.status = 'cancelada', iv.quantidade, 0)),
+                SUM(IF(v.status = 'cancelada', iv.subtotal, 0))
+            FROM vendas v
+            JOIN itens_venda iv ON iv.venda_id = v.id
+            WHERE v.status IN ('finalizada', 'cancelada') AND {filtro_vendas}
+            GROUP BY DATE(v.data_hora), COALESCE(v.caixa_id, 0), iv.produto_id
+        """
+        
+        try:
+            with DatabaseConnection.get_cursor() as cursor:
+                cursor.execute(sql_limpar, tuple(params_resumo))
+                cursor.execute(sql_recalcular, tuple(params_vendas))
+                return cursor.rowcount
+        except Exception as e:
+            print(f"Erro ao reconstruir resumo de produtos: {e}")
+            return -1
+    
+    @staticmethod
+    def ranking(data_inicio: date, data_fim: date = None, categoria_id: int = None,
+                caixa_id: int = None, ordenar_por: str = 'valor', limite: int = None) -> List[Dict]:
+        """
+        Totais de cada produto vendido no período, do maior para o menor.
+        
+        Args:
+            data_inicio: Primeiro dia
+            data_fim: Último dia (usa data_inicio se None)
+            categoria_id: Filtra pela categoria atual do produto
+            caixa_id: Filtra por caixa
+            ordenar_por: 'valor', 'quantidade' ou 'vendas'
+            limite: Máximo de produtos (todos se None)
+        
+        Returns:
+            Lista de dicts com produto_id, codigo_barras, nome, categoria_nome,
+            quantidade, valor_total e quantidade_vendas
+        """
+        coluna = ResumoProdutosDAO.ORDENACOES.get(ordenar_por)
+        if coluna is None:
+            raise ValueError(f"Ordenação inválida: {ordenar_por}")
+        
+        sql = """
+            SELECT
+                r.produto_id,
+                p.codigo_barras,
+                p.nome,
+                c.nome as categoria_nome,
+                SUM(r.quantidade) as quantidade,
+                SUM(r.valor_total) as valor_total,
+                SUM(r.quantidade_vendas) as quantidade_vendas
+            FROM vendas_produtos_diario r
+            JOIN produtos p ON p.id = r.produto_id
+            LEFT JOIN categorias c ON c.id = p.categoria_id
+            WHERE r.data BETWEEN %s AND %s
+        """
+        params = [data_inicio, data_fim or data_inicio]
+        
+        if caixa_id:
+            sql += " AND r.caixa_id = %s"
+            params.append(caixa_id)
+        
+        if categoria_id:
+            sql += " AND p.categoria_id = %s"
+            params.append(categoria_id)
+        
+        sql += f"""
+            GROUP BY r.produto_id, p.codigo_barras, p.nome, c.nome
+            HAVING SUM(r.quantidade_vendas) > 0
+            ORDER BY {coluna} DESC, r.produto_id
+        """
+        
+        if limite:
+            sql += " LIMIT %s"
+            params.append(limite)
+        
+        try:
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
+                cursor.execute(sql, tuple(params))
+                return [{
+                    'produto_id': row['produto_id'],
+                    'codigo_barras': row['codigo_barras'],
+                    'nome': row['nome'],
+                    'categoria_nome': row['categoria_nome'],
+                    'quantidade': float(row['quantidade']),
+                    'valor_total': float(row['valor_total']),
+                    'quantidade_vendas': int(row['quantidade_vendas'])
+                } for row in cursor.fetchall()]
+        except Exception as e:
+            print(f"Erro ao obter ranking de produtos: {e}")
+            return []
+    
+    @staticmethod
+    def por_dia(produto_id: int, data_inicio: date, data_fim: date = None, caixa_id: int = None) -> List[Dict]:
+        """
+        Totais diários de um produto no período (só os dias com movimento).
+        
+        Args:
+            produto_id: ID do produto
+            data_inicio: Primeiro dia
+            data_fim: Último dia (usa data_inicio se None)
+            caixa_id: Filtra por caixa
+        
+        Returns:
+            Lista de dicts com data, quantidade, valor_total e
+            quantidade_vendas, em ordem de data
+        """
+        sql = """
+            SELECT
+                data,
+                SUM(quantidade) as quantidade,
+                SUM(valor_total) as valor_total,
+                SUM(quantidade_vendas) as quantidade_vendas
+            FROM vendas_produtos_diario
+            WHERE produto_id = %s AND data BETWEEN %s AND %s
+        """
+        params = [produto_id, data_inicio, data_fim or data_inicio]
+        
+        if caixa_id:
+            sql += " AND caixa_id = %s"
+            params.append(caixa_id)
+        
+        sql += " GROUP BY data ORDER BY data"
+        
+        try:
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
+                cursor.execute(sql, tuple(params))
+                return [{
+                    'data': row['data'],
+                    'quantidade': float(row['quantidade']),
+                    'valor_total': float(row['valor_total']),
+                    'quantidade_vendas': int(row['quantidade_vendas'])
+                } for row in cursor.fetchall()]
+        except Exception as e:
+            print(f"Erro ao obter vendas diárias do produto: {e}")
+            return []
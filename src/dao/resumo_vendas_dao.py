@@ -0,0 +1,236 @@
+"""
+DAO para o resumo diário de vendas (tabela vendas_resumo_diario).
+Agregado por dia × caixa × forma de pagamento, mantido de forma incremental
+na finalização da venda e no estorno, para que dashboards e relatórios não
+precisem varrer vendas/pagamentos.
+"""
+
+from datetime import date
+from src.config.database import DatabaseConnection
+from src.dao.periodo import Periodo
+
+
+class ResumoVendasDAO:
+    """Data Access Object para o resumo diário de vendas."""
+    
+    # Soma os contadores do agregado em vez de sobrescrevê-los
+    _ACUMULAR = """
+        ON DUPLICATE KEY UPDATE
+            quantidade_vendas = quantidade_vendas + VALUES(quantidade_vendas),
+            quantidade_pagamentos = quantidade_pagamentos + VALUES(quantidade_pagamentos),
+            valor_total = valor_total + VALUES(valor_total),
+            quantidade_estornos = quantidade_estornos + VALUES(quantidade_estornos),
+            valor_estornado = valor_estornado + VALUES(valor_estornado)
+    """
+    
+    @staticmethod
+    def _aplicar_venda(venda_id: int, sinal: int, cursor) -> None:
+        """
+        Soma (sinal=1) ou retira (sinal=-1) uma venda do resumo do seu dia.
+        
+        A venda é contada na forma do primeiro pagamento aprovado (um cartão
+        recusado antes do pagamento final não conta); os valores são
+        somados na forma de cada pagamento aprovado. Ao retirar, os valores
+        passam para quantidade_estornos/valor_estornado da mesma linha.
+        """
+        estorno = 1 if sinal < 0 else 0
+        
+        sql = """
+            INSERT INTO vendas_resumo_diario (
+                data, caixa_id, forma_pagamento, quantidade_vendas,
+                quantidade_pagamentos, valor_total, quantidade_estornos, valor_estornado
+            )
+            SELECT
+                DATE(v.data_hora),
+                COALESCE(v.caixa_id, 0),
+                p.forma_pagamento,
+                %s * SUM(p.id = pp.primeiro),
+                %s * COUNT(*),
+                %s * SUM(p.valor),
+                %s * SUM(p.id = pp.primeiro),
+                %s * SUM(p.valor)
+            FROM vendas v
+            JOIN pagamentos p ON p.venda_id = v.id AND p.status = 'aprovado'
+            JOIN (
+                SELECT MIN(id) AS primeiro FROM pagamentos WHERE venda_id = %s AND status = 'aprovado'
+            ) pp
+            WHERE v.id = %s
+            GROUP BY DATE(v.data_hora), COALESCE(v.caixa_id, 0), p.forma_pagamento
+        """ + ResumoVendasDAO._ACUMULAR
+        
+        cursor.execute(sql, (sinal, sinal, sinal, estorno, estorno, venda_id, venda_id))
+    
+    @staticmethod
+    def registrar_venda(venda_id: int, cursor) -> None:
+        """
+        Soma uma venda finalizada ao resumo do dia.
+        
+        Args:
+            venda_id: ID da venda (itens e pagamentos já gravados)
+            cursor: Cursor da transação que grava a venda
+        """
+        ResumoVendasDAO._aplicar_venda(venda_id, 1, cursor)
+    
+    @staticmethod
+    def registrar_estorno(venda_id: int, cursor) -> None:
+        """
+        Retira uma venda estornada do resumo do dia em que foi feita.
+        
+        Args:
+            venda_id: ID da venda estornada
+            cursor: Cursor da transação que grava o estorno
+        """
+        ResumoVendasDAO._aplicar_venda(venda_id, -1, cursor)
+    
+    @staticmethod
+    def reconstruir(data_inicio: date = None, data_fim: date = None, cursor=None) -> int:
+        """
+        Recalcula o resumo a partir de vendas/pagamentos/estornos.
+        
+        Usado para carga inicial (backfill) ou correção. Sem datas, recalcula
+        todo o histórico.
+        
+        Args:
+            data_inicio: Primeiro dia a recalcular
+            data_fim: Último dia a recalcular
+            cursor: Cursor de uma transação já aberta (quem chama confirma)
+        
+        Returns:
+            Número de linhas geradas no resumo (-1 em caso de erro)
+        """
+        if data_inicio:
+            filtro_resumo = "data BETWEEN %s AND %s"
+            params_resumo = [data_inicio, data_fim or data_inicio]
+            filtro_vendas, params_vendas = Periodo.filtro("v.data_hora", data_inicio, data_fim)
+        else:
+            filtro_resumo, params_resumo = "1 = 1", []
+            filtro_vendas, params_vendas = "1 = 1", []
+        
+        sql_limpar = f"DELETE FROM vendas_resumo_diario WHERE {filtro_resumo}"
+        
+        sql_recalcular = f"""
+            INSERT INTO vendas_resumo_diario (
+                data, caixa_id, forma_pagamento, quantidade_vendas,
+                quantidade_pagamentos, valor_total, quantidade_estornos, valor_estornado
+            )
+            SELECT
+                DATE(v.data_hora),
+                COALESCE(v.caixa_id, 0),
+                p.forma_pagamento,
+                SUM(v.status = 'finalizada' AND p.id = pp.primeiro),
+                SUM(v.status = 'finalizada'),
+                SUM(IF(v.status = 'finalizada', p.valor, 0)),
+                SUM(v.status = 'cancelada' AND p.id = pp.primeiro),
+                SUM(IF(v.status = 'cancelada', p.valor, 0))
+            FROM vendas v
+            JOIN pagamentos p ON p.venda_id = v.id AND p.status = 'aprovado'
+            JOIN (
+                SELECT venda_id, MIN(id) AS primeiro FROM pagamentos
+                WHERE status = 'aprovado' GROUP BY venda_id
+            ) pp ON pp.venda_id = v.id
+            WHERE v.status IN ('finalizada', 'cancelada') AND {filtro_vendas}
+            GROUP BY DATE(v.data_hora), COALESCE(v.caixa_id, 0), p.forma_pagamento
+        """
+        
+        def recalcular(cursor):
+            cursor.execute(sql_limpar, tuple(params_resumo))
+            cursor.execute(sql_recalcular, tuple(params_vendas))
+            return cursor.rowcount
+        
+        try:
+            if cursor is not None:
+                return recalcular(cursor)
+            with DatabaseConnection.get_cursor() as cursor:
+                return recalcular(cursor)
+        except Exception as e:
+            print(f"Erro ao reconstruir resumo de vendas: {e}")
+            return -1
+    
+    @staticmethod
+    def obter_totais(data_inicio: date = None, data_fim: date = None, caixa_id: int = None) -> dict:
+        """
+        Obtém os totais de vendas finalizadas de um período.
+        
+        Args:
+            data_inicio: Primeiro dia (usa hoje se None)
+            data_fim: Último dia (usa data_inicio se None)
+            caixa_id: Filtra por caixa
+        
+        Returns:
+            dict com total, quantidade, valor_estornado e quantidade_estornos
+        """
+        if data_inicio is None:
+            data_inicio = date.today()
+        
+        sql = """
+            SELECT
+                COALESCE(SUM(valor_total), 0) as total,
+                COALESCE(SUM(quantidade_vendas), 0) as quantidade,
+                COALESCE(SUM(valor_estornado), 0) as valor_estornado,
+                COALESCE(SUM(quantidade_estornos), 0) as quantidade_estornos
+            FROM vendas_resumo_diario
+            WHERE data BETWEEN %s AND %s
+        """
+        params = [data_inicio, data_fim or data_inicio]
+        
+        if caixa_id:
+            sql += " AND caixa_id = %s"
+            params.append(caixa_id)
+        
+        try:
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
+                cursor.execute(sql, tuple(params))
+                row = cursor.fetchone()
+                
+                return {
+                    'total': float(row['total']),
+                    'quantidade': int(row['quantidade']),
+                    'valor_estornado': float(row['valor_estornado']),
+                    'quantidade_estornos': int(row['quantidade_estornos'])
+                }
+        except Exception as e:
+            print(f"Erro ao obter totais do resumo de vendas: {e}")
+            return {'total': 0.0, 'quantidade': 0, 'valor_estornado': 0.0, 'quantidade_estornos': 0}
+    
+    @staticmethod
+    def obter_totais_por_forma_pagamento(data_inicio: date = None, data_fim: date = None) -> dict:
+        """
+        Obtém o total por forma de pagamento de um período.
+        
+        Args:
+            data_inicio: Primeiro dia (usa hoje se None)
+            data_fim: Último dia (usa data_inicio se None)
+        
+        Returns:
+            dict {forma_pagamento: {'total', 'quantidade'}} (quantidade = pagamentos)
+        """
+        if data_inicio is None:
+            data_inicio = date.today()
+        
+        sql = """
+            SELECT
+                forma_pagamento,
+                SUM(valor_total) as total,
+                SUM(quantidade_pagamentos) as quantidade
+            FROM vendas_resumo_diario
+            WHERE data BETWEEN %s AND %s
+            GROUP BY forma_pagamento
+            HAVING SUM(quantidade_pagamentos) > 0
+        """
+        
+        try:
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
+                cursor.execute(sql, (data_inicio, data_fim or data_inicio))
+                rows = cursor.fetchall()
+                
+                resultado = {}
+                for row in rows:
+                    resultado[row['forma_pagamento']] = {
+                        'total': float(row['total']),
+                        'quantidade': int(row['quantidade'])
+                    }
+                
+                return resultado
+        except Exception as e:
+            print(f"Erro ao obter total por forma de pagamento: {e}")
+            return {}
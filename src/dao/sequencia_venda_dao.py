@@ -0,0 +1,41 @@
+"""
+DAO da tabela sequencias_venda: reserva de blocos de números de venda por caixa.
+"""
+
+from src.config.database import DatabaseConnection
+
+
+class SequenciaVendaDAO:
+    """Data Access Object para a tabela sequencias_venda."""
+    
+    @staticmethod
+    def reservar_bloco(caixa_id: int, tamanho: int) -> int:
+        """
+        Reserva os próximos `tamanho` números de venda do caixa.
+        
+        Um único comando cria a linha do caixa (primeiro bloco) ou avança o
+        contador; a trava da linha garante que dois processos nunca recebam
+        o mesmo bloco. LAST_INSERT_ID(expr) devolve o novo valor na mesma
+        conexão, sem precisar de SELECT ... FOR UPDATE.
+        
+        Args:
+            caixa_id: ID do caixa (0 para vendas sem caixa)
+            tamanho: Quantidade de números do bloco
+        
+        Returns:
+            Primeiro número do bloco; o bloco vai até inicio + tamanho - 1
+        
+        Raises:
+            Error: Se o banco estiver indisponível
+        """
+        sql = """
+            INSERT INTO sequencias_venda (caixa_id, proximo)
+            VALUES (%s, LAST_INSERT_ID(1 + %s))
+            ON DUPLICATE KEY UPDATE proximo = LAST_INSERT_ID(proximo + %s)
+        """
+        
+        with DatabaseConnection.get_cursor(dictionary=False) as cursor:
+            cursor.execute(sql, (caixa_id, tamanho, tamanho))
+            cursor.execute("SELECT LAST_INSERT_ID()")
+            proximo = cursor.fetchone()[0]
+            return int(proximo) - tamanho
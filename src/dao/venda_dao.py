@@ -2,10 +2,17 @@
 DAO para operações com Vendas no banco de dados.
 """
 
-from typing import List, Optional
-from datetime import datetime, date
+from typing import Dict, Iterator, List, Optional, Tuple
+from datetime import date
 from src.config.database import DatabaseConnection
 from src.models.venda import Venda, ItemVenda
+from src.models.pagamento import Pagamento
+from src.dao.pagamento_dao import PagamentoDAO
+from src.dao.estoque_dao import EstoqueDAO, EstoqueInsuficienteError
+from src.dao.lotes import Lotes
+from src.dao.periodo import Periodo
+from src.dao.resumo_vendas_dao import ResumoVendasDAO
+from src.dao.resumo_produtos_dao import ResumoProdutosDAO
 
 
 class VendaDAO:
@@ -39,8 +46,158 @@ class VendaDAO:
             return None
     
     @staticmethod
-    def buscar_por_id(id: int) -> Optional[Venda]:
-        """Busca uma venda por ID."""
+    def registrar_venda_completa(venda: Venda, pagamentos: List[Pagamento]) -> Optional[int]:
+        """
+        Grava a venda, seus itens e pagamentos em uma única transação.
+        
+        Usa uma só conexão do pool: um INSERT para a venda (já com o
+        status final), um INSERT multi-linha para os itens e outro para
+        os pagamentos, seguidos da baixa de estoque em lote e da
+        atualização do resumo diário. Em caso de erro nada é gravado.
+        
+        Args:
+            venda: Venda com itens preenchidos
+            pagamentos: Pagamentos da venda
+            
+        Returns:
+            ID da venda criada ou None em caso de erro
+            
+        Raises:
+            EstoqueInsuficienteError: Se algum item não tiver saldo
+        """
+        try:
+            with DatabaseConnection.get_cursor() as cursor:
+                return VendaDAO._gravar_venda_completa(venda, pagamentos, cursor)
+        except EstoqueInsuficienteError:
+            raise
+        except Exception as e:
+            print(f"Erro ao registrar venda completa: {e}")
+            return None
+    
+    # Erros do MySQL que passam sozinhos (espera por trava, deadlock): o lote é repetido depois
+    ERROS_TRANSITORIOS = (1205, 1213)
+    
+    @staticmethod
+    def replicar_lote(registros: List[Tuple[Venda, List[Pagamento]]]) -> Tuple[List[str], Dict[str, str], Dict[str, List[str]]]:
+        """
+        Grava no MySQL um lote de vendas vindas do diário local do caixa.
+        
+        Todo o lote usa uma conexão e uma transação; cada venda fica em um
+        SAVEPOINT próprio, de modo que uma venda com erro não impede as
+        demais. A chave de idempotência torna a operação segura para
+        repetir: vendas que já existem são apenas confirmadas.
+        
+        As vendas já aconteceram no caixa, então a baixa de estoque é
+        aplicada mesmo que o saldo fique negativo; os produtos que ficarem
+        negativos são devolvidos para serem sinalizados.
+        
+        Args:
+            registros: Lista de (venda com chave_idempotencia, pagamentos)
+            
+        Returns:
+            Tupla (chaves gravadas ou já existentes, {chave: erro} das vendas
+            recusadas pelo banco, {numero_venda: produtos com estoque negativo})
+        
+        Raises:
+            Error: Se a conexão ou o commit falharem, ou em espera por trava /
+                deadlock (nada do lote foi confirmado; repetir depois)
+        """
+        gravadas: List[str] = []
+        falhas: Dict[str, str] = {}
+        estoque_negativo: Dict[str, List[str]] = {}
+        
+        if not registros:
+            return gravadas, falhas, estoque_negativo
+        
+        chaves = [venda.chave_idempotencia for venda, _ in registros]
+        placeholders = ", ".join(["%s"] * len(chaves))
+        sql_existentes = f"SELECT chave_idempotencia FROM vendas WHERE chave_idempotencia IN ({placeholders})"
+        
+        with DatabaseConnection.get_cursor() as cursor:
+            cursor.execute(sql_existentes, tuple(chaves))
+            existentes = {row['chave_idempotencia'] for row in cursor.fetchall()}
+            
+            for venda, pagamentos in registros:
+                chave = venda.chave_idempotencia
+                if chave in existentes:
+                    gravadas.append(chave)
+                    continue
+                
+                cursor.execute("SAVEPOINT venda_replicada")
+                try:
+                    VendaDAO._gravar_venda_completa(
+                        venda, pagamentos, cursor, permitir_estoque_negativo=True
+                    )
+                    negativos = EstoqueDAO.produtos_negativos(venda.itens, cursor)
+                    cursor.execute("RELEASE SAVEPOINT venda_replicada")
+                except Exception as e:
+                    if getattr(e, 'errno', None) in VendaDAO.ERROS_TRANSITORIOS:
+                        raise
+                    # A conexão segue válida: o erro é da própria venda (chave estrangeira, número repetido...)
+                    cursor.execute("ROLLBACK TO SAVEPOINT venda_replicada")
+                    falhas[chave] = str(e)
+                    continue
+                
+                gravadas.append(chave)
+                if negativos:
+                    estoque_negativo[venda.numero_venda] = negativos
+        
+        return gravadas, falhas, estoque_negativo
+    
+    @staticmethod
+    def _gravar_venda_completa(venda: Venda, pagamentos: List[Pagamento], cursor,
+                               permitir_estoque_negativo: bool = False) -> int:
+        """Grava venda, itens, pagamentos, estoque e resumo no cursor informado."""
+        sql = """
+            INSERT INTO vendas (
+                numero_venda, usuario_id, caixa_id, data_hora, subtotal,
+                desconto, total, status, observacoes, chave_idempotencia
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """
+        
+        cursor.execute(sql, (
+            venda.numero_venda,
+            venda.usuario_id,
+            venda.caixa_id,
+            venda.data_hora,
+            venda.subtotal,
+            venda.desconto,
+            venda.total,
+            venda.status,
+            venda.observacoes,
+            venda.chave_idempotencia
+        ))
+        venda_id = cursor.lastrowid
+        
+        for item in venda.itens:
+            item.venda_id = venda_id
+        for pagamento in pagamentos:
+            pagamento.venda_id = venda_id
+        
+        ItemVendaDAO.criar_em_lote(venda.itens, cursor)
+        PagamentoDAO.criar_em_lote(pagamentos, cursor)
+        EstoqueDAO.baixar_estoque(
+            venda.itens,
+            venda.usuario_id,
+            f"Venda #{venda.numero_venda}",
+            cursor,
+            permitir_negativo=permitir_estoque_negativo
+        )
+        ResumoVendasDAO.registrar_venda(venda_id, cursor)
+        ResumoProdutosDAO.registrar_venda(venda_id, cursor)
+        
+        return venda_id
+    
+    @staticmethod
+    def buscar_por_id(id: int, include_itens: bool = True, include_pagamentos: bool = False) -> Optional[Venda]:
+        """
+        Busca uma venda por ID.
+        
+        Args:
+            id: ID da venda
+            include_itens: Carrega os itens (na mesma conexão)
+            include_pagamentos: Carrega os pagamentos (na mesma conexão)
+        """
         sql = """
             SELECT v.*, u.nome_completo as usuario_nome
             FROM vendas v
@@ -55,7 +212,7 @@ class VendaDAO:
                 
                 if row:
                     venda = Venda.from_dict(row)
-                    venda.itens = ItemVendaDAO.buscar_por_venda(venda.id)
+                    VendaDAO._carregar_relacionados([venda], include_itens, include_pagamentos, cursor)
                     return venda
                 return None
         except Exception as e:
@@ -63,8 +220,16 @@ class VendaDAO:
             return None
     
     @staticmethod
-    def buscar_por_numero(numero_venda: str) -> Optional[Venda]:
-        """Busca uma venda por número."""
+    def buscar_por_numero(numero_venda: str, include_itens: bool = True,
+                          include_pagamentos: bool = False) -> Optional[Venda]:
+        """
+        Busca uma venda por número.
+        
+        Args:
+            numero_venda: Número da venda
+            include_itens: Carrega os itens (na mesma conexão)
+            include_pagamentos: Carrega os pagamentos (na mesma conexão)
+        """
         sql = """
             SELECT v.*, u.nome_completo as usuario_nome
             FROM vendas v
@@ -79,7 +244,7 @@ class VendaDAO:
                 
                 if row:
                     venda = Venda.from_dict(row)
-                    venda.itens = ItemVendaDAO.buscar_por_venda(venda.id)
+                    VendaDAO._carregar_relacionados([venda], include_itens, include_pagamentos, cursor)
                     return venda
                 return None
         except Exception as e:
@@ -87,36 +252,110 @@ class VendaDAO:
             return None
     
     @staticmethod
-    def buscar_por_periodo(data_inicio: date, data_fim: date, status: str = None) -> List[Venda]:
-        """Busca vendas por período."""
-        sql = """
+    def buscar_por_periodo(data_inicio: date, data_fim: date, status: str = None,
+                           include_itens: bool = False, include_pagamentos: bool = False,
+                           limite: int = None) -> List[Venda]:
+        """
+        Busca vendas por período.
+        
+        Args:
+            data_inicio: Primeiro dia do período
+            data_fim: Último dia do período
+            status: Filtra pelo status da venda
+            include_itens: Carrega os itens de todas as vendas (uma consulta por bloco de vendas)
+            include_pagamentos: Carrega os pagamentos de todas as vendas (idem)
+            limite: Só as N vendas mais recentes (períodos longos: ver percorrer_periodo)
+        """
+        filtro, params = Periodo.filtro("v.data_hora", data_inicio, data_fim)
+        sql = f"""
             SELECT v.*, u.nome_completo as usuario_nome
             FROM vendas v
             LEFT JOIN usuarios u ON v.usuario_id = u.id
-            WHERE DATE(v.data_hora) BETWEEN %s AND %s
+            WHERE {filtro}
         """
         
-        params = [data_inicio, data_fim]
-        
         if status:
             sql += " AND v.status = %s"
             params.append(status)
         
         sql += " ORDER BY v.data_hora DESC"
+        if limite:
+            sql += " LIMIT %s"
+            params.append(limite)
         
         try:
-            with DatabaseConnection.get_cursor() as cursor:
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
                 cursor.execute(sql, tuple(params))
                 rows = cursor.fetchall()
                 
-                return [Venda.from_dict(row) for row in rows]
+                vendas = [Venda.from_dict(row) for row in rows]
+                VendaDAO._carregar_relacionados(vendas, include_itens, include_pagamentos, cursor)
+                return vendas
         except Exception as e:
             print(f"Erro ao buscar vendas por período: {e}")
             return []
     
+    # Colunas devolvidas por percorrer_periodo, nesta ordem
+    CAMPOS_EXPORTACAO = (
+        'numero_venda', 'data_hora', 'usuario_nome', 'caixa_id',
+        'subtotal', 'desconto', 'total', 'status'
+    )
+    
     @staticmethod
-    def buscar_por_caixa(caixa_id: int) -> List[Venda]:
-        """Busca vendas por caixa."""
+    def contar_por_periodo(data_inicio: date, data_fim: date, status: str = None) -> int:
+        """Quantidade de vendas do período (pelo índice de status/data, sem ler as vendas)."""
+        filtro, params = Periodo.filtro("data_hora", data_inicio, data_fim)
+        sql = f"SELECT COUNT(*) as quantidade FROM vendas WHERE {filtro}"
+        if status:
+            sql += " AND status = %s"
+            params.append(status)
+        
+        try:
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
+                cursor.execute(sql, tuple(params))
+                return cursor.fetchone()['quantidade']
+        except Exception as e:
+            print(f"Erro ao contar vendas do período: {e}")
+            return 0
+    
+    @staticmethod
+    def percorrer_periodo(data_inicio: date, data_fim: date, status: str = None,
+                          tamanho_lote: int = 1000) -> Iterator[List[tuple]]:
+        """
+        Percorre as vendas do período em ordem cronológica, em lotes de tuplas.
+        
+        Lê por cursor não bufferizado (DatabaseConnection.consultar_em_fluxo):
+        a memória não cresce com o período. Colunas em CAMPOS_EXPORTACAO.
+        
+        Raises:
+            Error: Se a consulta falhar
+        """
+        filtro, params = Periodo.filtro("v.data_hora", data_inicio, data_fim)
+        sql = f"""
+            SELECT v.numero_venda, v.data_hora, u.nome_completo, v.caixa_id,
+                   v.subtotal, v.desconto, v.total, v.status
+            FROM vendas v
+            LEFT JOIN usuarios u ON v.usuario_id = u.id
+            WHERE {filtro}
+        """
+        if status:
+            sql += " AND v.status = %s"
+            params.append(status)
+        sql += " ORDER BY v.data_hora"
+        
+        return DatabaseConnection.consultar_em_fluxo(sql, tuple(params), tamanho_lote)
+    
+    @staticmethod
+    def buscar_por_caixa(caixa_id: int, include_itens: bool = False,
+                         include_pagamentos: bool = False) -> List[Venda]:
+        """
+        Busca vendas por caixa.
+        
+        Args:
+            caixa_id: ID do caixa
+            include_itens: Carrega os itens de todas as vendas (uma consulta por bloco de vendas)
+            include_pagamentos: Carrega os pagamentos de todas as vendas (idem)
+        """
         sql = """
             SELECT v.*, u.nome_completo as usuario_nome
             FROM vendas v
@@ -126,15 +365,33 @@ class VendaDAO:
         """
         
         try:
-            with DatabaseConnection.get_cursor() as cursor:
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
                 cursor.execute(sql, (caixa_id,))
                 rows = cursor.fetchall()
                 
-                return [Venda.from_dict(row) for row in rows]
+                vendas = [Venda.from_dict(row) for row in rows]
+                VendaDAO._carregar_relacionados(vendas, include_itens, include_pagamentos, cursor)
+                return vendas
         except Exception as e:
             print(f"Erro ao buscar vendas por caixa: {e}")
             return []
     
+    @staticmethod
+    def _carregar_relacionados(vendas: List[Venda], include_itens: bool, include_pagamentos: bool, cursor):
+        """Preenche itens e/ou pagamentos de todas as vendas com consultas em lote no mesmo cursor."""
+        if not vendas:
+            return
+        
+        venda_ids = [venda.id for venda in vendas]
+        if include_itens:
+            itens = ItemVendaDAO.buscar_por_vendas(venda_ids, cursor)
+            for venda in vendas:
+                venda.itens = itens.get(venda.id, [])
+        if include_pagamentos:
+            pagamentos = PagamentoDAO.buscar_por_vendas(venda_ids, cursor)
+            for venda in vendas:
+                venda.pagamentos = pagamentos.get(venda.id, [])
+    
     @staticmethod
     def atualizar(venda: Venda) -> bool:
         """Atualiza uma venda existente."""
@@ -161,10 +418,15 @@ class VendaDAO:
             return False
     
     @staticmethod
-    def gerar_numero_venda() -> str:
-        """Gera um número único para a venda."""
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        return f"V{timestamp}"
+    def buscar_itens_venda(venda_id: int) -> List[ItemVenda]:
+        """Busca os itens de uma venda."""
+        return ItemVendaDAO.buscar_por_venda(venda_id)
+    
+    @staticmethod
+    def gerar_numero_venda(caixa_id: int = None) -> str:
+        """Gera um número único para a venda (sequência do caixa, ver NumeracaoVendas)."""
+        from src.services.numeracao_vendas import numeracao_vendas
+        return numeracao_vendas.proximo_numero(caixa_id)
     
     @staticmethod
     def obter_total_vendas_dia(data: date = None) -> float:
@@ -172,15 +434,16 @@ class VendaDAO:
         if data is None:
             data = date.today()
         
-        sql = """
+        filtro, params = Periodo.filtro("data_hora", data)
+        sql = f"""
             SELECT COALESCE(SUM(total), 0) as total
             FROM vendas
-            WHERE DATE(data_hora) = %s AND status = 'finalizada'
+            WHERE status = 'finalizada' AND {filtro}
         """
         
         try:
-            with DatabaseConnection.get_cursor() as cursor:
-                cursor.execute(sql, (data,))
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
+                cursor.execute(sql, tuple(params))
                 row = cursor.fetchone()
                 return float(row['total']) if row else 0.0
         except Exception as e:
@@ -216,11 +479,52 @@ class ItemVendaDAO:
             print(f"Erro ao criar item de venda: {e}")
             return None
     
+    @staticmethod
+    def criar_em_lote(itens: List[ItemVenda], cursor) -> int:
+        """
+        Insere vários itens com um único INSERT multi-linha.
+        
+        Não abre transação própria: deve ser chamado com o cursor da
+        transação que grava a venda.
+        
+        Args:
+            itens: Itens com venda_id já preenchido
+            cursor: Cursor da transação em andamento
+            
+        Returns:
+            Número de linhas inseridas
+        """
+        if not itens:
+            return 0
+        
+        sql = """
+            INSERT INTO itens_venda (
+                venda_id, produto_id, quantidade, preco_unitario,
+                desconto, subtotal
+            ) VALUES 
+        """ + ", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(itens))
+        
+        params = []
+        for item in itens:
+            params.extend((
+                item.venda_id,
+                item.produto_id,
+                item.quantidade,
+                item.preco_unitario,
+                item.desconto,
+                item.subtotal
+            ))
+        
+        cursor.execute(sql, tuple(params))
+        return cursor.rowcount
+    
     @staticmethod
     def buscar_por_venda(venda_id: int) -> List[ItemVenda]:
         """Busca todos os itens de uma venda."""
+        # Colunas na ordem de ItemVenda.CAMPOS_LINHA (consulta preparada)
         sql = """
-            SELECT iv.*, p.nome as produto_nome, p.codigo_barras as produto_codigo_barras
+            SELECT iv.id, iv.venda_id, iv.produto_id, iv.quantidade, iv.preco_unitario,
+                   iv.desconto, iv.subtotal, p.nome, p.codigo_barras
             FROM itens_venda iv
             JOIN produtos p ON iv.produto_id = p.id
             WHERE iv.venda_id = %s
@@ -228,15 +532,143 @@ class ItemVendaDAO:
         """
         
         try:
-            with DatabaseConnection.get_cursor() as cursor:
-                cursor.execute(sql, (venda_id,))
-                rows = cursor.fetchall()
-                
-                return [ItemVenda.from_dict(row) for row in rows]
+            rows = DatabaseConnection.consultar_preparado(sql, (venda_id,))
+            return [ItemVenda.from_row(row) for row in rows]
         except Exception as e:
             print(f"Erro ao buscar itens da venda: {e}")
             return []
     
+    @staticmethod
+    def buscar_por_vendas(venda_ids: List[int], cursor=None) -> Dict[int, List[ItemVenda]]:
+        """
+        Busca os itens de várias vendas com uma consulta por bloco de IDs.
+        
+        Args:
+            venda_ids: IDs das vendas
+            cursor: Cursor já aberto (reaproveita a conexão de quem chama)
+            
+        Returns:
+            dict venda_id -> itens na ordem de inclusão (vendas sem itens ficam de fora)
+        """
+        itens: Dict[int, List[ItemVenda]] = {}
+        if not venda_ids:
+            return itens
+        
+        def consultar(cursor):
+            for lote in Lotes.dividir(venda_ids):
+                filtro, params = Lotes.filtro("iv.venda_id", lote)
+                # Colunas na ordem de ItemVenda.CAMPOS_LINHA
+                cursor.execute(f"""
+                    SELECT iv.id, iv.venda_id, iv.produto_id, iv.quantidade, iv.preco_unitario,
+                           iv.desconto, iv.subtotal, p.nome, p.codigo_barras
+                    FROM itens_venda iv
+                    JOIN produtos p ON iv.produto_id = p.id
+                    WHERE {filtro}
+                    ORDER BY iv.venda_id, iv.id
+                """, tuple(params))
+                for row in cursor.fetchall():
+                    item = ItemVenda.from_row(tuple(row.values()) if isinstance(row, dict) else row)
+                    itens.setdefault(item.venda_id, []).append(item)
+        
+        try:
+            if cursor is not None:
+                consultar(cursor)
+            else:
+                with DatabaseConnection.get_cursor(dictionary=False, readonly=True) as cursor:
+                    consultar(cursor)
+            return itens
+        except Exception as e:
+            print(f"Erro ao buscar itens das vendas: {e}")
+            return {}
+    
+    # Colunas devolvidas por percorrer_periodo, nesta ordem
+    CAMPOS_EXPORTACAO = (
+        'numero_venda', 'data_hora', 'codigo_barras', 'produto_nome', 'categoria_nome',
+        'quantidade', 'preco_unitario', 'desconto', 'subtotal'
+    )
+    
+    @staticmethod
+    def contar_por_periodo(data_inicio: date, data_fim: date, status: str = None) -> int:
+        """Quantidade de itens vendidos nas vendas do período."""
+        filtro, params = Periodo.filtro("v.data_hora", data_inicio, data_fim)
+        sql = f"""
+            SELECT COUNT(*) as quantidade
+            FROM itens_venda iv
+            JOIN vendas v ON iv.venda_id = v.id
+            WHERE {filtro}
+        """
+        if status:
+            sql += " AND v.status = %s"
+            params.append(status)
+        
+        try:
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
+                cursor.execute(sql, tuple(params))
+                return cursor.fetchone()['quantidade']
+        except Exception as e:
+            print(f"Erro ao contar itens do período: {e}")
+            return 0
+    
+    @staticmethod
+    def percorrer_periodo(data_inicio: date, data_fim: date, status: str = None,
+                          tamanho_lote: int = 1000) -> Iterator[List[tuple]]:
+        """
+        Percorre os itens das vendas do período, em lotes de tuplas, sem carregá-los inteiros.
+        
+        Colunas em CAMPOS_EXPORTACAO.
+        
+        Raises:
+            Error: Se a consulta falhar
+        """
+        filtro, params = Periodo.filtro("v.data_hora", data_inicio, data_fim)
+        sql = f"""
+            SELECT v.numero_venda, v.data_hora, p.codigo_barras, p.nome, c.nome,
+                   iv.quantidade, iv.preco_unitario, iv.desconto, iv.subtotal
+            FROM vendas v
+            JOIN itens_venda iv ON iv.venda_id = v.id
+            JOIN produtos p ON iv.produto_id = p.id
+            LEFT JOIN categorias c ON p.categoria_id = c.id
+            WHERE {filtro}
+        """
+        if status:
+            sql += " AND v.status = %s"
+            params.append(status)
+        sql += " ORDER BY v.data_hora, iv.id"
+        
+        return DatabaseConnection.consultar_em_fluxo(sql, tuple(params), tamanho_lote)
+    
+    @staticmethod
+    def contar_por_vendas(venda_ids: List[int]) -> Dict[int, int]:
+        """
+        Conta os itens de várias vendas com uma consulta agrupada por bloco de IDs.
+        
+        Args:
+            venda_ids: IDs das vendas
+            
+        Returns:
+            dict venda_id -> quantidade de itens (vendas sem itens ficam de fora)
+        """
+        contagem = {}
+        if not venda_ids:
+            return contagem
+        
+        try:
+            with DatabaseConnection.get_cursor(readonly=True) as cursor:
+                for lote in Lotes.dividir(venda_ids):
+                    filtro, params = Lotes.filtro("venda_id", lote)
+                    cursor.execute(f"""
+                        SELECT venda_id, COUNT(*) as total
+                        FROM itens_venda
+                        WHERE {filtro}
+                        GROUP BY venda_id
+                    """, tuple(params))
+                    for row in cursor.fetchall():
+                        contagem[row['venda_id']] = row['total']
+            return contagem
+        except Exception as e:
+            print(f"Erro ao contar itens das vendas: {e}")
+            return {}
+    
     @staticmethod
     def excluir_por_venda(venda_id: int) -> bool:
         """Exclui todos os itens de uma venda."""
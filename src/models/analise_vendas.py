@@ -0,0 +1,57 @@
+"""
+Model para a análise de vendas por produto.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Optional
+
+
+@dataclass
+class FiltroAnalise:
+    """Período e recortes da análise de vendas por produto (critérios combinados com E)."""
+    
+    DIAS_PADRAO = 30
+    # Maior período aceito (a tendência monta um ponto por dia)
+    DIAS_MAXIMO = 730
+    
+    data_inicio: date
+    data_fim: date
+    categoria_id: Optional[int] = None
+    caixa_id: Optional[int] = None
+    
+    def validar(self) -> Optional[str]:
+        """Retorna a mensagem de erro, ou None se o filtro for válido."""
+        if self.data_fim < self.data_inicio:
+            return "A data final deve ser igual ou posterior à data inicial"
+        if (self.data_fim - self.data_inicio).days >= self.DIAS_MAXIMO:
+            return f"O período deve ter no máximo {self.DIAS_MAXIMO} dias"
+        return None
+    
+    @staticmethod
+    def ultimos_dias(dias: int = DIAS_PADRAO) -> 'FiltroAnalise':
+        """Filtro dos últimos `dias` dias, incluindo hoje."""
+        hoje = date.today()
+        return FiltroAnalise(data_inicio=hoje - timedelta(days=dias - 1), data_fim=hoje)
+    
+    @staticmethod
+    def from_dict(data: dict) -> 'FiltroAnalise':
+        """
+        Cria o filtro a partir de um dicionário (API); sem datas, usa os últimos 30 dias.
+        
+        Raises:
+            ValueError: Se as datas não estiverem no formato AAAA-MM-DD
+        """
+        padrao = FiltroAnalise.ultimos_dias()
+        try:
+            inicio = date.fromisoformat(data['data_inicio']) if data.get('data_inicio') else padrao.data_inicio
+            fim = date.fromisoformat(data['data_fim']) if data.get('data_fim') else padrao.data_fim
+        except ValueError:
+            raise ValueError("Datas devem estar no formato AAAA-MM-DD")
+        
+        return FiltroAnalise(
+            data_inicio=inicio,
+            data_fim=fim,
+            categoria_id=int(data['categoria_id']) if data.get('categoria_id') else None,
+            caixa_id=int(data['caixa_id']) if data.get('caixa_id') else None
+        )
@@ -10,6 +10,15 @@ from decimal import Decimal
 class Produto:
     """Representa um produto do sistema."""
     
+    __slots__ = (
+        'id', 'codigo_barras', 'nome', 'descricao', 'categoria_id', 'preco_custo', 'preco_venda',
+        'estoque_atual', 'estoque_minimo', 'unidade_medida', 'ativo', 'data_cadastro',
+        'data_atualizacao', 'categoria_nome'
+    )
+    
+    # Ordem das colunas esperada por from_row (SELECT posicional do caminho rápido)
+    CAMPOS_LINHA = __slots__
+    
     def __init__(
         self,
         id: Optional[int] = None,
@@ -86,6 +95,23 @@ class Produto:
         
         return produto
     
+    @classmethod
+    def from_row(cls, row: tuple) -> 'Produto':
+        """
+        Cria um Produto a partir de uma linha posicional na ordem de CAMPOS_LINHA.
+        
+        Sem conversões: o conector já devolve DECIMAL como Decimal e
+        DATETIME como datetime.
+        """
+        produto = cls.__new__(cls)
+        (
+            produto.id, produto.codigo_barras, produto.nome, produto.descricao, produto.categoria_id,
+            produto.preco_custo, produto.preco_venda, produto.estoque_atual, produto.estoque_minimo,
+            produto.unidade_medida, produto.ativo, produto.data_cadastro, produto.data_atualizacao,
+            produto.categoria_nome
+        ) = row
+        return produto
+    
     def estoque_baixo(self) -> bool:
         """Verifica se o estoque está abaixo do mínimo."""
         return self.estoque_atual <= self.estoque_minimo
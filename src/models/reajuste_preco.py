@@ -0,0 +1,99 @@
+"""
+Model para reajuste de preços em massa.
+"""
+
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import List, Optional
+
+
+@dataclass
+class RegraReajuste:
+    """
+    Como calcular o novo preço de venda.
+    
+    Tipos:
+        percentual: preço atual + valor% (negativo para reduzir)
+        margem: preço de custo + valor% (markup sobre o custo)
+        arredondamento: mantém o preço e só aplica a terminação
+    """
+    
+    TIPO_PERCENTUAL = 'percentual'
+    TIPO_MARGEM = 'margem'
+    TIPO_ARREDONDAMENTO = 'arredondamento'
+    TIPOS = (TIPO_PERCENTUAL, TIPO_MARGEM, TIPO_ARREDONDAMENTO)
+    
+    tipo: str
+    valor: Decimal = Decimal('0')
+    terminacao: Optional[Decimal] = None  # Centavos finais, ex.: Decimal('0.99') para terminar em ,99
+    
+    def validar(self) -> Optional[str]:
+        """Retorna a mensagem de erro, ou None se a regra for válida."""
+        if self.tipo not in self.TIPOS:
+            return f"Tipo de reajuste inválido: {self.tipo}"
+        # NaN e infinito não podem nem ser comparados (InvalidOperation)
+        if not self.valor.is_finite() or (self.terminacao is not None and not self.terminacao.is_finite()):
+            return "Valor ou terminação inválidos"
+        if self.tipo == self.TIPO_PERCENTUAL and self.valor <= Decimal('-100'):
+            return "O percentual de redução deve ser menor que 100%"
+        if self.tipo == self.TIPO_MARGEM and self.valor < 0:
+            return "A margem sobre o custo não pode ser negativa"
+        if self.tipo == self.TIPO_ARREDONDAMENTO and self.terminacao is None:
+            return "Informe a terminação do arredondamento"
+        if self.terminacao is not None and not (Decimal('0') <= self.terminacao < Decimal('1')):
+            return "A terminação deve estar entre 0,00 e 0,99"
+        return None
+    
+    def descricao(self) -> str:
+        """Texto gravado no histórico de preços."""
+        partes = []
+        if self.tipo == self.TIPO_PERCENTUAL:
+            partes.append(f"{self.valor:+}% sobre o preço")
+        elif self.tipo == self.TIPO_MARGEM:
+            partes.append(f"margem de {self.valor}% sobre o custo")
+        if self.terminacao is not None:
+            partes.append(f"terminação {self.terminacao:.2f}".replace('.', ','))
+        return ", ".join(partes)
+    
+    @staticmethod
+    def from_dict(data: dict) -> 'RegraReajuste':
+        """
+        Cria a regra a partir de um dicionário (API).
+        
+        Raises:
+            ValueError: Se valor ou terminação não forem números finitos
+        """
+        try:
+            terminacao = data.get('terminacao')
+            regra = RegraReajuste(
+                tipo=data.get('tipo', ''),
+                valor=Decimal(str(data.get('valor', 0)).replace(',', '.')),
+                terminacao=Decimal(str(terminacao).replace(',', '.')) if terminacao not in (None, '') else None
+            )
+        except InvalidOperation:
+            raise ValueError("Valor ou terminação inválidos")
+        
+        # "NaN" e "Infinity" são aceitos por Decimal
+        if not regra.valor.is_finite() or (regra.terminacao is not None and not regra.terminacao.is_finite()):
+            raise ValueError("Valor ou terminação inválidos")
+        return regra
+
+
+@dataclass
+class FiltroProdutos:
+    """Quais produtos entram no reajuste (critérios combinados com E)."""
+    
+    categoria_id: Optional[int] = None
+    termo: Optional[str] = None  # Parte do nome
+    codigos_barras: List[str] = field(default_factory=list)  # Ex.: códigos da lista de um fornecedor
+    apenas_ativos: bool = True
+    
+    @staticmethod
+    def from_dict(data: dict) -> 'FiltroProdutos':
+        """Cria o filtro a partir de um dicionário (API)."""
+        return FiltroProdutos(
+            categoria_id=data.get('categoria_id'),
+            termo=data.get('termo') or None,
+            codigos_barras=[str(c).strip() for c in data.get('codigos_barras') or [] if str(c).strip()],
+            apenas_ativos=data.get('apenas_ativos', True)
+        )
@@ -25,7 +25,8 @@ class Venda:
         desconto: Decimal = Decimal('0.00'),
         total: Decimal = Decimal('0.00'),
         status: str = STATUS_ABERTA,
-        observacoes: str = ""
+        observacoes: str = "",
+        chave_idempotencia: Optional[str] = None
     ):
         self.id = id
         self.numero_venda = numero_venda
@@ -37,9 +38,11 @@ class Venda:
         self.total = total
         self.status = status
         self.observacoes = observacoes
+        self.chave_idempotencia = chave_idempotencia  # Identifica a venda na replicação do caixa
         
         # Campos auxiliares (não persistidos)
         self.itens: List['ItemVenda'] = []
+        self.pagamentos: list = []  # Preenchido só com include_pagamentos nas buscas do VendaDAO
         self.usuario_nome = None
     
     def to_dict(self) -> dict:
@@ -54,7 +57,8 @@ class Venda:
             'desconto': float(self.desconto) if self.desconto else 0.00,
             'total': float(self.total) if self.total else 0.00,
             'status': self.status,
-            'observacoes': self.observacoes
+            'observacoes': self.observacoes,
+            'chave_idempotencia': self.chave_idempotencia
         }
     
     @classmethod
@@ -70,7 +74,8 @@ class Venda:
             desconto=Decimal(str(data.get('desconto', 0))),
             total=Decimal(str(data.get('total', 0))),
             status=data.get('status', cls.STATUS_ABERTA),
-            observacoes=data.get('observacoes', '')
+            observacoes=data.get('observacoes', ''),
+            chave_idempotencia=data.get('chave_idempotencia')
         )
         
         if 'usuario_nome' in data:
@@ -114,6 +119,14 @@ class Venda:
 class ItemVenda:
     """Representa um item de uma venda."""
     
+    __slots__ = (
+        'id', 'venda_id', 'produto_id', 'quantidade', 'preco_unitario', 'desconto', 'subtotal',
+        'produto_nome', 'produto_codigo_barras'
+    )
+    
+    # Ordem das colunas esperada por from_row (SELECT posicional do caminho rápido)
+    CAMPOS_LINHA = __slots__
+    
     def __init__(
         self,
         id: Optional[int] = None,
@@ -172,6 +185,16 @@ class ItemVenda:
         
         return item
     
+    @classmethod
+    def from_row(cls, row: tuple) -> 'ItemVenda':
+        """Cria um ItemVenda a partir de uma linha posicional na ordem de CAMPOS_LINHA, sem conversões."""
+        item = cls.__new__(cls)
+        (
+            item.id, item.venda_id, item.produto_id, item.quantidade, item.preco_unitario,
+            item.desconto, item.subtotal, item.produto_nome, item.produto_codigo_barras
+        ) = row
+        return item
+    
     def calcular_subtotal(self):
         """Calcula o subtotal do item."""
         self.subtotal = (self.quantidade * self.preco_unitario) - self.desconto
@@ -0,0 +1,133 @@
+"""
+Serviço de análise de vendas por produto.
+
+Ranking dos mais vendidos, curva ABC (Pareto) e tendência diária de um
+produto, todos lidos do resumo vendas_produtos_diario (dia × caixa ×
+produto) em vez de varrer itens_venda. O resumo só conta vendas
+finalizadas; estornos são retirados do dia da venda.
+"""
+
+from datetime import timedelta
+from typing import Dict, List
+
+from src.dao.resumo_produtos_dao import ResumoProdutosDAO
+from src.models.analise_vendas import FiltroAnalise
+
+
+class AnaliseVendasService:
+    """Consultas de desempenho dos produtos em um período."""
+    
+    # Participação acumulada (%) que fecha as classes A e B da curva ABC
+    LIMITE_A = 80
+    LIMITE_B = 95
+    
+    @staticmethod
+    def _validar(filtro: FiltroAnalise) -> None:
+        """Levanta ValueError se o filtro for inválido."""
+        erro = filtro.validar()
+        if erro:
+            raise ValueError(erro)
+    
+    @staticmethod
+    def mais_vendidos(filtro: FiltroAnalise, ordenar_por: str = 'valor', limite: int = 50) -> List[Dict]:
+        """
+        Produtos mais vendidos no período.
+        
+        Args:
+            filtro: Período, categoria e caixa
+            ordenar_por: 'valor', 'quantidade' ou 'vendas'
+            limite: Máximo de produtos
+        
+        Returns:
+            Lista de dicts (ver ResumoProdutosDAO.ranking)
+        
+        Raises:
+            ValueError: Se o filtro ou a ordenação forem inválidos
+        """
+        AnaliseVendasService._validar(filtro)
+        return ResumoProdutosDAO.ranking(
+            filtro.data_inicio, filtro.data_fim, filtro.categoria_id, filtro.caixa_id,
+            ordenar_por=ordenar_por, limite=limite
+        )
+    
+    @staticmethod
+    def curva_abc(filtro: FiltroAnalise, ordenar_por: str = 'valor') -> Dict:
+        """
+        Classifica os produtos vendidos no período pela curva ABC.
+        
+        Em ordem decrescente do critério, o produto é classe A enquanto a
+        participação acumulada antes dele for menor que LIMITE_A, classe B
+        até LIMITE_B e classe C no restante. O primeiro produto é sempre A.
+        
+        Args:
+            filtro: Período, categoria e caixa
+            ordenar_por: Critério da curva: 'valor', 'quantidade' ou 'vendas'
+        
+        Returns:
+            dict com itens (ranking completo com participacao, acumulado e
+            classe), total (soma do critério) e classes ({'A': {'produtos',
+            'total', 'participacao'}, ...})
+        
+        Raises:
+            ValueError: Se o filtro ou a ordenação forem inválidos
+        """
+        AnaliseVendasService._validar(filtro)
+        itens = ResumoProdutosDAO.ranking(
+            filtro.data_inicio, filtro.data_fim, filtro.categoria_id, filtro.caixa_id,
+            ordenar_por=ordenar_por
+        )
+        
+        coluna = ResumoProdutosDAO.ORDENACOES[ordenar_por]
+        total = sum(item[coluna] for item in itens)
+        classes = {classe: {'produtos': 0, 'total': 0.0, 'participacao': 0.0} for classe in "ABC"}
+        
+        acumulado = 0.0
+        for item in itens:
+            if acumulado < AnaliseVendasService.LIMITE_A:
+                classe = 'A'
+            elif acumulado < AnaliseVendasService.LIMITE_B:
+                classe = 'B'
+            else:
+                classe = 'C'
+            
+            participacao = item[coluna] / total * 100 if total else 0.0
+            acumulado += participacao
+            
+            item['participacao'] = participacao
+            item['acumulado'] = acumulado
+            item['classe'] = classe
+            
+            classes[classe]['produtos'] += 1
+            classes[classe]['total'] += item[coluna]
+            classes[classe]['participacao'] += participacao
+        
+        return {'itens': itens, 'total': total, 'classes': classes}
+    
+    @staticmethod
+    def tendencia(produto_id: int, filtro: FiltroAnalise) -> List[Dict]:
+        """
+        Vendas diárias de um produto no período, com zeros nos dias sem venda.
+        
+        Args:
+            produto_id: ID do produto
+            filtro: Período e caixa (a categoria não se aplica)
+        
+        Returns:
+            Lista de dicts com data, quantidade, valor_total e
+            quantidade_vendas, um por dia do período
+        
+        Raises:
+            ValueError: Se o filtro for inválido
+        """
+        AnaliseVendasService._validar(filtro)
+        dias = {
+            linha['data']: linha
+            for linha in ResumoProdutosDAO.por_dia(produto_id, filtro.data_inicio, filtro.data_fim, filtro.caixa_id)
+        }
+        
+        serie = []
+        dia = filtro.data_inicio
+        while dia <= filtro.data_fim:
+            serie.append(dias.get(dia) or {'data': dia, 'quantidade': 0.0, 'valor_total': 0.0, 'quantidade_vendas': 0})
+            dia += timedelta(days=1)
+        return serie
@@ -0,0 +1,469 @@
+"""
+Importação e exportação do catálogo de produtos em CSV e XLSX.
+
+A planilha é lida em streaming (linha a linha) e gravada em lotes com
+ProdutoDAO.salvar_em_lote, que faz INSERT ... ON DUPLICATE KEY UPDATE pelo
+código de barras: produtos novos são criados e os existentes atualizados,
+sem uma conexão/commit por produto. Linhas inválidas não interrompem a
+importação; ficam na lista de erros com o número da linha. Células vazias
+não alteram os produtos existentes, e as mudanças de estoque_atual entram
+no histórico de movimentações como ajuste. Categorias novas são criadas na
+mesma transação do lote que as usa: lote desfeito não deixa categoria órfã.
+"""
+
+import csv
+import threading
+import unicodedata
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.config.database import DatabaseConnection
+from src.dao.categoria_dao import CategoriaDAO
+from src.dao.produto_dao import ProdutoDAO
+from src.models.categoria import Categoria
+from src.models.produto import Produto
+from src.utils.formatters import Formatters
+from src.utils.logger import Logger
+from src.utils.validators import Validators
+
+
+# Recebe (linhas processadas, total de linhas ou None se desconhecido)
+Progresso = Callable[[int, Optional[int]], None]
+
+
+@dataclass
+class ResultadoImportacao:
+    """Resumo de uma importação de catálogo."""
+    
+    linhas: int = 0
+    validas: int = 0
+    inseridos: int = 0
+    atualizados: int = 0
+    erros: List[Tuple[int, str, str]] = field(default_factory=list)  # (linha, código, mensagem)
+    cancelado: bool = False
+    
+    @property
+    def gravados(self) -> int:
+        return self.inseridos + self.atualizados
+
+
+class CatalogoService:
+    """Importa e exporta o catálogo de produtos em planilhas."""
+    
+    # Colunas da planilha, na ordem da exportação
+    COLUNAS = [
+        'codigo_barras', 'nome', 'descricao', 'categoria', 'preco_custo', 'preco_venda',
+        'estoque_atual', 'estoque_minimo', 'unidade_medida', 'ativo'
+    ]
+    
+    # Cabeçalhos alternativos comuns nas listas de fornecedores (sem acento, minúsculos)
+    APELIDOS = {
+        'codigo': 'codigo_barras', 'codigo de barras': 'codigo_barras', 'ean': 'codigo_barras', 'gtin': 'codigo_barras',
+        'produto': 'nome', 'descricao do produto': 'nome',
+        'custo': 'preco_custo', 'preco de custo': 'preco_custo',
+        'preco': 'preco_venda', 'preco de venda': 'preco_venda', 'valor': 'preco_venda',
+        'estoque': 'estoque_atual', 'minimo': 'estoque_minimo', 'estoque minimo': 'estoque_minimo',
+        'unidade': 'unidade_medida', 'un': 'unidade_medida', 'categoria_nome': 'categoria'
+    }
+    
+    # Tamanhos das colunas em database/schema.sql
+    TAMANHO_MAXIMO = {'codigo_barras': 50, 'nome': 200, 'unidade_medida': 20, 'categoria': 100}
+    PRECO_MAXIMO = Decimal('99999999.99')  # DECIMAL(10,2)
+    INTEIRO_MAXIMO = 2147483647  # INT
+    
+    # Sempre preenchidas; nas demais, célula vazia mantém o valor do produto existente
+    COLUNAS_OBRIGATORIAS = ('codigo_barras', 'nome', 'preco_venda')
+    
+    VERDADEIROS = {'1', 'sim', 's', 'true', 'ativo', 'x', 'yes'}
+    FALSOS = {'0', 'nao', 'n', 'false', 'inativo', 'no'}
+    
+    def __init__(self, tamanho_lote: int = 1000):
+        self.tamanho_lote = tamanho_lote
+    
+    # ==================== IMPORTAÇÃO ====================
+    
+    def importar(self, caminho: str, simular: bool = False, progresso: Progresso = None,
+                 cancelar: threading.Event = None, usuario_id: int = None,
+                 usuario_nome: str = "Sistema") -> ResultadoImportacao:
+        """
+        Importa (insere ou atualiza) os produtos de um CSV ou XLSX.
+        
+        Colunas ausentes na planilha e células vazias não são alteradas nos
+        produtos que já existem. A planilha precisa ter ao menos
+        codigo_barras, nome e preco_venda (ou apelidos, ver APELIDOS).
+        
+        Args:
+            caminho: Arquivo .csv ou .xlsx
+            simular: Só valida, sem gravar nada
+            progresso: Chamado a cada lote com (linhas processadas, total)
+            cancelar: Evento que interrompe a importação entre um lote e outro
+            usuario_id: Usuário responsável (gravado nas movimentações de estoque)
+            usuario_nome: Nome para o log de operações
+        
+        Returns:
+            ResultadoImportacao com contadores e erros por linha
+        
+        Raises:
+            ValueError: Formato não suportado, colunas obrigatórias ausentes ou
+                planilha com estoque_atual sem usuario_id
+        """
+        resultado = ResultadoImportacao()
+        total, cabecalho, linhas = self._abrir(caminho)
+        
+        colunas = [self._normalizar_coluna(nome) for nome in cabecalho]
+        faltando = [c for c in self.COLUNAS_OBRIGATORIAS if c not in colunas]
+        if faltando:
+            raise ValueError(f"Colunas obrigatórias ausentes: {', '.join(faltando)}")
+        if 'estoque_atual' in colunas and usuario_id is None and not simular:
+            raise ValueError("Informe o usuário responsável: o estoque importado entra no histórico de movimentações")
+        
+        # Nos produtos existentes só as colunas presentes na planilha são sobrescritas
+        colunas_atualizar = [self._coluna_banco(c) for c in colunas if c in self.COLUNAS]
+        categorias = self._carregar_categorias()
+        
+        # (nº da linha, produto, colunas vazias, categoria a criar ou None)
+        lote: List[Tuple[int, Produto, frozenset, Optional[str]]] = []
+        for numero, valores in linhas:
+            dados = {coluna: valor for coluna, valor in zip(colunas, valores) if coluna}
+            if not any(self._texto(v) for v in dados.values()):
+                continue  # linha em branco
+            
+            resultado.linhas += 1
+            produto, erro = self._montar_produto(dados, categorias)
+            if erro:
+                resultado.erros.append((numero, self._texto(dados.get('codigo_barras')), erro))
+            else:
+                vazias = frozenset(
+                    self._coluna_banco(c) for c in dados
+                    if c not in self.COLUNAS_OBRIGATORIAS and not self._texto(dados[c])
+                )
+                nome_categoria = self._texto(dados.get('categoria'))
+                nova = nome_categoria if nome_categoria and produto.categoria_id is None else None
+                lote.append((numero, produto, vazias, nova))
+            
+            if len(lote) >= self.tamanho_lote:
+                self._gravar_lote(lote, colunas_atualizar, categorias, simular, resultado, usuario_id)
+                lote = []
+                if progresso:
+                    progresso(resultado.linhas, total)
+                if cancelar is not None and cancelar.is_set():
+                    resultado.cancelado = True
+                    break
+        
+        if lote and not resultado.cancelado:
+            self._gravar_lote(lote, colunas_atualizar, categorias, simular, resultado, usuario_id)
+        if progresso:
+            progresso(resultado.linhas, total)
+        
+        if not simular:
+            Logger.log_operacao(
+                usuario_nome, "CATALOGO IMPORTADO",
+                f"{Path(caminho).name}: {resultado.inseridos} novo(s), {resultado.atualizados} atualizado(s), "
+                f"{len(resultado.erros)} erro(s){' - CANCELADO' if resultado.cancelado else ''}"
+            )
+        return resultado
+    
+    def _gravar_lote(self, lote: List[Tuple[int, Produto, frozenset, Optional[str]]],
+                     colunas_atualizar: List[str], categorias: Dict[str, int], simular: bool,
+                     resultado: ResultadoImportacao, usuario_id: Optional[int]):
+        """
+        Grava um lote; se o banco recusar, todas as linhas do lote viram erro.
+        
+        Linhas com as mesmas células vazias vão juntas para o banco, que só
+        atualiza as colunas preenchidas de cada grupo. As categorias novas do
+        grupo são criadas na transação dele; se a criação falhar, as linhas
+        daquela categoria viram erro e as demais seguem.
+        """
+        resultado.validas += len(lote)
+        if simular:
+            return
+        
+        grupos: Dict[frozenset, List[Tuple[int, Produto, Optional[str]]]] = {}
+        for numero, produto, vazias, nova in lote:
+            grupos.setdefault(vazias, []).append((numero, produto, nova))
+        
+        for vazias, linhas in grupos.items():
+            criadas: Dict[str, int] = {}
+            try:
+                with DatabaseConnection.get_cursor() as cursor:
+                    linhas = self._criar_categorias(linhas, categorias, criadas, resultado, cursor)
+                    inseridos, atualizados = ProdutoDAO.salvar_em_lote(
+                        [p for _, p, _ in linhas], [c for c in colunas_atualizar if c not in vazias],
+                        usuario_id, cursor=cursor
+                    )
+                # Só depois do commit: categoria de lote desfeito não existe no banco
+                categorias.update(criadas)
+                resultado.inseridos += inseridos
+                resultado.atualizados += atualizados
+            except Exception as e:
+                Logger.log_erro("IMPORTAÇÃO DE CATÁLOGO", e)
+                resultado.erros.extend((numero, p.codigo_barras, f"Lote não gravado: {e}") for numero, p, _ in linhas)
+    
+    @staticmethod
+    def _criar_categorias(linhas: List[Tuple[int, Produto, Optional[str]]], categorias: Dict[str, int],
+                          criadas: Dict[str, int], resultado: ResultadoImportacao,
+                          cursor) -> List[Tuple[int, Produto, Optional[str]]]:
+        """
+        Cria as categorias novas das linhas na transação do lote e preenche categoria_id.
+        
+        Returns:
+            As linhas que podem ser gravadas (sem as de categoria não criada)
+        """
+        falhas = set()
+        gravar = []
+        for numero, produto, nova in linhas:
+            if nova:
+                chave = nova.lower()
+                if chave not in categorias and chave not in criadas and chave not in falhas:
+                    categoria_id = CategoriaDAO.criar(Categoria(nome=nova), cursor)
+                    if categoria_id:
+                        criadas[chave] = categoria_id
+                    else:
+                        falhas.add(chave)
+                if chave in falhas:
+                    resultado.erros.append((numero, produto.codigo_barras, f"Categoria '{nova}' não foi criada"))
+                    continue
+                produto.categoria_id = categorias.get(chave) or criadas[chave]
+            gravar.append((numero, produto, nova))
+        return gravar
+    
+    def _montar_produto(self, dados: Dict[str, object],
+                        categorias: Dict[str, int]) -> Tuple[Optional[Produto], Optional[str]]:
+        """
+        Valida uma linha e monta o Produto; retorna (None, mensagem) se inválida.
+        
+        Categoria ainda não cadastrada fica com categoria_id None; é criada
+        na gravação do lote (_criar_categorias).
+        """
+        codigo = self._texto(dados.get('codigo_barras'))
+        if not Validators.validar_codigo_barras(codigo):
+            return None, "Código de barras inválido (8 a 14 dígitos)"
+        # Gravado só com os dígitos, como o leitor envia na frente de caixa
+        codigo = Formatters.remover_formatacao(codigo)
+        
+        nome = self._texto(dados.get('nome'))
+        if not nome:
+            return None, "Nome não informado"
+        
+        for coluna, tamanho in self.TAMANHO_MAXIMO.items():
+            if len(self._texto(dados.get(coluna))) > tamanho:
+                return None, f"{coluna} com mais de {tamanho} caracteres"
+        
+        preco_venda = self._preco(self._texto(dados.get('preco_venda')))
+        if preco_venda is None:
+            return None, f"Preço de venda inválido (0 a {self.PRECO_MAXIMO})"
+        
+        preco_custo = Decimal('0.00')
+        if self._texto(dados.get('preco_custo')):
+            preco_custo = self._preco(self._texto(dados.get('preco_custo')))
+            if preco_custo is None:
+                return None, f"Preço de custo inválido (0 a {self.PRECO_MAXIMO})"
+        
+        inteiros = {}
+        for coluna in ('estoque_atual', 'estoque_minimo'):
+            texto = self._texto(dados.get(coluna))
+            try:
+                inteiros[coluna] = int(Decimal(texto.replace(',', '.'))) if texto else 0
+            except (ArithmeticError, ValueError):
+                return None, f"{coluna} inválido"
+            if not 0 <= inteiros[coluna] <= self.INTEIRO_MAXIMO:
+                return None, f"{coluna} fora do intervalo (0 a {self.INTEIRO_MAXIMO})"
+        
+        ativo = True
+        texto_ativo = self._sem_acento(self._texto(dados.get('ativo')).lower())
+        if texto_ativo:
+            if texto_ativo not in self.VERDADEIROS | self.FALSOS:
+                return None, "Valor de 'ativo' inválido (use sim/não)"
+            ativo = texto_ativo in self.VERDADEIROS
+        
+        categoria_id = categorias.get(self._texto(dados.get('categoria')).lower())
+        
+        produto = Produto(
+            codigo_barras=codigo,
+            nome=nome,
+            descricao=self._texto(dados.get('descricao')),
+            categoria_id=categoria_id,
+            preco_custo=preco_custo,
+            preco_venda=preco_venda,
+            estoque_atual=inteiros['estoque_atual'],
+            estoque_minimo=inteiros['estoque_minimo'],
+            unidade_medida=self._texto(dados.get('unidade_medida')).upper() or "UN",
+            ativo=ativo
+        )
+        return produto, None
+    
+    def _preco(self, texto: str) -> Optional[Decimal]:
+        """Preço com 2 casas, ou None se inválido, infinito ou acima de DECIMAL(10,2)."""
+        valido, valor = Validators.validar_preco(texto)
+        if not valido or not valor.is_finite() or valor > self.PRECO_MAXIMO:
+            return None
+        return valor.quantize(Decimal('0.01'))
+    
+    @staticmethod
+    def _coluna_banco(coluna: str) -> str:
+        """Coluna de produtos gravada a partir da coluna da planilha."""
+        return 'categoria_id' if coluna == 'categoria' else coluna
+    
+    @staticmethod
+    def _carregar_categorias() -> Dict[str, int]:
+        """Mapa nome (minúsculo) -> id das categorias cadastradas."""
+        return {c.nome.strip().lower(): c.id for c in CategoriaDAO.buscar_todas(apenas_ativas=False)}
+    
+    # ==================== LEITURA ====================
+    
+    def _abrir(self, caminho: str) -> Tuple[Optional[int], list, Iterator[Tuple[int, list]]]:
+        """
+        Abre a planilha para leitura em streaming.
+        
+        Returns:
+            Tupla (total de linhas de dados ou None, cabeçalho, iterador de (nº da linha, valores))
+        """
+        extensao = Path(caminho).suffix.lower()
+        if extensao == '.csv':
+            return self._abrir_csv(caminho)
+        if extensao == '.xlsx':
+            return self._abrir_xlsx(caminho)
+        raise ValueError(f"Formato não suportado: {extensao} (use .csv ou .xlsx)")
+    
+    @staticmethod
+    def _abrir_csv(caminho: str):
+        """CSV em UTF-8 (com ou sem BOM), separado por ';' ou ','."""
+        with open(caminho, encoding='utf-8-sig', newline='') as arquivo:
+            primeira = arquivo.readline()
+            total = sum(1 for _ in arquivo)  # passada rápida só para a barra de progresso
+        
+        separador = ';' if primeira.count(';') >= primeira.count(',') else ','
+        cabecalho = next(csv.reader([primeira], delimiter=separador), [])
+        
+        def linhas():
+            with open(caminho, encoding='utf-8-sig', newline='') as arquivo:
+                leitor = csv.reader(arquivo, delimiter=separador)
+                next(leitor, None)
+                for numero, valores in enumerate(leitor, start=2):
+                    yield numero, valores
+        
+        return total, cabecalho, linhas()
+    
+    @staticmethod
+    def _abrir_xlsx(caminho: str):
+        """Primeira aba do XLSX, em modo somente leitura (não carrega a pasta inteira)."""
+        from openpyxl import load_workbook
+        
+        pasta = load_workbook(caminho, read_only=True, data_only=True)
+        aba = pasta.worksheets[0]
+        total = aba.max_row - 1 if aba.max_row else None
+        
+        iterador = aba.iter_rows(values_only=True)
+        cabecalho = [str(v) if v is not None else "" for v in next(iterador, ())]
+        
+        def linhas():
+            try:
+                for numero, valores in enumerate(iterador, start=2):
+                    yield numero, list(valores)
+            finally:
+                pasta.close()
+        
+        return total, cabecalho, linhas()
+    
+    def _normalizar_coluna(self, nome: str) -> Optional[str]:
+        """Nome da coluna no padrão do sistema, ou None se a coluna for ignorada."""
+        chave = self._sem_acento(str(nome or "").strip().lower())
+        chave = self.APELIDOS.get(chave, chave.replace(' ', '_'))
+        if chave == 'categoria_id':
+            return None  # IDs variam entre bancos; a planilha usa o nome da categoria
+        return chave if chave in self.COLUNAS else None
+    
+    @staticmethod
+    def _sem_acento(texto: str) -> str:
+        return unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode('ascii')
+    
+    @staticmethod
+    def _texto(valor) -> str:
+        """Valor da célula como texto (códigos numéricos do Excel sem '.0')."""
+        if valor is None:
+            return ""
+        if isinstance(valor, float) and valor.is_integer():
+            valor = int(valor)
+        return str(valor).strip()
+    
+    # ==================== EXPORTAÇÃO ====================
+    
+    def exportar(self, caminho: str, apenas_ativos: bool = False, progresso: Progresso = None,
+                 cancelar: threading.Event = None) -> int:
+        """
+        Exporta o catálogo para CSV ou XLSX, nas mesmas colunas aceitas pela importação.
+        
+        Os produtos são lidos página a página (ProdutoDAO.buscar_pagina) e
+        escritos direto no arquivo, sem carregar o catálogo inteiro na memória.
+        
+        Args:
+            caminho: Arquivo .csv ou .xlsx
+            apenas_ativos: Ignora produtos inativos
+            progresso: Chamado a cada página com (produtos exportados, total)
+            cancelar: Evento que interrompe a exportação entre uma página e outra
+        
+        Returns:
+            Quantidade de produtos exportados
+        """
+        extensao = Path(caminho).suffix.lower()
+        if extensao not in ('.csv', '.xlsx'):
+            raise ValueError(f"Formato não suportado: {extensao} (use .csv ou .xlsx)")
+        
+        total = ProdutoDAO.contar(apenas_ativos)
+        
+        if extensao == '.csv':
+            arquivo = open(caminho, 'w', encoding='utf-8-sig', newline='')
+            escritor = csv.writer(arquivo, delimiter=';')
+            escrever = escritor.writerow
+            formatar_valor = lambda valor: f"{valor:.2f}".replace('.', ',')
+        else:
+            from openpyxl import Workbook
+            pasta = Workbook(write_only=True)
+            aba = pasta.create_sheet("Produtos")
+            escrever = aba.append
+            formatar_valor = float
+        
+        exportados = 0
+        try:
+            escrever(self.COLUNAS)
+            for pagina in self._paginas(apenas_ativos):
+                for p in pagina:
+                    escrever([
+                        p['codigo_barras'] or "", p['nome'], p['descricao'] or "", p['categoria_nome'] or "",
+                        formatar_valor(p['preco_custo'] or 0), formatar_valor(p['preco_venda'] or 0),
+                        p['estoque_atual'], p['estoque_minimo'], p['unidade_medida'] or "UN",
+                        "sim" if p['ativo'] else "não"
+                    ])
+                exportados += len(pagina)
+                if progresso:
+                    progresso(exportados, total)
+                if cancelar is not None and cancelar.is_set():
+                    break
+        finally:
+            if extensao == '.csv':
+                arquivo.close()
+            else:
+                pasta.save(caminho)
+        
+        Logger.log_operacao("Sistema", "CATALOGO EXPORTADO", f"{Path(caminho).name}: {exportados} produto(s)")
+        return exportados
+    
+    def _paginas(self, apenas_ativos: bool) -> Iterator[List[dict]]:
+        """Percorre o catálogo por páginas (paginação por cursor na chave primária)."""
+        campos = ['codigo_barras', 'nome', 'descricao', 'categoria_nome', 'preco_custo', 'preco_venda',
+                  'estoque_atual', 'estoque_minimo', 'unidade_medida', 'ativo']
+        ultimo_id = 0
+        while True:
+            pagina = ProdutoDAO.buscar_pagina(ultimo_id, self.tamanho_lote, campos, apenas_ativos)
+            if not pagina:
+                return
+            yield pagina
+            ultimo_id = pagina[-1]['id']
+            if len(pagina) < self.tamanho_lote:
+                return
+
+
+# Instância global
+catalogo_service = CatalogoService()
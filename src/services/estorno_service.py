@@ -9,7 +9,6 @@ from src.models.estorno import Estorno
 from src.models.venda import Venda
 from src.dao.estorno_dao import EstornoDAO
 from src.dao.venda_dao import VendaDAO
-from src.dao.produto_dao import ProdutoDAO
 from src.utils.logger import Logger
 
 
@@ -63,8 +62,8 @@ class EstornoService:
             if not sucesso:
                 return False, mensagem
             
-            # Busca itens da venda
-            itens = VendaDAO.buscar_itens_venda(venda_id)
+            # Itens já vêm carregados com a venda
+            itens = venda.itens
             if not itens:
                 return False, "Venda sem itens!"
             
@@ -77,26 +76,13 @@ class EstornoService:
                 observacoes=observacoes
             )
             
-            estorno_id = EstornoDAO.criar(estorno)
+            # Estorno, reposição de estoque e cancelamento da venda na mesma transação
+            estorno_id = EstornoDAO.registrar_estorno_completo(
+                estorno, itens, venda.numero_venda
+            )
             if not estorno_id:
                 return False, "Erro ao criar registro de estorno!"
             
-            # Reverte estoque de cada item
-            for item in itens:
-                produto = ProdutoDAO.buscar_por_id(item.produto_id)
-                if produto:
-                    novo_estoque = produto.estoque_atual + item.quantidade
-                    ProdutoDAO.atualizar_estoque(item.produto_id, novo_estoque)
-                    
-                    Logger.info(
-                        f"Estoque revertido: Produto {produto.nome} - "
-                        f"Quantidade: +{item.quantidade} - "
-                        f"Estoque: {produto.estoque_atual} -> {novo_estoque}"
-                    )
-            
-            # Atualiza status da venda para cancelada
-            VendaDAO.cancelar_venda(venda_id)
-            
             # Log do estorno
             Logger.warning(
                 f"ESTORNO PROCESSADO - Venda #{venda.numero_venda} - "
@@ -127,7 +113,7 @@ class EstornoService:
         if not venda:
             return None
         
-        itens = VendaDAO.buscar_itens_venda(venda_id)
+        itens = venda.itens
         
         return {
             'venda': venda,
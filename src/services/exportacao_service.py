@@ -0,0 +1,314 @@
+"""
+Exportação de relatórios de vendas em CSV, XLSX e PDF.
+
+As linhas vêm do banco por cursor não bufferizado, em lotes, e são
+escritas direto no arquivo: a memória não cresce com o período (um ano
+de vendas ocupa o mesmo que um dia). Roda fora da thread da interface,
+com progresso e cancelamento (ver ProgressoDialog).
+"""
+
+import csv
+import os
+import threading
+import zlib
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.dao.venda_dao import VendaDAO, ItemVendaDAO
+from src.utils.formatters import Formatters
+from src.utils.logger import Logger
+
+
+# Recebe (linhas exportadas, total de linhas ou None se desconhecido)
+Progresso = Callable[[int, Optional[int]], None]
+
+# Tipos de coluna: definem a formatação em cada formato de arquivo
+TEXTO, DATA_HORA, MOEDA, QUANTIDADE, INTEIRO = 'texto', 'data_hora', 'moeda', 'quantidade', 'inteiro'
+
+
+@dataclass
+class RelatorioExportacao:
+    """Relatório exportável: colunas e as funções que contam e percorrem as linhas."""
+    
+    titulo: str
+    colunas: List[Tuple[str, str, float]]  # (cabeçalho, tipo, largura relativa no PDF)
+    contar: Callable[[date, date, Optional[str]], int]
+    percorrer: Callable[..., Iterator[List[tuple]]]
+
+
+RELATORIOS: Dict[str, RelatorioExportacao] = {
+    'vendas': RelatorioExportacao(
+        titulo="Vendas",
+        colunas=[
+            ("Número", TEXTO, 1.3), ("Data/Hora", DATA_HORA, 1.4), ("Operador", TEXTO, 1.8),
+            ("Caixa", INTEIRO, 0.6), ("Subtotal", MOEDA, 1), ("Desconto", MOEDA, 1),
+            ("Total", MOEDA, 1), ("Status", TEXTO, 1)
+        ],
+        contar=VendaDAO.contar_por_periodo,
+        percorrer=VendaDAO.percorrer_periodo
+    ),
+    'itens': RelatorioExportacao(
+        titulo="Itens Vendidos",
+        colunas=[
+            ("Venda", TEXTO, 1.2), ("Data/Hora", DATA_HORA, 1.3), ("Código", TEXTO, 1.3),
+            ("Produto", TEXTO, 2.4), ("Categoria", TEXTO, 1.3), ("Quantidade", QUANTIDADE, 0.9),
+            ("Preço Unit.", MOEDA, 0.9), ("Desconto", MOEDA, 0.9), ("Subtotal", MOEDA, 0.9)
+        ],
+        contar=ItemVendaDAO.contar_por_periodo,
+        percorrer=ItemVendaDAO.percorrer_periodo
+    ),
+}
+
+
+class EscritorCSV:
+    """CSV no padrão do Excel brasileiro (separador ; e vírgula decimal)."""
+    
+    def __init__(self, caminho: str, relatorio: RelatorioExportacao, subtitulo: str):
+        self.tipos = [tipo for _, tipo, _ in relatorio.colunas]
+        self.arquivo = open(caminho, 'w', encoding='utf-8-sig', newline='')
+        self.escritor = csv.writer(self.arquivo, delimiter=';')
+        self.escritor.writerow([titulo for titulo, _, _ in relatorio.colunas])
+    
+    def escrever(self, lote: List[tuple]):
+        self.escritor.writerows([self._formatar(linha) for linha in lote])
+    
+    def _formatar(self, linha: tuple) -> list:
+        valores = []
+        for valor, tipo in zip(linha, self.tipos):
+            if valor is None:
+                valor = ""
+            elif tipo == DATA_HORA:
+                valor = valor.strftime("%d/%m/%Y %H:%M:%S")
+            elif tipo in (MOEDA, QUANTIDADE):
+                valor = str(valor).replace('.', ',')
+            valores.append(valor)
+        return valores
+    
+    def fechar(self):
+        self.arquivo.close()
+
+
+class EscritorXLSX:
+    """XLSX em modo write-only do openpyxl: cada linha vai para o disco ao ser escrita."""
+    
+    def __init__(self, caminho: str, relatorio: RelatorioExportacao, subtitulo: str):
+        from openpyxl import Workbook
+        
+        self.caminho = caminho
+        self.tipos = [tipo for _, tipo, _ in relatorio.colunas]
+        self.pasta = Workbook(write_only=True)
+        self.aba = self.pasta.create_sheet(relatorio.titulo[:31])
+        self.aba.append([titulo for titulo, _, _ in relatorio.colunas])
+    
+    def escrever(self, lote: List[tuple]):
+        for linha in lote:
+            # Decimal vira número na planilha (somável), não texto
+            self.aba.append([float(v) if isinstance(v, Decimal) else v for v in linha])
+    
+    def fechar(self):
+        self.pasta.save(self.caminho)
+
+
+class EscritorPDF:
+    """
+    PDF em tabela de largura fixa (Courier), A4 deitada, gravado página a página.
+    
+    Cada página é comprimida e escrita no arquivo assim que fica cheia; só
+    os deslocamentos dos objetos ficam na memória. O canvas do reportlab
+    guarda todas as páginas até o save(), o que não serve para um ano de
+    vendas, por isso o arquivo é montado aqui diretamente.
+    """
+    
+    LARGURA, ALTURA, MARGEM = 842, 595, 34  # pontos (A4 deitada)
+    FONTE, ALTURA_LINHA, LINHAS_POR_PAGINA = 7.5, 12, 40
+    
+    # Objetos fixos; as páginas vêm a partir do 5
+    CATALOGO, PAGINAS, FONTE_NORMAL, FONTE_NEGRITO = 1, 2, 3, 4
+    
+    def __init__(self, caminho: str, relatorio: RelatorioExportacao, subtitulo: str):
+        self.relatorio = relatorio
+        self.subtitulo = subtitulo
+        
+        # Courier: cada caractere ocupa 0,6 do tamanho da fonte
+        caracteres = int((self.LARGURA - 2 * self.MARGEM) / (self.FONTE * 0.6))
+        soma = sum(largura for _, _, largura in relatorio.colunas)
+        self.larguras = [max(4, int(caracteres * largura / soma) - 1) for _, _, largura in relatorio.colunas]
+        
+        self.arquivo = open(caminho, 'wb')
+        self.deslocamentos = {}
+        self.paginas: List[int] = []
+        self.proximo_objeto = 5
+        self.linhas_pagina: List[str] = []
+        
+        self.arquivo.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        for numero, fonte in ((self.FONTE_NORMAL, b"Courier"), (self.FONTE_NEGRITO, b"Courier-Bold")):
+            self._objeto(numero, b"<< /Type /Font /Subtype /Type1 /BaseFont /" + fonte +
+                         b" /Encoding /WinAnsiEncoding >>")
+    
+    def _objeto(self, numero: int, conteudo: bytes):
+        self.deslocamentos[numero] = self.arquivo.tell()
+        self.arquivo.write(f"{numero} 0 obj\n".encode() + conteudo + b"\nendobj\n")
+    
+    @staticmethod
+    def _texto(texto: str) -> bytes:
+        """String PDF literal em WinAnsi (acentos do português)."""
+        dados = texto.encode('cp1252', errors='replace')
+        return b"(" + dados.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+    
+    def _formatar(self, valores) -> str:
+        """Linha da tabela com cada coluna cortada/alinhada na sua largura."""
+        partes = []
+        for valor, (_, tipo, _), largura in zip(valores, self.relatorio.colunas, self.larguras):
+            if valor is None:
+                texto = ""
+            elif tipo == DATA_HORA and not isinstance(valor, str):
+                texto = Formatters.formatar_data_hora(valor, "%d/%m/%Y %H:%M")
+            elif tipo == MOEDA and not isinstance(valor, str):
+                texto = Formatters.formatar_moeda(valor)
+            elif tipo == QUANTIDADE and not isinstance(valor, str):
+                texto = Formatters.formatar_quantidade(valor)
+            else:
+                texto = str(valor)
+            texto = texto[:largura]
+            partes.append(texto.rjust(largura) if tipo in (MOEDA, QUANTIDADE, INTEIRO) else texto.ljust(largura))
+        return " ".join(partes)
+    
+    def escrever(self, lote: List[tuple]):
+        for linha in lote:
+            self.linhas_pagina.append(self._formatar(linha))
+            if len(self.linhas_pagina) == self.LINHAS_POR_PAGINA:
+                self._gravar_pagina()
+    
+    def _gravar_pagina(self):
+        """Comprime o conteúdo da página e grava a página no arquivo."""
+        numero_pagina = len(self.paginas) + 1
+        topo = self.ALTURA - self.MARGEM
+        cabecalho = self._formatar(titulo for titulo, _, _ in self.relatorio.colunas)
+        
+        comandos = [
+            b"BT /F2 12 Tf %d %d Td " % (self.MARGEM, topo - 10) + self._texto(self.relatorio.titulo) + b" Tj ET",
+            b"BT /F1 8 Tf %d %d Td " % (self.MARGEM, topo - 24) +
+            self._texto(f"{self.subtitulo}  |  Página {numero_pagina}") + b" Tj ET",
+            b"BT /F2 %.1f Tf %d %d Td " % (self.FONTE, self.MARGEM, topo - 44) + self._texto(cabecalho) + b" Tj ET",
+            b"%d %d m %d %d l S" % (self.MARGEM, topo - 48, self.LARGURA - self.MARGEM, topo - 48),
+            b"BT /F1 %.1f Tf %d TL %d %d Td" % (self.FONTE, self.ALTURA_LINHA, self.MARGEM, topo - 60),
+        ]
+        comandos += [self._texto(linha) + b" '" for linha in self.linhas_pagina]
+        comandos.append(b"ET")
+        conteudo = zlib.compress(b"\n".join(comandos))
+        
+        numero_conteudo, numero_pagina_obj = self.proximo_objeto, self.proximo_objeto + 1
+        self.proximo_objeto += 2
+        self._objeto(numero_conteudo, b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(conteudo) +
+                     conteudo + b"\nendstream")
+        self._objeto(numero_pagina_obj, (
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 %d 0 R /F2 %d 0 R >> >> /Contents %d 0 R >>"
+        ) % (self.PAGINAS, self.LARGURA, self.ALTURA, self.FONTE_NORMAL, self.FONTE_NEGRITO, numero_conteudo))
+        self.paginas.append(numero_pagina_obj)
+        self.linhas_pagina = []
+    
+    def fechar(self):
+        """Grava a última página, a árvore de páginas, a tabela xref e fecha o arquivo."""
+        try:
+            if self.linhas_pagina or not self.paginas:
+                self._gravar_pagina()
+            
+            filhos = b" ".join(b"%d 0 R" % numero for numero in self.paginas)
+            self._objeto(self.PAGINAS, b"<< /Type /Pages /Kids [" + filhos + b"] /Count %d >>" % len(self.paginas))
+            self._objeto(self.CATALOGO, b"<< /Type /Catalog /Pages %d 0 R >>" % self.PAGINAS)
+            info = self.proximo_objeto
+            self._objeto(info, b"<< /Title " + self._texto(self.relatorio.titulo) + b" /Producer (PDV Sistema) >>")
+            
+            inicio_xref = self.arquivo.tell()
+            self.arquivo.write(b"xref\n0 %d\n0000000000 65535 f \n" % (info + 1))
+            for numero in range(1, info + 1):
+                self.arquivo.write(b"%010d 00000 n \n" % self.deslocamentos[numero])
+            self.arquivo.write(b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+                info + 1, self.CATALOGO, info, inicio_xref))
+        finally:
+            self.arquivo.close()
+
+
+ESCRITORES = {'.csv': EscritorCSV, '.xlsx': EscritorXLSX, '.pdf': EscritorPDF}
+
+
+class ExportacaoService:
+    """Exporta relatórios de vendas de qualquer período com memória constante."""
+    
+    def __init__(self, tamanho_lote: int = 1000):
+        self.tamanho_lote = tamanho_lote
+    
+    def exportar(self, relatorio: str, caminho: str, data_inicio: date, data_fim: date,
+                 status: str = 'finalizada', progresso: Progresso = None,
+                 cancelar: threading.Event = None) -> Dict:
+        """
+        Exporta um relatório do período para o arquivo (formato pela extensão).
+        
+        Args:
+            relatorio: Chave em RELATORIOS ('vendas' ou 'itens')
+            caminho: Arquivo .csv, .xlsx ou .pdf
+            data_inicio: Primeiro dia do período
+            data_fim: Último dia do período
+            status: Status das vendas (None para todas)
+            progresso: Chamado a cada lote com (linhas exportadas, total)
+            cancelar: Evento que interrompe a exportação entre um lote e outro
+        
+        Returns:
+            dict com linhas, cancelado e caminho. Cancelada ou com erro, o
+            arquivo incompleto é apagado
+        
+        Raises:
+            ValueError: Relatório ou formato desconhecido
+        """
+        definicao = RELATORIOS.get(relatorio)
+        if definicao is None:
+            raise ValueError(f"Relatório desconhecido: {relatorio}")
+        extensao = Path(caminho).suffix.lower()
+        if extensao not in ESCRITORES:
+            raise ValueError(f"Formato não suportado: {extensao} (use .csv, .xlsx ou .pdf)")
+        
+        total = definicao.contar(data_inicio, data_fim, status)
+        subtitulo = (
+            f"Período: {Formatters.formatar_data(data_inicio)} a {Formatters.formatar_data(data_fim)}"
+            f"  |  Gerado em {Formatters.formatar_data_hora(datetime.now(), '%d/%m/%Y %H:%M')}"
+        )
+        
+        escritor = ESCRITORES[extensao](caminho, definicao, subtitulo)
+        linhas = 0
+        cancelado = False
+        concluido = False
+        lotes = definicao.percorrer(data_inicio, data_fim, status, self.tamanho_lote)
+        try:
+            for lote in lotes:
+                escritor.escrever(lote)
+                linhas += len(lote)
+                if progresso:
+                    progresso(linhas, total)
+                if cancelar is not None and cancelar.is_set():
+                    cancelado = True
+                    break
+            concluido = True
+        finally:
+            # Libera a conexão do cursor em fluxo já, mesmo parando no meio
+            lotes.close()
+            escritor.fechar()
+            if cancelado or not concluido:
+                try:
+                    os.remove(caminho)
+                except OSError:
+                    pass
+        
+        Logger.log_operacao(
+            "Sistema", "RELATORIO EXPORTADO",
+            f"{definicao.titulo} {data_inicio} a {data_fim} - {Path(caminho).name}: {linhas} linha(s)"
+            f"{' - CANCELADO' if cancelado else ''}"
+        )
+        return {'linhas': linhas, 'cancelado': cancelado, 'caminho': caminho}
+
+
+# Instância global
+exportacao_service = ExportacaoService()
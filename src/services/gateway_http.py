@@ -0,0 +1,139 @@
+"""
+Cliente HTTP compartilhado para as APIs de pagamento (Mercado Pago).
+
+Uma única requests.Session com pool de conexões keep-alive, timeout em
+todas as chamadas, nova tentativa com espera exponencial aleatória e
+métricas de latência/erros por operação.
+"""
+
+import random
+import time
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.config.config_reader import config
+from src.utils.logger import Logger
+from src.utils.metricas import MetricasLatencia
+
+
+class GatewayHTTPError(Exception):
+    """Falha definitiva em uma chamada ao gateway (após todas as tentativas)."""
+    pass
+
+
+class GatewayHTTP:
+    """Sessão HTTP compartilhada com timeouts, novas tentativas e métricas."""
+    
+    # Respostas que indicam falha temporária do servidor
+    STATUS_REPETIR = (429, 500, 502, 503, 504)
+    
+    # Métodos que podem ser repetidos sem efeito duplicado
+    METODOS_IDEMPOTENTES = ("GET", "HEAD", "PUT", "DELETE", "OPTIONS")
+    
+    def __init__(self, base_url: str = None):
+        self.base_url = (base_url or config.get(
+            'mercadopago', 'api_url', fallback="https://api.mercadopago.com"
+        )).rstrip('/')
+        self.timeout = (
+            config.getfloat('mercadopago', 'timeout_conexao', fallback=3.05),
+            config.getfloat('mercadopago', 'timeout_leitura', fallback=10.0)
+        )
+        self.max_tentativas = config.getint('mercadopago', 'max_tentativas', fallback=3)
+        self.espera_base = config.getfloat('mercadopago', 'espera_base_tentativa', fallback=0.3)
+        self.espera_maxima = config.getfloat('mercadopago', 'espera_maxima_tentativa', fallback=5.0)
+        tamanho_pool = config.getint('mercadopago', 'tamanho_pool_http', fallback=10)
+        
+        self.session = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=2, pool_maxsize=tamanho_pool)
+        self.session.mount("https://", adaptador)
+        self.session.mount("http://", adaptador)
+        
+        self.metricas = MetricasLatencia()
+    
+    # ==================== REQUISIÇÕES ====================
+    
+    def requisitar(self, metodo: str, caminho: str, operacao: str = None,
+                   timeout=None, **kwargs) -> requests.Response:
+        """
+        Executa uma requisição com timeout e novas tentativas.
+        
+        Repete em falhas de conexão, timeout e respostas 429/5xx, mas só para
+        métodos idempotentes ou POST com X-Idempotency-Key (o gateway descarta
+        a duplicata). Outros códigos de status são devolvidos ao chamador.
+        
+        Args:
+            metodo: Método HTTP (GET, POST, PUT...)
+            caminho: Caminho relativo à base_url (ex: "/v1/payments")
+            operacao: Nome usado nas métricas (usa "METODO caminho" se None)
+            timeout: Timeout (conexão, leitura) específico desta chamada
+            **kwargs: Repassados para requests.Session.request (headers, json...)
+        
+        Returns:
+            Resposta HTTP
+        
+        Raises:
+            GatewayHTTPError: Se todas as tentativas falharem
+        """
+        metodo = metodo.upper()
+        operacao = operacao or f"{metodo} {caminho}"
+        url = f"{self.base_url}{caminho}"
+        
+        headers = kwargs.get("headers") or {}
+        pode_repetir = metodo in self.METODOS_IDEMPOTENTES or "X-Idempotency-Key" in headers
+        tentativas = self.max_tentativas if pode_repetir else 1
+        
+        ultimo_erro = None
+        for tentativa in range(1, tentativas + 1):
+            inicio = time.perf_counter()
+            try:
+                response = self.session.request(metodo, url, timeout=timeout or self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self.metricas.registrar(operacao, time.perf_counter() - inicio, erro=True)
+                ultimo_erro = e
+            else:
+                falha_temporaria = response.status_code in self.STATUS_REPETIR
+                self.metricas.registrar(operacao, time.perf_counter() - inicio, erro=falha_temporaria)
+                
+                if not falha_temporaria or tentativa == tentativas:
+                    return response
+                ultimo_erro = GatewayHTTPError(f"HTTP {response.status_code}")
+            
+            if tentativa < tentativas:
+                espera = self._calcular_espera(tentativa)
+                Logger.log_operacao(
+                    "GatewayHTTP", "NOVA_TENTATIVA",
+                    f"{operacao}: tentativa {tentativa}/{tentativas} falhou ({ultimo_erro}); "
+                    f"aguardando {espera:.2f}s"
+                )
+                time.sleep(espera)
+        
+        raise GatewayHTTPError(f"{operacao} falhou após {tentativas} tentativa(s): {ultimo_erro}")
+    
+    def get(self, caminho: str, operacao: str = None, **kwargs) -> requests.Response:
+        """Atalho para requisitar("GET", ...)."""
+        return self.requisitar("GET", caminho, operacao, **kwargs)
+    
+    def post(self, caminho: str, operacao: str = None, **kwargs) -> requests.Response:
+        """Atalho para requisitar("POST", ...)."""
+        return self.requisitar("POST", caminho, operacao, **kwargs)
+    
+    def put(self, caminho: str, operacao: str = None, **kwargs) -> requests.Response:
+        """Atalho para requisitar("PUT", ...)."""
+        return self.requisitar("PUT", caminho, operacao, **kwargs)
+    
+    def _calcular_espera(self, tentativa: int) -> float:
+        """Espera exponencial com variação aleatória total (evita rajadas sincronizadas)."""
+        limite = min(self.espera_maxima, self.espera_base * (2 ** (tentativa - 1)))
+        return random.uniform(0, limite)
+    
+    # ==================== MÉTRICAS ====================
+    
+    def obter_metricas(self) -> Dict[str, dict]:
+        """Retorna latência e erros acumulados por operação."""
+        return self.metricas.obter()
+
+
+# Instância global compartilhada pelos serviços de pagamento
+gateway_http = GatewayHTTP()
@@ -0,0 +1,342 @@
+"""
+Impressão do cupom não fiscal em segundo plano (spooler).
+
+A frente de caixa só entrega a venda a uma fila; uma thread monta o cupom
+em ESC/POS e escreve no dispositivo da impressora térmica (porta serial
+ou arquivo, por exemplo um pty nos testes) e, se configurado, arquiva uma
+cópia em PDF. O loop do Tk nunca espera a impressora. O cabeçalho da loja
+(nome, CNPJ, endereço, telefone) é codificado em bytes uma única vez.
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from src.config.config_reader import config
+from src.models.pagamento import Pagamento
+from src.models.venda import Venda
+from src.utils.formatters import Formatters
+from src.utils.logger import Logger
+
+# Comandos ESC/POS usados no cupom
+ESC_INICIALIZAR = b"\x1b@"
+ESC_CODEPAGE = b"\x1bt"  # + n (3 = CP860, português)
+ESC_ALINHAR = b"\x1ba"  # + 0 esquerda, 1 centro
+ESC_NEGRITO = b"\x1bE"  # + 0/1
+GS_TAMANHO = b"\x1d!"  # + 0x00 normal, 0x11 altura e largura dupla
+GS_CORTE_PARCIAL = b"\x1dVB\x00"  # avança o papel até a guilhotina e corta
+
+CODEPAGES_ESCPOS = {'cp437': 0, 'cp850': 2, 'cp860': 3}
+
+# Estilos das linhas do cupom
+NORMAL, NEGRITO, CENTRO, TITULO = 'normal', 'negrito', 'centro', 'titulo'
+
+
+class RenderizadorCupom:
+    """Monta o cupom não fiscal em ESC/POS e em PDF a partir das mesmas linhas."""
+    
+    def __init__(self, colunas: int = None, codificacao: str = None):
+        self.colunas = colunas or config.getint('impressora', 'colunas', fallback=48)
+        self.codificacao = codificacao or config.get('impressora', 'codificacao', fallback='cp860')
+        self._cabecalho_bytes: Optional[bytes] = None
+        self._rodape_bytes: Optional[bytes] = None
+    
+    # ==================== LINHAS ====================
+    
+    def linhas_cabecalho(self) -> List[Tuple[str, str]]:
+        """Dados da loja (config_reader), iguais em todos os cupons."""
+        linhas = [(config.get_nome_empresa(), TITULO)]
+        cnpj = config.get_cnpj()
+        if cnpj:
+            linhas.append((f"CNPJ: {cnpj}", CENTRO))
+        for dado in (config.get_endereco(), config.get_telefone()):
+            if dado:
+                linhas.append((dado, CENTRO))
+        linhas.append(("-" * self.colunas, NORMAL))
+        linhas.append(("CUPOM NÃO FISCAL", CENTRO))
+        linhas.append(("-" * self.colunas, NORMAL))
+        return linhas
+    
+    def linhas_rodape(self) -> List[Tuple[str, str]]:
+        """Fechamento do cupom, igual em todos."""
+        return [("-" * self.colunas, NORMAL), ("Obrigado pela preferência!", CENTRO)]
+    
+    def linhas_venda(self, venda: Venda, pagamentos: List[Pagamento]) -> List[Tuple[str, str]]:
+        """Parte do cupom que muda a cada venda: itens, totais e pagamentos."""
+        data_hora = Formatters.formatar_data_hora(venda.data_hora or datetime.now(), "%d/%m/%Y %H:%M")
+        linhas = [(self._colunas(f"Venda {venda.numero_venda}", data_hora), NORMAL), ("", NORMAL)]
+        
+        for item in venda.itens:
+            nome = item.produto_nome or f"Produto {item.produto_id}"
+            linhas.append((Formatters.truncar_texto(nome, self.colunas), NORMAL))
+            detalhe = (
+                f"  {Formatters.formatar_quantidade(item.quantidade)} x "
+                f"{Formatters.formatar_moeda(item.preco_unitario)}"
+            )
+            if item.desconto:
+                detalhe += f" -{Formatters.formatar_moeda(item.desconto)}"
+            linhas.append((self._colunas(detalhe, Formatters.formatar_moeda(item.subtotal)), NORMAL))
+        
+        linhas.append(("-" * self.colunas, NORMAL))
+        if venda.desconto:
+            linhas.append((self._colunas("Subtotal", Formatters.formatar_moeda(venda.subtotal)), NORMAL))
+            linhas.append((self._colunas("Desconto", f"-{Formatters.formatar_moeda(venda.desconto)}"), NORMAL))
+        linhas.append((self._colunas("TOTAL", Formatters.formatar_moeda(venda.total)), NEGRITO))
+        
+        troco = Decimal('0')
+        for pagamento in pagamentos or []:
+            linhas.append((self._colunas(
+                pagamento.get_forma_pagamento_descricao(), Formatters.formatar_moeda(pagamento.valor_pago)
+            ), NORMAL))
+            troco += pagamento.troco or Decimal('0')
+        if troco:
+            linhas.append((self._colunas("Troco", Formatters.formatar_moeda(troco)), NORMAL))
+        return linhas
+    
+    def _colunas(self, esquerda: str, direita: str) -> str:
+        """Texto à esquerda e valor alinhado à direita na largura do papel."""
+        espaco = self.colunas - len(direita) - 1
+        return f"{esquerda[:espaco]:<{espaco}} {direita}"
+    
+    # ==================== ESC/POS ====================
+    
+    def _codificar(self, linhas: List[Tuple[str, str]]) -> bytes:
+        """Converte linhas em comandos ESC/POS."""
+        partes = []
+        for texto, estilo in linhas:
+            alinhamento = b"\x01" if estilo in (CENTRO, TITULO) else b"\x00"
+            partes.append(ESC_ALINHAR + alinhamento)
+            if estilo == TITULO:
+                partes.append(GS_TAMANHO + b"\x11" + ESC_NEGRITO + b"\x01")
+            elif estilo == NEGRITO:
+                partes.append(ESC_NEGRITO + b"\x01")
+            partes.append(texto.encode(self.codificacao, errors='replace') + b"\n")
+            if estilo in (TITULO, NEGRITO):
+                partes.append(GS_TAMANHO + b"\x00" + ESC_NEGRITO + b"\x00")
+        return b"".join(partes)
+    
+    @property
+    def cabecalho_escpos(self) -> bytes:
+        """Inicialização, código de página e dados da loja, codificados uma vez."""
+        if self._cabecalho_bytes is None:
+            codepage = bytes([CODEPAGES_ESCPOS.get(self.codificacao, 0)])
+            self._cabecalho_bytes = (
+                ESC_INICIALIZAR + ESC_CODEPAGE + codepage + self._codificar(self.linhas_cabecalho())
+            )
+        return self._cabecalho_bytes
+    
+    @property
+    def rodape_escpos(self) -> bytes:
+        """Rodapé com avanço de papel e corte, codificado uma vez."""
+        if self._rodape_bytes is None:
+            self._rodape_bytes = self._codificar(self.linhas_rodape()) + b"\n\n\n" + GS_CORTE_PARCIAL
+        return self._rodape_bytes
+    
+    def recarregar_cabecalho(self):
+        """Descarta o cabeçalho em cache (após alterar os dados da loja)."""
+        self._cabecalho_bytes = None
+        self._rodape_bytes = None
+    
+    def escpos(self, venda: Venda, pagamentos: List[Pagamento]) -> bytes:
+        """Cupom completo pronto para enviar à impressora térmica."""
+        return self.cabecalho_escpos + self._codificar(self.linhas_venda(venda, pagamentos)) + self.rodape_escpos
+    
+    # ==================== PDF ====================
+    
+    def pdf(self, venda: Venda, pagamentos: List[Pagamento], caminho: str):
+        """
+        Grava o cupom em PDF (bobina de 80 mm) para arquivo.
+        
+        Raises:
+            ImportError: Se o reportlab não estiver instalado
+        """
+        from reportlab.lib.units import mm
+        from reportlab.pdfgen import canvas
+        
+        linhas = self.linhas_cabecalho() + self.linhas_venda(venda, pagamentos) + self.linhas_rodape()
+        largura, margem, altura_linha = 80 * mm, 4 * mm, 3.6 * mm
+        tamanho_fonte = (largura - 2 * margem) / (self.colunas * 0.6)  # Courier: 0,6 da fonte por caractere
+        altura = 2 * margem + altura_linha + sum(altura_linha * (1.4 if estilo == TITULO else 1) for _, estilo in linhas)
+        
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        
+        documento = canvas.Canvas(caminho, pagesize=(largura, altura))
+        documento.setTitle(f"Cupom {venda.numero_venda}")
+        y = altura - margem - altura_linha
+        for texto, estilo in linhas:
+            fonte = "Courier-Bold" if estilo in (NEGRITO, TITULO) else "Courier"
+            tamanho = tamanho_fonte * (1.4 if estilo == TITULO else 1)
+            documento.setFont(fonte, tamanho)
+            if estilo in (CENTRO, TITULO):
+                documento.drawCentredString(largura / 2, y, texto)
+            else:
+                documento.drawString(margem, y, texto)
+            y -= altura_linha * (1.4 if estilo == TITULO else 1)
+        documento.showPage()
+        documento.save()
+
+
+class SpoolerImpressao:
+    """Fila de cupons + thread que imprime e arquiva cada um."""
+    
+    def __init__(self, renderizador: RenderizadorCupom = None, dispositivo: str = None, pasta_pdf: str = None):
+        """
+        Args:
+            renderizador: Montagem do cupom (padrão: colunas/codificação do config)
+            dispositivo: Porta serial ou arquivo da impressora (padrão: [impressora] dispositivo)
+            pasta_pdf: Pasta de arquivamento em PDF (padrão: [impressora] pasta_pdf)
+        """
+        self.renderizador = renderizador or RenderizadorCupom()
+        self.dispositivo = dispositivo if dispositivo is not None else config.get('impressora', 'dispositivo', fallback='')
+        self.pasta_pdf = pasta_pdf if pasta_pdf is not None else config.get('impressora', 'pasta_pdf', fallback='')
+        self.tipo = config.get('impressora', 'tipo', fallback='arquivo')
+        self.baudrate = config.getint('impressora', 'baudrate', fallback=9600)
+        self.tentativas = config.getint('impressora', 'tentativas', fallback=3)
+        
+        self._fila = queue.Queue(maxsize=config.getint('impressora', 'capacidade_fila', fallback=50))
+        self._saida = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        
+        self.impressos = 0
+        self.falhas = 0
+        self.ultimo_erro: Optional[str] = None
+    
+    @property
+    def ativo(self) -> bool:
+        """Há impressora ou arquivamento em PDF configurado."""
+        return bool(self.dispositivo or self.pasta_pdf)
+    
+    def iniciar(self):
+        """Inicia a thread de impressão (chamadas repetidas não criam novas threads)."""
+        with self._lock:
+            if not (self._thread and self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._executar, daemon=True, name="spooler-impressao")
+                self._thread.start()
+    
+    # ==================== ENTRADA ====================
+    
+    def enfileirar(self, venda: Venda, pagamentos: List[Pagamento]) -> bool:
+        """
+        Entrega o cupom de uma venda finalizada para impressão; não espera a impressora.
+        
+        Returns:
+            False se a fila estiver cheia (impressora parada há muito tempo)
+        """
+        self.iniciar()
+        try:
+            self._fila.put_nowait((venda, list(pagamentos or [])))
+        except queue.Full:
+            return False
+        return True
+    
+    def profundidade(self) -> int:
+        """Cupons aguardando ou em impressão."""
+        return self._fila.unfinished_tasks
+    
+    def aguardar(self, timeout: float = None) -> bool:
+        """
+        Espera a fila esvaziar.
+        
+        Returns:
+            True se todos os cupons foram processados dentro do prazo
+        """
+        limite = time.monotonic() + timeout if timeout is not None else None
+        while self._fila.unfinished_tasks:
+            if limite is not None and time.monotonic() >= limite:
+                return False
+            time.sleep(0.05)
+        return True
+    
+    def obter_status(self) -> Dict:
+        """fila (cupons pendentes), impressos, falhas e erro (último erro, None se ok)."""
+        return {
+            "fila": self.profundidade(),
+            "impressos": self.impressos,
+            "falhas": self.falhas,
+            "erro": self.ultimo_erro
+        }
+    
+    # ==================== IMPRESSÃO ====================
+    
+    def _executar(self):
+        """Laço da thread: um cupom por vez, na ordem das vendas."""
+        while True:
+            venda, pagamentos = self._fila.get()
+            try:
+                self._processar(venda, pagamentos)
+            finally:
+                self._fila.task_done()
+    
+    def _processar(self, venda: Venda, pagamentos: List[Pagamento]):
+        """Imprime (com novas tentativas) e arquiva o cupom; falhas não param a fila."""
+        sucesso = True
+        
+        if self.dispositivo:
+            dados = self.renderizador.escpos(venda, pagamentos)
+            espera = 0.5
+            for tentativa in range(1, self.tentativas + 1):
+                try:
+                    self._escrever(dados)
+                    break
+                except Exception as e:
+                    self._fechar_saida()
+                    self.ultimo_erro = f"Impressora: {e}"
+                    if tentativa == self.tentativas:
+                        sucesso = False
+                        Logger.log_erro(f"IMPRESSÃO CUPOM {venda.numero_venda}", e)
+                    else:
+                        time.sleep(espera)
+                        espera *= 2
+        
+        if self.pasta_pdf:
+            caminho = os.path.join(
+                self.pasta_pdf, (venda.data_hora or datetime.now()).strftime("%Y-%m-%d"), f"{venda.numero_venda}.pdf"
+            )
+            try:
+                self.renderizador.pdf(venda, pagamentos, caminho)
+            except Exception as e:
+                sucesso = False
+                self.ultimo_erro = f"PDF do cupom: {e}"
+                Logger.log_erro(f"PDF CUPOM {venda.numero_venda}", e)
+        
+        if sucesso:
+            self.impressos += 1
+            self.ultimo_erro = None
+        else:
+            self.falhas += 1
+    
+    def _escrever(self, dados: bytes):
+        """Escreve no dispositivo, abrindo-o na primeira vez (fica aberto entre cupons)."""
+        if self._saida is None:
+            if self.tipo == 'serial':
+                import serial
+                self._saida = serial.Serial(self.dispositivo, self.baudrate, timeout=5, write_timeout=10)
+            else:
+                # Arquivo comum ou dispositivo de caracteres (/dev/usb/lp0, pty de testes)
+                self._saida = open(self.dispositivo, 'ab', buffering=0)
+        self._saida.write(dados)
+        self._saida.flush()
+    
+    def _fechar_saida(self):
+        """Fecha o dispositivo; o próximo cupom tenta abrir de novo."""
+        if self._saida is not None:
+            try:
+                self._saida.close()
+            except Exception:
+                pass
+            self._saida = None
+
+
+# Instância global usada pela frente de caixa
+spooler_impressao = SpoolerImpressao()
+
+# Termina os cupons já enviados ao fechar o programa normalmente
+atexit.register(spooler_impressao.aguardar, 5)
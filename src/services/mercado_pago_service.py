@@ -2,7 +2,6 @@
 Serviço de integração com Mercado Pago para PIX.
 """
 
-import requests
 import json
 import time
 from decimal import Decimal, ROUND_HALF_UP
@@ -10,15 +9,17 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 
 from src.utils.logger import Logger
+from src.services.gateway_http import GatewayHTTP, gateway_http
 from src.services.config_service import config_service, PERCENTUAL_PLATAFORMA, PIX_PLATAFORMA
 
 
 class MercadoPagoService:
     """Serviço para integração com Mercado Pago."""
     
-    def __init__(self):
+    def __init__(self, http: GatewayHTTP = None):
         # Access token vem das configurações do banco de dados
-        self.base_url = "https://api.mercadopago.com"
+        # Sessão HTTP compartilhada (pool keep-alive, timeouts e novas tentativas)
+        self.http = http or gateway_http
         self.webhook_url = "https://your-domain.com/webhook/mercadopago"  # URL do webhook
     
     @property
@@ -49,8 +50,6 @@ class MercadoPagoService:
             Logger.log_operacao("MercadoPago", "PIX_SEM_SPLIT", 
                               f"PIX criado sem split - Total: R$ {valor_float:.2f}".replace('.', ','))
             
-            url = f"{self.base_url}/v1/payments"
-            
             headers = {
                 "Authorization": f"Bearer {self.access_token}",
                 "Content-Type": "application/json",
@@ -79,7 +78,7 @@ class MercadoPagoService:
                 }
             }
             
-            response = requests.post(url, headers=headers, json=payment_data)
+            response = self.http.post("/v1/payments", "criar_pagamento_pix", headers=headers, json=payment_data)
             
             if response.status_code == 201:
                 payment_data = response.json()
@@ -132,13 +131,11 @@ class MercadoPagoService:
             Status do pagamento ou None se erro
         """
         try:
-            url = f"{self.base_url}/v1/payments/{payment_id}"
-            
             headers = {
                 "Authorization": f"Bearer {self.access_token}"
             }
             
-            response = requests.get(url, headers=headers)
+            response = self.http.get(f"/v1/payments/{payment_id}", "verificar_status_pagamento", headers=headers)
             
             if response.status_code == 200:
                 payment_data = response.json()
@@ -167,13 +164,11 @@ class MercadoPagoService:
             Dados completos do pagamento ou None se erro
         """
         try:
-            url = f"{self.base_url}/v1/payments/{payment_id}"
-            
             headers = {
                 "Authorization": f"Bearer {self.access_token}"
             }
             
-            response = requests.get(url, headers=headers)
+            response = self.http.get(f"/v1/payments/{payment_id}", "obter_dados_pagamento", headers=headers)
             
             if response.status_code == 200:
                 return response.json()
@@ -184,6 +179,8 @@ class MercadoPagoService:
         except Exception as e:
             Logger.log_erro("MercadoPago", f"Erro ao obter dados do pagamento: {str(e)}")
             return None
+    
+    def cancelar_pagamento(self, payment_id: str) -> bool:
         """
         Cancela um pagamento PIX.
         
@@ -194,8 +191,6 @@ class MercadoPagoService:
             True se cancelado com sucesso
         """
         try:
-            url = f"{self.base_url}/v1/payments/{payment_id}"
-            
             headers = {
                 "Authorization": f"Bearer {self.access_token}",
                 "Content-Type": "application/json",
@@ -204,7 +199,7 @@ class MercadoPagoService:
             
             data = {"status": "cancelled"}
             
-            response = requests.put(url, headers=headers, json=data)
+            response = self.http.put(f"/v1/payments/{payment_id}", "cancelar_pagamento", headers=headers, json=data)
             
             if response.status_code == 200:
                 Logger.log_operacao("MercadoPago", "PIX_CANCELADO", f"Payment ID: {payment_id}")
@@ -218,88 +213,5 @@ class MercadoPagoService:
             return False
 
 
-class PIXMonitor:
-    """Monitor para verificar status de pagamentos PIX."""
-    
-    def __init__(self, mercado_pago_service: MercadoPagoService):
-        self.mp_service = mercado_pago_service
-        self.pagamentos_monitorados = {}  # payment_id -> callback
-        self.monitoring = False
-    
-    def adicionar_monitoramento(self, payment_id: str, callback_aprovado, callback_erro):
-        """
-        Adiciona um pagamento para monitoramento.
-        
-        Args:
-            payment_id: ID do pagamento
-            callback_aprovado: Função chamada quando aprovado
-            callback_erro: Função chamada quando erro/cancelado
-        """
-        self.pagamentos_monitorados[payment_id] = {
-            "callback_aprovado": callback_aprovado,
-            "callback_erro": callback_erro,
-            "tentativas": 0,
-            "max_tentativas": 60  # 5 minutos (5s * 60)
-        }
-        
-        if not self.monitoring:
-            self.iniciar_monitoramento()
-    
-    def iniciar_monitoramento(self):
-        """Inicia o monitoramento dos pagamentos."""
-        import threading
-        
-        def monitorar():
-            self.monitoring = True
-            
-            while self.pagamentos_monitorados and self.monitoring:
-                payments_to_remove = []
-                
-                for payment_id, data in self.pagamentos_monitorados.items():
-                    status = self.mp_service.verificar_status_pagamento(payment_id)
-                    
-                    if status == "approved":
-                        # Pagamento aprovado
-                        data["callback_aprovado"]()
-                        payments_to_remove.append(payment_id)
-                        
-                    elif status == "cancelled" or status == "rejected":
-                        # Pagamento cancelado/rejeitado
-                        data["callback_erro"]("Pagamento " + status)
-                        payments_to_remove.append(payment_id)
-                        
-                    elif data["tentativas"] >= data["max_tentativas"]:
-                        # Timeout
-                        data["callback_erro"]("Timeout - PIX expirado")
-                        payments_to_remove.append(payment_id)
-                    
-                    else:
-                        # Ainda pendente, incrementa tentativas
-                        data["tentativas"] += 1
-                
-                # Remove pagamentos finalizados
-                for payment_id in payments_to_remove:
-                    del self.pagamentos_monitorados[payment_id]
-                
-                # Aguarda 5 segundos antes da próxima verificação
-                time.sleep(5)
-            
-            self.monitoring = False
-        
-        thread = threading.Thread(target=monitorar, daemon=True)
-        thread.start()
-    
-    def parar_monitoramento(self):
-        """Para o monitoramento."""
-        self.monitoring = False
-        self.pagamentos_monitorados.clear()
-    
-    def remover_monitoramento(self, payment_id: str):
-        """Remove um pagamento específico do monitoramento."""
-        if payment_id in self.pagamentos_monitorados:
-            del self.pagamentos_monitorados[payment_id]
-
-
 # Instância global
 mercado_pago_service = MercadoPagoService()
-pix_monitor = PIXMonitor(mercado_pago_service)
\ No newline at end of file
@@ -0,0 +1,167 @@
+"""
+Numeração das vendas por caixa (hi/lo).
+
+Cada caixa reserva no banco um bloco de números (tabela sequencias_venda)
+e emite os números do bloco em memória. O próximo bloco é reservado em
+segundo plano quando o atual está acabando, então a finalização da venda
+quase nunca espera o banco. Os números são únicos entre caixas (levam o ID
+do caixa) e crescentes dentro de cada caixa. Números de um bloco não usado
+(programa fechado no meio do bloco) são simplesmente pulados.
+
+Sem banco, o caixa segue com números locais e só volta a tentar reservar
+depois de uma pausa, sempre em segundo plano: a tela nunca trava esperando
+o banco que caiu.
+"""
+
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Set
+
+from src.config.config_reader import config
+from src.utils.logger import Logger
+
+
+class NumeracaoVendas:
+    """Emite números de venda a partir de blocos reservados por caixa."""
+    
+    _BASE36 = "0123456789abcdefghijklmnopqrstuvwxyz"
+    
+    def __init__(self, tamanho_bloco: int = None, reservar: Callable[[int, int], int] = None,
+                 pausa_falha: float = None):
+        """
+        Args:
+            tamanho_bloco: Números reservados por ida ao banco (padrão: config)
+            reservar: Função reservar(caixa_id, tamanho) -> primeiro número
+                do bloco (padrão: SequenciaVendaDAO.reservar_bloco)
+            pausa_falha: Segundos sem tentar o banco após uma falha de reserva
+                (padrão: config)
+        """
+        if tamanho_bloco is None:
+            tamanho_bloco = config.getint('caixa', 'tamanho_bloco_numeracao', fallback=50)
+        if reservar is None:
+            from src.dao.sequencia_venda_dao import SequenciaVendaDAO
+            reservar = SequenciaVendaDAO.reservar_bloco
+        if pausa_falha is None:
+            pausa_falha = config.getfloat('caixa', 'pausa_falha_numeracao', fallback=30.0)
+        
+        self.tamanho_bloco = max(1, tamanho_bloco)
+        # Com até este número de vendas restantes no bloco o próximo já é reservado
+        self.limiar_reserva = max(1, self.tamanho_bloco // 5)
+        self.pausa_falha = pausa_falha
+        self._reservar = reservar
+        self._blocos: Dict[int, List[int]] = {}  # caixa_id -> [próximo, fim (exclusivo)]
+        self._proximos: Dict[int, List[int]] = {}  # bloco já reservado em segundo plano
+        self._reservando: Set[int] = set()
+        self._pausa_ate: Optional[float] = None  # monotonic; None = sem falha pendente
+        self._ultimo_local = 0
+        # Distingue os números locais de processos diferentes do mesmo caixa
+        self._sufixo_local = uuid.uuid4().hex[:4]
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def formatar(caixa_id: int, numero: int) -> str:
+        """Número da venda exibido e gravado: V<caixa>-<sequência>."""
+        return f"V{caixa_id}-{numero:06d}"
+    
+    def proximo_numero(self, caixa_id: int = None) -> str:
+        """
+        Próximo número de venda do caixa.
+        
+        Sem bloco disponível e sem banco, emite um número local
+        (V<caixa>-L<milissegundos em base 36><sufixo aleatório do processo>)
+        para o caixa continuar vendendo pelo diário local.
+        """
+        caixa_id = caixa_id or 0
+        
+        with self._lock:
+            bloco = self._bloco_disponivel(caixa_id)
+            
+            if bloco is None:
+                if self._pausa_ate is not None:
+                    # Banco falhou há pouco: não trava a venda; tenta de novo em segundo plano
+                    self._reservar_em_segundo_plano(caixa_id)
+                    return self._numero_local(caixa_id)
+                
+                try:
+                    inicio = self._reservar(caixa_id, self.tamanho_bloco)
+                except Exception as e:
+                    self._registrar_falha(caixa_id, e)
+                    return self._numero_local(caixa_id)
+                bloco = [inicio, inicio + self.tamanho_bloco]
+                self._blocos[caixa_id] = bloco
+            
+            numero = bloco[0]
+            bloco[0] += 1
+            
+            if bloco[1] - bloco[0] <= self.limiar_reserva:
+                self._reservar_em_segundo_plano(caixa_id)
+        
+        return self.formatar(caixa_id, numero)
+    
+    def prereservar(self, caixa_id: int = None):
+        """Reserva o primeiro bloco do caixa em segundo plano (ao abrir a frente de caixa)."""
+        with self._lock:
+            self._reservar_em_segundo_plano(caixa_id or 0)
+    
+    # ==================== RESERVA ====================
+    
+    def _bloco_disponivel(self, caixa_id: int) -> Optional[List[int]]:
+        """Bloco com números livres, trocando pelo já reservado quando o atual acaba (chamar com o lock)."""
+        bloco = self._blocos.get(caixa_id)
+        if bloco is not None and bloco[0] < bloco[1]:
+            return bloco
+        
+        bloco = self._proximos.pop(caixa_id, None)
+        if bloco is not None:
+            self._blocos[caixa_id] = bloco
+        return bloco
+    
+    def _reservar_em_segundo_plano(self, caixa_id: int):
+        """Dispara a reserva do próximo bloco, se ainda não houver um (chamar com o lock)."""
+        if caixa_id in self._proximos or caixa_id in self._reservando:
+            return
+        if self._pausa_ate is not None and time.monotonic() < self._pausa_ate:
+            return
+        
+        self._reservando.add(caixa_id)
+        threading.Thread(
+            target=self._reservar_proximo, args=(caixa_id,), daemon=True, name="numeracao-vendas"
+        ).start()
+    
+    def _reservar_proximo(self, caixa_id: int):
+        """Thread: reserva um bloco e o guarda para quando o atual acabar."""
+        try:
+            inicio = self._reservar(caixa_id, self.tamanho_bloco)
+        except Exception as e:
+            with self._lock:
+                self._reservando.discard(caixa_id)
+                self._registrar_falha(caixa_id, e)
+            return
+        
+        with self._lock:
+            self._reservando.discard(caixa_id)
+            self._pausa_ate = None
+            atual = self._blocos.get(caixa_id)
+            # Um bloco reservado depois (sem esperar esta thread) já passou à frente:
+            # usar este agora faria os números voltarem; os números dele são pulados
+            if atual is None or inicio >= atual[1]:
+                self._proximos[caixa_id] = [inicio, inicio + self.tamanho_bloco]
+    
+    def _registrar_falha(self, caixa_id: int, erro: Exception):
+        """Suspende as tentativas no banco por pausa_falha segundos (chamar com o lock)."""
+        self._pausa_ate = time.monotonic() + self.pausa_falha
+        Logger.log_erro(f"Reserva de números de venda (caixa {caixa_id})", erro)
+    
+    def _numero_local(self, caixa_id: int) -> str:
+        """Número emitido sem o banco (chamar com o lock); cabe em numero_venda VARCHAR(20)."""
+        self._ultimo_local = max(self._ultimo_local + 1, int(time.time() * 1000))
+        valor, digitos = self._ultimo_local, ""
+        while valor:
+            valor, resto = divmod(valor, 36)
+            digitos = self._BASE36[resto] + digitos
+        return f"V{caixa_id}-L{digitos}{self._sufixo_local}"
+
+
+# Instância global
+numeracao_vendas = NumeracaoVendas()
@@ -0,0 +1,222 @@
+"""
+Central de status de pagamentos PIX.
+
+Substitui o antigo PIXMonitor (laço que consultava a API a cada 5 s para
+todos os pagamentos). O status chega primeiro pelo webhook do Mercado Pago:
+no processo do web_app via notificar(), e na frente de caixa pela tabela
+pix_notificacoes, lida em uma única consulta local. A consulta à API fica
+como reserva, em paralelo e com intervalo crescente por pagamento.
+"""
+
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from src.config.config_reader import config
+from src.dao.pix_notificacao_dao import PixNotificacaoDAO
+from src.services.mercado_pago_service import MercadoPagoService, mercado_pago_service
+from src.utils.logger import Logger
+
+
+class PagamentoStatusHub:
+    """Acompanha pagamentos pendentes e dispara os callbacks de aprovação/erro."""
+    
+    STATUS_APROVADO = "approved"
+    STATUS_ERRO = ("cancelled", "rejected", "refunded", "charged_back")
+    
+    # Fator de crescimento do intervalo entre consultas à API
+    FATOR_BACKOFF = 1.5
+    
+    def __init__(self, mp_service: MercadoPagoService):
+        self.mp_service = mp_service
+        self._lock = threading.Lock()
+        self._acordar = threading.Event()
+        self._pagamentos: Dict[str, dict] = {}
+        self._em_consulta = set()
+        self._callbacks = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
+        self.intervalo_notificacoes = config.getfloat('pix', 'intervalo_notificacoes', fallback=0.5)
+        self.intervalo_consulta_inicial = config.getfloat('pix', 'intervalo_consulta_inicial', fallback=3.0)
+        self.intervalo_consulta_maximo = config.getfloat('pix', 'intervalo_consulta_maximo', fallback=30.0)
+        self.consultas_simultaneas = config.getint('pix', 'consultas_simultaneas', fallback=4)
+        self.prazo_pagamento = config.getfloat('pix', 'prazo_pagamento', fallback=900.0)
+    
+    # ==================== REGISTRO ====================
+    
+    def registrar(self, payment_id: str, callback_aprovado: Callable[[], None],
+                  callback_erro: Callable[[str], None]):
+        """
+        Passa a acompanhar um pagamento.
+        
+        Cada callback é chamado no máximo uma vez, sempre pela mesma thread
+        de despacho (nunca pela thread do webhook ou da consulta). Quem mexe
+        em widgets Tk deve repassar a chamada para a thread da interface.
+        
+        Args:
+            payment_id: ID do pagamento
+            callback_aprovado: Função chamada quando aprovado
+            callback_erro: Função chamada com o motivo quando recusado/cancelado/expirado
+        """
+        agora = time.monotonic()
+        
+        with self._lock:
+            self._pagamentos[str(payment_id)] = {
+                "callback_aprovado": callback_aprovado,
+                "callback_erro": callback_erro,
+                "prazo": agora + self.prazo_pagamento,
+                "intervalo": self.intervalo_consulta_inicial,
+                # A primeira consulta à API espera o webhook ter uma chance
+                "proxima_consulta": agora + self.intervalo_consulta_inicial
+            }
+        
+        self._iniciar()
+        self._acordar.set()
+    
+    def remover(self, payment_id: str):
+        """Deixa de acompanhar um pagamento (sem chamar callbacks)."""
+        with self._lock:
+            self._pagamentos.pop(str(payment_id), None)
+    
+    def parar(self):
+        """Deixa de acompanhar todos os pagamentos."""
+        with self._lock:
+            self._pagamentos.clear()
+    
+    def notificar(self, payment_id: str, status: str = None):
+        """
+        Recebe uma notificação de mudança de status (webhook).
+        
+        Args:
+            payment_id: ID do pagamento
+            status: Status já conhecido; se None, agenda consulta imediata à API
+        """
+        payment_id = str(payment_id)
+        
+        if status and self._resolver(payment_id, status):
+            return
+        
+        with self._lock:
+            acompanhamento = self._pagamentos.get(payment_id)
+            if acompanhamento is None:
+                return
+            acompanhamento["proxima_consulta"] = 0
+        
+        self._acordar.set()
+    
+    # ==================== THREADS ====================
+    
+    def _iniciar(self):
+        """Cria as threads de acompanhamento e de despacho na primeira utilização."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.consultas_simultaneas, thread_name_prefix="pix-consulta"
+            )
+            self._thread = threading.Thread(target=self._executar, daemon=True, name="pix-status")
+            self._thread.start()
+            threading.Thread(target=self._despachar, daemon=True, name="pix-callbacks").start()
+    
+    def _executar(self):
+        """Laço principal: lê notificações, expira prazos e agenda consultas de reserva."""
+        while True:
+            self._acordar.clear()
+            agora = time.monotonic()
+            
+            with self._lock:
+                if not self._pagamentos:
+                    espera = None
+                else:
+                    for payment_id in [p for p, a in self._pagamentos.items() if a["prazo"] <= agora]:
+                        acompanhamento = self._pagamentos.pop(payment_id)
+                        self._callbacks.put((acompanhamento["callback_erro"], ("Timeout - PIX expirado",)))
+                    
+                    devidos = [
+                        p for p, a in self._pagamentos.items()
+                        if a["proxima_consulta"] <= agora and p not in self._em_consulta
+                    ]
+                    self._em_consulta.update(devidos)
+                    pendentes = list(self._pagamentos)
+                    espera = self.intervalo_notificacoes
+            
+            if espera is None:
+                # Nada pendente: dorme até o próximo registrar()
+                self._acordar.wait()
+                continue
+            
+            try:
+                if pendentes:
+                    for payment_id, status in PixNotificacaoDAO.buscar_status(pendentes).items():
+                        self._resolver(payment_id, status)
+                
+                for payment_id in devidos:
+                    self._executor.submit(self._consultar, payment_id)
+            except Exception as e:
+                Logger.log_erro("PIX STATUS", e)
+            
+            self._acordar.wait(espera)
+    
+    def _consultar(self, payment_id: str):
+        """Consulta a API para um pagamento e reagenda com intervalo maior se ainda pendente."""
+        status = None
+        try:
+            status = self.mp_service.verificar_status_pagamento(payment_id)
+        except Exception as e:
+            Logger.log_erro("PIX STATUS", e)
+        
+        if status and self._resolver(payment_id, status):
+            with self._lock:
+                self._em_consulta.discard(payment_id)
+            return
+        
+        with self._lock:
+            self._em_consulta.discard(payment_id)
+            acompanhamento = self._pagamentos.get(payment_id)
+            if acompanhamento is None:
+                return
+            intervalo = min(acompanhamento["intervalo"] * self.FATOR_BACKOFF, self.intervalo_consulta_maximo)
+            acompanhamento["intervalo"] = intervalo
+            # Variação aleatória evita que vários caixas consultem no mesmo instante
+            acompanhamento["proxima_consulta"] = time.monotonic() + intervalo * random.uniform(0.8, 1.2)
+    
+    def _resolver(self, payment_id: str, status: str) -> bool:
+        """
+        Encerra o acompanhamento se o status for final e enfileira o callback.
+        
+        Returns:
+            True se o status é final (aprovado ou erro)
+        """
+        if status == self.STATUS_APROVADO:
+            chave, argumentos = "callback_aprovado", ()
+        elif status in self.STATUS_ERRO:
+            chave, argumentos = "callback_erro", (f"Pagamento {status}",)
+        else:
+            return False
+        
+        # Remover sob o lock garante um único disparo mesmo com webhook e consulta simultâneos
+        with self._lock:
+            acompanhamento = self._pagamentos.pop(payment_id, None)
+        
+        if acompanhamento:
+            Logger.log_operacao("PIX STATUS", status.upper(), f"Payment {payment_id}")
+            self._callbacks.put((acompanhamento[chave], argumentos))
+        return True
+    
+    def _despachar(self):
+        """Executa os callbacks em ordem, em uma única thread."""
+        while True:
+            callback, argumentos = self._callbacks.get()
+            try:
+                callback(*argumentos)
+            except Exception as e:
+                Logger.log_erro("PIX CALLBACK", e)
+
+
+# Instância global
+pagamento_status_hub = PagamentoStatusHub(mercado_pago_service)
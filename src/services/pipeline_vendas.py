@@ -0,0 +1,105 @@
+"""
+Pipeline de gravação das vendas finalizadas no caixa.
+
+finalizar_venda() grava a venda no diário local (venda_journal) antes de
+confirmá-la ao operador: com WAL a gravação é um append sequencial e leva
+poucos milissegundos, e a venda sobrevive a queda do programa ou de
+energia assim que enviar() retorna. Só a replicação para o MySQL é feita
+em segundo plano, pela thread do ReplicadorVendas.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional
+
+from src.models.pagamento import Pagamento
+from src.models.venda import Venda
+from src.services.venda_journal import VendaJournal, ReplicadorVendas, venda_journal, replicador_vendas
+from src.utils.logger import Logger
+from src.utils.metricas import MetricasLatencia
+
+
+class PipelineVendas:
+    """Grava as vendas no diário local e aciona a replicação para o MySQL."""
+    
+    def __init__(self, journal: VendaJournal, replicador: ReplicadorVendas):
+        self.journal = journal
+        self.replicador = replicador
+        self.metricas = MetricasLatencia()
+        
+        self.ultimo_erro: Optional[str] = None
+        self._lock = threading.Lock()
+        self._ultima_venda: Optional[float] = None
+    
+    def iniciar(self):
+        """Inicia a replicação (chamadas repetidas não criam novas threads)."""
+        self.replicador.iniciar()
+    
+    # ==================== ENTRADA ====================
+    
+    def enviar(self, venda: Venda, pagamentos: List[Pagamento]) -> bool:
+        """
+        Grava uma venda finalizada no diário local e acorda a replicação.
+        
+        Args:
+            venda: Venda finalizada com itens
+            pagamentos: Pagamentos aprovados
+        
+        Returns:
+            True se a venda está gravada em disco; False em falha de disco
+            (a venda não foi registrada e não deve ser confirmada)
+        """
+        self.iniciar()
+        
+        with self._lock:
+            agora = time.monotonic()
+            if self._ultima_venda is not None:
+                self.metricas.registrar("entre_vendas", agora - self._ultima_venda)
+            self._ultima_venda = agora
+        
+        inicio = time.perf_counter()
+        try:
+            self.journal.registrar(venda, pagamentos)
+        except Exception as e:
+            self.metricas.registrar("diario", time.perf_counter() - inicio, erro=True)
+            self.ultimo_erro = f"Diário local: {e}"
+            Logger.log_erro("PIPELINE VENDAS", e)
+            return False
+        
+        self.metricas.registrar("diario", time.perf_counter() - inicio)
+        self.ultimo_erro = None
+        self.replicador.acordar()
+        return True
+    
+    # ==================== ACOMPANHAMENTO ====================
+    
+    def obter_status(self) -> Dict:
+        """
+        Situação atual para o indicador da frente de caixa.
+        
+        Returns:
+            dict com pendentes (aguardando o MySQL), rejeitadas (recusadas
+            pelo MySQL, só no diário) e erro (último erro de gravação ou
+            replicação, None se tudo ok)
+        """
+        try:
+            pendentes = self.journal.contar_pendentes()
+            rejeitadas = self.journal.contar_rejeitadas()
+        except Exception as e:
+            return {"pendentes": None, "rejeitadas": 0, "erro": f"Diário local: {e}"}
+        
+        return {
+            "pendentes": pendentes,
+            "rejeitadas": rejeitadas,
+            "erro": self.ultimo_erro or (self.replicador.ultimo_erro if pendentes else None)
+        }
+    
+    def obter_metricas(self) -> Dict[str, dict]:
+        """Latência por etapa: validação, diário, replicação e atraso até o MySQL."""
+        metricas = self.metricas.obter()
+        metricas.update(self.replicador.metricas.obter())
+        return metricas
+
+
+# Instância global usada pela frente de caixa
+pipeline_vendas = PipelineVendas(venda_journal, replicador_vendas)
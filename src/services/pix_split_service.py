@@ -2,21 +2,22 @@
 Serviço para processamento de split via PIX interno.
 """
 
-import requests
 import json
 from decimal import Decimal, ROUND_HALF_UP
 from datetime import datetime
 from typing import Optional, Dict, Any
 
 from src.utils.logger import Logger
+from src.services.gateway_http import GatewayHTTP, gateway_http
 from src.services.config_service import config_service, PERCENTUAL_CLIENTE, PERCENTUAL_PLATAFORMA, PIX_PLATAFORMA
 
 
 class PIXSplitService:
     """Serviço para processamento de split via PIX interno."""
 
-    def __init__(self):
-        self.base_url = "https://api.mercadopago.com"
+    def __init__(self, http: GatewayHTTP = None):
+        # Sessão HTTP compartilhada com o MercadoPagoService
+        self.http = http or gateway_http
 
     @property
     def access_token(self) -> str:
@@ -155,13 +156,11 @@ class PIXSplitService:
             Status da transferência ou None se erro
         """
         try:
-            url = f"{self.base_url}/v1/payments/{transfer_id}"
-
             headers = {
                 "Authorization": f"Bearer {self.access_token}"
             }
 
-            response = requests.get(url, headers=headers)
+            response = self.http.get(f"/v1/payments/{transfer_id}", "verificar_status_transferencia", headers=headers)
 
             if response.status_code == 200:
                 transfer_data = response.json()
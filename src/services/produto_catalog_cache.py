@@ -0,0 +1,189 @@
+"""
+Cache em memória do catálogo de produtos para a frente de caixa.
+Carrega os produtos ativos uma vez e se mantém atualizado consultando
+apenas os produtos alterados desde a última leitura (produtos.data_atualizacao).
+"""
+
+import threading
+import unicodedata
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from src.config.config_reader import config
+from src.dao.produto_dao import ProdutoDAO
+from src.models.produto import Produto
+from src.utils.logger import Logger
+
+
+class ProdutoCatalogCache:
+    """Catálogo de produtos ativos indexado por código de barras e por nome."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._por_codigo: Dict[str, Produto] = {}
+        self._por_id: Dict[int, Produto] = {}
+        self._nomes: Dict[int, str] = {}  # id -> nome normalizado (índice de busca por nome)
+        self._marcador: Optional[datetime] = None
+        self._carregado = False
+        self._thread: Optional[threading.Thread] = None
+        self._parar = threading.Event()
+    
+    @property
+    def carregado(self) -> bool:
+        """Indica se a carga inicial do catálogo já foi feita."""
+        return self._carregado
+    
+    @staticmethod
+    def normalizar(texto: str) -> str:
+        """Converte para minúsculas e remove acentos (busca 'acucar' encontra 'Açúcar')."""
+        texto = unicodedata.normalize('NFKD', texto or '')
+        return ''.join(c for c in texto if not unicodedata.combining(c)).lower()
+    
+    # ==================== CICLO DE VIDA ====================
+    
+    def iniciar(self, intervalo: float = None):
+        """
+        Inicia a thread que carrega o catálogo e o mantém atualizado.
+        
+        Chamadas repetidas não criam novas threads.
+        
+        Args:
+            intervalo: Segundos entre verificações de alteração (usa config.ini se None)
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        
+        if intervalo is None:
+            intervalo = config.getfloat('caixa', 'intervalo_atualizacao_catalogo', fallback=3.0)
+        
+        self._parar.clear()
+        self._thread = threading.Thread(
+            target=self._executar, args=(intervalo,), daemon=True, name="catalogo-produtos"
+        )
+        self._thread.start()
+    
+    def parar(self):
+        """Interrompe a atualização periódica."""
+        self._parar.set()
+    
+    def _executar(self, intervalo: float):
+        """Laço da thread de atualização."""
+        while not self._parar.is_set():
+            try:
+                if self._carregado:
+                    self.atualizar()
+                else:
+                    self.carregar()
+            except Exception as e:
+                Logger.log_erro("CATALOGO CACHE", e)
+            
+            self._parar.wait(intervalo)
+    
+    # ==================== CARGA E ATUALIZAÇÃO ====================
+    
+    def carregar(self):
+        """Carrega o catálogo completo de produtos ativos."""
+        # Lê o marcador antes: o que mudar durante a carga é relido na próxima atualização
+        marcador = ProdutoDAO.obter_marcador_alteracao()
+        produtos = ProdutoDAO.buscar_todos(apenas_ativos=True)
+        
+        with self._lock:
+            self._por_codigo.clear()
+            self._por_id.clear()
+            self._nomes.clear()
+            for produto in produtos:
+                self._indexar(produto)
+            self._marcador = marcador
+            self._carregado = True
+        
+        Logger.log_operacao("Sistema", "CATALOGO CARREGADO", f"{len(produtos)} produtos")
+    
+    def atualizar(self) -> int:
+        """
+        Aplica as alterações feitas no catálogo desde a última leitura.
+        
+        Returns:
+            Número de produtos alterados
+        """
+        if self._marcador is None:
+            self.carregar()
+            return len(self._por_id)
+        
+        # Usa >= porque data_atualizacao tem resolução de segundos:
+        # linhas gravadas no mesmo segundo do marcador são relidas.
+        alterados = ProdutoDAO.buscar_alterados_desde(self._marcador)
+        if not alterados:
+            return 0
+        
+        with self._lock:
+            for produto in alterados:
+                self._remover(produto.id)
+                if produto.ativo:
+                    self._indexar(produto)
+            self._marcador = max(p.data_atualizacao for p in alterados)
+        
+        return len(alterados)
+    
+    def _indexar(self, produto: Produto):
+        """Inclui o produto nos índices (chamar com o lock adquirido)."""
+        self._por_id[produto.id] = produto
+        self._nomes[produto.id] = self.normalizar(produto.nome)
+        if produto.codigo_barras:
+            self._por_codigo[produto.codigo_barras] = produto
+    
+    def _remover(self, produto_id: int):
+        """Retira o produto dos índices (chamar com o lock adquirido)."""
+        anterior = self._por_id.pop(produto_id, None)
+        self._nomes.pop(produto_id, None)
+        if anterior and anterior.codigo_barras and self._por_codigo.get(anterior.codigo_barras) is anterior:
+            del self._por_codigo[anterior.codigo_barras]
+    
+    # ==================== CONSULTAS ====================
+    
+    def buscar_por_codigo_barras(self, codigo_barras: str) -> Optional[Produto]:
+        """Busca um produto ativo pelo código de barras."""
+        if not self._carregado:
+            return ProdutoDAO.buscar_por_codigo_barras(codigo_barras)
+        return self._por_codigo.get(codigo_barras)
+    
+    def buscar_por_id(self, id: int) -> Optional[Produto]:
+        """Busca um produto ativo pelo ID."""
+        if not self._carregado:
+            return ProdutoDAO.buscar_por_id(id)
+        return self._por_id.get(id)
+    
+    def buscar_por_nome(self, nome: str, limite: int = None) -> List[Produto]:
+        """
+        Busca produtos ativos cujo nome contém o termo (sem diferenciar acentos).
+        
+        Args:
+            nome: Termo de busca
+            limite: Quantidade máxima de resultados
+        
+        Returns:
+            Lista de produtos ordenada por nome
+        """
+        if not self._carregado:
+            produtos = ProdutoDAO.buscar_por_nome(nome)
+            return produtos[:limite] if limite else produtos
+        
+        termo = self.normalizar(nome)
+        with self._lock:
+            encontrados = [self._por_id[pid] for pid, n in self._nomes.items() if termo in n]
+        
+        encontrados.sort(key=lambda p: p.nome)
+        return encontrados[:limite] if limite else encontrados
+    
+    def listar(self, limite: int = None) -> List[Produto]:
+        """Lista os produtos ativos ordenados por nome."""
+        if not self._carregado:
+            produtos = ProdutoDAO.buscar_todos()
+            return produtos[:limite] if limite else produtos
+        
+        with self._lock:
+            produtos = sorted(self._por_id.values(), key=lambda p: p.nome)
+        return produtos[:limite] if limite else produtos
+
+
+# Instância global usada pela frente de caixa
+produto_catalog_cache = ProdutoCatalogCache()
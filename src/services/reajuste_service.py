@@ -0,0 +1,100 @@
+"""
+Serviço de reajuste de preços em massa.
+
+A simulação mostra, em uma consulta, o preço atual e o novo de cada
+produto afetado. A aplicação percorre os produtos do filtro em faixas de
+IDs (uma transação curta por faixa) e grava uma linha de histórico por
+produto alterado, todas com o mesmo identificador de lote.
+"""
+
+import threading
+import uuid
+from decimal import Decimal
+from typing import Callable, Dict, Optional
+
+from src.dao.reajuste_preco_dao import ReajustePrecoDAO
+from src.models.reajuste_preco import RegraReajuste, FiltroProdutos
+from src.utils.logger import Logger
+
+
+class ReajusteService:
+    """Simula e aplica reajustes de preço por regra sobre um conjunto de produtos."""
+    
+    TAMANHO_FAIXA = 1000
+    
+    @staticmethod
+    def simular(regra: RegraReajuste, filtro: FiltroProdutos) -> Dict:
+        """
+        Prévia do reajuste, sem gravar nada.
+        
+        Returns:
+            dict com itens (produtos cujo preço muda, com preco_venda e
+            preco_novo), quantidade, total_atual e total_novo (somas dos preços)
+        
+        Raises:
+            ValueError: Se a regra for inválida
+        """
+        erro = regra.validar()
+        if erro:
+            raise ValueError(erro)
+        
+        itens = ReajustePrecoDAO.simular(regra, filtro)
+        return {
+            'itens': itens,
+            'quantidade': len(itens),
+            'total_atual': sum((i['preco_venda'] for i in itens), Decimal('0')),
+            'total_novo': sum((i['preco_novo'] for i in itens), Decimal('0'))
+        }
+    
+    @staticmethod
+    def aplicar(regra: RegraReajuste, filtro: FiltroProdutos, usuario_id: int, usuario_nome: str = "Sistema",
+                progresso: Callable[[int, Optional[int]], None] = None,
+                cancelar: threading.Event = None) -> Dict:
+        """
+        Aplica o reajuste em faixas de IDs, uma transação por faixa.
+        
+        Se uma faixa falhar, as anteriores continuam aplicadas (e registradas
+        no histórico com o mesmo lote); o erro é relançado.
+        
+        Args:
+            regra: Como calcular o novo preço
+            filtro: Produtos afetados
+            usuario_id: Usuário que autorizou (gravado no histórico)
+            usuario_nome: Nome para o log de operações
+            progresso: Chamado a cada faixa com (produtos alterados até agora, None)
+            cancelar: Evento que interrompe o reajuste entre uma faixa e outra
+        
+        Returns:
+            dict com lote (identificador no histórico), alterados e cancelado
+        
+        Raises:
+            ValueError: Se a regra for inválida
+        """
+        erro = regra.validar()
+        if erro:
+            raise ValueError(erro)
+        
+        lote = str(uuid.uuid4())
+        alterados = 0
+        ultimo_id = 0
+        cancelado = False
+        try:
+            while True:
+                if cancelar is not None and cancelar.is_set():
+                    cancelado = True
+                    break
+                limite = ReajustePrecoDAO.proximo_limite(filtro, regra, ultimo_id, ReajusteService.TAMANHO_FAIXA)
+                if limite is None:
+                    break
+                alterados += ReajustePrecoDAO.aplicar_faixa(regra, filtro, ultimo_id, limite, lote, usuario_id)
+                ultimo_id = limite
+                if progresso:
+                    progresso(alterados, None)
+        finally:
+            Logger.log_operacao(
+                usuario_nome, "REAJUSTE DE PREÇOS",
+                f"{regra.descricao()} - {alterados} produto(s) - lote {lote}{' - CANCELADO' if cancelado else ''}"
+            )
+        
+        return {'lote': lote, 'alterados': alterados, 'cancelado': cancelado}
+
@@ -0,0 +1,339 @@
+"""
+Diário local de vendas da frente de caixa (store-and-forward).
+
+A venda finalizada é gravada primeiro em um SQLite local (modo WAL) e o
+caixa segue para a próxima venda. Uma thread replicadora envia as vendas
+pendentes ao MySQL em lotes, usando a chave de idempotência da venda para
+que reenvios (queda de conexão após o commit, reinício do programa) não
+dupliquem nada. Lentidão ou queda do banco não param o caixa.
+
+Uma venda que o banco recusa repetidamente (chave estrangeira, número
+repetido) sai da fila após `tentativas_replicacao` tentativas e fica no
+diário como rejeitada, para conferência, sem travar as vendas seguintes.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from src.config.config_reader import config
+from src.dao.venda_dao import VendaDAO
+from src.models.pagamento import Pagamento
+from src.models.venda import Venda, ItemVenda
+from src.utils.logger import Logger
+from src.utils.metricas import MetricasLatencia
+
+
+class VendaJournal:
+    """Diário SQLite das vendas finalizadas no caixa e ainda não replicadas."""
+    
+    def __init__(self, caminho: str = None):
+        self.caminho = caminho or config.get('caixa', 'arquivo_diario', fallback='dados/diario_vendas.db')
+        self._lock = threading.Lock()
+        self._conexao: Optional[sqlite3.Connection] = None
+    
+    def _conectar(self) -> sqlite3.Connection:
+        """Abre o arquivo do diário na primeira utilização (chamar com o lock)."""
+        if self._conexao is None:
+            pasta = os.path.dirname(self.caminho)
+            if pasta:
+                os.makedirs(pasta, exist_ok=True)
+            
+            conexao = sqlite3.connect(self.caminho, check_same_thread=False, isolation_level=None)
+            # WAL: gravação sequencial e leitores não bloqueiam o caixa;
+            # FULL: a venda está no disco quando registrar() retorna
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.execute("PRAGMA synchronous=FULL")
+            conexao.execute("""
+                CREATE TABLE IF NOT EXISTS vendas_pendentes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    chave TEXT NOT NULL UNIQUE,
+                    numero_venda TEXT NOT NULL,
+                    dados TEXT NOT NULL,
+                    criado_em TEXT NOT NULL,
+                    tentativas INTEGER NOT NULL DEFAULT 0,
+                    ultimo_erro TEXT,
+                    replicado_em TEXT,
+                    rejeitado_em TEXT
+                )
+            """)
+            # Diários criados antes da coluna rejeitado_em
+            colunas = {row[1] for row in conexao.execute("PRAGMA table_info(vendas_pendentes)")}
+            if 'rejeitado_em' not in colunas:
+                conexao.execute("ALTER TABLE vendas_pendentes ADD COLUMN rejeitado_em TEXT")
+            conexao.execute("DROP INDEX IF EXISTS idx_replicado_em")
+            conexao.execute(
+                "CREATE INDEX IF NOT EXISTS idx_pendentes "
+                "ON vendas_pendentes (replicado_em, rejeitado_em, tentativas, id)"
+            )
+            self._conexao = conexao
+        
+        return self._conexao
+    
+    # ==================== SERIALIZAÇÃO ====================
+    
+    @staticmethod
+    def _serializar(venda: Venda, pagamentos: List[Pagamento]) -> str:
+        """Converte venda, itens e pagamentos em JSON."""
+        return json.dumps({
+            'venda': venda.to_dict(),
+            'itens': [item.to_dict() for item in venda.itens],
+            'pagamentos': [pagamento.to_dict() for pagamento in pagamentos]
+        }, default=lambda valor: valor.isoformat() if isinstance(valor, datetime) else str(valor))
+    
+    @staticmethod
+    def _desserializar(dados: str) -> Tuple[Venda, List[Pagamento]]:
+        """Reconstrói venda e pagamentos a partir do JSON do diário."""
+        conteudo = json.loads(dados)
+        
+        dados_venda = conteudo['venda']
+        dados_venda['data_hora'] = datetime.fromisoformat(dados_venda['data_hora'])
+        venda = Venda.from_dict(dados_venda)
+        venda.itens = [ItemVenda.from_dict(item) for item in conteudo['itens']]
+        
+        pagamentos = []
+        for dados_pagamento in conteudo['pagamentos']:
+            dados_pagamento['data_hora'] = datetime.fromisoformat(dados_pagamento['data_hora'])
+            pagamentos.append(Pagamento.from_dict(dados_pagamento))
+        
+        return venda, pagamentos
+    
+    # ==================== OPERAÇÕES ====================
+    
+    def registrar(self, venda: Venda, pagamentos: List[Pagamento]) -> str:
+        """
+        Grava uma venda finalizada no diário.
+        
+        Gera a chave de idempotência da venda se ela ainda não tiver uma.
+        Gravar de novo a mesma chave não tem efeito.
+        
+        Args:
+            venda: Venda finalizada com itens
+            pagamentos: Pagamentos aprovados
+        
+        Returns:
+            Chave de idempotência da venda
+        """
+        if not venda.chave_idempotencia:
+            venda.chave_idempotencia = str(uuid.uuid4())
+        
+        dados = self._serializar(venda, pagamentos)
+        
+        with self._lock:
+            self._conectar().execute(
+                "INSERT OR IGNORE INTO vendas_pendentes (chave, numero_venda, dados, criado_em) VALUES (?, ?, ?, ?)",
+                (venda.chave_idempotencia, venda.numero_venda, dados, datetime.now().isoformat())
+            )
+        
+        return venda.chave_idempotencia
+    
+    def buscar_pendentes(self, limite: int) -> List[Tuple[Venda, List[Pagamento]]]:
+        """
+        Retorna as vendas ainda não replicadas nem rejeitadas.
+        
+        As que falharam menos vezes vêm primeiro, e entre elas as mais
+        antigas: uma venda com erro não fica à frente das novas.
+        """
+        with self._lock:
+            rows = self._conectar().execute(
+                "SELECT dados FROM vendas_pendentes "
+                "WHERE replicado_em IS NULL AND rejeitado_em IS NULL "
+                "ORDER BY tentativas, id LIMIT ?",
+                (limite,)
+            ).fetchall()
+        
+        return [self._desserializar(row[0]) for row in rows]
+    
+    def marcar_replicadas(self, chaves: List[str]):
+        """Marca vendas como gravadas no MySQL."""
+        if not chaves:
+            return
+        
+        agora = datetime.now().isoformat()
+        with self._lock:
+            self._conectar().executemany(
+                "UPDATE vendas_pendentes SET replicado_em = ?, ultimo_erro = NULL WHERE chave = ?",
+                [(agora, chave) for chave in chaves]
+            )
+    
+    def registrar_falhas(self, falhas: Dict[str, str], limite_tentativas: int) -> List[str]:
+        """
+        Registra o erro da última tentativa de replicação de cada venda.
+        
+        Args:
+            falhas: {chave: erro} das vendas recusadas pelo banco
+            limite_tentativas: Tentativas após as quais a venda é rejeitada
+        
+        Returns:
+            Números das vendas que atingiram o limite e foram rejeitadas
+        """
+        if not falhas:
+            return []
+        
+        agora = datetime.now().isoformat()
+        with self._lock:
+            conexao = self._conectar()
+            conexao.executemany(
+                "UPDATE vendas_pendentes SET tentativas = tentativas + 1, ultimo_erro = ?, "
+                "rejeitado_em = CASE WHEN tentativas + 1 >= ? THEN ? END WHERE chave = ?",
+                [(erro[:500], limite_tentativas, agora, chave) for chave, erro in falhas.items()]
+            )
+            placeholders = ", ".join(["?"] * len(falhas))
+            rows = conexao.execute(
+                f"SELECT numero_venda FROM vendas_pendentes WHERE rejeitado_em = ? AND chave IN ({placeholders})",
+                (agora, *falhas)
+            ).fetchall()
+        
+        return [row[0] for row in rows]
+    
+    def contar_pendentes(self) -> int:
+        """Número de vendas aguardando replicação (sem as rejeitadas)."""
+        with self._lock:
+            return self._conectar().execute(
+                "SELECT COUNT(*) FROM vendas_pendentes WHERE replicado_em IS NULL AND rejeitado_em IS NULL"
+            ).fetchone()[0]
+    
+    def contar_rejeitadas(self) -> int:
+        """Número de vendas que o MySQL recusou e ficaram só no diário."""
+        with self._lock:
+            return self._conectar().execute(
+                "SELECT COUNT(*) FROM vendas_pendentes WHERE rejeitado_em IS NOT NULL AND replicado_em IS NULL"
+            ).fetchone()[0]
+    
+    def limpar_replicadas(self, dias: int = 7) -> int:
+        """Remove do diário as vendas replicadas há mais de `dias` dias."""
+        limite = (datetime.now() - timedelta(days=dias)).isoformat()
+        with self._lock:
+            return self._conectar().execute(
+                "DELETE FROM vendas_pendentes WHERE replicado_em IS NOT NULL AND replicado_em < ?",
+                (limite,)
+            ).rowcount
+
+
+class ReplicadorVendas:
+    """Thread que drena o diário local para o MySQL em lotes."""
+    
+    def __init__(self, journal: VendaJournal):
+        self.journal = journal
+        self.tamanho_lote = config.getint('caixa', 'tamanho_lote_replicacao', fallback=50)
+        self.intervalo = config.getfloat('caixa', 'intervalo_replicacao', fallback=2.0)
+        self.intervalo_maximo = config.getfloat('caixa', 'intervalo_maximo_replicacao', fallback=60.0)
+        self.limite_tentativas = config.getint('caixa', 'tentativas_replicacao', fallback=5)
+        
+        self.ultimo_erro: Optional[str] = None
+        self.metricas = MetricasLatencia()
+        self._acordar = threading.Event()
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock_drenagem = threading.Lock()
+    
+    def iniciar(self):
+        """Inicia a thread de replicação (chamadas repetidas não criam novas threads)."""
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._executar, daemon=True, name="replicador-vendas")
+        self._thread.start()
+    
+    def parar(self):
+        """Interrompe a replicação (as vendas pendentes ficam no diário)."""
+        self._parar.set()
+        self._acordar.set()
+    
+    def acordar(self):
+        """Pede uma replicação imediata (chamado após cada venda)."""
+        self._acordar.set()
+    
+    def _executar(self):
+        """Laço da thread: replica e, em caso de falha, espera cada vez mais."""
+        espera = self.intervalo
+        self.journal.limpar_replicadas()
+        
+        while not self._parar.is_set():
+            self._acordar.clear()
+            
+            try:
+                self.drenar()
+                espera = self.intervalo
+            except Exception as e:
+                self.ultimo_erro = str(e)
+                Logger.log_erro("REPLICADOR VENDAS", e)
+                espera = min(espera * 2, self.intervalo_maximo)
+            
+            self._acordar.wait(espera)
+    
+    def drenar(self) -> int:
+        """
+        Replica todas as vendas pendentes, lote a lote.
+        
+        Returns:
+            Número de vendas replicadas
+        
+        Raises:
+            Exception: Erros de conexão ou de trava do MySQL (o lote fica
+                pendente e é repetido depois)
+        """
+        total = 0
+        
+        # Evita que a thread e um fechamento de caixa enviem o mesmo lote juntos
+        with self._lock_drenagem:
+            while True:
+                lote = self.journal.buscar_pendentes(self.tamanho_lote)
+                if not lote:
+                    self.ultimo_erro = None
+                    return total
+                
+                inicio = time.perf_counter()
+                try:
+                    gravadas, falhas, estoque_negativo = VendaDAO.replicar_lote(lote)
+                except Exception:
+                    self.metricas.registrar("replicacao_lote", time.perf_counter() - inicio, erro=True)
+                    raise
+                self.metricas.registrar("replicacao_lote", time.perf_counter() - inicio, erro=bool(falhas))
+                self.journal.marcar_replicadas(gravadas)
+                self._registrar_atraso(lote, gravadas)
+                rejeitadas = self.journal.registrar_falhas(falhas, self.limite_tentativas)
+                total += len(gravadas)
+                
+                for numero_venda, produtos in estoque_negativo.items():
+                    Logger.log_operacao(
+                        "Sistema", "ESTOQUE NEGATIVO",
+                        f"Venda {numero_venda} replicada deixou estoque negativo: {', '.join(produtos)}"
+                    )
+                
+                if falhas:
+                    Logger.log_operacao(
+                        "Sistema", "REPLICACAO PENDENTE",
+                        f"{len(falhas)} venda(s) não replicada(s): {next(iter(falhas.values()))}"
+                    )
+                if rejeitadas:
+                    Logger.log_operacao(
+                        "Sistema", "VENDA REJEITADA",
+                        f"Venda(s) {', '.join(rejeitadas)} recusada(s) {self.limite_tentativas} vezes; "
+                        f"mantida(s) no diário para conferência"
+                    )
+                
+                if not gravadas:
+                    # Nenhum progresso: volta na próxima passada, quando as vendas
+                    # que acabaram de falhar já estarão atrás das com menos tentativas
+                    self.ultimo_erro = next(iter(falhas.values()))
+                    return total
+    
+    def _registrar_atraso(self, lote: List[Tuple[Venda, List[Pagamento]]], gravadas: List[str]):
+        """Mede quanto tempo cada venda replicada esperou entre o caixa e o MySQL."""
+        agora = datetime.now()
+        replicadas = set(gravadas)
+        for venda, _ in lote:
+            if venda.chave_idempotencia in replicadas:
+                self.metricas.registrar("atraso_replicacao", (agora - venda.data_hora).total_seconds())
+
+
+# Instâncias globais usadas pela frente de caixa
+venda_journal = VendaJournal()
+replicador_vendas = ReplicadorVendas(venda_journal)
@@ -2,25 +2,35 @@
 Serviço de gerenciamento de vendas.
 """
 
+import time
 from typing import Optional, List
 from decimal import Decimal
-from datetime import date
+from datetime import date, datetime
 
 from src.models.venda import Venda, ItemVenda
 from src.models.pagamento import Pagamento
 from src.models.produto import Produto
-from src.dao.venda_dao import VendaDAO, ItemVendaDAO
-from src.dao.pagamento_dao import PagamentoDAO
-from src.dao.produto_dao import ProdutoDAO
-from src.dao.caixa_dao import CaixaDAO
+from src.dao.venda_dao import VendaDAO
+from src.dao.estoque_dao import EstoqueInsuficienteError
+from src.config.config_reader import config
+from src.services.pipeline_vendas import pipeline_vendas
 from src.utils.logger import Logger
 
 
 class VendaService:
     """Serviço para gerenciamento de vendas."""
     
-    def __init__(self):
+    def __init__(self, usar_diario: bool = None):
         self.venda_atual: Optional[Venda] = None
+        
+        # Última venda finalizada, para o cupom não fiscal
+        self.ultima_venda: Optional[Venda] = None
+        self.ultimos_pagamentos: List[Pagamento] = []
+        
+        # Com o diário local a venda é gravada em disco e replicada ao MySQL em segundo plano
+        if usar_diario is None:
+            usar_diario = config.getboolean('caixa', 'diario_local', fallback=True)
+        self.usar_diario = usar_diario
     
     def iniciar_nova_venda(self, usuario_id: int, caixa_id: int) -> Venda:
         """
@@ -33,7 +43,7 @@ class VendaService:
         Returns:
             Objeto Venda criado
         """
-        numero_venda = VendaDAO.gerar_numero_venda()
+        numero_venda = VendaDAO.gerar_numero_venda(caixa_id)
         
         self.venda_atual = Venda(
             numero_venda=numero_venda,
@@ -158,8 +168,12 @@ class VendaService:
             pagamentos: Lista de pagamentos da venda
             
         Returns:
-            Tupla (sucesso, mensagem, venda_id)
+            Tupla (sucesso, mensagem, venda_id). Com o diário local ativo
+            (caixa.diario_local) venda_id é None: o ID só existe depois da
+            replicação; identifique a venda por numero_venda.
         """
+        inicio = time.perf_counter()
+        
         if not self.venda_atual:
             return False, "Nenhuma venda iniciada", None
         
@@ -172,27 +186,28 @@ class VendaService:
             return False, "Valor pago insuficiente", None
         
         try:
-            # Salva a venda
-            venda_id = VendaDAO.criar(self.venda_atual)
-            if not venda_id:
-                return False, "Erro ao salvar venda", None
-            
-            self.venda_atual.id = venda_id
-            
-            # Salva os itens
-            for item in self.venda_atual.itens:
-                item.venda_id = venda_id
-                ItemVendaDAO.criar(item)
-            
-            # Salva os pagamentos
+            # Venda, itens e pagamentos já seguem com o status final
+            self.venda_atual.finalizar()
+            self.venda_atual.data_hora = datetime.now()
             for pagamento in pagamentos:
-                pagamento.venda_id = venda_id
-                pagamento.aprovar()  # Marca como aprovado
-                PagamentoDAO.criar(pagamento)
+                pagamento.aprovar()
+                pagamento.data_hora = self.venda_atual.data_hora
             
-            # Finaliza a venda
-            self.venda_atual.finalizar()
-            VendaDAO.atualizar(self.venda_atual)
+            if self.usar_diario:
+                # Grava no diário local; só a replicação para o MySQL (que gera o ID) é em segundo plano
+                pipeline_vendas.metricas.registrar("validacao", time.perf_counter() - inicio)
+                if not pipeline_vendas.enviar(self.venda_atual, pagamentos):
+                    self.venda_atual.status = Venda.STATUS_ABERTA
+                    return False, "Erro ao gravar a venda no diário local. Verifique o disco e tente novamente.", None
+                venda_id = None
+            else:
+                # Grava tudo em uma única transação
+                venda_id = VendaDAO.registrar_venda_completa(self.venda_atual, pagamentos)
+                if not venda_id:
+                    self.venda_atual.status = Venda.STATUS_ABERTA
+                    return False, "Erro ao salvar venda", None
+            
+            self.venda_atual.id = venda_id
             
             # Log
             Logger.log_venda(
@@ -202,12 +217,19 @@ class VendaService:
             )
             
             # Limpa venda atual
+            self.ultima_venda, self.ultimos_pagamentos = self.venda_atual, pagamentos
             numero_venda = self.venda_atual.numero_venda
             self.venda_atual = None
             
             return True, f"Venda {numero_venda} finalizada com sucesso!", venda_id
         
+        except EstoqueInsuficienteError as e:
+            self.venda_atual.status = Venda.STATUS_ABERTA
+            Logger.log_erro("FINALIZAR VENDA", e)
+            return False, str(e), None
+        
         except Exception as e:
+            self.venda_atual.status = Venda.STATUS_ABERTA
             Logger.log_erro("FINALIZAR VENDA", e)
             return False, f"Erro ao finalizar venda: {str(e)}", None
     
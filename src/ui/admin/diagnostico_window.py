@@ -0,0 +1,113 @@
+"""
+Tela de diagnóstico de desempenho.
+Mostra a latência das consultas SQL por método de DAO e a situação do pool de conexões.
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from src.config.config_reader import config
+from src.config.database import DatabaseConnection
+from src.utils.monitor_sql import monitor_sql
+
+
+class DiagnosticoFrame(ttk.Frame):
+    """Frame com as estatísticas de consultas SQL deste processo."""
+    
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.criar_widgets()
+        self.carregar()
+    
+    def criar_widgets(self):
+        """Cria widgets."""
+        header = ttk.Frame(self)
+        header.pack(fill=tk.X, pady=(0, 15))
+        
+        tk.Label(header, text="🩺 Diagnóstico", font=("Arial", 20, "bold"),
+                 fg="#2c3e50").pack(side=tk.LEFT)
+        
+        tk.Button(header, text="🧹 Zerar", font=("Arial", 11),
+                  bg="#e67e22", fg="white", cursor="hand2", relief=tk.FLAT,
+                  padx=20, pady=8, command=self.zerar).pack(side=tk.RIGHT, padx=(10, 0))
+        
+        tk.Button(header, text="🔄 Atualizar", font=("Arial", 11),
+                  bg="#3498db", fg="white", cursor="hand2", relief=tk.FLAT,
+                  padx=20, pady=8, command=self.carregar).pack(side=tk.RIGHT)
+        
+        # Situação do pool / monitor
+        self.label_pool = tk.Label(self, font=("Arial", 10), fg="#7f8c8d", anchor=tk.W, justify=tk.LEFT)
+        self.label_pool.pack(fill=tk.X, pady=(0, 10))
+        
+        # Tabela
+        tree_frame = ttk.Frame(self)
+        tree_frame.pack(fill=tk.BOTH, expand=True)
+        
+        scroll = ttk.Scrollbar(tree_frame)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        colunas = ("origem", "chamadas", "total", "medio", "p95", "maximo", "linhas", "erros")
+        self.tree = ttk.Treeview(tree_frame, yscrollcommand=scroll.set, columns=colunas, show="headings")
+        
+        self.tree.heading("origem", text="Método")
+        self.tree.heading("chamadas", text="Chamadas")
+        self.tree.heading("total", text="Total (ms)")
+        self.tree.heading("medio", text="Médio (ms)")
+        self.tree.heading("p95", text="p95 (ms)")
+        self.tree.heading("maximo", text="Máximo (ms)")
+        self.tree.heading("linhas", text="Linhas")
+        self.tree.heading("erros", text="Erros")
+        
+        self.tree.column("origem", width=320)
+        for coluna in colunas[1:]:
+            self.tree.column(coluna, width=100, anchor=tk.E)
+        
+        # Destaque para métodos com média acima do limite de consulta lenta
+        self.tree.tag_configure('lenta', foreground="#e74c3c")
+        
+        scroll.config(command=self.tree.yview)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+        
+        tk.Label(self, text="Consultas acima do limite são gravadas em "
+                            f"{config.get_log_path()}/consultas_lentas.log",
+                 font=("Arial", 9), fg="#7f8c8d").pack(anchor=tk.W, pady=(10, 0))
+    
+    def carregar(self):
+        """Recarrega as estatísticas."""
+        for item in self.tree.get_children():
+            self.tree.delete(item)
+        
+        limite_ms = monitor_sql.limite_lenta * 1000
+        for r in monitor_sql.obter_resumo():
+            tags = ('lenta',) if r["tempo_medio_ms"] >= limite_ms else ()
+            self.tree.insert("", tk.END, values=(
+                r["origem"],
+                r["chamadas"],
+                f"{r['tempo_total_ms']:.1f}",
+                f"{r['tempo_medio_ms']:.2f}",
+                r["p95_ms"],
+                f"{r['tempo_maximo_ms']:.1f}",
+                r["linhas"],
+                r["erros"]
+            ), tags=tags)
+        
+        pool = DatabaseConnection.obter_metricas_pool()
+        if pool:
+            texto = (
+                f"Pool: {pool['em_uso']}/{pool['tamanho']} em uso, {pool['ociosas']} ociosa(s), "
+                f"{pool['aguardando']} aguardando  |  espera média {pool['espera_media_ms']} ms "
+                f"(máx. {pool['espera_maxima_ms']} ms)  |  esgotamentos: {pool['esgotamentos']}  |  "
+                f"reconexões: {pool['reconexoes']}"
+            )
+        else:
+            texto = "Pool ainda não iniciado"
+        
+        if not monitor_sql.ativo:
+            texto += "\nMonitoramento de SQL desligado ([monitoramento] monitorar_sql)"
+        self.label_pool.config(text=texto)
+    
+    def zerar(self):
+        """Descarta as estatísticas acumuladas."""
+        if messagebox.askyesno("Diagnóstico", "Zerar as estatísticas de consultas?"):
+            monitor_sql.zerar()
+            self.carregar()
@@ -8,7 +8,7 @@ from tkinter import ttk, messagebox
 from datetime import date, timedelta
 from typing import Optional
 
-from src.dao.venda_dao import VendaDAO
+from src.dao.venda_dao import VendaDAO, ItemVendaDAO
 from src.dao.estorno_dao import EstornoDAO
 from src.services.estorno_service import EstornoService
 from src.utils.formatters import Formatters
@@ -197,22 +197,25 @@ class EstornoFrame(ttk.Frame):
         vendas = VendaDAO.buscar_por_periodo(data_inicio, data_fim)
         
         # Filtra apenas finalizadas e canceladas
+        vendas = [venda for venda in vendas if venda.status in ['finalizada', 'cancelada']]
+        
+        # Quantidade de itens e estornos de todas as vendas em uma consulta cada
+        venda_ids = [venda.id for venda in vendas]
+        quantidade_itens = ItemVendaDAO.contar_por_vendas(venda_ids)
+        estornadas = EstornoDAO.buscar_vendas_estornadas(venda_ids)
+        
         for venda in vendas:
-            if venda.status in ['finalizada', 'cancelada']:
-                itens = VendaDAO.buscar_itens_venda(venda.id)
-                
-                # Verifica se foi estornada
-                estornada = EstornoDAO.verificar_venda_estornada(venda.id)
-                status_texto = "ESTORNADA" if estornada else venda.status.upper()
-                tag = 'estornada' if estornada else venda.status
-                
-                self.tree.insert("", tk.END, values=(
-                    venda.numero_venda,
-                    venda.data_hora.strftime("%d/%m/%Y %H:%M") if venda.data_hora else "",
-                    Formatters.formatar_moeda(venda.total),
-                    len(itens),
-                    status_texto
-                ), tags=(str(venda.id), tag))
+            estornada = venda.id in estornadas
+            status_texto = "ESTORNADA" if estornada else venda.status.upper()
+            tag = 'estornada' if estornada else venda.status
+            
+            self.tree.insert("", tk.END, values=(
+                venda.numero_venda,
+                venda.data_hora.strftime("%d/%m/%Y %H:%M") if venda.data_hora else "",
+                Formatters.formatar_moeda(venda.total),
+                quantidade_itens.get(venda.id, 0),
+                status_texto
+            ), tags=(str(venda.id), tag))
     
     def ver_detalhes(self):
         """Mostra detalhes da venda selecionada."""
@@ -8,7 +8,7 @@ from datetime import date
 
 from src.models.usuario import Usuario
 from src.services.auth_service import auth_service
-from src.dao.venda_dao import VendaDAO
+from src.dao.resumo_vendas_dao import ResumoVendasDAO
 from src.dao.produto_dao import ProdutoDAO
 from src.utils.formatters import Formatters
 
@@ -101,6 +101,8 @@ class MainAdmin:
         self.botoes_menu.append(self.criar_botao_menu(menu_frame, "📈 Relatórios", self.mostrar_relatorios))
         self.botoes_menu.append(self.criar_botao_menu(menu_frame, "⚙️ Configurações", self.mostrar_configuracoes))
         self.botoes_menu.append(self.criar_botao_menu(menu_frame, "🎨 Aparência", self.mostrar_aparencia))
+        self.botoes_menu.append(self.criar_botao_menu(menu_frame, "💲 Reajuste de Preços", self.mostrar_reajuste))
+        self.botoes_menu.append(self.criar_botao_menu(menu_frame, "🩺 Diagnóstico", self.mostrar_diagnostico))
         
         # Botão sair no final
         tk.Frame(menu_frame, bg="#2c3e50").pack(fill=tk.BOTH, expand=True)
@@ -158,7 +160,7 @@ class MainAdmin:
         cards_frame.pack(fill=tk.X, pady=(0, 20))
         
         # Busca dados
-        total_vendas_hoje = VendaDAO.obter_total_vendas_dia()
+        total_vendas_hoje = ResumoVendasDAO.obter_totais()['total']
         produtos_estoque_baixo = ProdutoDAO.buscar_estoque_baixo()
         
         # Cards
@@ -181,7 +183,7 @@ class MainAdmin:
         self.criar_card_info(
             cards_frame,
             "📦 Total Produtos",
-            str(len(ProdutoDAO.buscar_todos())),
+            str(ProdutoDAO.contar()),
             "#3498db",
             0, 2
         )
@@ -257,7 +259,7 @@ class MainAdmin:
         """Mostra a tela de produtos."""
         self.limpar_area_trabalho()
         from src.ui.admin.produtos_window import ProdutosFrame
-        ProdutosFrame(self.area_trabalho).pack(fill=tk.BOTH, expand=True)
+        ProdutosFrame(self.area_trabalho, self.usuario).pack(fill=tk.BOTH, expand=True)
     
     def mostrar_categorias(self):
         """Mostra a tela de categorias."""
@@ -296,6 +298,18 @@ class MainAdmin:
 
         ConfiguracoesFrame(self.area_trabalho).pack(fill=tk.BOTH, expand=True)
     
+    def mostrar_reajuste(self):
+        """Mostra a tela de reajuste de preços em massa."""
+        self.limpar_area_trabalho()
+        from src.ui.admin.reajuste_window import ReajusteFrame
+        ReajusteFrame(self.area_trabalho, self.usuario).pack(fill=tk.BOTH, expand=True)
+    
+    def mostrar_diagnostico(self):
+        """Mostra a tela de diagnóstico de desempenho."""
+        self.limpar_area_trabalho()
+        from src.ui.admin.diagnostico_window import DiagnosticoFrame
+        DiagnosticoFrame(self.area_trabalho).pack(fill=tk.BOTH, expand=True)
+    
     def mostrar_aparencia(self):
         """Mostra a tela de configuração de aparência."""
         from src.ui.admin.aparencia_window import AparenciaWindow
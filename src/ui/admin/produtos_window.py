@@ -3,11 +3,12 @@ Tela de gestão de produtos.
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 
 from src.dao.produto_dao import ProdutoDAO
 from src.dao.categoria_dao import CategoriaDAO
 from src.models.produto import Produto
+from src.models.usuario import Usuario
 from src.utils.formatters import Formatters
 from src.utils.validators import Validators
 from decimal import Decimal
@@ -16,8 +17,20 @@ from decimal import Decimal
 class ProdutosFrame(ttk.Frame):
     """Frame para gestão de produtos."""
     
-    def __init__(self, parent):
+    TAMANHO_PAGINA = 200
+    CAMPOS_LISTA = [
+        'codigo_barras', 'nome', 'categoria_nome', 'preco_custo',
+        'preco_venda', 'estoque_atual', 'ativo'
+    ]
+    
+    def __init__(self, parent, usuario: Usuario):
         super().__init__(parent)
+        self.usuario = usuario
+        
+        # Estado da paginação por cursor
+        self.ultimo_id = 0
+        self.tem_mais_paginas = False
+        self.carregando_pagina = False
         
         self.criar_widgets()
         self.carregar_produtos()
@@ -48,6 +61,32 @@ class ProdutosFrame(ttk.Frame):
             command=self.novo_produto
         ).pack(side=tk.RIGHT)
         
+        tk.Button(
+            header,
+            text="📤 Exportar",
+            font=("Arial", 11),
+            bg="#8e44ad",
+            fg="white",
+            cursor="hand2",
+            relief=tk.FLAT,
+            padx=20,
+            pady=8,
+            command=self.exportar_catalogo
+        ).pack(side=tk.RIGHT, padx=(0, 10))
+        
+        tk.Button(
+            header,
+            text="📥 Importar",
+            font=("Arial", 11),
+            bg="#8e44ad",
+            fg="white",
+            cursor="hand2",
+            relief=tk.FLAT,
+            padx=20,
+            pady=8,
+            command=self.importar_catalogo
+        ).pack(side=tk.RIGHT, padx=(0, 10))
+        
         # Busca
         busca_frame = ttk.Frame(self)
         busca_frame.pack(fill=tk.X, pady=(0, 15))
@@ -85,7 +124,7 @@ class ProdutosFrame(ttk.Frame):
             tree_frame,
             columns=("codigo", "nome", "categoria", "preco_custo", "preco_venda", "estoque", "status"),
             show="headings",
-            yscrollcommand=scrollbar_y.set,
+            yscrollcommand=lambda primeiro, ultimo: self._ao_rolar(scrollbar_y, primeiro, ultimo),
             xscrollcommand=scrollbar_x.set
         )
         
@@ -143,24 +182,58 @@ class ProdutosFrame(ttk.Frame):
         ).pack(side=tk.LEFT)
     
     def carregar_produtos(self):
-        """Carrega os produtos na tabela."""
+        """Carrega a primeira página de produtos na tabela."""
         # Limpa árvore
         for item in self.tree.get_children():
             self.tree.delete(item)
         
-        # Busca produtos
-        produtos = ProdutoDAO.buscar_todos(apenas_ativos=False)
+        self.ultimo_id = 0
+        self.tem_mais_paginas = True
+        self.carregar_proxima_pagina()
+    
+    def carregar_proxima_pagina(self):
+        """Acrescenta a próxima página de produtos (paginação por cursor)."""
+        if self.carregando_pagina or not self.tem_mais_paginas:
+            return
         
-        for produto in produtos:
-            self.tree.insert("", tk.END, values=(
-                produto.codigo_barras or "",
-                produto.nome,
-                produto.categoria_nome or "Sem Categoria",
-                Formatters.formatar_moeda(produto.preco_custo),
-                Formatters.formatar_moeda(produto.preco_venda),
-                produto.estoque_atual,
-                "Ativo" if produto.ativo else "Inativo"
-            ), tags=(produto.id,))
+        self.carregando_pagina = True
+        try:
+            linhas = ProdutoDAO.buscar_pagina(
+                after_id=self.ultimo_id,
+                limite=self.TAMANHO_PAGINA,
+                campos=self.CAMPOS_LISTA
+            )
+            
+            for linha in linhas:
+                self.tree.insert("", tk.END, values=(
+                    linha['codigo_barras'] or "",
+                    linha['nome'],
+                    linha['categoria_nome'] or "Sem Categoria",
+                    Formatters.formatar_moeda(linha['preco_custo']),
+                    Formatters.formatar_moeda(linha['preco_venda']),
+                    linha['estoque_atual'],
+                    "Ativo" if linha['ativo'] else "Inativo"
+                ), tags=(linha['id'],))
+            
+            if linhas:
+                self.ultimo_id = linhas[-1]['id']
+            self.tem_mais_paginas = len(linhas) == self.TAMANHO_PAGINA
+        except Exception as e:
+            self.tem_mais_paginas = False
+            messagebox.showerror("Erro", f"Erro ao carregar produtos:\n{e}")
+        finally:
+            self.carregando_pagina = False
+    
+    def _ao_rolar(self, scrollbar, primeiro, ultimo):
+        """Atualiza a barra de rolagem e busca a próxima página perto do fim da lista."""
+        scrollbar.set(primeiro, ultimo)
+        
+        # Durante uma busca por nome a lista não é paginada
+        if self.entry_busca.get().strip():
+            return
+        
+        if float(ultimo) >= 0.9 and self.tem_mais_paginas and not self.carregando_pagina:
+            self.after_idle(self.carregar_proxima_pagina)
     
     def buscar(self):
         """Busca produtos."""
@@ -206,6 +279,74 @@ class ProdutosFrame(ttk.Frame):
         if produto:
             ProdutoDialog(self, produto, self.carregar_produtos)
     
+    def importar_catalogo(self):
+        """Importa (insere/atualiza) produtos de uma planilha CSV ou XLSX."""
+        caminho = filedialog.askopenfilename(
+            title="Importar catálogo",
+            filetypes=[("Planilhas", "*.xlsx *.csv"), ("Excel", "*.xlsx"), ("CSV", "*.csv")]
+        )
+        if not caminho:
+            return
+        
+        from src.services.catalogo_service import catalogo_service
+        from src.ui.admin.progresso_dialog import ProgressoDialog
+        
+        def concluir(resultado, erro):
+            if erro:
+                messagebox.showerror("Importação", f"Não foi possível importar:\n{erro}")
+                return
+            
+            mensagem = (
+                f"Linhas lidas: {resultado.linhas}\n"
+                f"Novos: {resultado.inseridos}\n"
+                f"Atualizados: {resultado.atualizados}\n"
+                f"Com erro: {len(resultado.erros)}"
+            )
+            if resultado.cancelado:
+                mensagem += "\n\nImportação cancelada (lotes já gravados foram mantidos)."
+            if resultado.erros:
+                mensagem += "\n\nPrimeiros erros:\n" + "\n".join(
+                    f"Linha {linha} [{codigo}]: {texto}" for linha, codigo, texto in resultado.erros[:10]
+                )
+            
+            (messagebox.showwarning if resultado.erros else messagebox.showinfo)("Importação", mensagem)
+            self.carregar_produtos()
+        
+        ProgressoDialog(
+            self, "Importando catálogo...",
+            lambda progresso, cancelar: catalogo_service.importar(
+                caminho, progresso=progresso, cancelar=cancelar,
+                usuario_id=self.usuario.id, usuario_nome=self.usuario.nome_completo
+            ),
+            concluir
+        )
+    
+    def exportar_catalogo(self):
+        """Exporta o catálogo para uma planilha CSV ou XLSX."""
+        caminho = filedialog.asksaveasfilename(
+            title="Exportar catálogo",
+            defaultextension=".xlsx",
+            initialfile="catalogo.xlsx",
+            filetypes=[("Excel", "*.xlsx"), ("CSV", "*.csv")]
+        )
+        if not caminho:
+            return
+        
+        from src.services.catalogo_service import catalogo_service
+        from src.ui.admin.progresso_dialog import ProgressoDialog
+        
+        def concluir(quantidade, erro):
+            if erro:
+                messagebox.showerror("Exportação", f"Não foi possível exportar:\n{erro}")
+            else:
+                messagebox.showinfo("Exportação", f"{quantidade} produto(s) exportado(s) para\n{caminho}")
+        
+        ProgressoDialog(
+            self, "Exportando catálogo...",
+            lambda progresso, cancelar: catalogo_service.exportar(caminho, progresso=progresso, cancelar=cancelar),
+            concluir
+        )
+    
     def excluir_produto(self):
         """Exclui o produto selecionado."""
         selecionado = self.tree.selection()
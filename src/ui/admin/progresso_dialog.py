@@ -0,0 +1,99 @@
+"""
+Janela de progresso para tarefas demoradas (importação, exportação).
+A tarefa roda em uma thread; a janela só lê o andamento periodicamente,
+já que widgets Tk não podem ser alterados fora da thread principal.
+"""
+
+import threading
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Optional
+
+
+class ProgressoDialog(tk.Toplevel):
+    """Executa uma tarefa em segundo plano mostrando barra de progresso e botão Cancelar."""
+    
+    INTERVALO_ATUALIZACAO_MS = 200
+    
+    def __init__(self, parent, titulo: str, tarefa: Callable, ao_concluir: Callable):
+        """
+        Args:
+            parent: Janela pai
+            titulo: Título e texto da janela
+            tarefa: Função tarefa(progresso, cancelar) executada na thread;
+                progresso(feitos, total) informa o andamento e cancelar é um
+                threading.Event que a tarefa deve consultar
+            ao_concluir: Chamada na thread da interface com (resultado, erro);
+                erro é a exceção levantada pela tarefa, ou None
+        """
+        super().__init__(parent)
+        self.title(titulo)
+        self.geometry("420x150")
+        self.resizable(False, False)
+        self.transient(parent)
+        self.grab_set()
+        self.protocol("WM_DELETE_WINDOW", self.cancelar)
+        
+        self.ao_concluir = ao_concluir
+        self.evento_cancelar = threading.Event()
+        
+        # Estado compartilhado com a thread (só atribuições simples)
+        self._feitos = 0
+        self._total: Optional[int] = None
+        self._resultado = None
+        self._erro: Optional[Exception] = None
+        self._terminou = False
+        
+        tk.Label(self, text=titulo, font=("Arial", 11, "bold")).pack(pady=(15, 5))
+        
+        self.barra = ttk.Progressbar(self, length=360, mode='indeterminate')
+        self.barra.pack(pady=5)
+        self.barra.start(15)
+        
+        self.label_andamento = tk.Label(self, text="Iniciando...", font=("Arial", 9), fg="#7f8c8d")
+        self.label_andamento.pack()
+        
+        self.botao_cancelar = tk.Button(
+            self, text="Cancelar", font=("Arial", 10), bg="#e74c3c", fg="white",
+            cursor="hand2", relief=tk.FLAT, padx=15, pady=4, command=self.cancelar
+        )
+        self.botao_cancelar.pack(pady=10)
+        
+        threading.Thread(target=self._executar, args=(tarefa,), daemon=True).start()
+        self.after(self.INTERVALO_ATUALIZACAO_MS, self._atualizar)
+    
+    def _executar(self, tarefa: Callable):
+        """Corpo da thread."""
+        try:
+            self._resultado = tarefa(self._registrar_progresso, self.evento_cancelar)
+        except Exception as e:
+            self._erro = e
+        finally:
+            self._terminou = True
+    
+    def _registrar_progresso(self, feitos: int, total: Optional[int]):
+        self._feitos, self._total = feitos, total
+    
+    def _atualizar(self):
+        """Atualiza a barra a partir do estado da thread (roda na thread da interface)."""
+        if self._total:
+            if str(self.barra['mode']) != 'determinate':
+                self.barra.stop()
+                self.barra.config(mode='determinate', maximum=self._total)
+            self.barra['value'] = min(self._feitos, self._total)
+            self.label_andamento.config(text=f"{self._feitos} de {self._total}")
+        elif self._feitos:
+            self.label_andamento.config(text=f"{self._feitos} processado(s)")
+        
+        if not self._terminou:
+            self.after(self.INTERVALO_ATUALIZACAO_MS, self._atualizar)
+            return
+        
+        self.grab_release()
+        self.destroy()
+        self.ao_concluir(self._resultado, self._erro)
+    
+    def cancelar(self):
+        """Pede à tarefa que pare; a janela fecha quando a thread terminar."""
+        self.evento_cancelar.set()
+        self.botao_cancelar.config(state=tk.DISABLED, text="Cancelando...")
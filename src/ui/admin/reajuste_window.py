@@ -0,0 +1,211 @@
+"""
+Tela de reajuste de preços em massa.
+Simula o reajuste (prévia com preço atual e novo) antes de aplicar.
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+from decimal import Decimal, InvalidOperation
+
+from src.dao.categoria_dao import CategoriaDAO
+from src.models.reajuste_preco import RegraReajuste, FiltroProdutos
+from src.models.usuario import Usuario
+from src.services.reajuste_service import ReajusteService
+from src.utils.formatters import Formatters
+
+
+class ReajusteFrame(ttk.Frame):
+    """Frame para reajuste de preços por categoria, nome, percentual ou margem."""
+    
+    def __init__(self, parent, usuario: Usuario):
+        super().__init__(parent)
+        self.usuario = usuario
+        self.categorias = {"Todas": None}
+        self.criar_widgets()
+        self.carregar_categorias()
+    
+    def criar_widgets(self):
+        """Cria widgets."""
+        header = ttk.Frame(self)
+        header.pack(fill=tk.X, pady=(0, 15))
+        
+        tk.Label(header, text="💲 Reajuste de Preços", font=("Arial", 20, "bold"),
+                 fg="#2c3e50").pack(side=tk.LEFT)
+        
+        # Filtro dos produtos
+        filtro_frame = ttk.LabelFrame(self, text="Produtos", padding=10)
+        filtro_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        tk.Label(filtro_frame, text="Categoria:", font=("Arial", 10)).pack(side=tk.LEFT)
+        self.combo_categoria = ttk.Combobox(filtro_frame, state="readonly", width=25)
+        self.combo_categoria.pack(side=tk.LEFT, padx=(5, 20))
+        
+        tk.Label(filtro_frame, text="Nome contém:", font=("Arial", 10)).pack(side=tk.LEFT)
+        self.entry_termo = ttk.Entry(filtro_frame, width=25)
+        self.entry_termo.pack(side=tk.LEFT, padx=(5, 20))
+        
+        self.var_apenas_ativos = tk.BooleanVar(value=True)
+        ttk.Checkbutton(filtro_frame, text="Apenas ativos", variable=self.var_apenas_ativos).pack(side=tk.LEFT)
+        
+        # Regra
+        regra_frame = ttk.LabelFrame(self, text="Regra", padding=10)
+        regra_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self.var_tipo = tk.StringVar(value=RegraReajuste.TIPO_PERCENTUAL)
+        for texto, tipo in (("Percentual sobre o preço", RegraReajuste.TIPO_PERCENTUAL),
+                            ("Margem sobre o custo", RegraReajuste.TIPO_MARGEM),
+                            ("Só arredondar", RegraReajuste.TIPO_ARREDONDAMENTO)):
+            ttk.Radiobutton(regra_frame, text=texto, value=tipo, variable=self.var_tipo).pack(side=tk.LEFT, padx=(0, 10))
+        
+        tk.Label(regra_frame, text="Valor (%):", font=("Arial", 10)).pack(side=tk.LEFT, padx=(10, 0))
+        self.entry_valor = ttk.Entry(regra_frame, width=8)
+        self.entry_valor.insert(0, "5")
+        self.entry_valor.pack(side=tk.LEFT, padx=(5, 20))
+        
+        self.var_terminacao = tk.BooleanVar(value=False)
+        ttk.Checkbutton(regra_frame, text="Terminar em", variable=self.var_terminacao).pack(side=tk.LEFT)
+        self.entry_terminacao = ttk.Entry(regra_frame, width=6)
+        self.entry_terminacao.insert(0, "0,99")
+        self.entry_terminacao.pack(side=tk.LEFT, padx=(5, 0))
+        
+        # Botões
+        btn_frame = ttk.Frame(self)
+        btn_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        tk.Button(btn_frame, text="🔍 Simular", font=("Arial", 10), bg="#3498db",
+                  fg="white", cursor="hand2", relief=tk.FLAT, padx=20, pady=8,
+                  command=self.simular).pack(side=tk.LEFT, padx=(0, 10))
+        
+        tk.Button(btn_frame, text="✅ Aplicar Reajuste", font=("Arial", 10, "bold"), bg="#27ae60",
+                  fg="white", cursor="hand2", relief=tk.FLAT, padx=20, pady=8,
+                  command=self.aplicar).pack(side=tk.LEFT)
+        
+        self.label_resumo = tk.Label(btn_frame, text="", font=("Arial", 10), fg="#7f8c8d")
+        self.label_resumo.pack(side=tk.RIGHT)
+        
+        # Prévia
+        tree_frame = ttk.Frame(self)
+        tree_frame.pack(fill=tk.BOTH, expand=True)
+        
+        scroll = ttk.Scrollbar(tree_frame)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.tree = ttk.Treeview(tree_frame, yscrollcommand=scroll.set,
+            columns=("codigo", "nome", "categoria", "custo", "atual", "novo", "variacao"), show="headings")
+        
+        self.tree.heading("codigo", text="Código")
+        self.tree.heading("nome", text="Produto")
+        self.tree.heading("categoria", text="Categoria")
+        self.tree.heading("custo", text="Custo")
+        self.tree.heading("atual", text="Preço Atual")
+        self.tree.heading("novo", text="Preço Novo")
+        self.tree.heading("variacao", text="Variação")
+        
+        self.tree.column("codigo", width=120)
+        self.tree.column("nome", width=280)
+        self.tree.column("categoria", width=140)
+        for coluna in ("custo", "atual", "novo", "variacao"):
+            self.tree.column(coluna, width=100, anchor=tk.E)
+        
+        scroll.config(command=self.tree.yview)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+    
+    def carregar_categorias(self):
+        """Preenche o combo de categorias."""
+        for categoria in CategoriaDAO.buscar_todas():
+            self.categorias[categoria.nome] = categoria.id
+        self.combo_categoria['values'] = list(self.categorias)
+        self.combo_categoria.set("Todas")
+    
+    def _ler_parametros(self):
+        """Monta regra e filtro a partir da tela; mostra o erro e retorna None se inválidos."""
+        try:
+            valor = Decimal(self.entry_valor.get().strip().replace(',', '.') or "0")
+            terminacao = None
+            if self.var_terminacao.get():
+                terminacao = Decimal(self.entry_terminacao.get().strip().replace(',', '.'))
+        except InvalidOperation:
+            messagebox.showerror("Reajuste", "Valor ou terminação inválidos!")
+            return None
+        
+        regra = RegraReajuste(tipo=self.var_tipo.get(), valor=valor, terminacao=terminacao)
+        erro = regra.validar()
+        if erro:
+            messagebox.showerror("Reajuste", erro)
+            return None
+        
+        filtro = FiltroProdutos(
+            categoria_id=self.categorias.get(self.combo_categoria.get()),
+            termo=self.entry_termo.get().strip() or None,
+            apenas_ativos=self.var_apenas_ativos.get()
+        )
+        return regra, filtro
+    
+    def simular(self):
+        """Mostra a prévia do reajuste. Retorna a simulação (ou None se parâmetros inválidos)."""
+        parametros = self._ler_parametros()
+        if parametros is None:
+            return None
+        
+        simulacao = ReajusteService.simular(*parametros)
+        
+        for item in self.tree.get_children():
+            self.tree.delete(item)
+        
+        for item in simulacao['itens']:
+            variacao = (item['preco_novo'] / item['preco_venda'] - 1) * 100 if item['preco_venda'] else Decimal('0')
+            self.tree.insert("", tk.END, values=(
+                item['codigo_barras'] or "",
+                item['nome'],
+                item['categoria_nome'] or "Sem Categoria",
+                Formatters.formatar_moeda(item['preco_custo']),
+                Formatters.formatar_moeda(item['preco_venda']),
+                Formatters.formatar_moeda(item['preco_novo']),
+                f"{variacao:+.1f}%"
+            ))
+        
+        self.label_resumo.config(text=(
+            f"{simulacao['quantidade']} produto(s)  |  soma dos preços: "
+            f"{Formatters.formatar_moeda(simulacao['total_atual'])} → "
+            f"{Formatters.formatar_moeda(simulacao['total_novo'])}"
+        ))
+        return simulacao
+    
+    def aplicar(self):
+        """Aplica o reajuste após mostrar a prévia e pedir confirmação."""
+        parametros = self._ler_parametros()
+        if parametros is None:
+            return
+        
+        simulacao = self.simular()
+        if not simulacao or not simulacao['quantidade']:
+            messagebox.showinfo("Reajuste", "Nenhum produto teria o preço alterado.")
+            return
+        
+        regra, filtro = parametros
+        if not messagebox.askyesno(
+            "Confirmar Reajuste",
+            f"Reajustar o preço de {simulacao['quantidade']} produto(s)?\n\n"
+            f"Regra: {regra.descricao()}\n\n"
+            "Os preços anteriores ficam registrados no histórico."
+        ):
+            return
+        
+        from src.ui.admin.progresso_dialog import ProgressoDialog
+        
+        def concluir(resultado, erro):
+            if erro:
+                messagebox.showerror("Reajuste", f"Erro ao aplicar o reajuste:\n{erro}")
+            elif resultado['cancelado']:
+                messagebox.showwarning("Reajuste", f"Reajuste interrompido: {resultado['alterados']} produto(s) alterado(s).")
+            else:
+                messagebox.showinfo("Reajuste", f"{resultado['alterados']} produto(s) reajustado(s).")
+            self.simular()
+        
+        ProgressoDialog(
+            self, "Aplicando reajuste...",
+            lambda progresso, cancelar: ReajusteService.aplicar(
+                regra, filtro, self.usuario.id, self.usuario.nome_completo, progresso, cancelar
+            ),
+            concluir
+        )
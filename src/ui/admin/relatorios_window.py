@@ -3,20 +3,27 @@ Tela de relatórios.
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from datetime import date, timedelta
-from decimal import Decimal
 
 from src.dao.venda_dao import VendaDAO
-from src.dao.pagamento_dao import PagamentoDAO
+from src.dao.resumo_vendas_dao import ResumoVendasDAO
 from src.dao.produto_dao import ProdutoDAO
-from src.config.database import DatabaseConnection
+from src.dao.categoria_dao import CategoriaDAO
+from src.models.analise_vendas import FiltroAnalise
+from src.services.analise_vendas_service import AnaliseVendasService
 from src.utils.formatters import Formatters
 
 
 class RelatoriosFrame(ttk.Frame):
     """Frame para relatórios."""
     
+    # Vendas listadas na tela; o período completo vai para a exportação
+    LIMITE_TELA = 1000
+    
+    # Produtos listados no ranking; a curva ABC considera todos
+    LIMITE_PRODUTOS = 50
+    
     def __init__(self, parent):
         super().__init__(parent)
         self.criar_widgets()
@@ -69,11 +76,7 @@ class RelatoriosFrame(ttk.Frame):
     def relatorio_vendas_dia(self):
         """Relatório de vendas do dia."""
         hoje = date.today()
-        vendas = VendaDAO.buscar_por_periodo(hoje, hoje, "finalizada")
-        total = VendaDAO.obter_total_vendas_dia(hoje)
-        
-        self.mostrar_relatorio_vendas(f"Vendas do Dia - {Formatters.formatar_data(hoje)}",
-                                       vendas, total)
+        self.mostrar_relatorio_vendas(f"Vendas do Dia - {Formatters.formatar_data(hoje)}", hoje, hoje)
     
     def relatorio_vendas_periodo(self):
         """Relatório de vendas por período."""
@@ -103,24 +106,25 @@ class RelatoriosFrame(ttk.Frame):
                 from datetime import datetime
                 inicio = datetime.strptime(entry_inicio.get(), "%d/%m/%Y").date()
                 fim = datetime.strptime(entry_fim.get(), "%d/%m/%Y").date()
-                
-                vendas = VendaDAO.buscar_por_periodo(inicio, fim, "finalizada")
-                total = sum(v.total for v in vendas)
-                
-                d.destroy()
-                self.mostrar_relatorio_vendas(
-                    f"Vendas: {Formatters.formatar_data(inicio)} a {Formatters.formatar_data(fim)}",
-                    vendas, total
-                )
-            except:
+            except ValueError:
                 messagebox.showerror("Erro", "Data inválida! Use formato DD/MM/AAAA")
+                return
+            
+            d.destroy()
+            self.mostrar_relatorio_vendas(
+                f"Vendas: {Formatters.formatar_data(inicio)} a {Formatters.formatar_data(fim)}",
+                inicio, fim
+            )
         
         tk.Button(f, text="Gerar Relatório", font=("Arial", 11, "bold"), bg="#3498db",
                   fg="white", cursor="hand2", relief=tk.FLAT, padx=30, pady=10,
                   command=gerar).pack()
     
-    def mostrar_relatorio_vendas(self, titulo, vendas, total):
-        """Mostra relatório de vendas."""
+    def mostrar_relatorio_vendas(self, titulo, inicio, fim):
+        """Mostra relatório de vendas (totais do período e as vendas mais recentes)."""
+        totais = ResumoVendasDAO.obter_totais(inicio, fim)
+        vendas = VendaDAO.buscar_por_periodo(inicio, fim, "finalizada", limite=self.LIMITE_TELA)
+        
         w = tk.Toplevel(self)
         w.title(titulo)
         w.geometry("900x600")
@@ -130,8 +134,12 @@ class RelatoriosFrame(ttk.Frame):
         
         tk.Label(main, text=titulo, font=("Arial", 16, "bold")).pack(pady=(0, 10))
         
-        tk.Label(main, text=f"Total de Vendas: {len(vendas)}  |  Valor Total: {Formatters.formatar_moeda(total)}",
-                 font=("Arial", 12, "bold"), fg="#27ae60").pack(pady=(0, 15))
+        tk.Label(main, text=f"Total de Vendas: {totais['quantidade']}  |  Valor Total: {Formatters.formatar_moeda(totais['total'])}",
+                 font=("Arial", 12, "bold"), fg="#27ae60").pack(pady=(0, 5 if totais['quantidade'] > len(vendas) else 15))
+        
+        if totais['quantidade'] > len(vendas):
+            tk.Label(main, text=f"Exibindo as {len(vendas)} vendas mais recentes. Exporte para ver o período completo.",
+                     font=("Arial", 9), fg="#7f8c8d").pack(pady=(0, 10))
         
         tree_frame = ttk.Frame(main)
         tree_frame.pack(fill=tk.BOTH, expand=True)
@@ -163,14 +171,56 @@ class RelatoriosFrame(ttk.Frame):
                 Formatters.formatar_moeda(v.total)
             ))
         
-        tk.Button(main, text="Fechar", font=("Arial", 11), bg="#95a5a6",
+        botoes = ttk.Frame(main)
+        botoes.pack(pady=(15, 0))
+        
+        tk.Button(botoes, text="📤 Exportar Vendas", font=("Arial", 11), bg="#27ae60",
+                  fg="white", cursor="hand2", relief=tk.FLAT, padx=20, pady=10,
+                  command=lambda: self.exportar_relatorio(w, 'vendas', inicio, fim)).pack(side=tk.LEFT, padx=5)
+        
+        tk.Button(botoes, text="📤 Exportar Itens", font=("Arial", 11), bg="#3498db",
+                  fg="white", cursor="hand2", relief=tk.FLAT, padx=20, pady=10,
+                  command=lambda: self.exportar_relatorio(w, 'itens', inicio, fim)).pack(side=tk.LEFT, padx=5)
+        
+        tk.Button(botoes, text="Fechar", font=("Arial", 11), bg="#95a5a6",
                   fg="white", cursor="hand2", relief=tk.FLAT, padx=30, pady=10,
-                  command=w.destroy).pack(pady=(15, 0))
+                  command=w.destroy).pack(side=tk.LEFT, padx=5)
+    
+    def exportar_relatorio(self, janela, relatorio, inicio, fim):
+        """Exporta o período completo em segundo plano, lendo as vendas em fluxo do banco."""
+        caminho = filedialog.asksaveasfilename(
+            parent=janela,
+            title="Exportar relatório",
+            defaultextension=".xlsx",
+            initialfile=f"{relatorio}_{inicio:%Y%m%d}_{fim:%Y%m%d}.xlsx",
+            filetypes=[("Planilha Excel", "*.xlsx"), ("CSV", "*.csv"), ("PDF", "*.pdf")]
+        )
+        if not caminho:
+            return
+        
+        from src.services.exportacao_service import exportacao_service
+        from src.ui.admin.progresso_dialog import ProgressoDialog
+        
+        def concluir(resultado, erro):
+            if erro:
+                messagebox.showerror("Exportar", f"Erro ao exportar:\n{erro}", parent=janela)
+            elif resultado['cancelado']:
+                messagebox.showwarning("Exportar", "Exportação cancelada.", parent=janela)
+            else:
+                messagebox.showinfo("Exportar", f"{resultado['linhas']} linha(s) exportada(s) para\n{caminho}", parent=janela)
+        
+        ProgressoDialog(
+            janela, "Exportando relatório...",
+            lambda progresso, cancelar: exportacao_service.exportar(
+                relatorio, caminho, inicio, fim, progresso=progresso, cancelar=cancelar
+            ),
+            concluir
+        )
     
     def relatorio_formas_pagamento(self):
         """Relatório de formas de pagamento."""
         hoje = date.today()
-        totais = PagamentoDAO.obter_total_por_forma_pagamento(hoje)
+        totais = ResumoVendasDAO.obter_totais_por_forma_pagamento(hoje)
         
         w = tk.Toplevel(self)
         w.title(f"Formas de Pagamento - {Formatters.formatar_data(hoje)}")
@@ -206,102 +256,235 @@ class RelatoriosFrame(ttk.Frame):
                   command=w.destroy).pack(pady=(20, 0))
     
     def relatorio_produtos_vendidos(self):
-        """Relatório de produtos mais vendidos."""
-        # Busca dados do banco
-        conn = DatabaseConnection.get_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        try:
-            query = """
-                SELECT 
-                    p.id,
-                    p.codigo_barras,
-                    p.nome,
-                    SUM(iv.quantidade) as total_vendido,
-                    SUM(iv.subtotal) as receita_total,
-                    COUNT(DISTINCT v.id) as num_vendas
-                FROM produtos p
-                INNER JOIN itens_venda iv ON p.id = iv.produto_id
-                INNER JOIN vendas v ON iv.venda_id = v.id
-                WHERE v.cancelada = 0
-                GROUP BY p.id
-                ORDER BY total_vendido DESC
-                LIMIT 50
-            """
-            cursor.execute(query)
-            produtos = cursor.fetchall()
-            
-            if not produtos:
-                messagebox.showinfo("Aviso", "Nenhuma venda registrada ainda.")
+        """Relatório de produtos mais vendidos (período, categoria e caixa)."""
+        categorias = {"Todas": None}
+        for categoria in CategoriaDAO.buscar_todas():
+            categorias[categoria.nome] = categoria.id
+        
+        ordenacoes = {"Valor vendido": 'valor', "Quantidade": 'quantidade', "Nº de vendas": 'vendas'}
+        padrao = FiltroAnalise.ultimos_dias()
+        
+        d = tk.Toplevel(self)
+        d.title("Produtos Mais Vendidos")
+        d.geometry("380x430")
+        d.transient(self)
+        d.grab_set()
+        
+        f = ttk.Frame(d, padding="20")
+        f.pack(fill=tk.BOTH, expand=True)
+        
+        tk.Label(f, text="Filtros do Relatório", font=("Arial", 14, "bold")).pack(pady=(0, 20))
+        
+        tk.Label(f, text="Data Inicial:", font=("Arial", 10)).pack(pady=(0, 5))
+        entry_inicio = ttk.Entry(f, font=("Arial", 11))
+        entry_inicio.pack(pady=(0, 10))
+        entry_inicio.insert(0, padrao.data_inicio.strftime("%d/%m/%Y"))
+        
+        tk.Label(f, text="Data Final:", font=("Arial", 10)).pack(pady=(0, 5))
+        entry_fim = ttk.Entry(f, font=("Arial", 11))
+        entry_fim.pack(pady=(0, 10))
+        entry_fim.insert(0, padrao.data_fim.strftime("%d/%m/%Y"))
+        
+        tk.Label(f, text="Categoria:", font=("Arial", 10)).pack(pady=(0, 5))
+        combo_categoria = ttk.Combobox(f, state="readonly", values=list(categorias), width=25)
+        combo_categoria.set("Todas")
+        combo_categoria.pack(pady=(0, 10))
+        
+        linha = ttk.Frame(f)
+        linha.pack(pady=(0, 20))
+        
+        tk.Label(linha, text="Caixa nº:", font=("Arial", 10)).pack(side=tk.LEFT)
+        entry_caixa = ttk.Entry(linha, width=6)
+        entry_caixa.pack(side=tk.LEFT, padx=(5, 15))
+        
+        tk.Label(linha, text="Ordenar por:", font=("Arial", 10)).pack(side=tk.LEFT)
+        combo_ordem = ttk.Combobox(linha, state="readonly", values=list(ordenacoes), width=13)
+        combo_ordem.set("Valor vendido")
+        combo_ordem.pack(side=tk.LEFT, padx=(5, 0))
+        
+        def gerar():
+            try:
+                from datetime import datetime
+                inicio = datetime.strptime(entry_inicio.get(), "%d/%m/%Y").date()
+                fim = datetime.strptime(entry_fim.get(), "%d/%m/%Y").date()
+            except ValueError:
+                messagebox.showerror("Erro", "Data inválida! Use formato DD/MM/AAAA", parent=d)
                 return
             
-            # Cria janela
-            w = tk.Toplevel(self)
-            w.title("Produtos Mais Vendidos")
-            w.geometry("900x600")
-            
-            main = ttk.Frame(w, padding="20")
-            main.pack(fill=tk.BOTH, expand=True)
-            
-            tk.Label(main, text="🏆 Top 50 Produtos Mais Vendidos", 
-                     font=("Arial", 16, "bold"), fg="#27ae60").pack(pady=(0, 15))
-            
-            tk.Label(main, text=f"Total de produtos: {len(produtos)}",
-                     font=("Arial", 12)).pack(pady=(0, 15))
-            
-            # Treeview
-            tree_frame = ttk.Frame(main)
-            tree_frame.pack(fill=tk.BOTH, expand=True)
-            
-            scroll = ttk.Scrollbar(tree_frame)
-            scroll.pack(side=tk.RIGHT, fill=tk.Y)
-            
-            tree = ttk.Treeview(tree_frame, yscrollcommand=scroll.set,
-                columns=("pos", "codigo", "nome", "qtd", "vendas", "receita"), 
-                show="headings")
-            
-            tree.heading("pos", text="#")
-            tree.heading("codigo", text="Código")
-            tree.heading("nome", text="Produto")
-            tree.heading("qtd", text="Quantidade")
-            tree.heading("vendas", text="N° Vendas")
-            tree.heading("receita", text="Receita Total")
-            
-            tree.column("pos", width=50, anchor=tk.CENTER)
-            tree.column("codigo", width=120)
-            tree.column("nome", width=350)
-            tree.column("qtd", width=100, anchor=tk.CENTER)
-            tree.column("vendas", width=100, anchor=tk.CENTER)
-            tree.column("receita", width=120, anchor=tk.E)
-            
-            scroll.config(command=tree.yview)
-            tree.pack(fill=tk.BOTH, expand=True)
-            
-            # Preenche
-            for i, p in enumerate(produtos, 1):
-                tree.insert("", tk.END, values=(
-                    f"{i}º",
-                    p['codigo_barras'],
-                    p['nome'],
-                    f"{p['total_vendido']:.0f}",
-                    p['num_vendas'],
-                    Formatters.formatar_moeda(Decimal(str(p['receita_total'])))
-                ))
+            caixa = entry_caixa.get().strip()
+            if caixa and not caixa.isdigit():
+                messagebox.showerror("Erro", "Número do caixa inválido!", parent=d)
+                return
             
-            # Totais
-            total_receita = sum(Decimal(str(p['receita_total'])) for p in produtos)
-            tk.Label(main, text=f"Receita Total (Top 50): {Formatters.formatar_moeda(total_receita)}", 
-                     font=("Arial", 14, "bold"), fg="#27ae60").pack(pady=(20, 0))
+            filtro = FiltroAnalise(
+                data_inicio=inicio,
+                data_fim=fim,
+                categoria_id=categorias.get(combo_categoria.get()),
+                caixa_id=int(caixa) if caixa else None
+            )
+            erro = filtro.validar()
+            if erro:
+                messagebox.showerror("Erro", erro, parent=d)
+                return
             
-            tk.Button(main, text="Fechar", font=("Arial", 11), bg="#95a5a6",
-                      fg="white", cursor="hand2", relief=tk.FLAT, padx=30, pady=10,
-                      command=w.destroy).pack(pady=(20, 0))
-        
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao gerar relatório: {str(e)}")
-        finally:
-            cursor.close()
-            conn.close()
+            d.destroy()
+            self.mostrar_produtos_vendidos(filtro, ordenacoes[combo_ordem.get()], combo_ordem.get())
+        
+        tk.Button(f, text="Gerar Relatório", font=("Arial", 11, "bold"), bg="#e67e22",
+                  fg="white", cursor="hand2", relief=tk.FLAT, padx=30, pady=10,
+                  command=gerar).pack()
+    
+    def mostrar_produtos_vendidos(self, filtro, ordenar_por, descricao_ordem):
+        """Mostra o ranking do período com a classe ABC de cada produto."""
+        curva = AnaliseVendasService.curva_abc(filtro, ordenar_por)
+        produtos = curva['itens']
+        
+        if not produtos:
+            messagebox.showinfo("Aviso", "Nenhuma venda no período selecionado.")
+            return
+        
+        titulo = f"Produtos Mais Vendidos: {Formatters.formatar_data(filtro.data_inicio)} a {Formatters.formatar_data(filtro.data_fim)}"
+        
+        w = tk.Toplevel(self)
+        w.title(titulo)
+        w.geometry("1000x650")
+        
+        main = ttk.Frame(w, padding="20")
+        main.pack(fill=tk.BOTH, expand=True)
+        
+        tk.Label(main, text=f"🏆 {titulo}", font=("Arial", 16, "bold"), fg="#27ae60").pack(pady=(0, 10))
+        
+        tk.Label(main, text=f"{len(produtos)} produto(s) vendido(s)  |  Curva ABC por {descricao_ordem.lower()}",
+                 font=("Arial", 12)).pack(pady=(0, 5))
+        
+        resumo_abc = "   ".join(
+            f"Classe {classe}: {dados['produtos']} produto(s), {dados['participacao']:.1f}%"
+            for classe, dados in curva['classes'].items()
+        )
+        tk.Label(main, text=resumo_abc, font=("Arial", 10), fg="#7f8c8d").pack(pady=(0, 5))
+        
+        if len(produtos) > self.LIMITE_PRODUTOS:
+            tk.Label(main, text=f"Exibindo os {self.LIMITE_PRODUTOS} primeiros. Clique duas vezes em um produto para ver a tendência.",
+                     font=("Arial", 9), fg="#7f8c8d").pack(pady=(0, 10))
+        else:
+            tk.Label(main, text="Clique duas vezes em um produto para ver a tendência.",
+                     font=("Arial", 9), fg="#7f8c8d").pack(pady=(0, 10))
+        
+        tree_frame = ttk.Frame(main)
+        tree_frame.pack(fill=tk.BOTH, expand=True)
+        
+        scroll = ttk.Scrollbar(tree_frame)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        tree = ttk.Treeview(tree_frame, yscrollcommand=scroll.set,
+            columns=("pos", "codigo", "nome", "categoria", "qtd", "vendas", "receita", "participacao", "classe"),
+            show="headings")
+        
+        tree.heading("pos", text="#")
+        tree.heading("codigo", text="Código")
+        tree.heading("nome", text="Produto")
+        tree.heading("categoria", text="Categoria")
+        tree.heading("qtd", text="Quantidade")
+        tree.heading("vendas", text="N° Vendas")
+        tree.heading("receita", text="Receita Total")
+        tree.heading("participacao", text="Part. Acum.")
+        tree.heading("classe", text="ABC")
+        
+        tree.column("pos", width=50, anchor=tk.CENTER)
+        tree.column("codigo", width=120)
+        tree.column("nome", width=260)
+        tree.column("categoria", width=120)
+        tree.column("qtd", width=90, anchor=tk.CENTER)
+        tree.column("vendas", width=80, anchor=tk.CENTER)
+        tree.column("receita", width=110, anchor=tk.E)
+        tree.column("participacao", width=90, anchor=tk.E)
+        tree.column("classe", width=50, anchor=tk.CENTER)
+        
+        scroll.config(command=tree.yview)
+        tree.pack(fill=tk.BOTH, expand=True)
+        
+        for i, p in enumerate(produtos[:self.LIMITE_PRODUTOS], 1):
+            tree.insert("", tk.END, iid=str(i - 1), values=(
+                f"{i}º",
+                p['codigo_barras'] or "",
+                p['nome'],
+                p['categoria_nome'] or "Sem Categoria",
+                f"{p['quantidade']:g}",
+                p['quantidade_vendas'],
+                Formatters.formatar_moeda(p['valor_total']),
+                f"{p['acumulado']:.1f}%",
+                p['classe']
+            ))
+        
+        def abrir_tendencia(event):
+            selecionado = tree.focus()
+            if selecionado:
+                self.mostrar_tendencia_produto(w, produtos[int(selecionado)], filtro)
+        
+        tree.bind("<Double-1>", abrir_tendencia)
+        
+        total_receita = sum(p['valor_total'] for p in produtos)
+        tk.Label(main, text=f"Receita Total do Período: {Formatters.formatar_moeda(total_receita)}",
+                 font=("Arial", 14, "bold"), fg="#27ae60").pack(pady=(20, 0))
+        
+        tk.Button(main, text="Fechar", font=("Arial", 11), bg="#95a5a6",
+                  fg="white", cursor="hand2", relief=tk.FLAT, padx=30, pady=10,
+                  command=w.destroy).pack(pady=(20, 0))
+    
+    def mostrar_tendencia_produto(self, janela, produto, filtro):
+        """Mostra as vendas dia a dia de um produto no período do relatório."""
+        serie = AnaliseVendasService.tendencia(produto['produto_id'], filtro)
+        maior = max((dia['quantidade'] for dia in serie), default=0)
+        
+        w = tk.Toplevel(janela)
+        w.title(f"Tendência - {produto['nome']}")
+        w.geometry("700x550")
+        
+        main = ttk.Frame(w, padding="20")
+        main.pack(fill=tk.BOTH, expand=True)
+        
+        tk.Label(main, text=f"📈 {produto['nome']}", font=("Arial", 14, "bold")).pack(pady=(0, 10))
+        
+        dias_com_venda = sum(1 for dia in serie if dia['quantidade_vendas'])
+        tk.Label(main, text=f"Vendido em {dias_com_venda} de {len(serie)} dia(s)  |  Média: {produto['quantidade'] / len(serie):.2f} por dia",
+                 font=("Arial", 10), fg="#7f8c8d").pack(pady=(0, 10))
+        
+        tree_frame = ttk.Frame(main)
+        tree_frame.pack(fill=tk.BOTH, expand=True)
+        
+        scroll = ttk.Scrollbar(tree_frame)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        tree = ttk.Treeview(tree_frame, yscrollcommand=scroll.set,
+            columns=("data", "qtd", "vendas", "receita", "barra"), show="headings")
+        
+        tree.heading("data", text="Data")
+        tree.heading("qtd", text="Quantidade")
+        tree.heading("vendas", text="N° Vendas")
+        tree.heading("receita", text="Receita")
+        tree.heading("barra", text="")
+        
+        tree.column("data", width=100)
+        tree.column("qtd", width=90, anchor=tk.CENTER)
+        tree.column("vendas", width=80, anchor=tk.CENTER)
+        tree.column("receita", width=110, anchor=tk.E)
+        tree.column("barra", width=220)
+        
+        scroll.config(command=tree.yview)
+        tree.pack(fill=tk.BOTH, expand=True)
+        
+        for dia in serie:
+            tree.insert("", tk.END, values=(
+                Formatters.formatar_data(dia['data']),
+                f"{dia['quantidade']:g}",
+                dia['quantidade_vendas'],
+                Formatters.formatar_moeda(dia['valor_total']),
+                "█" * round(dia['quantidade'] / maior * 25) if maior > 0 else ""
+            ))
+        
+        tk.Button(main, text="Fechar", font=("Arial", 11), bg="#95a5a6",
+                  fg="white", cursor="hand2", relief=tk.FLAT, padx=30, pady=10,
+                  command=w.destroy).pack(pady=(15, 0))
     
     def relatorio_estoque_baixo(self):
         """Relatório de estoque baixo."""
@@ -6,7 +6,7 @@ Inclui alertas visuais e sonoros de estoque.
 import tkinter as tk
 from tkinter import ttk
 
-from src.dao.produto_dao import ProdutoDAO
+from src.services.produto_catalog_cache import produto_catalog_cache
 from src.utils.estoque_alerta import EstoqueAlerta
 
 
@@ -178,15 +178,15 @@ class BuscaProdutoPanel(tk.Frame):
         
         if not termo:
             # Sem termo: mostra todos (limitado)
-            produtos = ProdutoDAO.buscar_todos()[:50]
+            produtos = produto_catalog_cache.listar(limite=50)
         else:
             # Tenta buscar por código exato
-            produto = ProdutoDAO.buscar_por_codigo_barras(termo)
+            produto = produto_catalog_cache.buscar_por_codigo_barras(termo)
             if produto:
                 produtos = [produto]
             else:
                 # Busca por nome
-                produtos = ProdutoDAO.buscar_por_nome(termo)
+                produtos = produto_catalog_cache.buscar_por_nome(termo)
         
         self.produtos_cache = produtos
         
@@ -289,7 +289,7 @@ class BuscaProdutoPanel(tk.Frame):
         try:
             # Pega o ID do produto
             produto_id = int(self.tree.item(selecionado[0])['tags'][0])
-            produto = ProdutoDAO.buscar_por_id(produto_id)
+            produto = produto_catalog_cache.buscar_por_id(produto_id)
             
             if produto:
                 # Emite alerta sonoro se necessário
@@ -140,6 +140,18 @@ class MainCaixa:
         for widget in self.window.winfo_children():
             widget.destroy()
         
+        # Catálogo em memória para leitura de código de barras sem ir ao banco
+        from src.services.produto_catalog_cache import produto_catalog_cache
+        produto_catalog_cache.iniciar()
+        
+        # Vendas são gravadas no diário local e enviadas ao MySQL em segundo plano
+        from src.services.pipeline_vendas import pipeline_vendas
+        pipeline_vendas.iniciar()
+        
+        # Primeiro bloco de números de venda reservado sem esperar a primeira venda
+        from src.services.numeracao_vendas import numeracao_vendas
+        numeracao_vendas.prereservar(self.caixa_atual.id)
+        
         # Importa e cria a tela de venda
         from src.ui.caixa.venda_window import VendaFrame
         VendaFrame(self.window, self.usuario, self.caixa_atual, self.fechar_caixa_callback, self.sair).pack(fill=tk.BOTH, expand=True)
@@ -240,6 +252,31 @@ class MainCaixa:
             ):
                 return
             
+            # O fechamento usa os totais do MySQL: envia antes as vendas do diário local
+            from src.services.venda_journal import venda_journal, replicador_vendas
+            try:
+                replicador_vendas.drenar()
+            except Exception:
+                pass
+            
+            rejeitadas = venda_journal.contar_rejeitadas()
+            if rejeitadas:
+                messagebox.showwarning(
+                    "Vendas Recusadas",
+                    f"{rejeitadas} venda(s) foram recusadas pelo servidor e estão guardadas\n"
+                    f"apenas no diário local ({venda_journal.caminho}).\n\n"
+                    f"Elas não entram nos totais deste fechamento. Avise o gerente."
+                )
+            
+            pendentes = venda_journal.contar_pendentes()
+            if pendentes and not messagebox.askyesno(
+                "Vendas Pendentes",
+                f"{pendentes} venda(s) ainda não foram enviadas ao servidor.\n\n"
+                f"Elas continuarão sendo enviadas automaticamente, mas não entram\n"
+                f"nos totais deste fechamento. Fechar mesmo assim?"
+            ):
+                return
+            
             # Fecha caixa
             if CaixaDAO.fechar_caixa(self.caixa_atual.id, float(valor_fechamento)):
                 messagebox.showinfo(
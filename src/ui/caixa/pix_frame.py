@@ -8,9 +8,11 @@ import qrcode
 from PIL import Image, ImageTk
 import io
 import base64
+import queue
 from decimal import Decimal
 
-from src.services.mercado_pago_service import mercado_pago_service, pix_monitor
+from src.services.mercado_pago_service import mercado_pago_service
+from src.services.pagamento_status_hub import pagamento_status_hub
 from src.utils.formatters import Formatters
 
 
@@ -28,6 +30,7 @@ class PIXFrame(tk.Frame):
         self.payment_id = None
         self.qr_code_data = None
         self.timer_ativo = True
+        self.eventos_status = queue.Queue()  # callbacks vindos da central de status
         
         self.criar_widgets()
         self.processar_payment_data()
@@ -211,11 +214,29 @@ class PIXFrame(tk.Frame):
     def iniciar_monitoramento(self):
         """Inicia o monitoramento do pagamento."""
         if self.payment_id:
-            pix_monitor.adicionar_monitoramento(
+            # A central chama os callbacks em outra thread: repassa pela fila
+            # e os executa na thread do Tk
+            pagamento_status_hub.registrar(
                 self.payment_id,
-                self.pagamento_aprovado,
-                self.pagamento_erro
+                lambda: self.eventos_status.put((self.pagamento_aprovado, ())),
+                lambda motivo: self.eventos_status.put((self.pagamento_erro, (motivo,)))
             )
+            self.processar_eventos_status()
+    
+    def processar_eventos_status(self):
+        """Executa na thread do Tk os callbacks recebidos da central de status."""
+        if not self.winfo_exists():
+            return
+        
+        try:
+            while True:
+                callback, argumentos = self.eventos_status.get_nowait()
+                callback(*argumentos)
+        except queue.Empty:
+            pass
+        
+        if self.timer_ativo:
+            self.after(100, self.processar_eventos_status)
     
     def iniciar_countdown(self, segundos_restantes):
         """Inicia o countdown do PIX."""
@@ -258,7 +279,7 @@ class PIXFrame(tk.Frame):
         
         # Remove do monitoramento
         if self.payment_id:
-            pix_monitor.remover_monitoramento(self.payment_id)
+            pagamento_status_hub.remover(self.payment_id)
         
         # Chama callback após 3 segundos
         self.after(3000, lambda: self.callback_cancelado(motivo))
@@ -273,7 +294,7 @@ class PIXFrame(tk.Frame):
         # Cancela pagamento no Mercado Pago
         if self.payment_id:
             mercado_pago_service.cancelar_pagamento(self.payment_id)
-            pix_monitor.remover_monitoramento(self.payment_id)
+            pagamento_status_hub.remover(self.payment_id)
         
         # Chama callback após 2 segundos
         self.after(2000, lambda: self.callback_cancelado("PIX expirado"))
@@ -304,7 +325,7 @@ class PIXFrame(tk.Frame):
         # Cancela no Mercado Pago
         if self.payment_id:
             sucesso = mercado_pago_service.cancelar_pagamento(self.payment_id)
-            pix_monitor.remover_monitoramento(self.payment_id)
+            pagamento_status_hub.remover(self.payment_id)
             
             if sucesso:
                 self.label_status.config(text="❌ PIX CANCELADO", fg="#e74c3c")
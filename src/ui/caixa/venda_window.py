@@ -7,10 +7,11 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from decimal import Decimal
 
+from src.config.config_reader import config
 from src.models.usuario import Usuario
 from src.models.caixa import Caixa
 from src.services.venda_service import VendaService
-from src.dao.produto_dao import ProdutoDAO
+from src.services.produto_catalog_cache import produto_catalog_cache
 from src.utils.formatters import Formatters
 from src.utils.logger import Logger
 from src.ui.styles import ModernStyles
@@ -246,6 +247,18 @@ class VendaFrame(ttk.Frame):
             bg=ModernStyles.BG_DARK
         ).pack(side=tk.RIGHT)
         
+        # Situação da gravação das vendas em segundo plano
+        self.label_sincronizacao = tk.Label(
+            info_content,
+            text="",
+            font=(ModernStyles.FONT_FAMILY, 10),
+            fg=ModernStyles.TEXT_LIGHT,
+            bg=ModernStyles.BG_DARK
+        )
+        if self.venda_service.usar_diario:
+            self.label_sincronizacao.pack(side=tk.RIGHT, padx=(0, 20))
+            self._atualizar_status_sincronizacao()
+        
         # Área principal (esquerda e direita)
         corpo = tk.Frame(self.main_frame, bg=ModernStyles.BG_MAIN)
         corpo.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)  # Reduzido padding
@@ -262,6 +275,32 @@ class VendaFrame(ttk.Frame):
         
         # Estado da tela
         self.modo_pagamento = False
+    
+    def _atualizar_status_sincronizacao(self):
+        """Atualiza o indicador de vendas pendentes de envio ao servidor (a cada 1 s)."""
+        if not self.winfo_exists():
+            return
+        
+        from src.services.pipeline_vendas import pipeline_vendas
+        status = pipeline_vendas.obter_status()
+        pendentes = status["pendentes"] or 0
+        
+        if status["rejeitadas"]:
+            texto, cor = f"⚠ {status['rejeitadas']} venda(s) recusada(s) pelo servidor - avise o gerente", ModernStyles.WARNING
+        elif status["erro"]:
+            texto, cor = f"⚠ {pendentes} venda(s) pendente(s) - tentando novamente", ModernStyles.WARNING
+        elif pendentes:
+            texto, cor = f"⏳ Enviando {pendentes} venda(s)", ModernStyles.TEXT_LIGHT
+        else:
+            texto, cor = "✓ Vendas sincronizadas", ModernStyles.SUCCESS_LIGHT
+        
+        from src.services.impressao_cupom import spooler_impressao
+        impressora = spooler_impressao.obter_status()
+        if impressora["erro"]:
+            texto, cor = f"{texto}  |  ⚠ Impressora: {impressora['fila']} cupom(ns) na fila", ModernStyles.WARNING
+        
+        self.label_sincronizacao.config(text=texto, fg=cor)
+        self.after(1000, self._atualizar_status_sincronizacao)
 
     def _montar_area_venda_esquerda(self):
         """Monta components principais da área de venda."""
@@ -675,10 +714,10 @@ class VendaFrame(ttk.Frame):
             self.label_quantidade.config(text="")
             return
             
-        produto = ProdutoDAO.buscar_por_codigo_barras(codigo)
+        produto = produto_catalog_cache.buscar_por_codigo_barras(codigo)
         
         if not produto:
-            produtos = ProdutoDAO.buscar_por_nome(codigo)
+            produtos = produto_catalog_cache.buscar_por_nome(codigo)
             if len(produtos) == 1:
                 produto = produtos[0]
             elif len(produtos) > 1:
@@ -1656,7 +1695,7 @@ class VendaFrame(ttk.Frame):
                     thread_split.start()
                     
                     Logger.log_operacao("Sistema", "SPLIT_INICIADO", 
-                                      f"Venda {venda_id} - Payment ID: {payment_id} - Valor: R$ {float(venda.total):.2f}")
+                                      f"Venda {venda.numero_venda} - Payment ID: {payment_id} - Valor: R$ {float(venda.total):.2f}")
                 except Exception as e:
                     Logger.log_erro("SPLIT", f"Erro ao iniciar processamento de split: {str(e)}")
             
@@ -1682,12 +1721,20 @@ class VendaFrame(ttk.Frame):
                     if widget.winfo_exists():
                         widget.destroy()
             
-            # Mostrar pergunta sobre cupom (com timeout automático)
-            self.mostrar_pergunta_cupom()
             self.modo_pagamento = False
             
-            # Auto-avançar para nova venda após 5 segundos se não escolher
-            self._timeout_cupom = self.after(5000, self.nova_venda)
+            from src.services.impressao_cupom import spooler_impressao
+            if not spooler_impressao.ativo:
+                # Sem impressora nem arquivamento configurados: não há o que perguntar
+                self.nova_venda()
+            elif config.getboolean('impressora', 'imprimir_automatico', fallback=False):
+                self.imprimir_cupom()
+            else:
+                # Mostrar pergunta sobre cupom (com timeout automático)
+                self.mostrar_pergunta_cupom()
+                
+                # Auto-avançar para nova venda após 5 segundos se não escolher
+                self._timeout_cupom = self.after(5000, self.nova_venda)
         
         except Exception as e:
             Logger().error(f"Erro ao finalizar venda com sucesso: {e}")
@@ -1830,13 +1877,25 @@ class VendaFrame(ttk.Frame):
                 self.label_timeout.config(text="⏱️ Iniciando nova venda...")
     
     def imprimir_cupom(self):
-        """Simula impressão do cupom não fiscal."""
+        """Envia o cupom não fiscal da última venda para a fila de impressão (não espera a impressora)."""
         # Cancela timeout automático
         if hasattr(self, '_timeout_cupom'):
             self.after_cancel(self._timeout_cupom)
         
-        self.mostrar_mensagem_temporaria("🖨️ Cupom impresso!", "#27ae60")
-        self.after(2000, self.nova_venda)
+        from src.services.impressao_cupom import spooler_impressao
+        
+        self.nova_venda()
+        
+        venda = self.venda_service.ultima_venda
+        if venda is None:
+            return
+        
+        if spooler_impressao.enfileirar(venda, self.venda_service.ultimos_pagamentos):
+            fila = spooler_impressao.profundidade()
+            texto = "🖨️ Imprimindo cupom..." if fila <= 1 else f"🖨️ Cupom na fila de impressão ({fila} cupons)"
+            self.mostrar_mensagem_temporaria(texto, "#27ae60")
+        else:
+            self.mostrar_mensagem_temporaria("⚠ Fila de impressão cheia - verifique a impressora", "#e74c3c")
     
     def nova_venda(self):
         """Inicia nova venda."""
@@ -5,7 +5,6 @@ Janela de Login do Sistema PDV.
 import tkinter as tk
 from tkinter import ttk, messagebox
 
-from src.services.auth_service import auth_service
 from src.models.usuario import Usuario
 
 
@@ -138,7 +137,8 @@ class LoginWindow:
         self.btn_login.config(state=tk.DISABLED, text="Autenticando...")
         self.window.update()
         
-        # Tenta fazer login
+        # Tenta fazer login (serviço e banco carregados só agora, a tela abre antes)
+        from src.services.auth_service import auth_service
         sucesso, mensagem, usuario = auth_service.login(username, senha)
         
         # Reabilita botão
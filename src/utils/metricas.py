@@ -0,0 +1,72 @@
+"""
+Acumulador de métricas de latência em memória.
+Usado pelos serviços para medir etapas (tempo médio, máximo, erros).
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+
+class MetricasLatencia:
+    """Contadores de chamadas, erros e tempo por nome de etapa/operação."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._dados: Dict[str, dict] = {}
+    
+    def registrar(self, nome: str, duracao: float, erro: bool = False):
+        """
+        Acumula uma medição.
+        
+        Args:
+            nome: Nome da etapa ou operação
+            duracao: Duração em segundos
+            erro: Se a execução terminou em erro
+        """
+        with self._lock:
+            m = self._dados.setdefault(nome, {
+                "chamadas": 0, "erros": 0, "tempo_total": 0.0, "tempo_maximo": 0.0, "tempo_ultimo": 0.0
+            })
+            m["chamadas"] += 1
+            m["tempo_total"] += duracao
+            m["tempo_maximo"] = max(m["tempo_maximo"], duracao)
+            m["tempo_ultimo"] = duracao
+            if erro:
+                m["erros"] += 1
+    
+    @contextmanager
+    def medir(self, nome: str):
+        """Context manager que mede o bloco e registra erro se houver exceção."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.registrar(nome, time.perf_counter() - inicio, erro=True)
+            raise
+        self.registrar(nome, time.perf_counter() - inicio)
+    
+    def obter(self) -> Dict[str, dict]:
+        """
+        Retorna as métricas acumuladas.
+        
+        Returns:
+            dict {nome: {chamadas, erros, tempo_medio_ms, tempo_maximo_ms, tempo_ultimo_ms}}
+        """
+        with self._lock:
+            return {
+                nome: {
+                    "chamadas": m["chamadas"],
+                    "erros": m["erros"],
+                    "tempo_medio_ms": round(m["tempo_total"] / m["chamadas"] * 1000, 1),
+                    "tempo_maximo_ms": round(m["tempo_maximo"] * 1000, 1),
+                    "tempo_ultimo_ms": round(m["tempo_ultimo"] * 1000, 1)
+                }
+                for nome, m in self._dados.items()
+            }
+    
+    def zerar(self):
+        """Descarta as métricas acumuladas."""
+        with self._lock:
+            self._dados.clear()
@@ -0,0 +1,278 @@
+"""
+Monitoramento das consultas SQL feitas pelos DAOs.
+
+Cada cursor entregue por DatabaseConnection.get_cursor() é envolvido por um
+CursorMonitorado, que mede cada comando (execução + leitura das linhas),
+conta as linhas e atribui o tempo ao método que abriu o cursor (ex.:
+"ProdutoDAO.pesquisar"). Os números ficam agregados em histogramas por
+método e as consultas acima do limite vão para um log rotativo próprio.
+"""
+
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Dict, List
+
+from src.config.config_reader import config
+
+
+class CursorMonitorado:
+    """Cursor que mede cada comando e repassa o resto ao cursor real."""
+    
+    def __init__(self, cursor, monitor: 'MonitorSQL', origem: str):
+        self._cursor = cursor
+        self._monitor = monitor
+        self._origem = origem
+        self._sql = None
+        self._duracao = 0.0
+        self._linhas = 0
+    
+    def __getattr__(self, nome):
+        return getattr(self._cursor, nome)
+    
+    def __iter__(self):
+        for row in self._cursor:
+            self._linhas += 1
+            yield row
+    
+    def execute(self, sql, *args, **kwargs):
+        self._concluir()
+        inicio = time.perf_counter()
+        try:
+            resultado = self._cursor.execute(sql, *args, **kwargs)
+        except Exception:
+            self._monitor.registrar(self._origem, sql, time.perf_counter() - inicio, 0, erro=True)
+            raise
+        self._sql, self._duracao, self._linhas = sql, time.perf_counter() - inicio, 0
+        return resultado
+    
+    def executemany(self, sql, *args, **kwargs):
+        self._concluir()
+        inicio = time.perf_counter()
+        try:
+            resultado = self._cursor.executemany(sql, *args, **kwargs)
+        except Exception:
+            self._monitor.registrar(self._origem, sql, time.perf_counter() - inicio, 0, erro=True)
+            raise
+        self._sql, self._duracao, self._linhas = sql, time.perf_counter() - inicio, 0
+        return resultado
+    
+    def fetchone(self):
+        inicio = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._duracao += time.perf_counter() - inicio
+        if row is not None:
+            self._linhas += 1
+        return row
+    
+    def fetchmany(self, *args, **kwargs):
+        inicio = time.perf_counter()
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._duracao += time.perf_counter() - inicio
+        self._linhas += len(rows)
+        return rows
+    
+    def fetchall(self):
+        inicio = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._duracao += time.perf_counter() - inicio
+        self._linhas += len(rows)
+        return rows
+    
+    def close(self):
+        self._concluir()
+        return self._cursor.close()
+    
+    def _concluir(self):
+        """Registra o comando anterior (chamado no próximo execute ou no close)."""
+        if self._sql is None:
+            return
+        
+        # Em INSERT/UPDATE/DELETE as linhas são as afetadas
+        linhas = self._linhas or max(self._cursor.rowcount or 0, 0)
+        self._monitor.registrar(self._origem, self._sql, self._duracao, linhas)
+        self._sql = None
+
+
+class MonitorSQL:
+    """Histogramas de latência por método de DAO e log de consultas lentas."""
+    
+    # Limites superiores (ms) das faixas do histograma
+    FAIXAS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+    
+    # Quadros que não identificam quem fez a consulta
+    _ARQUIVOS_INTERNOS = ('database.py', 'contextlib.py', 'monitor_sql.py')
+    
+    def __init__(self):
+        self.ativo = config.getboolean('monitoramento', 'monitorar_sql', fallback=True)
+        self.limite_lenta = config.getfloat('monitoramento', 'limite_consulta_lenta_ms', fallback=200.0) / 1000
+        self._lock = threading.Lock()
+        self._dados: Dict[str, dict] = {}
+        self._log_lentas = None
+    
+    # ==================== COLETA ====================
+    
+    def envolver(self, cursor, origem: str = None):
+        """Devolve o cursor monitorado (ou o próprio cursor se o monitor estiver desligado)."""
+        if not self.ativo:
+            return cursor
+        return CursorMonitorado(cursor, self, origem or self.identificar_origem())
+    
+    def identificar_origem(self) -> str:
+        """Nome do primeiro método fora da camada de conexão na pilha (ex.: ProdutoDAO.pesquisar)."""
+        frame = sys._getframe(1)
+        while frame is not None:
+            codigo = frame.f_code
+            arquivo = os.path.basename(codigo.co_filename)
+            if arquivo not in self._ARQUIVOS_INTERNOS:
+                modulo = os.path.splitext(arquivo)[0]
+                return getattr(codigo, 'co_qualname', f"{modulo}.{codigo.co_name}")
+            frame = frame.f_back
+        return "desconhecido"
+    
+    def registrar(self, origem: str, sql: str, duracao: float, linhas: int, erro: bool = False):
+        """
+        Acumula a medição de um comando.
+        
+        Args:
+            origem: Método que fez a consulta
+            sql: Texto do comando
+            duracao: Segundos entre o execute e a última linha lida
+            linhas: Linhas lidas (SELECT) ou afetadas (DML)
+            erro: Se o comando falhou
+        """
+        duracao_ms = duracao * 1000
+        faixa = next((i for i, limite in enumerate(self.FAIXAS_MS) if duracao_ms <= limite), len(self.FAIXAS_MS))
+        
+        with self._lock:
+            m = self._dados.get(origem)
+            if m is None:
+                m = self._dados[origem] = {
+                    "chamadas": 0, "erros": 0, "linhas": 0, "tempo_total": 0.0, "tempo_maximo": 0.0,
+                    "faixas": [0] * (len(self.FAIXAS_MS) + 1)
+                }
+            m["chamadas"] += 1
+            m["linhas"] += linhas
+            m["tempo_total"] += duracao
+            m["tempo_maximo"] = max(m["tempo_maximo"], duracao)
+            m["faixas"][faixa] += 1
+            if erro:
+                m["erros"] += 1
+        
+        if duracao >= self.limite_lenta:
+            self._registrar_lenta(origem, sql, duracao_ms, linhas, erro)
+    
+    def _registrar_lenta(self, origem: str, sql: str, duracao_ms: float, linhas: int, erro: bool):
+        """Grava a consulta no log de consultas lentas (sem os parâmetros, que podem ter dados pessoais)."""
+        if self._log_lentas is None:
+            # Sob o lock: duas consultas lentas simultâneas não podem abrir dois handlers no mesmo arquivo
+            with self._lock:
+                if self._log_lentas is None:
+                    self._log_lentas = self._criar_log_lentas()
+        
+        sql_compacto = re.sub(r"\s+", " ", str(sql)).strip()[:2000]
+        self._log_lentas.warning(
+            f"{duracao_ms:.1f} ms | {origem} | {linhas} linha(s){' | ERRO' if erro else ''} | {sql_compacto}"
+        )
+    
+    @staticmethod
+    def _criar_log_lentas() -> logging.Logger:
+        """Logger com arquivo rotativo para as consultas lentas."""
+        pasta = Path(config.get_log_path())
+        pasta.mkdir(exist_ok=True)
+        
+        handler = RotatingFileHandler(
+            pasta / "consultas_lentas.log",
+            maxBytes=config.getint('monitoramento', 'tamanho_log_lentas_kb', fallback=5120) * 1024,
+            backupCount=config.getint('monitoramento', 'arquivos_log_lentas', fallback=5),
+            encoding='utf-8'
+        )
+        handler.setFormatter(logging.Formatter('%(asctime)s | %(message)s', datefmt='%Y-%m-%d %H:%M:%S'))
+        
+        logger = logging.getLogger('PDV.sql_lento')
+        logger.handlers.clear()
+        logger.addHandler(handler)
+        logger.setLevel(logging.WARNING)
+        logger.propagate = False
+        return logger
+    
+    # ==================== CONSULTA ====================
+    
+    def obter_resumo(self) -> List[dict]:
+        """
+        Estatísticas por método, do maior tempo total para o menor.
+        
+        Returns:
+            Lista de dicts com origem, chamadas, erros, linhas, tempo_total_ms,
+            tempo_medio_ms, p95_ms (limite da faixa do histograma) e tempo_maximo_ms
+        """
+        with self._lock:
+            dados = {origem: dict(m, faixas=list(m["faixas"])) for origem, m in self._dados.items()}
+        
+        resumo = []
+        for origem, m in dados.items():
+            resumo.append({
+                "origem": origem,
+                "chamadas": m["chamadas"],
+                "erros": m["erros"],
+                "linhas": m["linhas"],
+                "tempo_total_ms": round(m["tempo_total"] * 1000, 1),
+                "tempo_medio_ms": round(m["tempo_total"] / m["chamadas"] * 1000, 2),
+                "p95_ms": self._percentil(m["faixas"], m["chamadas"], 0.95, m["tempo_maximo"] * 1000),
+                "tempo_maximo_ms": round(m["tempo_maximo"] * 1000, 1)
+            })
+        
+        resumo.sort(key=lambda r: r["tempo_total_ms"], reverse=True)
+        return resumo
+    
+    def _percentil(self, faixas: List[int], total: int, fracao: float, maximo_ms: float) -> float:
+        """Percentil aproximado pelo limite superior da faixa do histograma."""
+        alvo = total * fracao
+        acumulado = 0
+        for i, quantidade in enumerate(faixas):
+            acumulado += quantidade
+            if acumulado >= alvo:
+                return self.FAIXAS_MS[i] if i < len(self.FAIXAS_MS) else round(maximo_ms, 1)
+        return round(maximo_ms, 1)
+    
+    def exportar_prometheus(self) -> str:
+        """Histogramas no formato texto do Prometheus (para o endpoint /metrics)."""
+        with self._lock:
+            dados = {origem: dict(m, faixas=list(m["faixas"])) for origem, m in self._dados.items()}
+        
+        linhas = [
+            "# HELP pdv_sql_duracao_ms Latência dos comandos SQL por método de DAO.",
+            "# TYPE pdv_sql_duracao_ms histogram"
+        ]
+        for origem, m in sorted(dados.items()):
+            acumulado = 0
+            for limite, quantidade in zip(self.FAIXAS_MS + ("+Inf",), m["faixas"]):
+                acumulado += quantidade
+                linhas.append(f'pdv_sql_duracao_ms_bucket{{origem="{origem}",le="{limite}"}} {acumulado}')
+            linhas.append(f'pdv_sql_duracao_ms_sum{{origem="{origem}"}} {m["tempo_total"] * 1000:.3f}')
+            linhas.append(f'pdv_sql_duracao_ms_count{{origem="{origem}"}} {m["chamadas"]}')
+        
+        for nome, chave, descricao in (
+            ("pdv_sql_linhas_total", "linhas", "Linhas lidas ou afetadas por método de DAO."),
+            ("pdv_sql_erros_total", "erros", "Comandos SQL com erro por método de DAO.")
+        ):
+            linhas.append(f"# HELP {nome} {descricao}")
+            linhas.append(f"# TYPE {nome} counter")
+            for origem, m in sorted(dados.items()):
+                linhas.append(f'{nome}{{origem="{origem}"}} {m[chave]}')
+        
+        return "\n".join(linhas) + "\n"
+    
+    def zerar(self):
+        """Descarta as estatísticas acumuladas."""
+        with self._lock:
+            self._dados.clear()
+
+
+# Instância global
+monitor_sql = MonitorSQL()
@@ -0,0 +1,103 @@
+"""
+Teste da baixa de estoque em lote (EstoqueDAO.baixar_estoque).
+
+Cria um produto de teste, dá baixa com quantidade fracionada (venda por
+peso), com quantidade acima do saldo e com saldo negativo permitido
+(replicação do diário local), e confere o resultado de cada caso. Tudo roda
+em uma transação que é desfeita no final: nada fica gravado no banco.
+
+Uso:
+    python testar_baixa_estoque.py
+"""
+import sys
+from decimal import Decimal
+from src.config.database import DatabaseConnection
+from src.dao.estoque_dao import EstoqueDAO, EstoqueInsuficienteError
+from src.models.venda import ItemVenda
+
+ESTOQUE_INICIAL = 10
+
+class Desfazer(Exception):
+    """Levantada no fim do teste para desfazer a transação."""
+
+def criar_produto(cursor):
+    """Insere o produto de teste e retorna (produto_id, usuario_id)."""
+    cursor.execute(
+        "INSERT INTO produtos (nome, preco_venda, estoque_atual) VALUES (%s, %s, %s)",
+        ("TESTE baixa de estoque", Decimal('1.00'), ESTOQUE_INICIAL)
+    )
+    produto_id = cursor.lastrowid
+    cursor.execute("SELECT id FROM usuarios ORDER BY id LIMIT 1")
+    return produto_id, cursor.fetchone()['id']
+
+def saldo(cursor, produto_id):
+    """Estoque atual do produto."""
+    cursor.execute("SELECT estoque_atual FROM produtos WHERE id = %s", (produto_id,))
+    return cursor.fetchone()['estoque_atual']
+
+def movimentacoes(cursor, produto_id):
+    """Quantidade de movimentações registradas para o produto."""
+    cursor.execute("SELECT COUNT(*) as total FROM movimentacoes_estoque WHERE produto_id = %s", (produto_id,))
+    return cursor.fetchone()['total']
+
+def executar_casos(cursor):
+    """Executa os casos e retorna a lista de (descrição, ok, detalhe)."""
+    produto_id, usuario_id = criar_produto(cursor)
+    resultados = []
+    
+    # Venda por peso: 0,3 kg em estoque INT não altera a linha, mas a venda é válida
+    try:
+        EstoqueDAO.baixar_estoque(
+            [ItemVenda(produto_id=produto_id, quantidade=Decimal('0.300'))], usuario_id, "Teste fracionado", cursor
+        )
+        ok = movimentacoes(cursor, produto_id) == 1
+        resultados.append(("Quantidade fracionada (0,300) aceita", ok, f"saldo: {saldo(cursor, produto_id)}"))
+    except EstoqueInsuficienteError as e:
+        resultados.append(("Quantidade fracionada (0,300) aceita", False, str(e)))
+    
+    # Dois itens do mesmo produto somam mais que o saldo
+    itens = [ItemVenda(produto_id=produto_id, quantidade=Decimal('6')) for _ in range(2)]
+    try:
+        EstoqueDAO.baixar_estoque(itens, usuario_id, "Teste sem saldo", cursor)
+        resultados.append(("Quantidade acima do saldo recusada", False, "baixa aplicada"))
+    except EstoqueInsuficienteError as e:
+        ok = "TESTE baixa de estoque" in str(e) and saldo(cursor, produto_id) == ESTOQUE_INICIAL
+        resultados.append(("Quantidade acima do saldo recusada", ok, str(e)))
+    
+    # Replicação do diário: aplica mesmo sem saldo
+    EstoqueDAO.baixar_estoque(itens, usuario_id, "Teste negativo", cursor, permitir_negativo=True)
+    negativo = saldo(cursor, produto_id)
+    resultados.append(("Baixa com saldo negativo permitido", negativo == ESTOQUE_INICIAL - 12, f"saldo: {negativo}"))
+    
+    return resultados
+
+def main():
+    """Função principal."""
+    print("=" * 60)
+    print("📦 Teste da baixa de estoque em lote")
+    print("=" * 60)
+    
+    DatabaseConnection.initialize_pool()
+    
+    resultados = []
+    try:
+        with DatabaseConnection.get_cursor() as cursor:
+            resultados = executar_casos(cursor)
+            raise Desfazer()
+    except Desfazer:
+        pass
+    
+    falhas = 0
+    for descricao, ok, detalhe in resultados:
+        print(f"   {'✓' if ok else '✗'} {descricao:<40} {detalhe}")
+        if not ok:
+            falhas += 1
+    
+    if falhas:
+        print(f"\n✗ {falhas} caso(s) com falha")
+        sys.exit(1)
+    
+    print("\n✓ Baixa de estoque correta (nada foi gravado)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Teste do spooler de impressão do cupom sem impressora física.
+
+Cria um pseudo-terminal (pty) que faz o papel da impressora térmica, envia
+alguns cupons para a fila e confere os bytes ESC/POS recebidos do outro
+lado. Também mede quanto tempo o caixa fica preso em cada envio.
+
+Uso:
+    python testar_impressora.py                   # pty (Linux/macOS)
+    python testar_impressora.py saida.bin         # arquivo comum no lugar da impressora
+    python testar_impressora.py saida.bin cupons  # + arquiva os PDFs na pasta cupons
+"""
+import os
+import sys
+import threading
+import time
+from decimal import Decimal
+from src.models.pagamento import Pagamento
+from src.models.venda import Venda, ItemVenda
+from src.services.impressao_cupom import SpoolerImpressao, GS_CORTE_PARCIAL
+
+CUPONS = 20
+
+def venda_exemplo(numero):
+    """Venda com dois itens paga em dinheiro com troco."""
+    venda = Venda(numero_venda=f"V1-{numero:06d}", caixa_id=1, status=Venda.STATUS_FINALIZADA)
+    for nome, quantidade, preco in (("Arroz Branco 1kg", Decimal('2'), Decimal('5.99')),
+                                    ("Feijão Carioca 1kg", Decimal('1'), Decimal('8.49'))):
+        item = ItemVenda(produto_id=numero, quantidade=quantidade, preco_unitario=preco)
+        item.produto_nome = nome
+        venda.adicionar_item(item)
+    pagamento = Pagamento(forma_pagamento=Pagamento.FORMA_DINHEIRO, valor=venda.total,
+                          valor_pago=Decimal('50.00'), troco=Decimal('50.00') - venda.total)
+    return venda, [pagamento]
+
+def abrir_pty():
+    """Retorna (descritor do lado da 'impressora', caminho do dispositivo para o spooler)."""
+    import pty
+    mestre, escravo = pty.openpty()
+    import tty
+    tty.setraw(escravo)  # sem conversão de \n nem eco
+    return mestre, os.ttyname(escravo)
+
+def main():
+    """Função principal."""
+    argumentos = sys.argv[1:]
+    arquivo = argumentos[0] if argumentos else None
+    pasta_pdf = argumentos[1] if len(argumentos) > 1 else ''
+    
+    print("=" * 60)
+    print("🖨️  Teste do spooler de impressão")
+    print("=" * 60)
+    
+    recebido = bytearray()
+    if arquivo:
+        if os.path.exists(arquivo):
+            os.remove(arquivo)
+        dispositivo = arquivo
+    else:
+        mestre, dispositivo = abrir_pty()
+        
+        def ler():
+            while True:
+                try:
+                    dados = os.read(mestre, 4096)
+                except OSError:
+                    return
+                if not dados:
+                    return
+                recebido.extend(dados)
+        
+        threading.Thread(target=ler, daemon=True).start()
+    
+    print(f"   Dispositivo: {dispositivo}")
+    spooler = SpoolerImpressao(dispositivo=dispositivo, pasta_pdf=pasta_pdf)
+    spooler.tipo = 'arquivo'
+    
+    tempos = []
+    for numero in range(1, CUPONS + 1):
+        venda, pagamentos = venda_exemplo(numero)
+        inicio = time.perf_counter()
+        spooler.enfileirar(venda, pagamentos)
+        tempos.append(time.perf_counter() - inicio)
+    print(f"   {CUPONS} cupons enviados; fila logo após o envio: {spooler.profundidade()}")
+    print(f"   Espera máxima do caixa por envio: {max(tempos) * 1000:.2f} ms")
+    
+    if not spooler.aguardar(30):
+        print("   ✗ A fila não esvaziou em 30 segundos")
+        sys.exit(1)
+    time.sleep(0.2)
+    
+    if arquivo:
+        with open(arquivo, 'rb') as f:
+            recebido.extend(f.read())
+    
+    status = spooler.obter_status()
+    cortes = bytes(recebido).count(GS_CORTE_PARCIAL)
+    cabecalhos = bytes(recebido).count(spooler.renderizador.cabecalho_escpos)
+    print(f"   {len(recebido)} bytes recebidos, {cortes} corte(s), {cabecalhos} cabeçalho(s)")
+    print(f"   Impressos: {status['impressos']}  Falhas: {status['falhas']}")
+    
+    if status['falhas'] or cortes != CUPONS or cabecalhos != CUPONS:
+        print(f"   ✗ Esperados {CUPONS} cupons completos ({status['erro'] or 'cupons incompletos'})")
+        sys.exit(1)
+    print("   ✓ Todos os cupons chegaram completos e na ordem da fila")
+
+if __name__ == '__main__':
+    main()
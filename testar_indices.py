@@ -0,0 +1,119 @@
+"""
+Teste de uso dos índices nas consultas por período.
+
+Executa os métodos dos DAOs que filtram por período (Periodo.filtro) e,
+antes de cada SELECT que eles geram, roda o mesmo SQL com EXPLAIN, com os
+mesmos parâmetros. Falha se a tabela filtrada não usar o índice esperado
+ou se for lida por varredura completa (type = ALL).
+
+Em tabelas quase vazias o otimizador pode preferir a varredura completa;
+rode em uma base com movimento real (ou uma cópia dela).
+
+Uso:
+    python testar_indices.py
+    python testar_indices.py 2026-10-01 2026-10-31   # período consultado (padrão: últimos 30 dias)
+"""
+import sys
+from datetime import date, timedelta
+from src.config.database import DatabaseConnection
+from src.dao.venda_dao import VendaDAO
+from src.dao.pagamento_dao import PagamentoDAO
+from src.dao.estorno_dao import EstornoDAO
+from src.dao.caixa_dao import CaixaDAO
+from src.utils.monitor_sql import monitor_sql
+
+INDICES_VENDAS = ('idx_status_data_hora', 'idx_data_hora')
+
+class CursorExplain:
+    """Cursor que roda EXPLAIN de cada SELECT antes de executá-lo e guarda o plano."""
+    
+    def __init__(self, cursor, planos):
+        self._cursor = cursor
+        self._planos = planos
+    
+    def __getattr__(self, nome):
+        return getattr(self._cursor, nome)
+    
+    def __iter__(self):
+        return iter(self._cursor)
+    
+    def execute(self, sql, params=None, *args, **kwargs):
+        if str(sql).lstrip().upper().startswith("SELECT"):
+            self._cursor.execute("EXPLAIN " + sql, params)
+            linhas = self._cursor.fetchall()
+            nomes = self._cursor.column_names
+            self._planos.append([linha if isinstance(linha, dict) else dict(zip(nomes, linha)) for linha in linhas])
+        return self._cursor.execute(sql, params, *args, **kwargs)
+
+def capturar_planos(funcao):
+    """Executa a função do DAO e retorna os planos (linhas do EXPLAIN) de cada SELECT."""
+    planos = []
+    envolver_original = monitor_sql.envolver
+    monitor_sql.envolver = lambda cursor, origem=None: CursorExplain(envolver_original(cursor, origem), planos)
+    try:
+        funcao()
+    finally:
+        monitor_sql.envolver = envolver_original
+    return planos
+
+def verificar(planos, tabela, indices):
+    """Retorna (ok, descrição) para a linha do plano da tabela filtrada."""
+    for plano in planos:
+        for linha in plano:
+            if linha.get('table') == tabela:
+                chave, tipo = linha.get('key'), linha.get('type')
+                descricao = f"key={chave} type={tipo} rows={linha.get('rows')}"
+                return chave in indices and tipo != 'ALL', descricao
+    return False, f"tabela {tabela} não aparece no plano"
+
+def main():
+    """Função principal."""
+    argumentos = sys.argv[1:]
+    
+    try:
+        data_fim = date.fromisoformat(argumentos[1]) if len(argumentos) > 1 else date.today()
+        data_inicio = date.fromisoformat(argumentos[0]) if argumentos else data_fim - timedelta(days=29)
+    except ValueError:
+        print("✗ Datas devem estar no formato AAAA-MM-DD")
+        sys.exit(1)
+    
+    # (descrição, chamada do DAO, tabela/alias filtrado no plano, índices aceitos)
+    casos = [
+        ("VendaDAO.obter_total_vendas_dia", lambda: VendaDAO.obter_total_vendas_dia(data_fim),
+         'vendas', INDICES_VENDAS),
+        ("VendaDAO.buscar_por_periodo", lambda: VendaDAO.buscar_por_periodo(data_inicio, data_fim, "finalizada"),
+         'v', INDICES_VENDAS),
+        ("VendaDAO.contar_por_periodo", lambda: VendaDAO.contar_por_periodo(data_inicio, data_fim, "finalizada"),
+         'vendas', INDICES_VENDAS),
+        ("PagamentoDAO.obter_total_por_forma_pagamento", lambda: PagamentoDAO.obter_total_por_forma_pagamento(data_fim),
+         'p', INDICES_VENDAS),
+        ("PagamentoDAO.buscar_por_periodo", lambda: PagamentoDAO.buscar_por_periodo(data_inicio, data_fim),
+         'p', INDICES_VENDAS),
+        ("EstornoDAO.obter_total_estornos_dia", lambda: EstornoDAO.obter_total_estornos_dia(data_fim),
+         'estornos', ('idx_data',)),
+        ("CaixaDAO.buscar_por_periodo", lambda: CaixaDAO.buscar_por_periodo(data_inicio, data_fim),
+         'c', ('idx_data_abertura',)),
+    ]
+    
+    print("=" * 60)
+    print("🔍 Teste de uso dos índices nas consultas por período")
+    print(f"   Período: {data_inicio} a {data_fim}")
+    print("=" * 60)
+    
+    DatabaseConnection.initialize_pool()
+    
+    falhas = 0
+    for descricao, funcao, tabela, indices in casos:
+        ok, detalhe = verificar(capturar_planos(funcao), tabela, indices)
+        print(f"   {'✓' if ok else '✗'} {descricao:<46} {detalhe}")
+        if not ok:
+            falhas += 1
+    
+    if falhas:
+        print(f"\n✗ {falhas} consulta(s) sem o índice esperado ou com varredura completa")
+        sys.exit(1)
+    
+    print("\n✓ Todas as consultas por período usam índice")
+
+if __name__ == '__main__':
+    main()
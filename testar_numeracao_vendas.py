@@ -0,0 +1,136 @@
+"""
+Teste de concorrência da numeração das vendas.
+
+Simula vários caixas finalizando vendas no mesmo instante (cada caixa com
+mais de um processo, como o programa reaberto no meio do expediente) e
+confere que nenhum número se repete e que os números de cada processo
+crescem dentro do caixa.
+
+Uso:
+    python testar_numeracao_vendas.py            # sequência simulada em memória
+    python testar_numeracao_vendas.py --banco    # reserva os blocos no MySQL (tabela sequencias_venda)
+
+Com --banco o teste usa caixas fictícios a partir de 900000 e apaga as
+linhas deles de sequencias_venda ao terminar (e antes de começar, caso uma
+execução anterior tenha sido interrompida).
+"""
+import sys
+import threading
+import time
+from collections import defaultdict
+from src.services.numeracao_vendas import NumeracaoVendas
+
+CAIXAS = 20
+PROCESSOS_POR_CAIXA = 2
+VENDAS_POR_PROCESSO = 300
+TAMANHO_BLOCO = 25
+
+class SequenciaMemoria:
+    """Mesma regra da tabela sequencias_venda, em memória."""
+    
+    def __init__(self):
+        self.proximo = defaultdict(lambda: 1)
+        self.reservas = 0
+        self.lock = threading.Lock()
+    
+    def reservar(self, caixa_id, tamanho):
+        with self.lock:
+            inicio = self.proximo[caixa_id]
+            self.proximo[caixa_id] = inicio + tamanho
+            self.reservas += 1
+            return inicio
+
+def executar(reservar, caixa_base):
+    """Dispara todos os processos juntos e retorna os números emitidos por (caixa, processo)."""
+    emitidos = {}
+    barreira = threading.Barrier(CAIXAS * PROCESSOS_POR_CAIXA)
+    
+    def processo(caixa_id, indice):
+        numeracao = NumeracaoVendas(TAMANHO_BLOCO, reservar)
+        barreira.wait()
+        emitidos[(caixa_id, indice)] = [numeracao.proximo_numero(caixa_id) for _ in range(VENDAS_POR_PROCESSO)]
+    
+    threads = [
+        threading.Thread(target=processo, args=(caixa_base + c, p))
+        for c in range(CAIXAS) for p in range(PROCESSOS_POR_CAIXA)
+    ]
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return emitidos, time.perf_counter() - inicio
+
+def verificar(emitidos):
+    """Retorna a lista de problemas encontrados (vazia se tudo certo)."""
+    problemas = []
+    todos = [numero for numeros in emitidos.values() for numero in numeros]
+    
+    repetidos = len(todos) - len(set(todos))
+    if repetidos:
+        problemas.append(f"{repetidos} número(s) repetido(s)")
+    
+    locais = [numero for numero in todos if '-L' in numero]
+    if locais:
+        problemas.append(f"{len(locais)} número(s) emitido(s) sem reserva no banco")
+    
+    for (caixa_id, indice), numeros in emitidos.items():
+        sequencia = [int(numero.split('-')[1]) for numero in numeros if '-L' not in numero]
+        if sequencia != sorted(sequencia):
+            problemas.append(f"caixa {caixa_id}, processo {indice}: números fora de ordem")
+        if any(not numero.startswith(f"V{caixa_id}-") for numero in numeros):
+            problemas.append(f"caixa {caixa_id}, processo {indice}: número de outro caixa")
+    
+    return problemas
+
+def limpar_sequencias(caixa_base):
+    """Apaga de sequencias_venda as linhas dos caixas fictícios do teste."""
+    from src.config.database import DatabaseConnection
+    with DatabaseConnection.get_cursor() as cursor:
+        cursor.execute(
+            "DELETE FROM sequencias_venda WHERE caixa_id BETWEEN %s AND %s",
+            (caixa_base, caixa_base + CAIXAS - 1)
+        )
+
+def main():
+    """Função principal."""
+    usar_banco = '--banco' in sys.argv[1:]
+    
+    print("=" * 60)
+    print("🔢 Teste de concorrência da numeração de vendas")
+    print("=" * 60)
+    print(f"   {CAIXAS} caixas x {PROCESSOS_POR_CAIXA} processos x {VENDAS_POR_PROCESSO} vendas, blocos de {TAMANHO_BLOCO}")
+    
+    if usar_banco:
+        from src.dao.sequencia_venda_dao import SequenciaVendaDAO
+        reservar = SequenciaVendaDAO.reservar_bloco
+        # Caixas fictícios bem acima dos reais, para não consumir a sequência de verdade
+        caixa_base = 900000
+        sequencia = None
+        limpar_sequencias(caixa_base)
+    else:
+        sequencia = SequenciaMemoria()
+        reservar = sequencia.reservar
+        caixa_base = 1
+    
+    try:
+        emitidos, duracao = executar(reservar, caixa_base)
+    finally:
+        if usar_banco:
+            limpar_sequencias(caixa_base)
+    total = sum(len(numeros) for numeros in emitidos.values())
+    
+    print(f"\n   {total} números emitidos em {duracao * 1000:.0f} ms")
+    if sequencia:
+        print(f"   {sequencia.reservas} reservas de bloco ({total / sequencia.reservas:.0f} vendas por ida ao banco)")
+    
+    problemas = verificar(emitidos)
+    if problemas:
+        for problema in problemas:
+            print(f"   ✗ {problema}")
+        sys.exit(1)
+    
+    print("   ✓ Nenhum número repetido; números crescentes em cada caixa")
+
+if __name__ == '__main__':
+    main()
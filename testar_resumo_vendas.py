@@ -0,0 +1,97 @@
+"""
+Teste do resumo diário de vendas (ResumoVendasDAO).
+
+Cria uma venda de teste cujo primeiro pagamento foi recusado (cartão) e o
+segundo aprovado (PIX), e confere que tanto o registro incremental quanto a
+reconstrução contam a venda na forma do pagamento aprovado, como o
+relatório detalhado. Tudo roda em uma transação que é desfeita no final:
+nada fica gravado no banco.
+
+Uso:
+    python testar_resumo_vendas.py
+"""
+import sys
+import uuid
+from datetime import date
+from decimal import Decimal
+from src.config.database import DatabaseConnection
+from src.dao.resumo_vendas_dao import ResumoVendasDAO
+
+DIA_TESTE = date(2000, 1, 1)
+
+class Desfazer(Exception):
+    """Levantada no fim do teste para desfazer a transação."""
+
+def criar_venda(cursor):
+    """Insere a venda de teste com um pagamento recusado e outro aprovado; retorna o ID."""
+    cursor.execute("SELECT id FROM usuarios ORDER BY id LIMIT 1")
+    usuario_id = cursor.fetchone()['id']
+    cursor.execute(
+        """INSERT INTO vendas (numero_venda, usuario_id, caixa_id, data_hora, subtotal, total, status)
+           VALUES (%s, %s, NULL, %s, %s, %s, 'finalizada')""",
+        (f"T-{uuid.uuid4().hex[:12]}", usuario_id, f"{DIA_TESTE} 12:00:00", Decimal('10.00'), Decimal('10.00'))
+    )
+    venda_id = cursor.lastrowid
+    for forma, status in (('debito', 'recusado'), ('pix', 'aprovado')):
+        cursor.execute(
+            "INSERT INTO pagamentos (venda_id, forma_pagamento, valor, status) VALUES (%s, %s, %s, %s)",
+            (venda_id, forma, Decimal('10.00'), status)
+        )
+    return venda_id
+
+def vendas_por_forma(cursor):
+    """Quantidade de vendas do dia de teste por forma de pagamento."""
+    cursor.execute(
+        "SELECT forma_pagamento, quantidade_vendas FROM vendas_resumo_diario WHERE data = %s",
+        (DIA_TESTE,)
+    )
+    return {linha['forma_pagamento']: linha['quantidade_vendas'] for linha in cursor.fetchall()}
+
+def executar_casos(cursor):
+    """Executa os casos e retorna a lista de (descrição, ok, detalhe)."""
+    resultados = []
+    cursor.execute("DELETE FROM vendas_resumo_diario WHERE data = %s", (DIA_TESTE,))
+    venda_id = criar_venda(cursor)
+    
+    ResumoVendasDAO.registrar_venda(venda_id, cursor)
+    contagem = vendas_por_forma(cursor)
+    ok = contagem.get('pix') == 1 and not contagem.get('debito')
+    resultados.append(("Registro conta na forma aprovada (PIX)", ok, str(contagem)))
+    
+    ResumoVendasDAO.reconstruir(DIA_TESTE, DIA_TESTE, cursor)
+    contagem = vendas_por_forma(cursor)
+    ok = contagem.get('pix') == 1 and not contagem.get('debito')
+    resultados.append(("Reconstrução conta na forma aprovada", ok, str(contagem)))
+    
+    return resultados
+
+def main():
+    """Função principal."""
+    print("=" * 60)
+    print("📊 Teste do resumo diário de vendas")
+    print("=" * 60)
+    
+    DatabaseConnection.initialize_pool()
+    
+    resultados = []
+    try:
+        with DatabaseConnection.get_cursor() as cursor:
+            resultados = executar_casos(cursor)
+            raise Desfazer()
+    except Desfazer:
+        pass
+    
+    falhas = 0
+    for descricao, ok, detalhe in resultados:
+        print(f"   {'✓' if ok else '✗'} {descricao:<40} {detalhe}")
+        if not ok:
+            falhas += 1
+    
+    if falhas:
+        print(f"\n✗ {falhas} caso(s) com falha")
+        sys.exit(1)
+    
+    print("\n✓ Resumo de vendas correto (nada foi gravado)")
+
+if __name__ == '__main__':
+    main()
@@ -10,11 +10,13 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 import os
 import secrets
+import hashlib
+import hmac
 
 from src.services.auth_service import auth_service
 from src.dao.produto_dao import ProdutoDAO
 from src.dao.categoria_dao import CategoriaDAO
-from src.dao.venda_dao import VendaDAO
+from src.dao.resumo_vendas_dao import ResumoVendasDAO
 from src.dao.usuario_dao import UsuarioDAO
 from src.services.config_service import config_service
 from src.utils.formatters import Formatters
@@ -52,6 +54,51 @@ def admin_required(f):
     return decorated_function
 
 
+# Campos devolvidos por /api/produtos quando "fields" não é informado
+CAMPOS_PRODUTO_LISTA = [
+    'id', 'codigo_barras', 'nome', 'categoria_id', 'preco_venda',
+    'preco_custo', 'estoque_atual', 'estoque_minimo', 'ativo'
+]
+
+
+def _resposta_com_etag(versao: str, gerar_resposta):
+    """
+    Responde 304 quando o cliente já tem a versão atual (If-None-Match).
+    
+    Args:
+        versao: Versão atual dos dados (None desativa o ETag)
+        gerar_resposta: Função que monta a resposta completa
+    """
+    if versao is None:
+        return gerar_resposta()
+    
+    # A mesma versão pode gerar corpos diferentes conforme os parâmetros
+    etag = hashlib.sha1(f"{versao}|{request.full_path}".encode('utf-8')).hexdigest()
+    
+    if request.if_none_match.contains(etag):
+        resposta = make_response('', 304)
+    else:
+        resposta = make_response(gerar_resposta())
+    
+    resposta.set_etag(etag)
+    resposta.headers['Cache-Control'] = 'private, no-cache'
+    return resposta
+
+
+def _serializar_linha(linha: dict) -> dict:
+    """Converte valores de uma linha do banco (Decimal, datetime) para JSON."""
+    resultado = {}
+    for chave, valor in linha.items():
+        if isinstance(valor, Decimal):
+            valor = float(valor)
+        elif isinstance(valor, datetime):
+            valor = valor.isoformat()
+        elif chave == 'ativo' and valor is not None:
+            valor = bool(valor)
+        resultado[chave] = valor
+    return resultado
+
+
 # ==================== ROTAS DE AUTENTICAÇÃO ====================
 
 @app.route('/')
@@ -169,23 +216,11 @@ def api_pdv_buscar_produtos():
     if not termo:
         return jsonify([])
     
-    # Busca por código de barras ou nome
+    # Busca por código de barras ou nome (filtro, ranking e limite no banco)
     try:
-        # Tenta buscar por código de barras exato
-        produto = ProdutoDAO.buscar_por_codigo_barras(termo)
-        if produto:
-            return jsonify([{
-                'id': produto.id,
-                'codigo_barras': produto.codigo_barras,
-                'nome': produto.nome,
-                'preco_venda': float(produto.preco_venda),
-                'estoque_atual': produto.estoque_atual,
-                'unidade_medida': produto.unidade_medida
-            }])
-        
-        # Busca por nome
-        produtos = ProdutoDAO.listar_ativos()
-        resultados = [
+        produtos = ProdutoDAO.pesquisar(termo, limite=10)
+        
+        return jsonify([
             {
                 'id': p.id,
                 'codigo_barras': p.codigo_barras,
@@ -195,10 +230,7 @@ def api_pdv_buscar_produtos():
                 'unidade_medida': p.unidade_medida
             }
             for p in produtos
-            if termo.lower() in p.nome.lower() or termo in (p.codigo_barras or '')
-        ][:10]  # Limita a 10 resultados
-        
-        return jsonify(resultados)
+        ])
     
     except Exception as e:
         return jsonify({'erro': str(e)}), 400
@@ -209,19 +241,99 @@ def api_pdv_buscar_produtos():
 @app.route('/api/produtos', methods=['GET'])
 @login_required
 def api_produtos_listar():
-    """Lista todos os produtos."""
-    produtos = ProdutoDAO.buscar_todos()
-    return jsonify([{
-        'id': p.id,
-        'codigo_barras': p.codigo_barras,
-        'nome': p.nome,
-        'categoria_id': p.categoria_id,
-        'preco_venda': float(p.preco_venda),
-        'preco_custo': float(p.preco_custo) if p.preco_custo else 0,
-        'estoque_atual': p.estoque_atual,
-        'estoque_minimo': p.estoque_minimo,
-        'ativo': p.ativo
-    } for p in produtos])
+    """
+    Lista produtos com paginação por cursor e projeção de campos.
+    
+    Parâmetros (query string):
+        after_id: Último ID recebido (cursor); omitido na primeira página
+        limit: Tamanho da página (máx. 1000); sem limit devolve o catálogo todo
+        fields: Campos separados por vírgula (ex: id,nome,preco_venda)
+        include_inactive: 1 para incluir produtos inativos (padrão: só ativos)
+    
+    O cursor da próxima página vai no cabeçalho X-Next-After-Id.
+    """
+    try:
+        after_id = request.args.get('after_id', 0, type=int)
+        limite = request.args.get('limit', type=int)
+        campos = [c.strip() for c in request.args.get('fields', '').split(',') if c.strip()]
+        campos = campos or CAMPOS_PRODUTO_LISTA
+        apenas_ativos = request.args.get('include_inactive', '').lower() not in ('1', 'true', 'sim')
+        
+        invalidos = [c for c in campos if c not in ProdutoDAO.CAMPOS_PROJETAVEIS]
+        if invalidos:
+            raise ValueError(f"Campos inválidos: {', '.join(invalidos)}")
+        
+        paginado = limite is not None
+        if paginado:
+            limite = max(1, min(limite, 1000))
+        
+        def gerar_resposta():
+            cursor = after_id
+            if paginado:
+                linhas = ProdutoDAO.buscar_pagina(cursor, limite, campos, apenas_ativos)
+            else:
+                # Compatibilidade: sem limit percorre todas as páginas
+                linhas = []
+                while True:
+                    pagina = ProdutoDAO.buscar_pagina(cursor, 1000, campos, apenas_ativos)
+                    linhas.extend(pagina)
+                    if len(pagina) < 1000:
+                        break
+                    cursor = pagina[-1]['id']
+            
+            resposta = jsonify([_serializar_linha(linha) for linha in linhas])
+            if paginado and len(linhas) == limite:
+                resposta.headers['X-Next-After-Id'] = str(linhas[-1]['id'])
+            return resposta
+        
+        return _resposta_com_etag(ProdutoDAO.obter_versao_catalogo(), gerar_resposta)
+    
+    except ValueError as e:
+        return jsonify({'erro': str(e)}), 400
+    except Exception as e:
+        Logger.log_erro("Listagem de produtos", e)
+        return jsonify({'erro': 'Erro ao listar produtos'}), 500
+
+
+@app.route('/api/produtos/changes', methods=['GET'])
+@login_required
+def api_produtos_alteracoes():
+    """
+    Sincronização incremental do catálogo.
+    
+    Parâmetros (query string):
+        since: Versão recebida na sincronização anterior; omitido na primeira
+    
+    Retorna {"version", "completo", "produtos"}: com since, apenas os produtos
+    (ativos ou não) alterados desde aquela versão; sem since, o catálogo todo.
+    O cliente deve substituir os produtos recebidos pelo id.
+    """
+    since = request.args.get('since', '').strip()
+    versao_atual = ProdutoDAO.obter_versao_catalogo()
+    
+    def gerar_resposta():
+        completo = not since or since == "0"
+        if completo:
+            produtos = ProdutoDAO.buscar_todos(apenas_ativos=False)
+        elif since == versao_atual:
+            produtos = []
+        else:
+            try:
+                marcador = datetime.fromisoformat(since.rsplit('.', 1)[0])
+            except ValueError:
+                return jsonify({'erro': 'Versão inválida'}), 400
+            produtos = ProdutoDAO.buscar_alterados_desde(marcador)
+        
+        return jsonify({
+            'version': versao_atual,
+            'completo': completo,
+            'produtos': [
+                _serializar_linha({campo: p.to_dict()[campo] for campo in CAMPOS_PRODUTO_LISTA})
+                for p in produtos
+            ]
+        })
+    
+    return _resposta_com_etag(versao_atual, gerar_resposta)
 
 
 @app.route('/api/produtos/<int:produto_id>', methods=['GET'])
@@ -322,6 +434,46 @@ def api_produto_atualizar(produto_id):
         return jsonify({'erro': str(e)}), 400
 
 
+@app.route('/api/produtos/reajuste', methods=['POST'])
+@admin_required
+def api_produtos_reajuste():
+    """
+    Reajuste de preços em massa.
+    
+    Body: tipo (percentual, margem, arredondamento), valor, terminacao,
+    filtro {categoria_id, termo, codigos_barras, apenas_ativos} e simular
+    (padrão true: só devolve a prévia, sem gravar).
+    """
+    data = request.get_json() or {}
+    
+    try:
+        from src.models.reajuste_preco import RegraReajuste, FiltroProdutos
+        from src.services.reajuste_service import ReajusteService
+        
+        regra = RegraReajuste.from_dict(data)
+        filtro = FiltroProdutos.from_dict(data.get('filtro') or {})
+        
+        if data.get('simular', True):
+            simulacao = ReajusteService.simular(regra, filtro)
+            return jsonify({
+                'quantidade': simulacao['quantidade'],
+                'total_atual': float(simulacao['total_atual']),
+                'total_novo': float(simulacao['total_novo']),
+                'itens': [_serializar_linha(item) for item in simulacao['itens'][:500]]
+            })
+        
+        resultado = ReajusteService.aplicar(
+            regra, filtro, session['usuario_id'], session.get('usuario_nome', 'Sistema')
+        )
+        return jsonify({'sucesso': True, **resultado})
+        
+    except ValueError as e:
+        return jsonify({'erro': str(e)}), 400
+    except Exception as e:
+        Logger.log_erro("Reajuste de preços", e)
+        return jsonify({'erro': 'Erro ao aplicar o reajuste'}), 500
+
+
 # ==================== API - CATEGORIAS ====================
 
 @app.route('/api/categorias', methods=['GET'])
@@ -346,16 +498,20 @@ def api_vendas_resumo():
     data_inicio = request.args.get('data_inicio')
     data_fim = request.args.get('data_fim')
     
-    if not data_inicio:
-        data_inicio = datetime.now().date()
+    try:
+        inicio = datetime.strptime(data_inicio, '%Y-%m-%d').date() if data_inicio else datetime.now().date()
+        fim = datetime.strptime(data_fim, '%Y-%m-%d').date() if data_fim else inicio
+    except ValueError:
+        return jsonify({'erro': 'Datas devem estar no formato AAAA-MM-DD'}), 400
     
-    total = VendaDAO.obter_total_vendas_dia(data_inicio)
+    resumo = ResumoVendasDAO.obter_totais(inicio, fim)
     
     return jsonify({
-        'data_inicio': str(data_inicio),
-        'data_fim': str(data_fim) if data_fim else str(data_inicio),
-        'total_vendas': float(total),
-        'total_vendas_formatado': Formatters.formatar_moeda(total)
+        'data_inicio': str(inicio),
+        'data_fim': str(fim),
+        'total_vendas': resumo['total'],
+        'total_vendas_formatado': Formatters.formatar_moeda(resumo['total']),
+        'quantidade_vendas': resumo['quantidade']
     })
 
 
@@ -603,14 +759,15 @@ def api_config_mercadopago_atualizar():
 def api_estatisticas_dashboard():
     """Estatísticas para o dashboard."""
     try:
-        vendas_hoje = VendaDAO.obter_total_vendas_dia()
+        resumo_hoje = ResumoVendasDAO.obter_totais()
         produtos_estoque_baixo = ProdutoDAO.buscar_estoque_baixo()
-        total_produtos = len(ProdutoDAO.buscar_todos())
+        total_produtos = ProdutoDAO.contar()
         
         return jsonify({
             'vendas_hoje': {
-                'valor': float(vendas_hoje),
-                'formatado': Formatters.formatar_moeda(vendas_hoje)
+                'valor': resumo_hoje['total'],
+                'formatado': Formatters.formatar_moeda(resumo_hoje['total']),
+                'quantidade': resumo_hoje['quantidade']
             },
             'estoque_baixo': len(produtos_estoque_baixo),
             'total_produtos': total_produtos
@@ -619,6 +776,58 @@ def api_estatisticas_dashboard():
         return jsonify({'erro': str(e)}), 500
 
 
+@app.route('/api/estatisticas/produtos', methods=['GET'])
+@login_required
+def api_estatisticas_produtos():
+    """
+    Produtos mais vendidos do período, com a classe ABC de cada um.
+    
+    Query: data_inicio e data_fim (AAAA-MM-DD; padrão: últimos 30 dias),
+    categoria_id, caixa_id, ordenar_por (valor, quantidade, vendas) e
+    limite (padrão 50).
+    """
+    try:
+        from src.models.analise_vendas import FiltroAnalise
+        from src.services.analise_vendas_service import AnaliseVendasService
+        
+        filtro = FiltroAnalise.from_dict(request.args)
+        limite = request.args.get('limite', 50, type=int)
+        curva = AnaliseVendasService.curva_abc(filtro, request.args.get('ordenar_por', 'valor'))
+        
+        return jsonify({
+            'data_inicio': str(filtro.data_inicio),
+            'data_fim': str(filtro.data_fim),
+            'total_produtos': len(curva['itens']),
+            'total': curva['total'],
+            'classes': curva['classes'],
+            'itens': curva['itens'][:limite]
+        })
+    except ValueError as e:
+        return jsonify({'erro': str(e)}), 400
+    except Exception as e:
+        Logger.log_erro("Estatísticas de produtos", e)
+        return jsonify({'erro': 'Erro ao consultar as vendas por produto'}), 500
+
+
+@app.route('/api/estatisticas/produtos/<int:produto_id>/tendencia', methods=['GET'])
+@login_required
+def api_estatisticas_produto_tendencia(produto_id):
+    """Vendas diárias de um produto. Query: data_inicio, data_fim e caixa_id."""
+    try:
+        from src.models.analise_vendas import FiltroAnalise
+        from src.services.analise_vendas_service import AnaliseVendasService
+        
+        filtro = FiltroAnalise.from_dict(request.args)
+        serie = AnaliseVendasService.tendencia(produto_id, filtro)
+        
+        return jsonify([{**dia, 'data': str(dia['data'])} for dia in serie])
+    except ValueError as e:
+        return jsonify({'erro': str(e)}), 400
+    except Exception as e:
+        Logger.log_erro("Tendência do produto", e)
+        return jsonify({'erro': 'Erro ao consultar as vendas do produto'}), 500
+
+
 # ==================== API - MERCADO PAGO WEBHOOK ====================
 
 @app.route('/webhook/mercadopago', methods=['POST'])
@@ -642,31 +851,38 @@ def webhook_mercadopago():
                 # Processa em background para não bloquear o webhook
                 from threading import Thread
                 from src.services.mercado_pago_service import mercado_pago_service
+                from src.services.pagamento_status_hub import pagamento_status_hub
                 from src.services.pix_split_service import pix_split_service
+                from src.dao.pix_notificacao_dao import PixNotificacaoDAO
                 
                 def processar_webhook_background():
                     try:
-                        # Verifica status do pagamento
-                        status = mercado_pago_service.verificar_status_pagamento(str(payment_id))
+                        # Uma única consulta traz status e valor do pagamento
+                        payment_data = mercado_pago_service._obter_dados_pagamento(str(payment_id))
+                        if not payment_data:
+                            return
+                        
+                        status = payment_data.get('status')
+                        
+                        # Repassa o status para a frente de caixa (outro processo)
+                        # e para pagamentos acompanhados neste processo
+                        PixNotificacaoDAO.registrar(str(payment_id), status)
+                        pagamento_status_hub.notificar(str(payment_id), status)
                         
                         if status == 'approved':
-                            # Obtém dados do pagamento
-                            payment_data = mercado_pago_service._obter_dados_pagamento(str(payment_id))
+                            valor_total = Decimal(str(payment_data.get('transaction_amount', 0)))
                             
-                            if payment_data:
-                                valor_total = Decimal(str(payment_data.get('transaction_amount', 0)))
-                                
-                                # Processa o split
-                                sucesso = pix_split_service.processar_split_pagamento(
-                                    payment_id_original=str(payment_id),
-                                    valor_total=valor_total
-                                )
-                                
-                                if sucesso:
-                                    Logger.log_operacao("Webhook", "SPLIT_PROCESSADO_WEBHOOK", 
-                                                      f"Payment ID: {payment_id} - Valor: R$ {float(valor_total):.2f}")
-                                else:
-                                    Logger.log_erro("Webhook", f"Falha no processamento do split via webhook: {payment_id}")
+                            # Processa o split
+                            sucesso = pix_split_service.processar_split_pagamento(
+                                payment_id_original=str(payment_id),
+                                valor_total=valor_total
+                            )
+                            
+                            if sucesso:
+                                Logger.log_operacao("Webhook", "SPLIT_PROCESSADO_WEBHOOK", 
+                                                  f"Payment ID: {payment_id} - Valor: R$ {float(valor_total):.2f}")
+                            else:
+                                Logger.log_erro("Webhook", f"Falha no processamento do split via webhook: {payment_id}")
                         
                     except Exception as e:
                         Logger.log_erro("Webhook", f"Erro no processamento do webhook: {str(e)}")
@@ -701,6 +917,80 @@ def configuracoes_page():
     return render_template('configuracoes.html', usuario=session)
 
 
+# ==================== MÉTRICAS ====================
+
+def _metricas_autorizadas() -> bool:
+    """Admin logado ou coletor com o token de [monitoramento] token_metricas."""
+    from src.config.config_reader import config
+    token = config.get('monitoramento', 'token_metricas', fallback='').strip()
+    if token:
+        autorizacao = request.headers.get('Authorization', '')
+        if hmac.compare_digest(autorizacao, f"Bearer {token}"):
+            return True
+    return session.get('usuario_tipo') == 'admin'
+
+
+def _linhas_gauge(nome: str, descricao: str, series) -> list:
+    """
+    Gauges no formato texto do Prometheus.
+    
+    Args:
+        nome: Prefixo das métricas (cada chave numérica vira nome_chave)
+        descricao: Texto do HELP
+        series: dict de valores, ou lista de (rótulos, dict) para várias séries
+    """
+    if isinstance(series, dict):
+        series = [('', series)]
+    
+    por_metrica = {}
+    for rotulos, valores in series:
+        for chave, valor in valores.items():
+            if isinstance(valor, bool):
+                valor = int(valor)
+            if isinstance(valor, (int, float)):
+                por_metrica.setdefault(f"{nome}_{chave}", []).append(f"{nome}_{chave}{rotulos} {valor}")
+    
+    linhas = []
+    for metrica, amostras in por_metrica.items():
+        linhas.append(f"# HELP {metrica} {descricao}.")
+        linhas.append(f"# TYPE {metrica} gauge")
+        linhas.extend(amostras)
+    return linhas
+
+
+@app.route('/metrics')
+def metrics():
+    """Métricas no formato do Prometheus: latência SQL por DAO, pool, réplica e gateway HTTP."""
+    if not _metricas_autorizadas():
+        return jsonify({'erro': 'Acesso negado'}), 403
+    
+    import sys
+    from src.config.database import DatabaseConnection
+    from src.utils.monitor_sql import monitor_sql
+    
+    linhas = [monitor_sql.exportar_prometheus().rstrip("\n")]
+    linhas += _linhas_gauge("pdv_pool", "Pool de conexões do primário", DatabaseConnection.obter_metricas_pool())
+    
+    replica = DatabaseConnection.obter_metricas_replica()
+    if replica:
+        linhas += _linhas_gauge("pdv_replica", "Réplica de leitura", {
+            chave: valor for chave, valor in replica.items() if chave != 'pool'
+        })
+        linhas += _linhas_gauge("pdv_replica_pool", "Pool de conexões da réplica", replica['pool'])
+    
+    # Só se algum pagamento já usou o gateway neste processo
+    if 'src.services.gateway_http' in sys.modules:
+        from src.services.gateway_http import gateway_http
+        linhas += _linhas_gauge("pdv_gateway", "Chamadas HTTP ao gateway de pagamento", [
+            (f'{{operacao="{operacao}"}}', valores)
+            for operacao, valores in sorted(gateway_http.obter_metricas().items())
+        ])
+    
+    resposta = make_response("\n".join(linhas) + "\n")
+    resposta.headers['Content-Type'] = 'text/plain; version=0.0.4; charset=utf-8'
+    return resposta
+
+
 # ==================== ERRO HANDLERS ====================
 
 @app.errorhandler(404)